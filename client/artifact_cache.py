@@ -0,0 +1,146 @@
+"""
+아티팩트 캐시 (클라이언트)
+install/download 명령의 파일을 원본 URL 대신 서버의 아티팩트 캐시(/install/artifacts)에서 받는다.
+
+- 서버가 알려준 SHA-256 이름으로 로컬에 보관 → 같은 파일은 다시 받지 않음
+- 끊기면 .part 파일 크기부터 Range/If-Range로 이어받기
+- 받은 뒤 해시가 다르면 버림 (호출자는 원본 URL에서 직접 받음)
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from typing import Optional
+from urllib.parse import quote
+
+import requests
+
+logger = logging.getLogger('wcms')
+
+_READ_BLOCK = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """서버 아티팩트 캐시에서 파일을 받아 로컬에 보관
+
+    Args:
+        server_url: 서버 URL
+        cache_dir: 로컬 보관 디렉토리
+        max_bytes: 로컬 보관 상한 (넘으면 오래 안 쓴 파일부터 삭제)
+        max_wait: 서버가 원본을 받는 중일 때 기다리는 최대 시간 (초)
+        timeout: HTTP 타임아웃 (초)
+        max_attempts: 다운로드가 끊겼을 때 이어받기 시도 횟수
+    """
+
+    def __init__(self, server_url: str, cache_dir: str, max_bytes: int = 2 * 1024 * 1024 * 1024,
+                 max_wait: float = 300, timeout: float = 30, max_attempts: int = 3):
+        self.server_url = server_url.rstrip('/')
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+
+    def _resolve(self, source_url: str) -> Optional[dict]:
+        """서버 캐시 항목 조회 (받는 중이면 Retry-After만큼 기다림). 캐시가 없으면 None"""
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            try:
+                url = f"{self.server_url}/install/artifacts?url={quote(source_url, safe='')}"
+                r = requests.get(url, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                logger.debug(f"아티팩트 조회 실패: {e}")
+                return None
+            if r.status_code == 200:
+                return r.json()
+            if r.status_code != 202:
+                return None
+            wait = float(r.headers.get('Retry-After', 5))
+            if time.monotonic() + wait > deadline:
+                logger.info(f"서버 아티팩트 캐시 대기 시간 초과: {source_url}")
+                return None
+            time.sleep(wait)
+
+    def _download(self, download_url: str, sha256: str, part_path: str) -> bool:
+        """part_path로 받기 (있으면 이어받기). 끝까지 받았으면 True"""
+        for attempt in range(self.max_attempts):
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = {'Range': f'bytes={offset}-', 'If-Range': f'"{sha256}"'} if offset else {}
+            try:
+                with requests.get(download_url, headers=headers, stream=True,
+                                  timeout=self.timeout) as r:
+                    if r.status_code == 416:
+                        # .part가 이미 전체 크기 이상 → 처음부터
+                        os.unlink(part_path)
+                        continue
+                    r.raise_for_status()
+                    # 206이면 이어쓰기, 200이면(서버가 Range 무시) 처음부터
+                    with open(part_path, 'ab' if r.status_code == 206 else 'wb') as f:
+                        for block in r.iter_content(chunk_size=64 * 1024):
+                            f.write(block)
+                return True
+            except (requests.exceptions.RequestException, OSError) as e:
+                logger.warning(f"아티팩트 다운로드 중단 (시도 {attempt + 1}/{self.max_attempts}): {e}")
+        return False
+
+    def _evict(self, keep: str) -> None:
+        """보관 상한을 넘으면 오래 안 쓴 파일부터 삭제"""
+        try:
+            entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)]
+            files = sorted((os.stat(path).st_mtime, os.path.getsize(path), path)
+                           for path in entries if os.path.isfile(path) and path != keep)
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files) + os.path.getsize(keep)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+
+    def fetch(self, source_url: str) -> Optional[str]:
+        """source_url의 파일을 로컬 캐시 경로로 반환 (서버 캐시에 없거나 실패하면 None)"""
+        try:
+            return self._fetch(source_url)
+        except (OSError, ValueError) as e:
+            # 캐시는 최적화일 뿐이므로 실패하면 호출자가 원본에서 받음
+            logger.warning(f"아티팩트 캐시 사용 실패: {source_url} - {e}")
+            return None
+
+    def _fetch(self, source_url: str) -> Optional[str]:
+        entry = self._resolve(source_url)
+        sha256 = (entry or {}).get('sha256') or ''
+        if not re.fullmatch(r'[0-9a-f]{64}', sha256):
+            return None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, sha256)
+
+        if os.path.exists(path):
+            if file_sha256(path) == sha256:
+                os.utime(path)
+                logger.info(f"로컬 아티팩트 캐시 사용: {source_url}")
+                return path
+            os.unlink(path)
+
+        part_path = path + '.part'
+        if not self._download(self.server_url + entry['download_url'], sha256, part_path):
+            return None
+        if file_sha256(part_path) != sha256:
+            logger.warning(f"아티팩트 해시 불일치, 삭제: {source_url}")
+            os.unlink(part_path)
+            return None
+        os.replace(part_path, path)
+        self._evict(path)
+        return path
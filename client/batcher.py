@@ -0,0 +1,77 @@
+"""
+명령 결과 묶음 전송
+짧은 시간(window) 안에 끝난 명령 결과들을 모아 한 번의 요청으로 보낸다.
+메시지/프로세스 종료처럼 금방 끝나는 명령이 연달아 오면 결과마다 HTTP 요청과
+서버 커밋이 한 번씩 생기던 것을 줄인다.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger('wcms')
+
+
+class ResultBatcher:
+    """결과를 window초 동안 모아 send_batch로 넘기는 백그라운드 스레드
+
+    Args:
+        send_batch: 결과 목록 전송 함수 (실패 처리는 이 함수 책임 - 예: 스풀에 보관)
+        window: 첫 결과가 들어온 뒤 더 기다리는 시간 (초)
+        max_items: 한 번에 보내는 최대 결과 수 (넘으면 window를 기다리지 않고 전송)
+        on_error: send_batch가 예외를 던졌을 때 그 묶음을 넘겨받는 함수
+            (이미 실행된 명령의 결과이므로 버리지 않고 보관)
+    """
+
+    def __init__(self, send_batch: Callable[[List[Dict]], None], window: float = 0.5,
+                 max_items: int = 50, on_error: Optional[Callable[[List[Dict]], None]] = None):
+        self.send_batch = send_batch
+        self.on_error = on_error
+        self.window = window
+        self.max_items = max_items
+        self._items: List[Dict] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def submit(self, item: Dict) -> None:
+        """결과 추가 (즉시 반환). 종료 후에는 호출한 스레드에서 바로 전송"""
+        with self._cond:
+            if not self._closed:
+                self._items.append(item)
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='wcms-result-batcher',
+                                                    daemon=True)
+                    self._thread.start()
+                self._cond.notify_all()
+                return
+        self._deliver([item])
+
+    def _deliver(self, batch: List[Dict]) -> None:
+        try:
+            self.send_batch(batch)
+        except Exception as e:
+            logger.error(f"명령 결과 묶음 전송 오류: {e} ({len(batch)}건)")
+            if self.on_error is not None:
+                self.on_error(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._items and not self._closed:
+                    self._cond.wait()
+                if not self._items:
+                    return
+                # 첫 결과 이후 window 동안 더 모음 (가득 차거나 종료되면 바로 전송)
+                self._cond.wait_for(lambda: len(self._items) >= self.max_items or self._closed,
+                                    self.window)
+                batch, self._items = self._items[:self.max_items], self._items[self.max_items:]
+            self._deliver(batch)
+
+    def close(self, timeout: float = 10) -> None:
+        """남은 결과를 보내고 스레드 종료 (클라이언트 종료 시)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
@@ -157,6 +157,51 @@ RETRY_DELAY = int(os.getenv('WCMS_RETRY_DELAY', '5'))
 # 지수 백오프 사용 여부
 USE_EXPONENTIAL_BACKOFF = os.getenv('WCMS_USE_EXPONENTIAL_BACKOFF', 'true').lower() == 'true'
 
+# 네트워크 장애 후 재연결 대기 상한 (초) - full-jitter 백오프 (0 ~ min(상한, RETRY_DELAY * 2^n))
+RECONNECT_MAX_DELAY = int(os.getenv('WCMS_RECONNECT_MAX_DELAY', '60'))
+
+
+# ==================== 업로드 설정 (스풀, 묶음 전송) ====================
+
+# 전송 실패한 명령 결과를 보관하는 디렉토리 (재시작 후에도 유지)
+SPOOL_DIR = os.path.join(
+    os.environ.get('PROGRAMDATA', os.getcwd()),
+    'WCMS',
+    'spool'
+)
+
+# 스풀 최대 크기 (바이트) - 넘으면 오래된 레코드부터 정리
+SPOOL_MAX_BYTES = int(os.getenv('WCMS_SPOOL_MAX_BYTES', str(5 * 1024 * 1024)))  # 5MB
+
+# 재연결 시 한 번에 재전송하는 레코드 수
+SPOOL_BATCH_SIZE = int(os.getenv('WCMS_SPOOL_BATCH_SIZE', '50'))
+
+# 명령 결과 묶음 대기 시간 (초) - 이 시간 안에 끝난 결과는 한 번의 요청으로 전송
+RESULT_BATCH_WINDOW = float(os.getenv('WCMS_RESULT_BATCH_WINDOW', '0.5'))
+
+# 설치/삭제 명령 출력 업로드 주기 (초)
+OUTPUT_STREAM_INTERVAL = float(os.getenv('WCMS_OUTPUT_STREAM_INTERVAL', '2'))
+
+
+# ==================== 아티팩트 캐시 (install/download 파일) ====================
+
+# 서버 아티팩트 캐시에서 받은 파일 보관 디렉토리 (SHA-256 이름)
+ARTIFACT_CACHE_DIR = os.path.join(
+    os.environ.get('PROGRAMDATA', os.getcwd()),
+    'WCMS',
+    'artifacts'
+)
+
+# 로컬 보관 상한 (바이트) - 넘으면 오래 안 쓴 파일부터 삭제
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv('WCMS_ARTIFACT_CACHE_MAX_BYTES',
+                                         str(2 * 1024 * 1024 * 1024)))  # 2GB
+
+# 서버가 원본을 받는 중일 때 기다리는 최대 시간 (초) - 넘으면 원본 URL에서 직접 받음
+ARTIFACT_MAX_WAIT = float(os.getenv('WCMS_ARTIFACT_MAX_WAIT', '300'))
+
+# 업데이트 확인 주기 (초) - 단계적 배포 중이면 서버가 알려준 Retry-After를 따름
+UPDATE_CHECK_INTERVAL = int(os.getenv('WCMS_UPDATE_CHECK_INTERVAL', '3600'))  # 1시간
+
 
 # ==================== 버전 정보 ====================
 
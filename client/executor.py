@@ -6,8 +6,11 @@ import subprocess
 import logging
 import os
 import glob
+import shutil
 import tempfile
-from typing import Dict, Any
+import threading
+from collections import deque
+from typing import Callable, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger('wcms')
 
@@ -16,13 +19,17 @@ class CommandExecutor:
     """Windows 명령 실행 클래스"""
 
     @staticmethod
-    def execute_command(command_type: str, command_data: Dict[str, Any]) -> str:
+    def execute_command(command_type: str, command_data: Dict[str, Any],
+                        on_output: Optional[Callable[[str], None]] = None,
+                        fetch_artifact: Optional[Callable[[str], Optional[str]]] = None) -> str:
         """
         명령 타입에 따라 적절한 명령 실행
 
         Args:
             command_type: 명령 타입 (shutdown, restart, execute, etc)
             command_data: 명령 데이터 (parameters)
+            on_output: 실행 중 출력 줄을 받을 함수 (install/uninstall 진행 상황 스트리밍)
+            fetch_artifact: 원본 URL → 서버 아티팩트 캐시에서 받은 로컬 파일 경로 (없으면 None)
 
         Returns:
             실행 결과 메시지
@@ -44,14 +51,19 @@ class CommandExecutor:
                 command_data.get('command', '')
             ),
             'install': lambda: CommandExecutor.install(
-                command_data.get('app_id', '')
+                command_data.get('app_id', ''),
+                on_output,
+                command_data.get('package_url'),
+                fetch_artifact
             ),
             'uninstall': lambda: CommandExecutor.uninstall(
-                command_data.get('app_id', '')
+                command_data.get('app_id', ''),
+                on_output
             ),
             'download': lambda: CommandExecutor.download(
                 command_data.get('url', ''),
-                command_data.get('destination')
+                command_data.get('destination'),
+                fetch_artifact
             ),
             'create_user': lambda: CommandExecutor.create_user(**command_data),
             'delete_user': lambda: CommandExecutor.delete_user(
@@ -123,6 +135,49 @@ class CommandExecutor:
         except Exception as e:
             return f"실행 실패: {str(e)}"
 
+    @staticmethod
+    def _run_streaming(cmd: list, timeout: int,
+                       on_output: Optional[Callable[[str], None]] = None,
+                       tail_lines: int = 50) -> Tuple[int, str, bool]:
+        """프로세스 출력(stdout+stderr)을 줄 단위로 읽으며 on_output에 전달
+
+        전체 출력을 메모리에 모으지 않고 마지막 tail_lines줄만 남긴다 (실패 메시지용).
+
+        Returns:
+            (반환 코드, 마지막 출력 줄들, 타임아웃 여부)
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors='replace',
+            bufsize=1
+        )
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, kill)
+        timer.daemon = True
+        timer.start()
+        tail = deque(maxlen=tail_lines)
+        try:
+            for line in process.stdout:
+                tail.append(line.rstrip('\r\n'))
+                if on_output:
+                    try:
+                        on_output(line)
+                    except Exception as e:
+                        logger.debug(f"출력 전달 실패 (무시): {e}")
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+        return returncode, '\n'.join(tail).strip(), timed_out.is_set()
+
     @staticmethod
     def _ensure_chocolatey_installed() -> bool:
         """Chocolatey 설치 확인 및 설치"""
@@ -157,8 +212,14 @@ class CommandExecutor:
             return False
 
     @staticmethod
-    def install(app_id: str) -> str:
-        """프로그램 설치 (Chocolatey)"""
+    def install(app_id: str, on_output: Optional[Callable[[str], None]] = None,
+                package_url: Optional[str] = None,
+                fetch_artifact: Optional[Callable[[str], Optional[str]]] = None) -> str:
+        """프로그램 설치 (Chocolatey)
+
+        package_url(.nupkg)이 서버 아티팩트 캐시에 있으면 로컬 소스로 설치하고,
+        의존 패키지만 기본 Chocolatey 저장소에서 받는다.
+        """
         if not app_id:
             return "오류: 설치할 프로그램의 패키지 ID가 필요합니다."
         
@@ -166,32 +227,36 @@ class CommandExecutor:
         if not CommandExecutor._ensure_chocolatey_installed():
             return "오류: Chocolatey를 설치할 수 없어 프로그램을 설치할 수 없습니다."
 
+        source_dir = None
         try:
             # choco.exe는 보통 C:\ProgramData\chocolatey\bin\choco.exe에 있음
             choco_path = r"C:\ProgramData\chocolatey\bin\choco.exe"
             choco_exe = choco_path if os.path.exists(choco_path) else 'choco'
             cmd = [choco_exe, 'install', app_id, '-y', '--force']
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600 # 설치는 시간이 걸릴 수 있음
-            )
+            package_path = fetch_artifact(package_url) if package_url and fetch_artifact else None
+            if package_path:
+                source_dir = tempfile.mkdtemp(prefix='wcms-choco-')
+                shutil.copyfile(package_path, os.path.join(source_dir, f'{app_id}.nupkg'))
+                cmd += ['--source', f'{source_dir};https://community.chocolatey.org/api/v2/']
 
-            if result.returncode == 0:
+            # 설치는 시간이 걸릴 수 있음 (출력은 줄 단위로 on_output에 전달)
+            returncode, output, timed_out = CommandExecutor._run_streaming(cmd, 600, on_output)
+
+            if timed_out:
+                return f"설치 타임아웃: {app_id} (10분 초과)"
+            if returncode == 0:
                 return f"설치 완료: {app_id}"
-            else:
-                error_msg = result.stderr.strip() or result.stdout.strip()
-                return f"설치 실패: {app_id} (반환 코드: {result.returncode})\n출력: {error_msg}"
+            return f"설치 실패: {app_id} (반환 코드: {returncode})\n출력: {output}"
 
-        except subprocess.TimeoutExpired:
-            return f"설치 타임아웃: {app_id} (10분 초과)"
         except Exception as e:
             return f"설치 실패: {str(e)}"
+        finally:
+            if source_dir:
+                shutil.rmtree(source_dir, ignore_errors=True)
 
     @staticmethod
-    def uninstall(app_id: str) -> str:
+    def uninstall(app_id: str, on_output: Optional[Callable[[str], None]] = None) -> str:
         """프로그램 삭제 (Chocolatey)"""
         if not app_id:
             return "오류: 삭제할 프로그램의 패키지 ID가 필요합니다."
@@ -205,27 +270,22 @@ class CommandExecutor:
             choco_exe = choco_path if os.path.exists(choco_path) else 'choco'
             cmd = [choco_exe, 'uninstall', app_id, '-y', '--remove-dependencies']
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600 # 삭제는 시간이 걸릴 수 있음
-            )
+            # 삭제는 시간이 걸릴 수 있음 (출력은 줄 단위로 on_output에 전달)
+            returncode, output, timed_out = CommandExecutor._run_streaming(cmd, 600, on_output)
 
-            if result.returncode == 0:
+            if timed_out:
+                return f"삭제 타임아웃: {app_id} (10분 초과)"
+            if returncode == 0:
                 return f"삭제 완료: {app_id}"
-            else:
-                error_msg = result.stderr.strip() or result.stdout.strip()
-                return f"삭제 실패: {app_id} (반환 코드: {result.returncode})\n출력: {error_msg}"
+            return f"삭제 실패: {app_id} (반환 코드: {returncode})\n출력: {output}"
 
-        except subprocess.TimeoutExpired:
-            return f"삭제 타임아웃: {app_id} (10분 초과)"
         except Exception as e:
             return f"삭제 실패: {str(e)}"
 
     @staticmethod
-    def download(url: str, destination: str = None) -> str:
-        """파일 다운로드"""
+    def download(url: str, destination: str = None,
+                 fetch_artifact: Optional[Callable[[str], Optional[str]]] = None) -> str:
+        """파일 다운로드 (서버 아티팩트 캐시에 있으면 서버에서, 없으면 원본 URL에서)"""
         if not url:
             return "오류: 다운로드할 파일의 URL이 필요합니다."
         try:
@@ -243,6 +303,11 @@ class CommandExecutor:
                 os.makedirs(downloads_folder, exist_ok=True)
                 save_path = os.path.join(downloads_folder, filename)
 
+            cached_path = fetch_artifact(url) if fetch_artifact else None
+            if cached_path:
+                shutil.copyfile(cached_path, save_path)
+                return f"다운로드 완료: {save_path} ({os.path.getsize(save_path):,} bytes, 서버 캐시)"
+
             response = requests.get(url, stream=True, timeout=60)
             response.raise_for_status()
 
@@ -1,4 +1,6 @@
+import random
 import threading
+import time
 import requests
 import os
 import logging
@@ -9,12 +11,19 @@ from typing import Optional
 from config import (
     SERVER_URL, MACHINE_ID, REGISTRATION_PIN, HEARTBEAT_INTERVAL, LONG_POLL_TIMEOUT,
     LOG_DIR, LOG_FILE, LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT,
-    REQUEST_TIMEOUT, SHUTDOWN_TIMEOUT, __version__, POWER_COMMAND_GRACE_PERIOD, validate_config
+    REQUEST_TIMEOUT, SHUTDOWN_TIMEOUT, __version__, POWER_COMMAND_GRACE_PERIOD, validate_config,
+    SPOOL_DIR, SPOOL_MAX_BYTES, SPOOL_BATCH_SIZE, RESULT_BATCH_WINDOW, RETRY_DELAY,
+    OUTPUT_STREAM_INTERVAL, ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_BYTES, ARTIFACT_MAX_WAIT,
+    UPDATE_CHECK_INTERVAL, RECONNECT_MAX_DELAY
 )
 from collector import collect_static_info, collect_dynamic_info
 from executor import CommandExecutor
-from utils import safe_request, retry_on_network_error
+from utils import safe_request, retry_on_network_error, backoff_delay, retry_after_seconds
 from updater import perform_update
+from spool import Spool, KIND_RESULT
+from batcher import ResultBatcher
+from output_stream import OutputStreamer
+from artifact_cache import ArtifactCache
 
 # 부팅 시간 기록 (전원 관리 명령 유예 시간 계산용)
 BOOT_TIME = datetime.now()
@@ -24,6 +33,17 @@ STOP_EVENT = threading.Event()
 
 logger = logging.getLogger('wcms')
 
+# 전송 실패한 명령 결과 보관 (재연결 시 재전송)
+spool = Spool(SPOOL_DIR, max_bytes=SPOOL_MAX_BYTES, batch_size=SPOOL_BATCH_SIZE)
+
+# 짧은 시간 안에 끝난 명령 결과 묶음 전송
+result_batcher = ResultBatcher(lambda items: _send_result_batch(items), window=RESULT_BATCH_WINDOW,
+                               on_error=lambda items: _spool_results(items))
+
+# install/download 파일을 서버 아티팩트 캐시에서 받아 로컬에 보관
+artifact_cache = ArtifactCache(SERVER_URL, ARTIFACT_CACHE_DIR, max_bytes=ARTIFACT_CACHE_MAX_BYTES,
+                               max_wait=ARTIFACT_MAX_WAIT, timeout=REQUEST_TIMEOUT)
+
 
 def setup_logging():
     global logger
@@ -45,26 +65,49 @@ def setup_logging():
     return logger
 
 
-def check_for_updates():
-    """서버에서 최신 버전 확인"""
+def check_for_updates() -> float:
+    """서버에서 최신 버전 확인
+
+    단계적 배포 중이면 서버가 차례가 된 PC에만 새 버전을 알려주므로
+    machine_id와 현재 버전을 보내고, 기다리라는 응답(Retry-After)을 받으면 그 뒤에 다시 확인한다.
+
+    Returns:
+        다음 확인까지 대기 시간 (초, 여러 PC가 한꺼번에 묻지 않도록 지터 포함)
+    """
+    delay = UPDATE_CHECK_INTERVAL
     try:
-        response = safe_request(f"{SERVER_URL}api/client/version", timeout=REQUEST_TIMEOUT, max_retries=2)
+        response = safe_request(
+            f"{SERVER_URL}api/client/version",
+            timeout=REQUEST_TIMEOUT,
+            max_retries=2,
+            params={"machine_id": MACHINE_ID, "current": __version__}
+        )
         if response and response.status_code == 200:
             data = response.json()
             latest_version = data.get('version', '1.0.0')
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                delay = min(int(retry_after), UPDATE_CHECK_INTERVAL)
+                logger.info(f"단계적 배포 대기 중: {delay}초 후 다시 확인")
 
             if latest_version != __version__:
                 logger.warning(f"새 버전이 있습니다! 현재: {__version__}, 최신: {latest_version}")
                 download_url = data.get('download_url')
                 if download_url:
-                    logger.info(f"업데이트 시작: {download_url}")
-                    perform_update(download_url, latest_version)
+                    # 서버 미러가 있으면 서버에서 받고, 게시된 SHA-256으로 검증
+                    mirror_url = data.get('mirror_url')
+                    if mirror_url:
+                        mirror_url = f"{SERVER_URL.rstrip('/')}{mirror_url}"
+                    logger.info(f"업데이트 시작: {mirror_url or download_url}")
+                    perform_update(download_url, latest_version, sha256=data.get('sha256'),
+                                   mirror_url=mirror_url)
                 else:
                     logger.info("다운로드 URL이 없어 업데이트를 건너뜁니다.")
             else:
                 logger.info(f"최신 버전 사용 중: {__version__}")
     except Exception as e:
         logger.debug(f"버전 체크 실패 (무시): {e}")
+    return delay * random.uniform(1.0, 1.25)
 
 
 @retry_on_network_error(max_retries=3, delay=5)
@@ -170,6 +213,7 @@ def send_heartbeat():
             register_client()
             return False
         else:
+            # 스풀에 보관하지 않음: 서버는 최신 동적 정보만 유지하므로 다음 하트비트가 대신함
             logger.error(f"Heartbeat 실패: {r.status_code if r else 'No response'}")
             return False
     except Exception as e:
@@ -221,6 +265,26 @@ def should_skip_command(cmd_type: str, cmd_params: dict) -> bool:
     return False
 
 
+# 실행 중 출력을 스트리밍하는 명령 타입
+STREAMING_COMMAND_TYPES = ('install', 'uninstall')
+
+
+def _output_sender(cmd_id: int):
+    """OutputStreamer 전송 함수 (POST /commands/{id}/output). 4xx는 다시 보내도 실패하므로 보낸 것으로 처리"""
+    def send(seq: int, data: str) -> bool:
+        try:
+            r = requests.post(
+                f"{SERVER_URL}api/client/commands/{cmd_id}/output",
+                json={"seq": seq, "data": data},
+                timeout=REQUEST_TIMEOUT
+            )
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"명령 출력 업로드 실패: CMD#{cmd_id} - {e}")
+            return False
+        return r.status_code < 500
+    return send
+
+
 def execute_command_async(cmd_id: int, cmd_type: str, cmd_data: dict):
     """명령을 비동기(별도 스레드)로 실행"""
     def _run():
@@ -237,8 +301,18 @@ def execute_command_async(cmd_id: int, cmd_type: str, cmd_data: dict):
                 elapsed = (datetime.now() - BOOT_TIME).total_seconds()
                 logger.warning(f"전원 관리 명령 실행 (부팅 후 {int(elapsed)}초 경과)")
 
-            # 명령 실행
-            result = CommandExecutor.execute_command(cmd_type, cmd_data)
+            # 명령 실행 (설치/삭제는 진행 중 출력을 서버로 스트리밍)
+            if cmd_type in STREAMING_COMMAND_TYPES:
+                streamer = OutputStreamer(_output_sender(cmd_id), interval=OUTPUT_STREAM_INTERVAL)
+                try:
+                    result = CommandExecutor.execute_command(cmd_type, cmd_data,
+                                                             on_output=streamer.write,
+                                                             fetch_artifact=artifact_cache.fetch)
+                finally:
+                    streamer.close()
+            else:
+                result = CommandExecutor.execute_command(cmd_type, cmd_data,
+                                                         fetch_artifact=artifact_cache.fetch)
             logger.info(f"명령 결과: {result}")
 
             # 결과를 서버로 보고
@@ -272,7 +346,10 @@ def poll_command(stop_event: threading.Event):
     - GET /api/client/commands?machine_id=X&timeout=30
     - 서버가 30초 동안 연결 유지, 명령 있으면 즉시 반환
     - Timeout(30초 만료) → 즉시 재연결 (sleep 없음)
-    - ConnectionError → offline 신호 전송 후 30초마다 재연결 시도
+    - 503(서버 과부하/재시작) → 서버가 준 Retry-After 후 재연결
+    - reconnect_after_ms(서버 재시작 drain) → 그만큼 기다린 뒤 재연결 (오프라인 신호 없음)
+    - ConnectionError → offline 신호 전송 후 full-jitter 지수 백오프로 재연결 시도
+      (장애 복구 시 모든 PC가 같은 순간에 몰리지 않도록)
     """
     logger.info("명령 대기 시작 (long-poll)")
 
@@ -285,24 +362,18 @@ def poll_command(stop_event: threading.Event):
             )
 
             if r.status_code == 200:
-                data = r.json()
-                if data.get('status') != 'success':
-                    logger.error(f"API 오류: {data.get('error', {}).get('message', 'Unknown')}")
-                    if stop_event.wait(5):
-                        break
-                    continue
-
-                response_data = data.get('data', {})
-                if response_data.get('has_command'):
-                    cmd = response_data['command']
-                    logger.info(f"명령 수신: {cmd.get('type')} | ID: {cmd.get('id')}")
-                    execute_command_async(cmd['id'], cmd['type'], cmd.get('parameters', {}))
-                # 명령 없음 (timeout 만료) → 즉시 재연결
+                if _handle_poll_response(r.json(), stop_event):
+                    break
 
             elif r.status_code == 404:
                 logger.warning("Long-poll: 등록되지 않은 PC. 30초 후 재시도")
                 if stop_event.wait(30):
                     break
+            elif r.status_code == 503:
+                wait_time = backoff_delay(0, RETRY_DELAY, hint=retry_after_seconds(r))
+                logger.warning(f"Long-poll: 서버 과부하. {wait_time:.1f}초 후 재시도")
+                if stop_event.wait(wait_time):
+                    break
             else:
                 logger.warning(f"Long-poll 응답 오류: {r.status_code}")
                 if stop_event.wait(5):
@@ -315,21 +386,8 @@ def poll_command(stop_event: threading.Event):
         except (requests.exceptions.ConnectionError, requests.exceptions.RequestException) as e:
             logger.error(f"네트워크 오류: {e}")
             send_offline_signal()
-
-            # 재연결 루프: 30초마다 시도
-            while not stop_event.is_set():
-                if stop_event.wait(30):
-                    return
-                try:
-                    requests.get(
-                        f"{SERVER_URL}api/client/commands",
-                        params={"machine_id": MACHINE_ID, "timeout": LONG_POLL_TIMEOUT},
-                        timeout=LONG_POLL_TIMEOUT + 5
-                    )
-                    logger.info("재연결 성공")
-                    break
-                except (requests.exceptions.ConnectionError, requests.exceptions.RequestException):
-                    logger.debug("재연결 시도 중...")
+            if not _wait_for_reconnect(stop_event):
+                return
 
         except Exception as e:
             logger.error(f"명령 대기 오류: {e}")
@@ -337,39 +395,160 @@ def poll_command(stop_event: threading.Event):
                 break
 
 
+def _handle_poll_response(data: dict, stop_event: threading.Event) -> bool:
+    """long-poll 200 응답 처리 (명령 실행, 서버 재시작 시 지시된 시간만큼 대기)
+
+    Returns:
+        대기 중 종료 요청을 받았으면 True
+    """
+    if data.get('status') != 'success':
+        logger.error(f"API 오류: {data.get('error', {}).get('message', 'Unknown')}")
+        return stop_event.wait(5)
+
+    response_data = data.get('data', {})
+    if response_data.get('has_command'):
+        cmd = response_data['command']
+        logger.info(f"명령 수신: {cmd.get('type')} | ID: {cmd.get('id')}")
+        execute_command_async(cmd['id'], cmd['type'], cmd.get('parameters', {}))
+    elif response_data.get('reconnect_after_ms'):
+        wait_time = response_data['reconnect_after_ms'] / 1000
+        logger.info(f"서버 재시작 중: {wait_time:.1f}초 후 재연결")
+        return stop_event.wait(wait_time)
+    # 명령 없음 (timeout 만료) → 즉시 재연결
+    return False
+
+
+def _wait_for_reconnect(stop_event: threading.Event) -> bool:
+    """재연결 루프: 0 ~ min(RECONNECT_MAX_DELAY, RETRY_DELAY * 2^n)초 대기 후 시도
+
+    Returns:
+        재연결 성공 여부 (종료 요청이면 False)
+    """
+    attempt = 0
+    while not stop_event.is_set():
+        if stop_event.wait(backoff_delay(attempt, RETRY_DELAY, cap=RECONNECT_MAX_DELAY)):
+            return False
+        attempt += 1
+        try:
+            requests.get(
+                f"{SERVER_URL}api/client/commands",
+                params={"machine_id": MACHINE_ID, "timeout": LONG_POLL_TIMEOUT},
+                timeout=LONG_POLL_TIMEOUT + 5
+            )
+            logger.info("재연결 성공")
+            flush_spool()
+            return True
+        except (requests.exceptions.ConnectionError, requests.exceptions.RequestException):
+            logger.debug("재연결 시도 중...")
+    return False
+
+
 def send_command_result(command_id: int, status: str, result: str):
-    """명령 실행 결과를 서버로 보고 (v0.8.0 - 새 API)"""
+    """명령 실행 결과를 서버로 보고 (짧은 시간 안의 결과는 묶어서 일괄 API로 전송)"""
+    result_batcher.submit({"command_id": command_id, "status": status, "result": result})
+
+
+def _result_payload(status: str, result: str) -> dict:
+    """명령 결과 API 요청 본문 (상태 매핑: completed/skipped → success, error → error)"""
+    return {
+        "status": 'success' if status in ['completed', 'skipped'] else 'error',
+        "output": result,
+        "error_message": result if status == 'error' else None
+    }
+
+
+def _post_result(item: dict) -> bool:
+    """결과 1건 전송 (단건 API). 서버가 처리했으면(4xx 포함) True"""
+    url = f"{SERVER_URL}api/client/commands/{item['command_id']}/result"
     try:
-        # 상태 매핑: completed/skipped → success, error → error
-        api_status = 'success' if status in ['completed', 'skipped'] else 'error'
-
-        data = {
-            "status": api_status,
-            "output": result,
-            "error_message": result if status == 'error' else None
-        }
-
-        # 새 API: RESTful 경로 사용
-        r = safe_request(
-            f"{SERVER_URL}api/client/commands/{command_id}/result",
-            method='POST',
-            json=data,
-            timeout=REQUEST_TIMEOUT,
-            max_retries=2
-        )
+        r = requests.post(url, json=_result_payload(item['status'], item['result']),
+                          timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"명령 결과 전송 실패 (네트워크): CMD#{item['command_id']} - {e}")
+        return False
+    if 400 <= r.status_code < 500:
+        logger.warning(f"명령 결과 폐기: CMD#{item['command_id']} ({r.status_code})")
+    return r.status_code < 500
 
-        if r and r.status_code == 200:
-            logger.debug(f"명령 결과 전송 완료: CMD#{command_id}")
-        else:
-            logger.error(f"명령 결과 전송 실패: {r.status_code if r else 'No response'}")
+
+def _post_results(items: list) -> int:
+    """결과 묶음 전송, 앞에서부터 서버가 처리한 개수 반환
+
+    - 일괄 API(/commands/results) 200: 전부 처리 (없는 명령은 경고만)
+    - 404/405: 일괄 API가 없는 구버전 서버 → 단건 API로 하나씩
+    - 5xx/네트워크 오류: 0 (호출자가 스풀에 보관)
+    """
+    body = {"results": [
+        {"command_id": item['command_id'], **_result_payload(item['status'], item['result'])}
+        for item in items
+    ]}
+    try:
+        r = requests.post(f"{SERVER_URL}api/client/commands/results", json=body,
+                          timeout=REQUEST_TIMEOUT)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"명령 결과 일괄 전송 실패 (네트워크): {e}")
+        return 0
+
+    if r.status_code == 200:
+        for outcome in r.json().get('data', {}).get('results', []):
+            if outcome.get('status') != 'recorded':
+                logger.warning(f"명령 결과 미반영: CMD#{outcome.get('command_id')} "
+                               f"({outcome.get('status')})")
+        logger.debug(f"명령 결과 전송 완료: {len(items)}건")
+        return len(items)
+    if r.status_code in (404, 405):
+        for index, item in enumerate(items):
+            if not _post_result(item):
+                return index
+        return len(items)
+    logger.debug(f"명령 결과 일괄 전송 실패: {r.status_code}")
+    return 0
+
+
+def _send_result_batch(items: list):
+    """ResultBatcher 전송 함수: 한 번 재시도 후에도 못 보낸 결과는 스풀에 보관"""
+    sent = _post_results(items)
+    if sent < len(items):
+        time.sleep(RETRY_DELAY)
+        sent += _post_results(items[sent:])
+    if sent < len(items):
+        logger.error(f"명령 결과 전송 실패: {len(items) - sent}건 스풀에 보관")
+        _spool_results(items[sent:])
+
+
+def _spool_results(items: list):
+    """명령은 이미 실행됐으므로 보내지 못한 결과는 버리지 않고 스풀에 보관 (재연결 시 재전송)"""
+    for item in items:
+        spool.append(KIND_RESULT, item)
+
+
+def _send_spooled(records: list) -> int:
+    """스풀 레코드(명령 결과)를 일괄 API 한 번으로 전송, 앞에서부터 처리된 개수 반환"""
+    return _post_results([record['payload'] for record in records])
+
+
+def flush_spool():
+    """스풀에 쌓인 명령 결과 재전송 (시작 시, 재연결 시, 하트비트 주기마다)"""
+    try:
+        spool.replay(_send_spooled)
     except Exception as e:
-        logger.error(f"명령 결과 전송 오류: {e}")
+        logger.error(f"스풀 재전송 오류: {e}")
 
 
-def heartbeat_thread(stop_event: threading.Event):
-    """주기적 Heartbeat 전송"""
+def heartbeat_thread(stop_event: threading.Event, update_delay: float = UPDATE_CHECK_INTERVAL):
+    """주기적 Heartbeat 전송 + 업데이트 확인"""
+    next_update_check = time.monotonic() + update_delay
     while not stop_event.is_set():
+        # 장애 중 보내지 못한 명령 결과 재전송
+        flush_spool()
         send_heartbeat()
+        if time.monotonic() >= next_update_check:
+            try:
+                next_update_check = time.monotonic() + check_for_updates()
+            except SystemExit:
+                # 업데이트 스크립트 실행 후 종료 (스레드의 sys.exit는 프로세스를 끝내지 않음)
+                stop_event.set()
+                break
         if stop_event.wait(HEARTBEAT_INTERVAL):
             break
 
@@ -391,7 +570,7 @@ def run_client(stop_event: Optional[threading.Event] = None):
     ev = stop_event or STOP_EVENT
 
     # 버전 체크
-    check_for_updates()
+    update_delay = check_for_updates()
 
     # 시작 시 먼저 등록 시도
     try:
@@ -407,7 +586,7 @@ def run_client(stop_event: Optional[threading.Event] = None):
         return
 
     # Heartbeat를 백그라운드 스레드에서 실행
-    hb_thread = threading.Thread(target=heartbeat_thread, args=(ev,), daemon=True)
+    hb_thread = threading.Thread(target=heartbeat_thread, args=(ev, update_delay), daemon=True)
     hb_thread.start()
 
     # 메인 스레드에서 명령 long-polling
@@ -417,6 +596,7 @@ def run_client(stop_event: Optional[threading.Event] = None):
     finally:
         ev.set()
         hb_thread.join(timeout=5)
+        result_batcher.close()
         logger.info("WCMS 클라이언트 종료")
 
 
@@ -0,0 +1,96 @@
+"""
+명령 출력 스트리밍
+오래 걸리는 명령(install/uninstall)의 출력을 줄 단위로 받아 interval초마다
+조각(chunk)으로 묶어 서버에 올린다. 관리자는 설치가 끝나기 전에도 진행 상황을 볼 수 있다.
+
+- 조각마다 seq(1부터)를 붙여 재전송해도 서버에서 한 번만 저장
+- 서버에 못 보낸 조각은 max_pending_bytes까지만 보관 (넘으면 오래된 조각부터 버림)
+"""
+import logging
+import threading
+from typing import Callable, List, Tuple
+
+logger = logging.getLogger('wcms')
+
+
+class OutputStreamer:
+    """출력 줄을 모아 주기적으로 send_chunk(seq, data)로 업로드
+
+    Args:
+        send_chunk: 조각 전송 함수. 서버가 받았으면(또는 다시 보내도 소용없으면) True
+        interval: 업로드 주기 (초)
+        max_chunk_bytes: 이만큼 쌓이면 주기를 기다리지 않고 업로드
+        max_pending_bytes: 전송 실패로 쌓아 둘 수 있는 최대 크기
+    """
+
+    def __init__(self, send_chunk: Callable[[int, str], bool], interval: float = 2.0,
+                 max_chunk_bytes: int = 16 * 1024, max_pending_bytes: int = 256 * 1024):
+        self.send_chunk = send_chunk
+        self.interval = interval
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_pending_bytes = max_pending_bytes
+        self.dropped = 0
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self._pending: List[Tuple[int, str]] = []
+        self._next_seq = 1
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='wcms-output-stream', daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> None:
+        """출력 추가 (subprocess 읽기 스레드에서 호출, 네트워크를 기다리지 않음)"""
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered_bytes += len(text.encode('utf-8', errors='replace'))
+            full = self._buffered_bytes >= self.max_chunk_bytes
+        if full:
+            self._wakeup.set()
+
+    def _cut_chunk(self) -> None:
+        """버퍼를 seq가 붙은 조각으로 옮기고 보관 상한을 넘는 오래된 조각 제거 (잠금 안에서 호출)"""
+        if self._buffer:
+            self._pending.append((self._next_seq, ''.join(self._buffer)))
+            self._next_seq += 1
+            self._buffer, self._buffered_bytes = [], 0
+        pending_bytes = sum(len(data.encode('utf-8', errors='replace'))
+                            for _, data in self._pending)
+        while len(self._pending) > 1 and pending_bytes > self.max_pending_bytes:
+            _, data = self._pending.pop(0)
+            pending_bytes -= len(data.encode('utf-8', errors='replace'))
+            self.dropped += 1
+
+    def flush(self) -> bool:
+        """쌓인 조각을 순서대로 업로드. 모두 보냈으면 True"""
+        with self._lock:
+            self._cut_chunk()
+            pending = list(self._pending)
+        for seq, data in pending:
+            try:
+                sent = self.send_chunk(seq, data)
+            except Exception as e:
+                logger.debug(f"명령 출력 업로드 오류: {e}")
+                sent = False
+            if not sent:
+                return False
+            with self._lock:
+                if self._pending and self._pending[0][0] == seq:
+                    self._pending.pop(0)
+        return True
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            if self._closed:
+                break
+            self.flush()
+
+    def close(self) -> None:
+        """남은 출력을 한 번 더 업로드하고 종료 (명령 완료 시)"""
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
@@ -0,0 +1,264 @@
+"""
+디스크 스풀 (네트워크 장애 중 보내지 못한 명령 결과 보관)
+서버에 보내지 못한 레코드를 C:\\ProgramData\\WCMS\\spool 아래 JSON Lines 세그먼트 파일에
+추가만 하고(append-only), 재연결 시 쌓인 순서대로 배치 단위로 재전송한다.
+
+- spool-00000001.jsonl ...: 레코드 한 줄 = {"kind", "ts", "payload"}
+- ack.json: 전송 완료 위치 (세그먼트 번호, 바이트 오프셋). 재시작 후에도 이어서 재전송
+- 용량 상한 초과 시 오래된 레코드부터 버림 (폐기 건수는 dropped와 오류 로그로 남김)
+- 하트비트는 스풀하지 않음 (서버는 현재 값만 유지하고, 재연결 직후 새 하트비트를 보냄)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('wcms')
+
+KIND_RESULT = 'result'
+
+SEGMENT_PREFIX = 'spool-'
+SEGMENT_SUFFIX = '.jsonl'
+ACK_FILE = 'ack.json'
+
+
+class Spool:
+    """추가 전용 디스크 스풀 (스레드 안전)
+
+    Args:
+        directory: 스풀 디렉토리 (처음 append할 때 생성)
+        max_bytes: 세그먼트 파일 전체 용량 상한
+        batch_size: 재전송 한 번에 넘기는 최대 레코드 수
+        segment_bytes: 세그먼트 파일 하나의 최대 크기 (넘으면 새 세그먼트)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 5 * 1024 * 1024,
+                 batch_size: int = 50, segment_bytes: int = 256 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.segment_bytes = min(segment_bytes, max_bytes)
+        self.dropped = 0
+        self._lock = threading.RLock()
+        self._replay_lock = threading.Lock()
+        self._generation = 0
+        self._loaded = False
+
+    # ==================== 파일 레이아웃 ====================
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{seq:08d}{SEGMENT_SUFFIX}")
+
+    def _segments(self) -> List[int]:
+        """세그먼트 번호 목록 (오름차순)"""
+        if not os.path.isdir(self.directory):
+            return []
+        seqs = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    seqs.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        return sorted(seqs)
+
+    def _read_ack(self) -> Tuple[int, int]:
+        try:
+            with open(os.path.join(self.directory, ACK_FILE), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return int(data['segment']), int(data['offset'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0, 0
+
+    def _write_ack(self, segment: int, offset: int) -> None:
+        """ack 위치 저장 (임시 파일 + os.replace로 원자적 교체)"""
+        path = os.path.join(self.directory, ACK_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'segment': segment, 'offset': offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load(self) -> None:
+        """시작 시 한 번: 쓰다가 끊긴 마지막 줄 잘라내기"""
+        if self._loaded:
+            return
+        self._loaded = True
+        segments = self._segments()
+        if not segments:
+            return
+        path = self._segment_path(segments[-1])
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                valid = data.rfind(b'\n') + 1
+                f.truncate(valid)
+                logger.warning(f"[스풀] 불완전한 마지막 레코드 제거: {path} ({len(data) - valid}바이트)")
+
+    # ==================== 추가 ====================
+
+    def append(self, kind: str, payload: Dict) -> bool:
+        """레코드 추가 (fsync까지 마친 뒤 반환). 실패하면 False"""
+        line = json.dumps({'kind': kind, 'ts': time.time(), 'payload': payload},
+                          ensure_ascii=False).encode('utf-8') + b'\n'
+        with self._lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._load()
+                if self.size() + len(line) > self.max_bytes:
+                    self._compact(self.max_bytes // 2 - len(line))
+
+                segments = self._segments()
+                seq = segments[-1] if segments else max(self._read_ack()[0], 1)
+                path = self._segment_path(seq)
+                if segments and os.path.getsize(path) + len(line) > self.segment_bytes:
+                    seq += 1
+                    path = self._segment_path(seq)
+
+                with open(path, 'ab') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return True
+            except OSError as e:
+                logger.error(f"[스풀] 기록 실패 ({kind}): {e}")
+                return False
+
+    def size(self) -> int:
+        """세그먼트 파일 전체 크기 (바이트)"""
+        total = 0
+        for seq in self._segments():
+            try:
+                total += os.path.getsize(self._segment_path(seq))
+            except OSError:
+                continue
+        return total
+
+    # ==================== 읽기 ====================
+
+    def _pending(self, limit: Optional[int] = None) -> List[Tuple[int, int, Dict]]:
+        """ack 이후 레코드 [(세그먼트, 다음 레코드 오프셋, 레코드)] (limit개까지)"""
+        ack_segment, ack_offset = self._read_ack()
+        records = []
+        for seq in self._segments():
+            if seq < ack_segment:
+                continue
+            with open(self._segment_path(seq), 'rb') as f:
+                if seq == ack_segment:
+                    f.seek(ack_offset)
+                offset = f.tell()
+                for raw in f:
+                    offset += len(raw)
+                    if not raw.endswith(b'\n'):
+                        break  # 다른 스레드가 쓰는 중인 줄
+                    try:
+                        record = json.loads(raw)
+                    except ValueError:
+                        logger.warning(f"[스풀] 손상된 레코드 건너뜀: 세그먼트 {seq}")
+                        continue
+                    records.append((seq, offset, record))
+                    if limit is not None and len(records) >= limit:
+                        return records
+        return records
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending())
+
+    def peek(self, limit: Optional[int] = None) -> List[Dict]:
+        """재전송 대기 레코드 (전송 완료 처리하지 않음)"""
+        with self._lock:
+            return [record for _, _, record in self._pending(limit)]
+
+    # ==================== 재전송 ====================
+
+    def replay(self, send_batch: Callable[[List[Dict]], int]) -> int:
+        """쌓인 레코드를 순서대로 배치 단위로 재전송
+
+        Args:
+            send_batch: 레코드 목록을 받아 앞에서부터 전송에 성공한(또는 버려도 되는) 개수를
+                반환하는 함수. 배치보다 적게 반환하면 재전송을 멈추고 나머지는 다음 기회에 보낸다.
+
+        Returns:
+            전송 완료 처리된 레코드 수
+        """
+        delivered = 0
+        # 전송 중에는 append를 막지 않도록 파일 잠금은 읽기/ack 때만 잡는다
+        with self._replay_lock:
+            while True:
+                with self._lock:
+                    if not os.path.isdir(self.directory):
+                        break
+                    self._load()
+                    batch = self._pending(self.batch_size)
+                    generation = self._generation
+                if not batch:
+                    break
+                count = max(0, min(send_batch([record for _, _, record in batch]), len(batch)))
+                with self._lock:
+                    if generation != self._generation:
+                        # 전송 중 용량 정리로 파일이 다시 써짐 → 위치를 믿을 수 없으니 다음 기회에
+                        # (이미 보낸 레코드가 한 번 더 갈 수 있으나 결과 제출은 같은 값으로 덮어씀)
+                        break
+                    if count:
+                        segment, offset, _ = batch[count - 1]
+                        self._acknowledge(segment, offset)
+                        delivered += count
+                if count < len(batch):
+                    break
+        if delivered:
+            logger.info(f"[스풀] 재전송 완료: {delivered}건")
+        return delivered
+
+    def _acknowledge(self, segment: int, offset: int) -> None:
+        """전송 완료 위치 기록 + 다 보낸 세그먼트 삭제"""
+        segments = self._segments()
+        for seq in segments:
+            if seq < segment:
+                self._remove(seq)
+        if offset >= os.path.getsize(self._segment_path(segment)):
+            # 세그먼트를 끝까지 보냄 → 삭제하고 다음 세그먼트부터
+            self._remove(segment)
+            self._write_ack(segment + 1, 0)
+        else:
+            self._write_ack(segment, offset)
+
+    def _remove(self, seq: int) -> None:
+        try:
+            os.remove(self._segment_path(seq))
+        except FileNotFoundError:
+            pass
+
+    # ==================== 용량 관리 ====================
+
+    def _compact(self, target_bytes: int) -> None:
+        """대기 레코드를 target_bytes 이하로 줄여 새 세그먼트로 다시 씀 (오래된 레코드부터 버림)"""
+        records = [record for _, _, record in self._pending()]
+        lines = [json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                 for record in records]
+        total = sum(len(line) for line in lines)
+        keep = [True] * len(records)
+
+        for index, line in enumerate(lines):
+            if total <= target_bytes:
+                break
+            keep[index] = False
+            total -= len(line)
+
+        dropped = keep.count(False)
+        self.dropped += dropped
+        logger.error(f"[스풀] 용량 상한({self.max_bytes}바이트) 초과: 오래된 레코드 {dropped}건 폐기")
+
+        old_segments = self._segments()
+        seq = (old_segments[-1] if old_segments else 0) + 1
+        with open(self._segment_path(seq), 'wb') as f:
+            f.writelines(line for index, line in enumerate(lines) if keep[index])
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_ack(seq, 0)
+        self._generation += 1
+        for old in old_segments:
+            self._remove(old)
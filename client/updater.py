@@ -11,25 +11,54 @@ import time
 import requests
 from typing import Optional
 
+from artifact_cache import file_sha256
+
 logger = logging.getLogger('wcms')
 
-def download_file(url: str, dest_path: str) -> bool:
-    """Download a file from a URL to a destination path."""
-    try:
-        logger.info(f"Downloading update from {url}...")
-        response = requests.get(url, stream=True, timeout=60)
-        response.raise_for_status()
-        
-        with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-        
+def download_file(url: str, dest_path: str, sha256: Optional[str] = None,
+                  max_attempts: int = 3, timeout: int = 60) -> bool:
+    """Download a file from a URL to a destination path.
+
+    The file is written to ``dest_path + '.part'`` and only renamed into place once it is
+    complete (and matches ``sha256`` when given). An interrupted download is resumed with a
+    Range request on the next attempt or the next update check.
+    """
+    part_path = dest_path + '.part'
+    for attempt in range(max_attempts):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {}
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+            if sha256:
+                # Only resume if the server still has the same content
+                headers['If-Range'] = f'"{sha256}"'
+        try:
+            logger.info(f"Downloading update from {url} (offset {offset})...")
+            with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code == 416:
+                    os.unlink(part_path)
+                    continue
+                response.raise_for_status()
+                # 206: append to the partial file, 200: server sent the whole file
+                with open(part_path, 'ab' if response.status_code == 206 else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=256 * 1024):
+                        if chunk:
+                            f.write(chunk)
+        except (requests.exceptions.RequestException, OSError) as e:
+            logger.warning(f"Download interrupted (attempt {attempt + 1}/{max_attempts}): {e}")
+            time.sleep(min(2 ** attempt, 10))
+            continue
+
+        if sha256 and file_sha256(part_path) != sha256:
+            logger.error("Downloaded update does not match the published SHA-256, discarding.")
+            os.unlink(part_path)
+            return False
+        os.replace(part_path, dest_path)
         logger.info(f"Download complete: {dest_path}")
         return True
-    except Exception as e:
-        logger.error(f"Download failed: {e}")
-        return False
+
+    logger.error(f"Download failed after {max_attempts} attempts: {url}")
+    return False
 
 def create_update_script(new_exe_path: str, target_exe_path: str, service_name: str = "WCMS-Client") -> str:
     """
@@ -70,9 +99,13 @@ del "%~f0"
         
     return script_path
 
-def perform_update(download_url: str, version: str):
+def perform_update(download_url: str, version: str, sha256: Optional[str] = None,
+                   mirror_url: Optional[str] = None):
     """
     Orchestrate the update process.
+
+    Downloads from the server mirror first (mirror_url) and falls back to download_url.
+    When sha256 is known the download is verified before the executable is swapped.
     """
     logger.info(f"Starting update process to version {version}...")
     
@@ -87,8 +120,9 @@ def perform_update(download_url: str, version: str):
     temp_dir = tempfile.gettempdir()
     new_exe_path = os.path.join(temp_dir, f"WCMS-Client-{version}.exe")
     
-    # 2. Download new version
-    if not download_file(download_url, new_exe_path):
+    # 2. Download new version (server mirror first, then the release URL)
+    sources = [url for url in (mirror_url, download_url) if url]
+    if not any(download_file(url, new_exe_path, sha256) for url in sources):
         logger.error("Aborting update due to download failure.")
         return
 
@@ -3,6 +3,7 @@
 네트워크 재시도, 에러 핸들링 등
 """
 import time
+import random
 import logging
 from functools import wraps
 from typing import Callable, Any, Optional
@@ -12,6 +13,36 @@ import requests
 logger = logging.getLogger('wcms')
 
 
+class ServerBusyError(requests.exceptions.RequestException):
+    """서버 과부하 응답 (503, 서버가 재시도 대기 시간 힌트를 줌)"""
+
+    def __init__(self, retry_after: float, *args, **kwargs):
+        super().__init__(f"서버 과부하 (Retry-After {retry_after:.1f}초)", *args, **kwargs)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """503 응답의 재시도 힌트 (본문 retry_after_ms 우선, 없으면 Retry-After 헤더)"""
+    try:
+        hint_ms = response.json().get('retry_after_ms')
+        if hint_ms is not None:
+            return float(hint_ms) / 1000
+    except Exception:
+        pass
+    header = response.headers.get('Retry-After', '')
+    return float(header) if header.isdigit() else None
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 300,
+                  hint: Optional[float] = None) -> float:
+    """full-jitter 지수 백오프: 0 ~ min(cap, base * 2^attempt) 사이 균등 분포
+
+    서버가 힌트(Retry-After)를 주면 그보다 먼저 다시 보내지 않는다.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    return max(delay, hint) if hint else delay
+
+
 def retry_on_network_error(max_retries: int = 3, delay: int = 5, exponential_backoff: bool = True):
     """
     네트워크 에러 시 재시도 데코레이터
@@ -43,11 +74,15 @@ def retry_on_network_error(max_retries: int = 3, delay: int = 5, exponential_bac
                     last_exception = e
 
                     if attempt < max_retries - 1:
-                        # 지수 백오프: delay * 2^attempt
-                        wait_time = delay * (2 ** attempt) if exponential_backoff else delay
+                        # full-jitter 지수 백오프 (장애 복구 시 PC들이 한꺼번에 재시도하지 않도록)
+                        hint = getattr(e, 'retry_after', None)
+                        if exponential_backoff:
+                            wait_time = backoff_delay(attempt, delay, hint=hint)
+                        else:
+                            wait_time = max(delay, hint or 0)
                         logger.warning(
                             f"{func.__name__} 실패 (시도 {attempt + 1}/{max_retries}): {e}. "
-                            f"{wait_time}초 후 재시도..."
+                            f"{wait_time:.1f}초 후 재시도..."
                         )
                         time.sleep(wait_time)
                     else:
@@ -95,6 +130,10 @@ def safe_request(
                 location = response.headers.get('Location', '')
                 response = method_func(location, timeout=timeout, allow_redirects=False, **kwargs)
                 redirect_count += 1
+        if response.status_code == 503:
+            hint = retry_after_seconds(response)
+            if hint is not None:
+                raise ServerBusyError(hint, response=response)
         response.raise_for_status()
         return response
 
@@ -75,6 +75,10 @@ def install_dependencies():
     else:
         print_step("클라이언트 의존성 설치 건너뛰기 (Windows 전용)")
 
+def get_db_path():
+    """DB 경로 (WCMS_DB_PATH, 기본값은 서버 config와 같은 server/db.sqlite3)"""
+    return os.getenv('WCMS_DB_PATH', os.path.join("server", "db.sqlite3"))
+
 def init_db(force=False, username='admin', password='admin'):
     """데이터베이스 초기화
 
@@ -86,7 +90,7 @@ def init_db(force=False, username='admin', password='admin'):
     print_step("데이터베이스 초기화 중...")
     
     # 환경변수 또는 기본 경로 사용
-    db_path = os.getenv('WCMS_DB_PATH', os.path.join("server", "db.sqlite3"))
+    db_path = get_db_path()
     schema_path = os.path.join("server", "migrations", "schema.sql")
     
     # DB 디렉토리 생성
@@ -194,7 +198,7 @@ def migrate_db(migration_file=None):
 
     import sqlite3
 
-    db_path = os.getenv('WCMS_DB_PATH', os.path.join("db", "wcms.sqlite3"))
+    db_path = get_db_path()
     migrations_dir = os.path.join("server", "migrations")
 
     if not os.path.exists(db_path):
@@ -265,12 +269,23 @@ def migrate_db(migration_file=None):
         print(f"오류: {e}")
         sys.exit(1)
 
-def run_server(host="0.0.0.0", port=5050, mode="development", use_gunicorn=False):
-    """서버 실행"""
+def run_server(host="0.0.0.0", port=5050, mode="development", use_gunicorn=False, workers=None):
+    """서버 실행
+
+    workers: Gunicorn 워커 수 (None이면 WCMS_WORKERS, 기본 1)
+    """
+    # 모델은 테이블이 있다고 가정하므로 기존 DB에 남은 마이그레이션을 먼저 적용
+    if os.path.exists(get_db_path()):
+        migrate_db()
+
     print_step(f"서버 시작 ({mode} 모드)...")
     
     env = os.environ.copy()
     env["FLASK_ENV"] = mode
+    if workers is None:
+        workers = int(env.get("WCMS_WORKERS", "1"))
+    # 워커 간 공유 상태 설정(Rate Limit 저장소 등)이 워커 수를 보고 결정되므로 환경변수로 전달
+    env["WCMS_WORKERS"] = str(workers)
     # PYTHONPATH에 server 디렉토리 추가
     env["PYTHONPATH"] = os.path.join(os.getcwd(), "server")
     
@@ -278,13 +293,14 @@ def run_server(host="0.0.0.0", port=5050, mode="development", use_gunicorn=False
         print_step("Gunicorn으로 서버 실행 중...")
         # Gunicorn 실행 명령
         # -k gevent: 비동기 워커 사용 (SocketIO 지원)
-        # -w 1: 워커 수 (SocketIO 사용 시 1개 권장, 여러 개 사용 시 Redis 등 메시지 큐 필요)
-        # --worker-connections 1000: 동시 접속 수
+        # -w N: 워커 수 (CPU 코어 수까지 권장). 워커 간 공유 상태는 SQLite로 처리
+        #   - Rate Limit: sqlite 저장소, 명령 알림: commands 테이블, 백그라운드 작업: worker_leases 임대
+        # --worker-connections 1000: 동시 접속 수 (워커당)
         # -b host:port: 바인딩 주소
         cmd = [
             "uv", "run", "--project", "server", "gunicorn",
             "-k", "gevent",
-            "-w", "1", 
+            "-w", str(workers),
             "--worker-connections", "1000",
             "-b", f"{host}:{port}",
             "app:app"
@@ -403,6 +419,19 @@ def build_client():
         print(f"예상치 못한 오류: {e}")
         os.chdir(cwd)
 
+def parse_workers(args):
+    """run 명령의 --workers/-w N 값 (없으면 None, 잘못된 값이면 종료)"""
+    for flag in ("--workers", "-w"):
+        if flag not in args:
+            continue
+        index = args.index(flag) + 1
+        value = args[index] if index < len(args) else ""
+        if not value.isdigit() or int(value) < 1:
+            print(f"{flag} 값은 1 이상의 정수여야 합니다: {value or '(없음)'}")
+            sys.exit(1)
+        return int(value)
+    return None
+
 def main():
     if len(sys.argv) < 2:
         command = "run"
@@ -427,7 +456,8 @@ def main():
     elif command == "run":
         use_gunicorn = "--prod" in args or "-p" in args
         mode = "production" if use_gunicorn else "development"
-        run_server(mode=mode, use_gunicorn=use_gunicorn)
+        workers = parse_workers(args)
+        run_server(mode=mode, use_gunicorn=use_gunicorn, workers=workers)
     elif command == "test":
         target = sys.argv[2] if len(sys.argv) > 2 else "all"
         run_tests(target)
@@ -440,6 +470,7 @@ def main():
         print("Commands:")
         print("  run                    : 서버 실행 (기본값)")
         print("    --prod,    -p        : Gunicorn으로 프로덕션 모드 실행")
+        print("    --workers, -w N      : Gunicorn 워커 수 (기본값: WCMS_WORKERS 또는 1)")
         print("  test [target]          : 테스트 실행 (target: all, server, client, archive)")
         print("  docker-test            : Docker Compose 통합 테스트 (dockurr/windows + VNC)")
         print("    --rebuild, -r        : 서버 이미지 강제 재빌드")
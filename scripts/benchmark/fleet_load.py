@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+가상 실습실 부하 생성기 (Linux에서 실행 가능)
+
+client/main.py와 같은 요청 형태(등록, 하트비트, long-poll, 명령 결과 제출)로
+수천 대의 가상 클라이언트를 실행하고 엔드포인트별 처리량, p50/p99 지연 시간,
+오류율과 명령 전달 지연(생성 → 수신 → 결과 기록)을 보고합니다.
+
+시나리오:
+    steady      클라이언트가 --ramp초에 걸쳐 고르게 켜짐
+    boot-storm  모든 클라이언트가 5초 안에 동시에 켜짐 (수업 시작)
+    outage      --outage-at초에 --outage-ratio 비율의 PC가 네트워크 단절,
+                --outage-length초 뒤 복구되면 client/main.py처럼 30초 재시도 주기로 재접속
+
+사용법:
+    python scripts/benchmark/fleet_load.py --serve -n 500 -d 60             # 로컬 서버를 직접 띄워 측정
+    python scripts/benchmark/fleet_load.py --server http://127.0.0.1:5050 --pin 123456 \\
+        --admin-user admin --admin-password admin -n 2000 --scenario boot-storm
+"""
+import argparse
+import heapq
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER_DIR = PROJECT_ROOT / 'server'
+
+PROCESS_NAMES = [
+    'explorer.exe', 'chrome.exe', 'msedge.exe', 'Code.exe', 'python.exe', 'javaw.exe', 'Teams.exe',
+    'notepad.exe', 'WINWORD.EXE', 'EXCEL.EXE', 'POWERPNT.EXE', 'Zoom.exe', 'OneDrive.exe',
+    'WCMS-Client.exe', 'RuntimeBroker.exe', 'SearchHost.exe', 'ctfmon.exe', 'TextInputHost.exe',
+    'igfxEM.exe', 'RtkAudUService64.exe', 'SecurityHealthSystray.exe', 'PhoneExperienceHost.exe',
+]
+
+
+class Recorder:
+    """엔드포인트별 지연 시간/상태 코드/예외 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.command_issued: Dict[int, float] = {}
+        self.command_delivery: List[float] = []
+        self.command_round_trip: List[float] = []
+
+    def record(self, endpoint: str, latency: float, status: str) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(latency)
+            self.statuses[endpoint][status] += 1
+
+    def command_created(self, command_id: int) -> None:
+        with self._lock:
+            self.command_issued[command_id] = time.monotonic()
+
+    def command_received(self, command_id: int) -> None:
+        with self._lock:
+            issued = self.command_issued.get(command_id)
+            if issued is not None:
+                self.command_delivery.append(time.monotonic() - issued)
+
+    def command_completed(self, command_id: int) -> None:
+        with self._lock:
+            issued = self.command_issued.pop(command_id, None)
+            if issued is not None:
+                self.command_round_trip.append(time.monotonic() - issued)
+
+
+class VirtualClient:
+    """client/main.py의 요청 흐름을 따르는 가상 PC 1대"""
+
+    def __init__(self, index: int, run_tag: int, args, recorder: Recorder, stop: threading.Event):
+        self.index = index
+        self.machine_id = f'{run_tag:04X}{index:08X}'
+        self.ip_address = f'10.{100 + index // 62500}.{index // 250 % 250}.{index % 250 + 1}'
+        self.args = args
+        self.base_url = args.server.rstrip('/') + '/api/client'
+        self.recorder = recorder
+        self.stop = stop
+        self.rng = random.Random(run_tag * 100003 + index)
+        self.pc_id: Optional[int] = None
+        self.offline_until = 0.0  # 네트워크 단절 종료 시각 (monotonic)
+        # 프록시(ProxyFix) 뒤 서버는 X-Forwarded-For로 PC별 IP를 구분 (Rate Limit 키)
+        self.headers = {'X-Forwarded-For': self.ip_address}
+
+    # ---------- 요청 형태 (client/collector.py, client/main.py) ----------
+
+    def static_info(self) -> dict:
+        return {
+            'hostname': f'LOAD-PC-{self.index:05d}',
+            'mac_address': ':'.join(self.machine_id[i:i + 2] for i in range(0, 12, 2)),
+            'ip_address': self.ip_address,
+            'cpu_model': 'Intel(R) Core(TM) i5-12400',
+            'cpu_cores': 6,
+            'cpu_threads': 12,
+            'ram_total': 16.0,
+            'disk_info': {'C:\\': {'total_gb': 237.0, 'fstype': 'NTFS', 'mountpoint': 'C:\\'}},
+            'os_edition': 'Windows 11 Education',
+            'os_version': '10.0.22631',
+        }
+
+    def dynamic_info(self) -> dict:
+        used = round(self.rng.uniform(60, 200), 2)
+        return {
+            'cpu_usage': round(self.rng.uniform(1, 95), 1),
+            'ram_used': round(self.rng.uniform(3, 14), 2),
+            'ram_usage_percent': round(self.rng.uniform(20, 90), 1),
+            'disk_usage': {'C:\\': {'used_gb': used, 'free_gb': round(237.0 - used, 2),
+                                    'percent': round(used / 237.0 * 100, 1)}},
+            'ip_address': self.ip_address,
+            'current_user': self.rng.choice([None, 'student']),
+            'uptime': int(time.monotonic()),
+            'processes': sorted(
+                self.rng.sample(PROCESS_NAMES, self.rng.randint(8, len(PROCESS_NAMES)))
+            ),
+        }
+
+    def request(self, endpoint: str, method: str, path: str, timeout: float,
+                **kwargs) -> Optional[requests.Response]:
+        """요청 1건 실행 + 기록 (네트워크 단절 중이면 ConnectionError)"""
+        if time.monotonic() < self.offline_until:
+            raise requests.exceptions.ConnectionError('simulated outage')
+        started = time.monotonic()
+        try:
+            response = requests.request(method, self.base_url + path, timeout=timeout,
+                                        headers=self.headers, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self.recorder.record(endpoint, time.monotonic() - started, type(e).__name__)
+            raise
+        self.recorder.record(endpoint, time.monotonic() - started, str(response.status_code))
+        return response
+
+    # ---------- 동작 ----------
+
+    def register(self) -> bool:
+        """등록 (retry_on_network_error: 3회, 5초 간격)"""
+        payload = {'machine_id': self.machine_id, 'pin': self.args.pin, **self.static_info(),
+                   'system_info': self.dynamic_info()}
+        for _ in range(3):
+            try:
+                response = self.request('register', 'POST', '/register', self.args.request_timeout,
+                                        json=payload)
+                if response.status_code == 200:
+                    self.pc_id = response.json().get('pc_id')
+                    return True
+                if response.status_code < 500:
+                    return False
+            except requests.exceptions.RequestException:
+                pass
+            if self.stop.wait(5):
+                return False
+        return False
+
+    def heartbeat(self) -> None:
+        try:
+            self.request('heartbeat', 'POST', '/heartbeat', self.args.request_timeout,
+                         json={'machine_id': self.machine_id, 'system_info': self.dynamic_info()})
+        except requests.exceptions.RequestException:
+            pass
+
+    def submit_result(self, command_id: int) -> None:
+        output = 'x' * self.args.result_bytes
+        try:
+            response = self.request(
+                'result', 'POST', f'/commands/{command_id}/result', self.args.request_timeout,
+                json={'status': 'success', 'output': output, 'error_message': None}
+            )
+            if response.status_code == 200:
+                self.recorder.command_completed(command_id)
+        except requests.exceptions.RequestException:
+            pass
+
+    def poll_loop(self) -> None:
+        """long-poll 루프 (poll_command와 같은 재시도 규칙)"""
+        timeout = self.args.poll_timeout
+        while not self.stop.is_set():
+            try:
+                response = self.request('poll', 'GET', '/commands', timeout + 5,
+                                        params={'machine_id': self.machine_id, 'timeout': timeout})
+            except requests.exceptions.Timeout:
+                continue
+            except requests.exceptions.RequestException:
+                self.wait_for_reconnect()
+                continue
+            if response.status_code == 200:
+                self.handle_poll(response.json().get('data', {}))
+            elif self.stop.wait(30 if response.status_code == 404 else 5):
+                return
+
+    def handle_poll(self, data: dict) -> None:
+        """받은 명령은 별도 스레드에서 실행, 폴링은 즉시 재개"""
+        if not data.get('has_command'):
+            return
+        command_id = data['command']['id']
+        self.recorder.command_received(command_id)
+        delay = self.rng.uniform(0.2, 2.0)
+        threading.Timer(delay, self.submit_result, args=(command_id,)).start()
+
+    def wait_for_reconnect(self) -> None:
+        """send_offline_signal() 후 30초마다 재접속 시도"""
+        try:
+            self.request('offline', 'POST', '/offline', 3, json={'machine_id': self.machine_id})
+        except requests.exceptions.RequestException:
+            pass
+        while not self.stop.wait(30):
+            if time.monotonic() >= self.offline_until:
+                break
+
+    def run(self, scheduler: 'HeartbeatScheduler') -> None:
+        """버전 확인 → 등록 → 하트비트 시작 → long-poll (run_client 순서)"""
+        try:
+            self.request('version', 'GET', '/version', self.args.request_timeout)
+        except requests.exceptions.RequestException:
+            pass
+        if self.register():
+            scheduler.add(self)
+            self.poll_loop()
+
+
+class HeartbeatScheduler:
+    """모든 가상 PC의 하트비트를 소수의 워커 스레드로 전송 (PC별 스레드 대신)"""
+
+    def __init__(self, interval: float, workers: int, stop: threading.Event):
+        self.interval = interval
+        self.stop = stop
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='heartbeat')
+        self._heap: List[tuple] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def add(self, client: VirtualClient) -> None:
+        # 하트비트 스레드는 시작 즉시 1회 전송 후 interval마다 전송
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic(), client.index, client))
+        self._wakeup.set()
+
+    def run(self) -> None:
+        while not self.stop.is_set():
+            with self._lock:
+                due = self._heap[0][0] if self._heap else None
+            if due is None or due > time.monotonic():
+                self._wakeup.wait(min(1.0, due - time.monotonic()) if due else 1.0)
+                self._wakeup.clear()
+                continue
+            with self._lock:
+                _, index, client = heapq.heappop(self._heap)
+                heapq.heappush(self._heap, (due + self.interval, index, client))
+            self.pool.submit(client.heartbeat)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def issue_commands(args, clients: List[VirtualClient], recorder: Recorder,
+                   stop: threading.Event) -> None:
+    """관리자 세션으로 --command-rate건/초 execute 명령 생성"""
+    session = requests.Session()
+    response = session.post(args.server.rstrip('/') + '/login', allow_redirects=False,
+                            data={'username': args.admin_user, 'password': args.admin_password})
+    if response.status_code != 302:
+        print(f"[!] 관리자 로그인 실패 ({response.status_code}), 명령 생성 생략")
+        return
+
+    rng = random.Random(7)
+    interval = 1.0 / args.command_rate
+    next_at = time.monotonic()
+    while not stop.wait(max(0.0, next_at - time.monotonic())):
+        next_at += interval
+        now = time.monotonic()
+        targets = [c for c in clients if c.pc_id is not None and now >= c.offline_until]
+        if not targets:
+            continue
+        target = rng.choice(targets)
+        started = time.monotonic()
+        try:
+            response = session.post(f"{args.server.rstrip('/')}/api/pc/{target.pc_id}/command",
+                                    json={'type': 'execute', 'data': {'command': 'hostname'}},
+                                    timeout=10)
+            recorder.record('admin_command', time.monotonic() - started, str(response.status_code))
+            if response.status_code == 200:
+                recorder.command_created(response.json()['command_id'])
+        except requests.exceptions.RequestException as e:
+            recorder.record('admin_command', time.monotonic() - started, type(e).__name__)
+
+
+def schedule_outage(args, clients: List[VirtualClient], stop: threading.Event) -> None:
+    if stop.wait(args.outage_at):
+        return
+    affected = random.Random(11).sample(clients, int(len(clients) * args.outage_ratio))
+    until = time.monotonic() + args.outage_length
+    for client in affected:
+        client.offline_until = until
+    print(f"[outage] {len(affected)}대 네트워크 단절 ({args.outage_length}초)")
+
+
+def serve_locally(args) -> str:
+    """임시 DB로 로컬 서버 실행 (단일 writer 사용), 서버 URL 반환"""
+    import sqlite3
+    import tempfile
+    from datetime import datetime, timedelta
+    import bcrypt
+
+    sys.path.insert(0, str(SERVER_DIR))
+    os.environ.setdefault('WCMS_ENV', 'test')
+    from werkzeug.serving import make_server
+    from app import create_app
+    from utils.database import init_db_manager
+
+    tmp_dir = tempfile.mkdtemp(prefix='wcms-load-')
+    db_path = os.path.join(tmp_dir, 'load.sqlite3')
+    conn = sqlite3.connect(db_path)
+    with open(SERVER_DIR / 'migrations' / 'schema.sql', encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.execute('''
+        INSERT INTO pc_registration_tokens (token, usage_type, expires_in, created_by, expires_at)
+        VALUES (?, 'multi', 86400, 'loadgen', ?)
+    ''', (args.pin, (datetime.now() + timedelta(days=1)).isoformat(' ')))
+    password_hash = bcrypt.hashpw(args.admin_password.encode(), bcrypt.gensalt(4)).decode()
+    conn.execute('INSERT INTO admins (username, password_hash, is_active) VALUES (?, ?, 1)',
+                 (args.admin_user, password_hash))
+    conn.commit()
+    conn.close()
+
+    import logging
+    logging.getLogger('wcms').setLevel(logging.WARNING)
+    app = create_app('test')
+    app.config['SESSION_COOKIE_SECURE'] = False  # http로 관리자 세션 쿠키 전송
+    init_db_manager(db_path, use_writer=True)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def report(recorder: Recorder, elapsed: float) -> int:
+    """엔드포인트별 결과 표 출력, 전체 오류 수 반환 (long-poll 타임아웃 제외)"""
+    total_errors = 0
+    print(f"\n{'엔드포인트':<14} {'요청':>7} {'req/s':>8} "
+          f"{'p50(ms)':>9} {'p99(ms)':>9} {'오류율':>7}  상태")
+    for endpoint in sorted(recorder.latencies):
+        latencies = recorder.latencies[endpoint]
+        statuses = recorder.statuses[endpoint]
+        errors = sum(n for status, n in statuses.items()
+                     if not status.startswith('2') and status != '302')
+        if endpoint == 'offline':
+            errors = 0  # 단절 중 전송 실패는 정상 동작
+        total_errors += errors
+        ms = [latency * 1000 for latency in latencies]
+        print(f"{endpoint:<14} {len(ms):>7} {len(ms) / elapsed:>8.1f} "
+              f"{statistics.median(ms):>9.1f} {percentile(ms, 99):>9.1f} "
+              f"{errors / len(ms) * 100:>6.2f}%  {dict(statuses)}")
+
+    print("(poll 지연 시간은 명령이 없을 때 서버가 연결을 유지하는 --poll-timeout초를 포함)")
+    if recorder.command_delivery:
+        delivery = [s * 1000 for s in recorder.command_delivery]
+        print(f"\n명령 전달 (생성 → long-poll 수신): {len(delivery)}건  "
+              f"p50={statistics.median(delivery):.0f}ms  p99={percentile(delivery, 99):.0f}ms")
+    if recorder.command_round_trip:
+        round_trip = [s * 1000 for s in recorder.command_round_trip]
+        print(f"명령 왕복 (생성 → 결과 기록):      {len(round_trip)}건  "
+              f"p50={statistics.median(round_trip):.0f}ms  p99={percentile(round_trip, 99):.0f}ms")
+    if recorder.command_issued:
+        print(f"결과 미수신 명령: {len(recorder.command_issued)}건")
+    return total_errors
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='WCMS 가상 실습실 부하 생성기')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--server', help='대상 서버 URL (예: http://127.0.0.1:5050)')
+    target.add_argument('--serve', action='store_true', help='임시 DB로 로컬 서버를 직접 실행')
+    parser.add_argument('-n', '--clients', type=int, default=1000, help='가상 PC 수')
+    parser.add_argument('-d', '--duration', type=float, default=120, help='측정 시간 (초)')
+    parser.add_argument('--scenario', choices=['steady', 'boot-storm', 'outage'], default='steady')
+    parser.add_argument('--ramp', type=float, default=30,
+                        help='steady/outage: 전체 PC가 켜지는 데 걸리는 시간 (초)')
+    parser.add_argument('--pin', default='482913', help='등록 PIN (--serve면 자동 생성)')
+    parser.add_argument('--heartbeat-interval', type=float, default=300,
+                        help='하트비트 주기 (클라이언트 기본 300초)')
+    parser.add_argument('--poll-timeout', type=int, default=30, help='long-poll 대기 (클라이언트 기본 30초)')
+    parser.add_argument('--request-timeout', type=float, default=30, help='일반 요청 타임아웃 (초)')
+    parser.add_argument('--command-rate', type=float, default=2.0, help='초당 생성할 명령 수 (0이면 생성 안 함)')
+    parser.add_argument('--result-bytes', type=int, default=2048, help='명령 결과 output 크기')
+    parser.add_argument('--admin-user', default='loadgen')
+    parser.add_argument('--admin-password', default='loadgen-password')
+    parser.add_argument('--outage-at', type=float, default=40, help='outage: 단절 시작 시각 (초)')
+    parser.add_argument('--outage-length', type=float, default=45, help='outage: 단절 지속 시간 (초)')
+    parser.add_argument('--outage-ratio', type=float, default=0.5, help='outage: 단절되는 PC 비율')
+    parser.add_argument('--heartbeat-workers', type=int, default=32, help='하트비트 전송 스레드 수')
+    args = parser.parse_args()
+
+    if args.serve:
+        args.server = serve_locally(args)
+        print(f"로컬 서버: {args.server}")
+
+    # long-poll은 PC당 스레드 1개가 필요하므로 스택 크기를 줄여 수천 개를 띄움
+    threading.stack_size(512 * 1024)
+    stop = threading.Event()
+    recorder = Recorder()
+    run_tag = random.randrange(0x10000)
+    clients = [VirtualClient(i, run_tag, args, recorder, stop) for i in range(args.clients)]
+
+    scheduler = HeartbeatScheduler(args.heartbeat_interval, args.heartbeat_workers, stop)
+    threading.Thread(target=scheduler.run, daemon=True).start()
+    if args.command_rate > 0:
+        threading.Thread(target=issue_commands, args=(args, clients, recorder, stop),
+                         daemon=True).start()
+    if args.scenario == 'outage':
+        threading.Thread(target=schedule_outage, args=(args, clients, stop), daemon=True).start()
+
+    ramp = 5.0 if args.scenario == 'boot-storm' else args.ramp
+    print(f"시나리오: {args.scenario}, 가상 PC {args.clients}대 ({ramp:.0f}초에 걸쳐 시작), "
+          f"{args.duration:.0f}초 측정")
+
+    def start_client(client: VirtualClient) -> None:
+        if not stop.wait(client.rng.uniform(0, ramp)):
+            client.run(scheduler)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=start_client, args=(client,), daemon=True)
+               for client in clients]
+    for thread in threads:
+        thread.start()
+
+    try:
+        stop.wait(args.duration)
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+    elapsed = time.monotonic() - started
+
+    registered = sum(1 for client in clients if client.pc_id is not None)
+    print(f"\n등록 완료: {registered}/{args.clients}대, 측정 시간 {elapsed:.1f}초")
+    errors = report(recorder, elapsed)
+    return 0 if errors == 0 and registered == args.clients else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+모델 계층 마이크로 벤치마크
+
+PC 100/1,000/10,000대 규모의 DB(실제와 비슷한 processes/disk_info JSON 포함)를 만들고
+핫 패스 모델 함수의 호출당 지연 시간과 실행 SQL 문 수를 측정합니다.
+저장된 기준값(baselines/model_bench.json)과 비교해 회귀를 보고합니다.
+
+사용법:
+    python scripts/benchmark/model_bench.py                       # 측정 + 기준값 비교
+    python scripts/benchmark/model_bench.py --sizes 100 1000 -n 100
+    python scripts/benchmark/model_bench.py --save-baseline       # 현재 결과를 기준값으로 저장
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER_DIR = PROJECT_ROOT / 'server'
+sys.path.insert(0, str(SERVER_DIR))
+os.environ.setdefault('WCMS_ENV', 'test')
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baselines' / 'model_bench.json'
+PIN = '482913'
+PCS_PER_ROOM = 40
+
+# 실습실 PC에서 흔히 보이는 프로세스 (하트비트 processes 필드)
+PROCESS_NAMES = [
+    'System', 'Registry', 'smss.exe', 'csrss.exe', 'wininit.exe', 'services.exe', 'lsass.exe',
+    'svchost.exe', 'fontdrvhost.exe', 'dwm.exe', 'explorer.exe', 'sihost.exe', 'taskhostw.exe',
+    'RuntimeBroker.exe', 'SearchHost.exe', 'StartMenuExperienceHost.exe', 'ctfmon.exe',
+    'TextInputHost.exe', 'ShellExperienceHost.exe', 'SecurityHealthService.exe', 'MsMpEng.exe',
+    'NisSrv.exe', 'spoolsv.exe', 'audiodg.exe', 'WmiPrvSE.exe', 'dllhost.exe', 'conhost.exe',
+    'OneDrive.exe', 'msedge.exe', 'chrome.exe', 'Code.exe', 'python.exe', 'javaw.exe',
+    'Teams.exe', 'notepad.exe', 'WINWORD.EXE', 'EXCEL.EXE', 'POWERPNT.EXE', 'Zoom.exe',
+    'WCMS-Client.exe', 'igfxEM.exe', 'RtkAudUService64.exe', 'SgrmBroker.exe',
+    'MoUsoCoreWorker.exe',
+]
+
+# 실행 수를 세지 않는 문장 (트랜잭션 제어, 연결 초기화 PRAGMA)
+UNCOUNTED_PREFIXES = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'PRAGMA')
+
+
+class StatementCounter:
+    """sqlite3 trace callback으로 실행된 SQL 문 수 집계 (writer 스레드 포함)
+
+    트리거/REPLACE 내부 단계도 같은 문장 텍스트로 다시 보고되므로
+    바로 앞과 같은 문장(파라미터가 채워진 SQL)은 한 번으로 센다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._last = None
+
+    def reset(self) -> None:
+        self.count = 0
+        self._last = None
+
+    def __call__(self, statement: str) -> None:
+        if statement == self._last or statement.lstrip().upper().startswith(UNCOUNTED_PREFIXES):
+            return
+        self._last = statement
+        self.count += 1
+
+    def install(self) -> None:
+        """이후 생성되는 모든 풀 연결에 trace callback 설치"""
+        from utils.database import ConnectionPool
+        original_connect = ConnectionPool.connect
+        counter = self
+
+        def traced_connect(pool):
+            conn = original_connect(pool)
+            conn.set_trace_callback(counter)
+            return conn
+
+        ConnectionPool.connect = traced_connect
+
+
+def random_processes(rng: random.Random) -> List[str]:
+    names = rng.sample(PROCESS_NAMES, rng.randint(25, len(PROCESS_NAMES)))
+    # svchost.exe 등은 여러 개 떠 있음
+    return names + ['svchost.exe'] * rng.randint(20, 60)
+
+
+def random_disk_usage(rng: random.Random) -> Dict[str, Dict[str, float]]:
+    usage = {}
+    for drive, total in (('C:\\', 237.0), ('D:\\', 931.5)):
+        used = round(rng.uniform(0.2, 0.9) * total, 1)
+        usage[drive] = {'used_gb': used, 'free_gb': round(total - used, 1),
+                        'percent': round(used / total * 100, 1)}
+    return usage
+
+
+def seed_database(db_path: str, pc_count: int, seed: int = 42) -> None:
+    """스키마 적용 + PC/스펙/동적 상태/명령 이력/토큰 생성"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    conn = sqlite3.connect(db_path)
+    with open(SERVER_DIR / 'migrations' / 'schema.sql', encoding='utf-8') as f:
+        conn.executescript(f.read())
+
+    conn.executemany('''
+        INSERT INTO pc_info (id, machine_id, hostname, mac_address, room_name, seat_number,
+                             ip_address, is_online, last_seen, is_verified, verified_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?, 1, ?)
+    ''', [
+        (
+            pc_id, f'{pc_id:012X}', f'LAB-PC-{pc_id:05d}',
+            ':'.join(f'{(pc_id >> s) & 0xFF:02X}' for s in (40, 32, 24, 16, 8, 0)),
+            f'{(pc_id - 1) // PCS_PER_ROOM + 1}실습실',
+            f'{(pc_id - 1) % PCS_PER_ROOM // 8 + 1}, {(pc_id - 1) % 8 + 1}',
+            f'10.{pc_id // 65000}.{pc_id // 250 % 256}.{pc_id % 250 + 1}',
+            now.isoformat(' ', 'seconds'), now.isoformat(' ', 'seconds'),
+        )
+        for pc_id in range(1, pc_count + 1)
+    ])
+    conn.executemany('''
+        INSERT INTO pc_specs (pc_id, cpu_model, cpu_cores, cpu_threads, ram_total, disk_info,
+                              os_edition, os_version)
+        VALUES (?, 'Intel(R) Core(TM) i5-12400', 6, 12, 16.0, ?,
+                'Windows 11 Education', '10.0.22631')
+    ''', [
+        (pc_id, json.dumps({'C:\\': {'total_gb': 237.0, 'fstype': 'NTFS'},
+                            'D:\\': {'total_gb': 931.5, 'fstype': 'NTFS'}}))
+        for pc_id in range(1, pc_count + 1)
+    ])
+    conn.executemany('''
+        INSERT INTO pc_dynamic_info (pc_id, cpu_usage, ram_used, ram_usage_percent, disk_usage,
+                                     current_user, uptime, processes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [
+        (
+            pc_id, round(rng.uniform(1, 90), 1), round(rng.uniform(3, 14), 1),
+            round(rng.uniform(20, 90), 1),
+            json.dumps(random_disk_usage(rng)), rng.choice([None, 'student', 'Administrator']),
+            rng.randint(60, 86400), json.dumps(random_processes(rng)),
+        )
+        for pc_id in range(1, pc_count + 1)
+    ])
+
+    # 명령 이력: PC당 완료 명령 20건, 10%의 PC에 대기 명령 2건
+    history = []
+    for pc_id in range(1, pc_count + 1):
+        for i in range(20):
+            created = (now - timedelta(hours=i * 6)).isoformat(' ', 'seconds')
+            history.append((pc_id, 'execute', json.dumps({'command': 'ipconfig /all'}), 5,
+                            'completed', json.dumps({'output': 'Windows IP Configuration ...'}),
+                            created))
+        if pc_id % 10 == 0:
+            for priority in (3, 5):
+                history.append((pc_id, 'execute', json.dumps({'command': 'gpupdate /force'}),
+                                priority, 'pending', None, now.isoformat(' ', 'seconds')))
+    conn.executemany('''
+        INSERT INTO commands (pc_id, command_type, command_data, priority, status, result,
+                              created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', history)
+
+    conn.executemany('''
+        INSERT INTO pc_registration_tokens (token, usage_type, expires_in, is_expired, created_by,
+                                            expires_at)
+        VALUES (?, ?, 3600, ?, 'bench', ?)
+    ''', [
+        (f'{100000 + i}', 'single', int(i % 3 == 0), (now - timedelta(hours=i)).isoformat(' '))
+        for i in range(200)
+    ] + [(PIN, 'multi', 0, (now + timedelta(hours=1)).isoformat(' '))])
+
+    conn.commit()
+    conn.close()
+
+
+def mark_stale(db_path: str, pc_ids: List[int]) -> None:
+    """update_offline_status 측정 준비: 일부 PC의 last_seen을 과거로"""
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "UPDATE pc_info SET is_online=1, last_seen=datetime('now', '-5 minutes') WHERE id=?",
+        [(pc_id,) for pc_id in pc_ids]
+    )
+    conn.execute('UPDATE network_events SET online_at=CURRENT_TIMESTAMP WHERE online_at IS NULL')
+    conn.commit()
+    conn.close()
+
+
+def build_operations(db_path: str, pc_count: int, rng: random.Random) -> Dict[str, tuple]:
+    """측정 대상: 이름 → (준비 함수 또는 None, 측정 함수, 반복 배율)"""
+    from models import CommandModel, PCModel, RegistrationTokenModel
+    from services import PCService
+
+    def heartbeat():
+        PCModel.update_heartbeat(
+            rng.randint(1, pc_count), cpu_usage=rng.uniform(1, 90), ram_used=rng.uniform(3, 14),
+            ram_usage_percent=rng.uniform(20, 90), disk_usage=random_disk_usage(rng),
+            current_user='student', uptime=rng.randint(60, 86400), processes=random_processes(rng)
+        )
+
+    stale_count = max(1, pc_count // 20)  # 5%가 동시에 타임아웃
+
+    def random_pc() -> int:
+        return rng.randint(1, pc_count)
+
+    return {
+        'PCModel.update_heartbeat': (None, heartbeat, 1.0),
+        'PCModel.get_with_status': (None, lambda: PCModel.get_with_status(random_pc()), 1.0),
+        'CommandModel.get_pending_for_pc': (
+            None, lambda: CommandModel.get_pending_for_pc(random_pc()), 1.0
+        ),
+        'RegistrationTokenModel.validate': (
+            None, lambda: RegistrationTokenModel.validate(PIN), 1.0
+        ),
+        'PCService.update_offline_status': (
+            lambda: mark_stale(db_path, rng.sample(range(1, pc_count + 1), stale_count)),
+            lambda: PCService.update_offline_status(),
+            0.1,
+        ),
+    }
+
+
+def measure(app, counter: StatementCounter, setup: Optional[Callable], run: Callable,
+            iterations: int) -> dict:
+    """함수 1회 호출 = 요청 1건 (앱 컨텍스트 안에서 실행, 준비 시간은 제외)"""
+    latencies, statements = [], []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        with app.app_context():
+            counter.reset()
+            started = time.perf_counter()
+            run()
+            latencies.append((time.perf_counter() - started) * 1000)
+            statements.append(counter.count)
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': round(statistics.median(ordered), 4),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 4),
+        'queries': round(statistics.mean(statements), 2),
+    }
+
+
+def run_benchmarks(sizes: List[int], iterations: int, warmup: int) -> Dict[str, Dict[str, dict]]:
+    import logging
+    from app import create_app
+    from utils.database import init_db_manager
+
+    logging.getLogger('wcms').setLevel(logging.WARNING)  # update_offline_status 로그 억제
+    counter = StatementCounter()
+    counter.install()
+    results = {}
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'bench.sqlite3')
+            seed_database(db_path, size)
+            app = create_app('test')
+            manager = init_db_manager(db_path, use_writer=True)
+
+            rng = random.Random(size)
+            results[str(size)] = {}
+            for name, (setup, run, scale) in build_operations(db_path, size, rng).items():
+                count = max(5, int(iterations * scale))
+                measure(app, counter, setup, run, max(1, int(warmup * scale)))
+                results[str(size)][name] = measure(app, counter, setup, run, count)
+            manager.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """기준값 대비 비교표 출력, 회귀 항목 반환
+
+    p50이 tolerance 비율과 min_delta_ms를 모두 넘게 느려지거나 SQL 문 수가 늘면 회귀.
+    """
+    regressions = []
+    print(f"\n{'규모':>6}  {'연산':<34} {'p50(ms)':>9} {'기준':>9} {'변화':>8}  {'SQL':>5} {'기준':>5}")
+    for size, operations in results.items():
+        for name, current in operations.items():
+            base = baseline.get(size, {}).get(name)
+            if not base:
+                print(f"{size:>6}  {name:<34} {current['p50_ms']:>9.3f} {'-':>9} {'-':>8}  "
+                      f"{current['queries']:>5} {'-':>5}")
+                continue
+            delta = current['p50_ms'] - base['p50_ms']
+            change = delta / base['p50_ms'] * 100 if base['p50_ms'] else 0.0
+            slower = change > tolerance * 100 and delta > min_delta_ms
+            more_queries = current['queries'] > base['queries']
+            mark = '  <-- 회귀' if slower or more_queries else ''
+            print(f"{size:>6}  {name:<34} {current['p50_ms']:>9.3f} {base['p50_ms']:>9.3f} "
+                  f"{change:>+7.1f}%  {current['queries']:>5} {base['queries']:>5}{mark}")
+            if slower or more_queries:
+                regressions.append(f"{size}대 {name}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='WCMS 모델 계층 마이크로 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='PC 수 (DB 규모)')
+    parser.add_argument('-n', '--iterations', type=int, default=300, help='연산당 측정 횟수')
+    parser.add_argument('--warmup', type=int, default=30, help='연산당 예열 횟수')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='기준값 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 기준값으로 저장')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='p50 회귀 판정 비율 (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.05, help='회귀로 보지 않는 최소 절대 차이 (ms)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.iterations, args.warmup)
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'environment': {
+                    'python': platform.python_version(),
+                    'sqlite': sqlite3.sqlite_version,
+                    'machine': platform.machine(),
+                    'recorded_at': datetime.now().isoformat(' ', 'seconds'),
+                },
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"기준값 저장: {args.baseline}")
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, encoding='utf-8') as f:
+            saved = json.load(f)
+        baseline = saved['results']
+        env = saved.get('environment', {})
+        print(f"기준값: {args.baseline.name} (Python {env.get('python')}, SQLite {env.get('sqlite')}, "
+              f"{env.get('recorded_at')})")
+
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n[!] 회귀 {len(regressions)}건: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+부팅 폭주(boot storm) 등록 벤치마크
+
+실습실 PC가 한꺼번에 켜지는 상황을 재현하여 /api/client/register를
+동시에 호출하고 처리량과 지연 시간을 측정합니다.
+
+사용법:
+    python scripts/benchmark/registration_storm.py                # 500대, 동시 48
+    python scripts/benchmark/registration_storm.py -n 1000 -c 96
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER_DIR = PROJECT_ROOT / 'server'
+sys.path.insert(0, str(SERVER_DIR))
+os.environ.setdefault('WCMS_ENV', 'test')
+
+PIN = '482913'
+
+
+def prepare_database(db_path: str) -> None:
+    """스키마 적용 + 재사용 가능 PIN 생성"""
+    conn = sqlite3.connect(db_path)
+    with open(SERVER_DIR / 'migrations' / 'schema.sql', encoding='utf-8') as f:
+        conn.executescript(f.read())
+    conn.execute('''
+        INSERT INTO pc_registration_tokens (token, usage_type, expires_in, created_by, expires_at)
+        VALUES (?, 'multi', 3600, 'bench', ?)
+    ''', (PIN, (datetime.now() + timedelta(hours=1)).isoformat(' ')))
+    conn.commit()
+    conn.close()
+
+
+def build_payload(index: int) -> dict:
+    """client/main.py register_client()와 같은 형태의 등록 요청"""
+    return {
+        'machine_id': f'{index:012X}',
+        'pin': PIN,
+        'hostname': f'LAB-PC-{index:04d}',
+        'mac_address': ':'.join(f'{(index >> s) & 0xFF:02X}' for s in (40, 32, 24, 16, 8, 0)),
+        'ip_address': f'10.0.{index // 250}.{index % 250 + 1}',
+        'cpu_model': 'Intel(R) Core(TM) i5-12400',
+        'cpu_cores': 6,
+        'cpu_threads': 12,
+        'ram_total': 16.0,
+        'disk_info': {'C:\\': {'total_gb': 237.0, 'fstype': 'NTFS'}},
+        'os_edition': 'Windows 11 Education',
+        'os_version': '10.0.22631',
+        'system_info': {
+            'cpu_usage': 35.0,
+            'ram_used': 6.2,
+            'ram_usage_percent': 38.7,
+            'disk_usage': {'C:\\': {'used_gb': 107.2, 'free_gb': 129.8, 'percent': 45.2}},
+            'current_user': None,
+            'uptime': 40,
+            'processes': ['explorer.exe', 'svchost.exe', 'WCMS-Client.exe'],
+        },
+    }
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='WCMS 등록 부팅 폭주 벤치마크')
+    parser.add_argument('-n', '--machines', type=int, default=500, help='등록할 PC 수')
+    parser.add_argument('-c', '--concurrency', type=int, default=48, help='동시 요청 수')
+    parser.add_argument('--no-writer', action='store_true', help='단일 writer 큐 없이 요청 스레드에서 직접 쓰기')
+    args = parser.parse_args()
+
+    from app import create_app
+    from utils.database import init_db_manager
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.sqlite3')
+        prepare_database(db_path)
+
+        app = create_app('test')
+        init_db_manager(db_path, use_writer=not args.no_writer)
+
+        def register(index: int):
+            started = time.perf_counter()
+            response = app.test_client().post('/api/client/register', json=build_payload(index))
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(register, range(args.machines)))
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency * 1000 for _, latency in results]
+        errors = sum(1 for status, _ in results if status != 200)
+
+        conn = sqlite3.connect(db_path)
+        registered = conn.execute('SELECT COUNT(*) FROM pc_info WHERE is_verified=1').fetchone()[0]
+        used_count = conn.execute('SELECT used_count FROM pc_registration_tokens WHERE token=?',
+                                  (PIN,)).fetchone()[0]
+        conn.close()
+
+    print(f"등록 요청: {args.machines}대 (동시 {args.concurrency})")
+    print(f"총 소요:   {elapsed:.2f}s  ({args.machines / elapsed:.1f} req/s)")
+    print(f"지연 시간: p50={statistics.median(latencies):.1f}ms  "
+          f"p99={percentile(latencies, 99):.1f}ms  max={max(latencies):.1f}ms")
+    print(f"오류:      {errors}건")
+    print(f"DB 확인:   검증된 PC {registered}대, 토큰 used_count={used_count}")
+
+    return 0 if errors == 0 and registered == args.machines == used_count else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+서버 콜드 스타트 벤치마크
+
+새 파이썬 프로세스에서 app 모듈 임포트와 create_app()을 각각 측정하고,
+`python -X importtime` 결과로 임포트 비용이 큰 모듈을 보여줍니다.
+중앙값이 예산(--budget-ms)을 넘으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/benchmark/startup_time.py                    # test 모드, 5회
+    python scripts/benchmark/startup_time.py --mode development -r 10 --budget-ms 600
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER_DIR = PROJECT_ROOT / 'server'
+
+# 자식 프로세스에서 실행: 임포트/앱 생성 시간을 JSON으로 출력
+MEASURE_CODE = '''
+import json, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app_module.create_app(sys.argv[1])
+created = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000,
+                  "create_ms": (created - imported) * 1000}))
+'''
+
+
+def child_env(tmp_dir: str, mode: str) -> dict:
+    """측정용 환경 변수 (DB/세션/로그 파일은 임시 디렉터리에 생성)"""
+    env = os.environ.copy()
+    env['PYTHONPATH'] = str(SERVER_DIR)
+    env['WCMS_ENV'] = mode
+    env['WCMS_DB_PATH'] = os.path.join(tmp_dir, 'db.sqlite3')
+    env['WCMS_SESSION_DB'] = os.path.join(tmp_dir, 'sessions.sqlite3')
+    env['WCMS_LOG_FILE'] = os.path.join(tmp_dir, 'logs', 'server.log')
+    env.setdefault('WCMS_SECRET_KEY', 'startup-benchmark')
+    return env
+
+
+def measure_once(mode: str, env: dict) -> dict:
+    """새 프로세스에서 1회 측정"""
+    result = subprocess.run(
+        [sys.executable, '-c', MEASURE_CODE, mode],
+        capture_output=True, text=True, env=env, cwd=SERVER_DIR, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_profile(env: dict, top: int) -> list:
+    """-X importtime 결과에서 누적 시간이 큰 모듈 top개 [(모듈, 누적 us)]"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        capture_output=True, text=True, env=env, cwd=SERVER_DIR, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # 'import time:   self | cumulative |   pkg.module' (들여쓰기 2칸 = 깊이 1)
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        # app이 직접 임포트한 모듈(깊이 1)과 app 자신만 집계
+        if depth <= 1:
+            modules[name.strip()] = int(cumulative_us)
+    return sorted(modules.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='WCMS 서버 콜드 스타트 벤치마크')
+    parser.add_argument('--mode', default='test', choices=['test', 'development', 'production'],
+                        help='create_app 모드')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='반복 횟수 (프로세스 수)')
+    parser.add_argument('--top', type=int, default=10, help='표시할 임포트 상위 모듈 수')
+    parser.add_argument('--budget-ms', type=float, default=400.0, help='임포트+create_app 중앙값 예산 (ms)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = child_env(tmp_dir, args.mode)
+        runs = [measure_once(args.mode, env) for _ in range(args.repeat)]
+        profile = import_profile(env, args.top)
+
+    import_ms = [run['import_ms'] for run in runs]
+    create_ms = [run['create_ms'] for run in runs]
+    total_ms = [run['import_ms'] + run['create_ms'] for run in runs]
+    median_total = statistics.median(total_ms)
+
+    print(f"모드: {args.mode} ({args.repeat}회, 새 프로세스)")
+    print(f"import app:   p50={statistics.median(import_ms):.1f}ms  max={max(import_ms):.1f}ms")
+    print(f"create_app(): p50={statistics.median(create_ms):.1f}ms  max={max(create_ms):.1f}ms")
+    print(f"합계:         p50={median_total:.1f}ms  (예산 {args.budget_ms:.0f}ms)")
+    print("\n임포트 누적 시간 상위 모듈 (-X importtime, app 직접 임포트 기준):")
+    for name, cumulative_us in profile:
+        print(f"  {cumulative_us / 1000:8.1f}ms  {name}")
+
+    if median_total > args.budget_ms:
+        print(f"\n[!] 콜드 스타트 예산 초과: {median_total:.1f}ms > {args.budget_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
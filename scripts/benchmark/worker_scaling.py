@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+워커 수별 처리량 벤치마크 (1 → N 워커)
+
+같은 SQLite DB를 쓰는 서버를 워커 1, 2, 4, ... 개로 띄우고, 여러 부하 프로세스가
+keep-alive 연결로 하트비트(경량)와 명령 조회(timeout=0)를 보내 초당 처리량과
+p50/p95 지연 시간, 1워커 대비 확장 배율을 보고합니다.
+
+서버:
+    prefork   하나의 리슨 소켓을 여러 프로세스가 공유하는 werkzeug 스레드 서버 (기본값, 추가 의존성 없음)
+    gunicorn  gunicorn -k gevent -w N app:app (gunicorn/gevent 설치 필요)
+
+사용법:
+    python scripts/benchmark/worker_scaling.py                       # 워커 1,2,4 / 10초씩
+    python scripts/benchmark/worker_scaling.py -w 1 2 4 8 -d 20 --server gunicorn
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SERVER_DIR = PROJECT_ROOT / 'server'
+
+MACHINE_PREFIX = 'SCALE-'
+
+
+def seed_database(db_path: str, pcs: int) -> None:
+    """schema.sql + 온라인 PC pcs대"""
+    conn = sqlite3.connect(db_path)
+    conn.executescript((SERVER_DIR / 'migrations' / 'schema.sql').read_text(encoding='utf-8'))
+    conn.executemany(
+        'INSERT INTO pc_info (machine_id, hostname, mac_address, is_online, room_name) '
+        'VALUES (?, ?, ?, 1, ?)',
+        [(f'{MACHINE_PREFIX}{i:05d}', f'scale-{i:05d}', f'02:00:00:00:{i // 256:02X}:{i % 256:02X}',
+          f'{i // 40 + 1}실습실') for i in range(pcs)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def server_env(tmp_dir: str, db_path: str, workers: int) -> dict:
+    env = os.environ.copy()
+    env.update({
+        'PYTHONPATH': str(SERVER_DIR),
+        'WCMS_ENV': 'production',
+        'WCMS_DB_PATH': db_path,
+        'WCMS_SESSION_DB': os.path.join(tmp_dir, 'sessions.sqlite3'),
+        'WCMS_LOG_FILE': os.path.join(tmp_dir, 'logs', 'server.log'),
+        'WCMS_WORKERS': str(workers),
+        'WCMS_RATELIMIT_STORAGE': f"sqlite:///{os.path.join(tmp_dir, 'ratelimit.sqlite3')}",
+        'WCMS_SECRET_KEY': 'worker-scaling-benchmark',
+    })
+    return env
+
+
+def _prefork_worker(fd: int, env: dict) -> None:
+    """fork된 자식에서 앱 생성 후 공유 소켓으로 서비스"""
+    import logging
+    os.environ.update(env)
+    sys.path.insert(0, str(SERVER_DIR))
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    logging.getLogger('wcms').setLevel(logging.WARNING)
+    app = create_app('production')
+    server = make_server('127.0.0.1', 0, app, threaded=True, fd=fd)
+    server.serve_forever()
+
+
+class PreforkServer:
+    """리슨 소켓 하나를 N개 프로세스가 accept (gunicorn sync/gthread 워커와 같은 구조)"""
+
+    def __init__(self, workers: int, env: dict):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(1024)
+        self.sock.set_inheritable(True)
+        self.port = self.sock.getsockname()[1]
+        ctx = multiprocessing.get_context('fork')
+        self.processes = [
+            ctx.Process(target=_prefork_worker, args=(self.sock.fileno(), env), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+    def stop(self) -> None:
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(5)
+        self.sock.close()
+
+
+class GunicornServer:
+    def __init__(self, workers: int, env: dict):
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-k', 'gevent', '-w', str(workers),
+             '--worker-connections', '1000', '-b', f'127.0.0.1:{self.port}', 'app:app'],
+            cwd=SERVER_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait(10)
+
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/robots.txt')
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'서버가 {timeout}초 안에 시작되지 않았습니다 (port {port})')
+
+
+def _load_thread(port: int, pcs: int, stop_at: float, seed: int, results: list) -> None:
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    errors = 0
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    while time.monotonic() < stop_at:
+        machine_id = f'{MACHINE_PREFIX}{rng.randrange(pcs):05d}'
+        started = time.perf_counter()
+        try:
+            if rng.random() < 0.7:
+                system_info = {'cpu_usage': rng.uniform(0, 100), 'ram_usage_percent': 40}
+                body = json.dumps({'machine_id': machine_id, 'full_update': False,
+                                   'system_info': system_info})
+                conn.request('POST', '/api/client/heartbeat', body,
+                             {'Content-Type': 'application/json'})
+            else:
+                conn.request('GET', f'/api/client/commands?machine_id={machine_id}&timeout=0')
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    results.append((latencies, errors))
+
+
+def _load_process(port: int, pcs: int, threads: int, stop_at_wall: float, seed: int, queue) -> None:
+    """부하 프로세스 1개 (threads개 keep-alive 연결)"""
+    import threading
+    stop_at = time.monotonic() + (stop_at_wall - time.time())
+    results: list = []
+    workers = [threading.Thread(target=_load_thread,
+                                args=(port, pcs, stop_at, seed * 1000 + i, results))
+               for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    latencies = [value for thread_latencies, _ in results for value in thread_latencies]
+    queue.put((latencies, sum(errors for _, errors in results)))
+
+
+def run_load(port: int, args) -> dict:
+    ctx = multiprocessing.get_context('fork')
+    queue = ctx.Queue()
+    stop_at = time.time() + args.duration
+    processes = [ctx.Process(target=_load_process,
+                             args=(port, args.pcs, args.threads, stop_at, i, queue))
+                 for i in range(args.load_processes)]
+    for process in processes:
+        process.start()
+    collected = [queue.get(timeout=args.duration + 60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = sorted(value for values, _ in collected for value in values)
+    errors = sum(errors for _, errors in collected)
+    if not latencies:
+        return {'rps': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'errors': errors}
+    return {
+        'rps': len(latencies) / args.duration,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='WCMS 워커 수별 처리량 벤치마크')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='측정할 워커 수 목록')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='워커 수별 측정 시간 (초)')
+    parser.add_argument('--pcs', type=int, default=500, help='가상 PC 수')
+    parser.add_argument('--load-processes', type=int, default=4, help='부하 생성 프로세스 수')
+    parser.add_argument('--threads', type=int, default=16, help='부하 프로세스당 동시 연결 수')
+    parser.add_argument('--server', choices=['prefork', 'gunicorn'], default='prefork',
+                        help='서버 실행 방식')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    print(f"CPU {cpus}개, PC {args.pcs}대, 부하 {args.load_processes}프로세스 x {args.threads}연결, "
+          f"{args.duration:.0f}초씩 ({args.server})")
+    if max(args.workers) + args.load_processes > cpus:
+        print("[!] 워커 + 부하 프로세스 수가 CPU 수보다 많아 확장 배율이 CPU에 묶일 수 있습니다")
+
+    rows = []
+    for workers in args.workers:
+        tmp_dir = tempfile.mkdtemp(prefix='wcms-scale-')
+        try:
+            db_path = os.path.join(tmp_dir, 'scale.sqlite3')
+            seed_database(db_path, args.pcs)
+            env = server_env(tmp_dir, db_path, workers)
+            server_class = GunicornServer if args.server == 'gunicorn' else PreforkServer
+            server = server_class(workers, env)
+            try:
+                wait_ready(server.port)
+                result = run_load(server.port, args)
+            finally:
+                server.stop()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        rows.append((workers, result))
+        print(f"  워커 {workers:>2}: {result['rps']:8.0f} req/s  p50={result['p50_ms']:6.1f}ms  "
+              f"p95={result['p95_ms']:6.1f}ms  오류={result['errors']}")
+
+    base = rows[0][1]['rps'] or 1.0
+    print("\n워커   req/s   배율   효율")
+    for workers, result in rows:
+        speedup = result['rps'] / base
+        efficiency = speedup / (workers / rows[0][0]) * 100
+        print(f"{workers:>4} {result['rps']:8.0f} {speedup:5.2f}x {efficiency:5.0f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
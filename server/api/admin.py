@@ -2,12 +2,23 @@
 관리자 API Blueprint
 관리자가 호출하는 API 엔드포인트
 """
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 import json
 import logging
-from models import PCModel, CommandModel, AdminModel
-from utils import require_admin, get_db, execute_query
+import os
+from datetime import date, datetime, timedelta, timezone
+from models import (
+    PCModel, CommandModel, AdminModel, AvailabilityModel, CommandOutputModel, RolloutModel,
+)
+from utils import (
+    require_admin, get_db, execute_query, get_db_stats, get_query_stats, invalidate_room_cache,
+)
+from services import MaintenanceService, ArtifactService, RolloutService
 from utils.validators import validate_username
+from utils.log_reader import tail_lines, get_log_index
+from utils.version_cache import invalidate_version_cache
+from services.rollout_service import invalidate_rollout_cache
+from utils.pc_identity import pc_identity
 
 logger = logging.getLogger('wcms.admin_api')
 
@@ -27,6 +38,7 @@ def _queue_command(pc_id: int, cmd_type: str, cmd_data=None):
     _, err = _get_pc_or_404(pc_id)
     if err:
         return err
+    ArtifactService.prefetch_for_command(cmd_type, cmd_data, current_app._get_current_object())
     try:
         command_id = CommandModel.create(
             pc_id=pc_id,
@@ -153,6 +165,8 @@ def send_command(pc_id):
         logger.warning(f"명령 전송 실패: PC 미존재 (pc_id={pc_id})")
         return jsonify({'status': 'error', 'message': 'PC를 찾을 수 없습니다'}), 404 # app.py message
 
+    ArtifactService.prefetch_for_command(data.get('type'), data.get('data'),
+                                         current_app._get_current_object())
     command_id = CommandModel.create(
         pc_id=pc_id,
         command_type=data.get('type'),
@@ -234,6 +248,9 @@ def bulk_command():
     if not pc_ids or not command_type:
         return jsonify({'error': 'pc_ids와 command_type은 필수입니다'}), 400
 
+    # 같은 파일을 PC마다 외부에서 받지 않도록 한 번만 캐시
+    ArtifactService.prefetch_for_command(command_type, command_data,
+                                         current_app._get_current_object())
     results = []
     for pc_id in pc_ids:
         try:
@@ -365,6 +382,28 @@ def get_command_results():
     })
 
 
+@admin_bp.route('/commands/<int:command_id>/output', methods=['GET'])
+@require_admin
+def get_command_output(command_id: int):
+    """실행 중인 명령의 출력 스트림 조회 (커서 기반 tail)
+
+    GET /api/commands/<id>/output?cursor=0&limit=100
+    - cursor: 마지막으로 받은 조각 번호 (응답의 next_cursor를 다음 요청에 전달)
+    - done: 명령이 끝나 더 이상 출력이 오지 않음
+    - truncated: 보관 용량 초과로 cursor 이후 일부 출력이 이미 삭제됨
+    """
+    cmd = CommandModel.get_by_id(command_id)
+    if not cmd:
+        return jsonify({'status': 'error', 'message': '명령을 찾을 수 없습니다'}), 404
+
+    cursor = max(request.args.get('cursor', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 500)
+    output = CommandOutputModel.read(command_id, cursor, limit)
+    output['command_status'] = cmd['status']
+    output['done'] = cmd['status'] not in ('pending', 'executing')
+    return jsonify({'status': 'success', 'data': output}), 200
+
+
 @admin_bp.route('/pcs/duplicates', methods=['GET'])
 @require_admin
 def get_duplicates():
@@ -408,6 +447,7 @@ def get_duplicates():
 def delete_pc(pc_id):
     """PC 삭제"""
     if PCModel.delete(pc_id):
+        pc_identity.evict_pc(pc_id)
         return jsonify({
             'status': 'success',
             'message': f'PC({pc_id})가 삭제되었습니다.', # app.py message format approximation
@@ -472,6 +512,7 @@ def create_room():
             VALUES (?, ?, ?, ?, 1)
         ''', (room_name, rows, cols, description))
         db.commit()
+        invalidate_room_cache()
 
         return jsonify({
             'status': 'success',
@@ -518,6 +559,7 @@ def update_room(room_id):
             WHERE id=?
         ''', (new_name, rows, cols, description, is_active, room_id))
         db.commit()
+        invalidate_room_cache()
 
         return jsonify({
             'status': 'success',
@@ -550,6 +592,7 @@ def delete_room(room_id):
 
         db.execute('DELETE FROM seat_layout WHERE id=?', (room_id,))
         db.commit()
+        invalidate_room_cache()
 
         return jsonify({
             'status': 'success',
@@ -569,6 +612,7 @@ def get_layout_map(room_name):
     if not layout:
         db.execute('INSERT INTO seat_layout (room_name, rows, cols) VALUES (?, 5, 8)', (room_name,))
         db.commit()
+        invalidate_room_cache()
         layout = {'rows': 5, 'cols': 8}
 
     return jsonify({
@@ -598,6 +642,7 @@ def save_layout_map(room_name):
     db.execute('INSERT OR REPLACE INTO seat_layout (room_name, cols, rows) VALUES (?, ?, ?)',
                (room_name, data.get('cols', 8), data.get('rows', 5)))
     db.commit()
+    invalidate_room_cache()
     return jsonify({'status': 'success'})
 
 # ==================== 클라이언트 버전 관리 ====================
@@ -631,6 +676,11 @@ def create_client_version():
     if not data or 'version' not in data or 'download_url' not in data:
         return jsonify({'status': 'error', 'message': 'version과 download_url이 필요합니다'}), 400
 
+    try:
+        rollout_options = RolloutService.release_options(data, current_app.config)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
     db = get_db()
 
     try:
@@ -643,12 +693,17 @@ def create_client_version():
             data.get('changelog', '')
         ))
         db.commit()
+        invalidate_version_cache()
+        rollout_id = RolloutService.release(data.get('version'), rollout_options,
+                                            current_app.config)
+        ArtifactService.mirror_release(data.get('download_url'), current_app._get_current_object())
 
         logger.info(f"클라이언트 버전 등록: {data.get('version')} by {session.get('username')}")
 
         return jsonify({
             'status': 'success',
-            'message': f"버전 {data.get('version')} 등록 완료"
+            'message': f"버전 {data.get('version')} 등록 완료",
+            'rollout_id': rollout_id
         }), 200
     except Exception as e:
         logger.error(f"버전 등록 실패: {e}", exc_info=True)
@@ -668,6 +723,7 @@ def delete_client_version(version_id):
 
         db.execute('DELETE FROM client_versions WHERE id=?', (version_id,))
         db.commit()
+        invalidate_version_cache()
 
         logger.info(f"클라이언트 버전 삭제: {version['version']} by {session.get('username')}")
 
@@ -680,6 +736,85 @@ def delete_client_version(version_id):
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
 
+# ==================== 클라이언트 단계적 배포 ====================
+
+@admin_bp.route('/rollouts', methods=['GET'])
+@require_admin
+def get_rollouts():
+    """배포 목록 조회 (최근 순)"""
+    return jsonify({'status': 'success', 'rollouts': RolloutModel.get_all()})
+
+
+@admin_bp.route('/rollouts', methods=['POST'])
+@require_admin
+def create_rollout():
+    """등록된 버전의 단계적 배포 시작 (진행 중인 배포는 취소)
+
+    Body: {version, strategy?: percent|room, waves?, max_concurrent?}
+    """
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    if not version:
+        return jsonify({'status': 'error', 'message': 'version이 필요합니다'}), 400
+
+    db = get_db()
+    if not db.execute('SELECT 1 FROM client_versions WHERE version=?', (version,)).fetchone():
+        return jsonify({'status': 'error', 'message': '등록되지 않은 버전입니다'}), 404
+
+    try:
+        rollout_id = RolloutService.create(
+            version, current_app.config,
+            strategy=data.get('strategy'), waves=data.get('waves'),
+            max_concurrent=data.get('max_concurrent')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    logger.info(f"클라이언트 배포 생성: v{version} by {session.get('username')}")
+    return jsonify({'status': 'success', 'rollout_id': rollout_id}), 201
+
+
+@admin_bp.route('/rollouts/<int:rollout_id>', methods=['GET'])
+@require_admin
+def get_rollout(rollout_id):
+    """배포 진행 상황 (웨이브별 대상/진행/실패 PC 수)"""
+    rollout = RolloutService.progress(rollout_id, current_app.config)
+    if rollout is None:
+        return jsonify({'status': 'error', 'message': '배포를 찾을 수 없습니다'}), 404
+    return jsonify({'status': 'success', 'rollout': rollout})
+
+
+@admin_bp.route('/rollouts/<int:rollout_id>/<action>', methods=['POST'])
+@require_admin
+def control_rollout(rollout_id, action):
+    """배포 제어: pause, resume, cancel, advance (soak를 기다리지 않고 다음 웨이브)"""
+    rollout = RolloutModel.get_by_id(rollout_id)
+    if rollout is None:
+        return jsonify({'status': 'error', 'message': '배포를 찾을 수 없습니다'}), 404
+
+    reason = f"{action} by {session.get('username')}"
+    if action == 'pause':
+        changed = RolloutModel.set_status(rollout_id, 'paused', reason, from_statuses=('active',))
+    elif action == 'resume':
+        changed = RolloutModel.set_status(rollout_id, 'active', reason, from_statuses=('paused',))
+    elif action == 'cancel':
+        changed = RolloutModel.set_status(rollout_id, 'cancelled', reason)
+    elif action == 'advance':
+        changed = rollout['status'] == 'active' and \
+            rollout['current_wave'] + 1 < RolloutService.wave_count(rollout) and \
+            RolloutModel.advance(rollout_id, rollout['current_wave'])
+    else:
+        return jsonify({'status': 'error', 'message': f'알 수 없는 동작: {action}'}), 400
+
+    if not changed:
+        message = f"현재 상태({rollout['status']})에서 {action} 불가"
+        return jsonify({'status': 'error', 'message': message}), 409
+
+    invalidate_rollout_cache()
+    logger.info(f"클라이언트 배포 {action}: v{rollout['version']} by {session.get('username')}")
+    return jsonify({'status': 'success', 'rollout': RolloutModel.get_by_id(rollout_id)})
+
+
 # ==================== 등록 토큰 관리 API (v0.8.0) ====================
 
 @admin_bp.route('/admin/registration-token', methods=['POST'])
@@ -955,3 +1090,127 @@ def get_pc_status():
     except Exception as e:
         logger.error(f"시스템 상태 조회 실패: {e}", exc_info=True)
         return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+@admin_bp.route('/debug/db-stats', methods=['GET'])
+@require_admin
+def get_database_stats():
+    """DB 연결 풀 / writer 큐 상태 조회 (큐 깊이, 쓰기 지연 시간)"""
+    return jsonify({'status': 'success', 'data': get_db_stats()}), 200
+
+
+@admin_bp.route('/debug/queries', methods=['GET', 'DELETE'])
+@require_admin
+def get_query_report():
+    """SQL 문장별 통계 top-N (GET) / 초기화 (DELETE)
+
+    GET /api/debug/queries?limit=20&sort=total
+    - sort: total(누적 시간), avg, max, count, rows
+    - index_usage: 실행 계획에 나온 인덱스별 실행 횟수, full_scans: 인덱스 없이 SCAN 하는 문장
+    """
+    stats = get_query_stats()
+    if stats is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'SQL 통계가 비활성 상태입니다 (WCMS_DB_QUERY_STATS=true로 활성화)'
+        }), 404
+
+    if request.method == 'DELETE':
+        stats.reset()
+        return jsonify({'status': 'success', 'message': 'SQL 통계를 초기화했습니다'}), 200
+
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 200)
+    sort = request.args.get('sort', 'total')
+    return jsonify({'status': 'success', 'data': stats.report(limit=limit, sort=sort)}), 200
+
+
+@admin_bp.route('/debug/maintenance', methods=['GET', 'POST'])
+@require_admin
+def db_maintenance():
+    """DB 유지보수 결과 조회 (GET) / 즉시 실행 (POST)"""
+    if request.method == 'GET':
+        return jsonify({'status': 'success', 'data': MaintenanceService.get_last_report()}), 200
+
+    try:
+        report = MaintenanceService.run(current_app.config)
+        return jsonify({'status': 'success', 'data': report}), 200
+    except Exception as e:
+        logger.error(f"DB 유지보수 실행 실패: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+# ==================== 가용성 리포트 API ====================
+
+@admin_bp.route('/availability', methods=['GET'])
+@require_admin
+def get_availability_report():
+    """PC/실습실별 가용률, 장애 횟수, MTTR, 사유별 장애 (network_events 일별 롤업)
+
+    GET /api/availability?start=2026-03-02&end=2026-06-20&room=1실습실&pc_id=3
+    - start/end: UTC 일자 (포함), 기본값 최근 30일
+    """
+    try:
+        today = datetime.now(timezone.utc).date()
+        end = date.fromisoformat(request.args['end']) if request.args.get('end') else today
+        if request.args.get('start'):
+            start = date.fromisoformat(request.args['start'])
+        else:
+            start = end - timedelta(days=29)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'잘못된 날짜: {e}'}), 400
+    if start > end:
+        return jsonify({'status': 'error', 'message': 'start는 end보다 이전이어야 합니다'}), 400
+
+    try:
+        report = AvailabilityModel.get_report(
+            start, end,
+            room_name=request.args.get('room'),
+            pc_id=request.args.get('pc_id', type=int)
+        )
+        return jsonify({'status': 'success', 'data': report}), 200
+    except Exception as e:
+        logger.error(f"가용성 리포트 조회 실패: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+
+# ==================== 서버 로그 API ====================
+
+@admin_bp.route('/admin/logs/tail', methods=['GET'])
+@require_admin
+def get_log_tail():
+    """서버 로그 마지막 N줄 (파일 끝에서 역방향으로 읽음)"""
+    count = min(request.args.get('lines', 200, type=int), 2000)
+    log_file = current_app.config['LOG_FILE']
+    if not os.path.exists(log_file):
+        return jsonify({'status': 'success', 'lines': []}), 200
+    return jsonify({'status': 'success', 'lines': tail_lines(log_file, count)}), 200
+
+
+@admin_bp.route('/admin/logs/search', methods=['GET'])
+@require_admin
+def search_logs():
+    """서버 로그 검색 (level, pc_id, command_id, since, until, limit)
+
+    since/until은 ISO 8601 (예: 2026-01-01T09:00:00)
+    """
+    try:
+        since = request.args.get('since')
+        until = request.args.get('until')
+        filters = {
+            'level': request.args.get('level'),
+            'pc_id': request.args.get('pc_id', type=int),
+            'command_id': request.args.get('command_id', type=int),
+            'since': datetime.fromisoformat(since) if since else None,
+            'until': datetime.fromisoformat(until) if until else None,
+            'limit': min(request.args.get('limit', 200, type=int), 1000),
+        }
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'잘못된 검색 조건: {e}'}), 400
+
+    try:
+        index = get_log_index(current_app.config['LOG_FILE'], current_app.config['LOG_INDEX_PATH'])
+        entries = index.search(**filters)
+        return jsonify({'status': 'success', 'total': len(entries), 'entries': entries}), 200
+    except Exception as e:
+        logger.error(f"로그 검색 실패: {e}", exc_info=True)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -6,15 +6,27 @@ from flask import Blueprint, request, jsonify, current_app
 import json
 import time
 import logging
-from models import PCModel, CommandModel
-from utils import get_db
+from models import PCModel, CommandModel, CommandOutputModel
+from services import PCService, ArtifactService, RolloutService
+from utils import get_db, get_read_db, run_write, close_db
+from utils.command_watcher import command_watcher
+from utils.admission import admission_controlled
+from utils.drain import drain, in_restart_window
+from utils.pc_identity import pc_identity
+from utils.version_cache import body_etag, get_latest_version, invalidate_version_cache
 
 logger = logging.getLogger('wcms.client_api')
 
 client_bp = Blueprint('client', __name__, url_prefix='/api/client')
 
 
+def _is_full_heartbeat() -> bool:
+    data = request.get_json(silent=True) or {}
+    return bool(data.get('full_update', True))
+
+
 @client_bp.route('/register', methods=['POST'])
+@admission_controlled()
 def register():
     """클라이언트 등록 (PIN 인증 필수 - v0.8.0)"""
     data = request.json
@@ -31,58 +43,19 @@ def register():
             'message': 'PIN required (use 6-digit registration token)'
         }), 400
 
-    from models import RegistrationTokenModel
+    # PC 정보
+    hostname = data.get('hostname') or 'Unknown-PC'
 
-    is_valid, error_msg = RegistrationTokenModel.validate(pin)
-    if not is_valid:
+    # 토큰 사용 처리 + PC 등록/검증 + 동적 정보 저장 (단일 트랜잭션)
+    pc_id, error_msg = PCService.register_client(data, pin)
+    if pc_id is None:
         logger.warning(f"등록 실패: PIN 검증 실패 (machine_id={machine_id}, pin=***, error={error_msg})")
         return jsonify({
             'status': 'error',
             'message': error_msg
         }), 403
 
-    # PC 정보
-    hostname = data.get('hostname') or 'Unknown-PC'
-    mac_address = data.get('mac_address') or '00:00:00:00:00:00'
-    ip_address = data.get('ip_address')
-
-    # PC 등록 (is_verified=True, registered_with_token=pin)
-    pc_id = PCModel.update_or_create(
-        machine_id=machine_id,
-        hostname=hostname,
-        mac_address=mac_address,
-        ip_address=ip_address,
-        cpu_model=data.get('cpu_model'),
-        cpu_cores=data.get('cpu_cores'),
-        cpu_threads=data.get('cpu_threads'),
-        ram_total=data.get('ram_total'),
-        disk_info=data.get('disk_info'),
-        os_edition=data.get('os_edition'),
-        os_version=data.get('os_version')
-    )
-
-    # PC 검증 처리
-    from utils import get_db
-    db = get_db()
-    db.execute('''
-        UPDATE pc_info 
-        SET is_verified=1, registered_with_token=?, verified_at=CURRENT_TIMESTAMP
-        WHERE id=?
-    ''', (pin, pc_id))
-    db.commit()
-
-    # 토큰 사용 처리
-    RegistrationTokenModel.mark_used(pin)
-
-    # 동적 정보 저장 (v0.8.0 - 등록 시 디스크/프로세스 정보도 함께)
-    system_info = data.get('system_info')
-    if system_info:
-        try:
-            PCModel.update_dynamic_info(pc_id, system_info)
-            logger.debug(f"등록 시 동적 정보 저장 완료: PC {pc_id}")
-        except Exception as e:
-            logger.warning(f"등록 시 동적 정보 저장 실패: {e}")
-
+    pc_identity.put(machine_id, pc_id, True, data.get('ip_address'))
     logger.info(f"PC 등록 성공: {hostname} (machine_id={machine_id})")
 
     return jsonify({
@@ -93,6 +66,7 @@ def register():
 
 
 @client_bp.route('/heartbeat', methods=['POST'])
+@admission_controlled(when=_is_full_heartbeat)
 def heartbeat():
     """클라이언트 하트비트 (전체/경량 구분)
 
@@ -110,39 +84,58 @@ def heartbeat():
     if not pc_id and not machine_id:
         return jsonify({'status': 'error', 'message': 'machine_id or pc_id is required'}), 400
 
-    if machine_id:
-        pc = PCModel.get_by_machine_id(machine_id)
-        if pc:
-            pc_id = pc['id']
-        else:
-            return jsonify({'status': 'error', 'message': 'PC not registered'}), 404
-    
-    # PC 존재 여부 확인
-    if not PCModel.get_by_id(pc_id):
-        return jsonify({'status': 'error', 'message': 'PC not found'}), 404
+    # PC 식별: machine_id는 식별 맵에서 (조회 없음), pc_id만 보낸 구버전은 DB 확인
+    pc = pc_identity.get(machine_id) if machine_id else PCModel.get_by_id(pc_id)
+    if not pc:
+        message = 'PC not registered' if machine_id else 'PC not found'
+        return jsonify({'status': 'error', 'message': message}), 404
 
     # system_info 필드 처리
     info = data.get('system_info', data)
 
-    # IP 주소 업데이트 (항상 처리)
-    ip_changed = False
-    ip_address = info.get('ip_address')
-    if ip_address and ip_address != 'Unknown':
-        from utils import get_db
-        db = get_db()
+    success, ip_changed = _record_heartbeat(pc['id'], pc['ip_address'], info, full_update,
+                                            machine_id)
+    if not success and machine_id:
+        # 다른 워커에서 삭제된 PC: 없어졌으면 재등록 유도, 재등록됐으면 새 pc_id로 다시 기록
+        fresh = pc_identity.refresh(machine_id)
+        if fresh is None:
+            return jsonify({'status': 'error', 'message': 'PC not registered'}), 404
+        if fresh['id'] != pc['id']:
+            pc = fresh
+            success, ip_changed = _record_heartbeat(
+                pc['id'], pc['ip_address'], info, full_update, machine_id
+            )
+    if not success:
+        return jsonify({'status': 'error', 'message': 'Failed to record heartbeat'}), 500
 
-        # 현재 IP 조회
-        current_ip = db.execute(
-            'SELECT ip_address FROM pc_info WHERE id=?',
-            (pc_id,)
-        ).fetchone()
+    if machine_id and not pc['is_online']:
+        pc_identity.update(machine_id, is_online=True)
+    return jsonify({
+        'status': 'success',
+        'message': 'Heartbeat received',
+        'full_update': full_update,
+        'ip_changed': ip_changed
+    }), 200
 
-        if current_ip and current_ip['ip_address'] != ip_address:
-            ip_changed = True
-            logger.info(f"IP 변경 감지 (하트비트): pc_id={pc_id}, {current_ip['ip_address']} → {ip_address}")
 
-        db.execute('UPDATE pc_info SET ip_address=? WHERE id=?', (ip_address, pc_id))
-        db.commit()
+def _record_heartbeat(pc_id: int, previous_ip, info: dict, full_update: bool, machine_id=None):
+    """하트비트 저장 (IP는 바뀌었을 때만 쓰기)
+
+    Returns:
+        (성공 여부, IP 변경 여부) - PC 행이 없으면 (False, False)
+    """
+    ip_changed = False
+    ip_address = info.get('ip_address')
+    if ip_address and ip_address != 'Unknown' and ip_address != previous_ip:
+        updated = run_write(lambda db: db.execute(
+            'UPDATE pc_info SET ip_address=? WHERE id=? AND ip_address IS NOT ?',
+            (ip_address, pc_id, ip_address)
+        ).rowcount)
+        if machine_id:
+            pc_identity.update(machine_id, ip_address=ip_address)
+        if updated and previous_ip is not None:
+            ip_changed = True
+            logger.info(f"IP 변경 감지 (하트비트): pc_id={pc_id}, {previous_ip} → {ip_address}")
 
     # 전체 하트비트: 모든 정보 저장
     if full_update:
@@ -163,16 +156,7 @@ def heartbeat():
             cpu_usage=info.get('cpu_usage', 0),
             ram_usage_percent=info.get('ram_usage_percent', 0)
         )
-
-    if success:
-        return jsonify({
-            'status': 'success',
-            'message': 'Heartbeat received',
-            'full_update': full_update,
-            'ip_changed': ip_changed
-        }), 200
-    else:
-        return jsonify({'status': 'error', 'message': 'Failed to record heartbeat'}), 500
+    return success, ip_changed
 
 
 @client_bp.route('/shutdown', methods=['POST'])
@@ -184,160 +168,248 @@ def shutdown_signal():
 
     machine_id = data['machine_id']
 
-    pc = PCModel.get_by_machine_id(machine_id)
-    if not pc:
+    pc = pc_identity.get(machine_id)
+    pc_id = _mark_offline(machine_id, pc, 'shutdown') if pc else None
+    if pc_id is None:
         return jsonify({'status': 'error', 'message': 'PC not found'}), 404
 
-    pc_id = pc['id']
-    db = get_db()
-    db.execute('UPDATE pc_info SET is_online=0, last_seen=CURRENT_TIMESTAMP WHERE id=?', (pc_id,))
-
-    # 열린 network_events 레코드가 없으면 새로 생성
-    existing = db.execute(
-        'SELECT id FROM network_events WHERE pc_id=? AND online_at IS NULL',
-        (pc_id,)
-    ).fetchone()
-    if not existing:
-        db.execute(
-            'INSERT INTO network_events (pc_id, offline_at, reason) VALUES (?, CURRENT_TIMESTAMP, ?)',
-            (pc_id, 'shutdown')
-        )
-    db.commit()
-
     logger.info(f"[종료] PC {pc_id} ({machine_id}) 종료 신호 수신")
     return jsonify({'status': 'success', 'message': 'Shutdown signal received'}), 200
 
 
+def _mark_offline(machine_id: str, pc: dict, reason: str):
+    """오프라인 처리 + 열린 network_events가 없으면 reason으로 생성
+
+    식별 맵의 pc_id가 낡았으면(다른 워커에서 삭제/재등록) 다시 읽어 새 pc_id로 재시도한다.
+
+    Returns:
+        처리한 pc_id (PC가 없으면 None)
+    """
+    def job(db, pc_id):
+        # 종료 신호는 마지막 생존 시각도 갱신, 네트워크 오프라인 신호는 마지막 하트비트 시각 유지
+        sql = ('UPDATE pc_info SET is_online=0, last_seen=CURRENT_TIMESTAMP WHERE id=?'
+               if reason == 'shutdown' else 'UPDATE pc_info SET is_online=0 WHERE id=?')
+        if db.execute(sql, (pc_id,)).rowcount == 0:
+            return False
+
+        # 열린 network_events 레코드가 없으면 새로 생성
+        existing = db.execute(
+            'SELECT id FROM network_events WHERE pc_id=? AND online_at IS NULL',
+            (pc_id,)
+        ).fetchone()
+        if not existing:
+            db.execute(
+                'INSERT INTO network_events (pc_id, offline_at, reason) '
+                'VALUES (?, CURRENT_TIMESTAMP, ?)',
+                (pc_id, reason)
+            )
+        return True
+
+    stale_id = None
+    while pc is not None and pc['id'] != stale_id:
+        if run_write(lambda db: job(db, pc['id'])):
+            pc_identity.update(machine_id, is_online=False)
+            return pc['id']
+        stale_id = pc['id']
+        pc = pc_identity.refresh(machine_id)
+    return None
+
+
 @client_bp.route('/command', methods=['GET'])  # 구버전 클라이언트 호환
 @client_bp.route('/commands', methods=['GET'])
 def poll_commands():
     """명령 대기 (Long-polling, GET)
 
     GET /api/client/commands?machine_id=X&timeout=30
-    - 서버가 timeout초 동안 연결 유지, 0.5초마다 명령 확인
+    - 서버가 timeout초 동안 연결 유지, 명령이 생성되면 즉시 반환 (다른 워커가 만든 명령은 0.25초 이내)
     - 연결 시작 시 last_seen 즉시 업데이트 (연결 자체가 생존 신호)
     - 오프라인이었던 PC 재연결 시 is_online=1 복원 + network_events 기록
+    - 서버 drain 중: 새 연결은 503 + Retry-After, 대기 중인 연결은 reconnect_after_ms 지시로 즉시 반환
     """
     machine_id = request.args.get('machine_id')
     timeout = min(int(request.args.get('timeout', 30)), 60)
 
+    if drain.draining:
+        return _draining_response()
+
     if not machine_id:
         return jsonify({
             'status': 'error',
             'error': {'code': 'MISSING_IDENTIFIER', 'message': 'machine_id required'}
         }), 400
 
-    pc = PCModel.get_by_machine_id(machine_id)
+    pc = pc_identity.get(machine_id)
     if not pc:
-        return jsonify({
-            'status': 'error',
-            'error': {'code': 'PC_NOT_FOUND', 'message': f'PC not registered: {machine_id}'}
-        }), 404
+        return _pc_not_registered(machine_id)
 
+    # 연결 시작 시 last_seen 즉시 업데이트
+    pc = _touch_last_seen(machine_id, pc)
+    if not pc:
+        return _pc_not_registered(machine_id)
     pc_id = pc['id']
-    db = get_db()
 
     # 재연결 감지: 오프라인이었으면 온라인으로 복원 + network_events 닫기
-    was_offline = not pc['is_online']
-    if was_offline:
-        # shutdown 신호 직후 Long-poll이 도달하는 경쟁 조건 방지
-        # shutdown 신호 후 5초 이내에 폴링이 오면 실제 재연결이 아닌 것으로 처리
-        recent_shutdown = db.execute('''
-            SELECT id FROM network_events
-            WHERE pc_id=? AND online_at IS NULL AND reason='shutdown'
-              AND (julianday('now') - julianday(offline_at)) * 86400 < 5
-            ORDER BY offline_at DESC LIMIT 1
-        ''', (pc_id,)).fetchone()
-
-        if recent_shutdown:
-            # 종료 직후 폴링 → 무시하고 명령 없음으로 반환
-            logger.debug(f"[폴링무시] PC {pc_id} shutdown 직후 폴링 무시 (경쟁 조건)")
-            return jsonify({'status': 'success', 'data': {'has_command': False, 'command': None}}), 200
-
-        db.execute('UPDATE pc_info SET is_online=1, last_seen=CURRENT_TIMESTAMP WHERE id=?', (pc_id,))
-        open_event = db.execute(
-            'SELECT id, offline_at FROM network_events WHERE pc_id=? AND online_at IS NULL ORDER BY offline_at DESC LIMIT 1',
-            (pc_id,)
-        ).fetchone()
-        if open_event:
-            db.execute('''
-                UPDATE network_events
-                SET online_at=CURRENT_TIMESTAMP,
-                    duration_sec=CAST((julianday('now') - julianday(offline_at)) * 86400 AS INTEGER)
-                WHERE id=?
-            ''', (open_event['id'],))
-        db.commit()
-        logger.info(f"[재연결] PC {pc_id} ({machine_id}) 온라인 복원")
-    else:
-        # 연결 시작 시 last_seen 즉시 업데이트
-        db.execute('UPDATE pc_info SET is_online=1, last_seen=CURRENT_TIMESTAMP WHERE id=?', (pc_id,))
-        db.commit()
+    if not pc['is_online'] and not _restore_online(pc_id, machine_id):
+        # 종료 직후 폴링 → 무시하고 명령 없음으로 반환
+        return jsonify({'status': 'success', 'data': {'has_command': False, 'command': None}}), 200
 
-    # Long-poll: timeout초 동안 명령 대기 (0.5초마다 확인, 최소 1회 실행)
+    # Long-poll: timeout초 동안 명령 대기 (최소 1회 조회)
+    # 새 명령이 생겼을 때만 다시 조회 (command_watcher가 프로세스 안의 모든 long-poll 대신 MAX(id) 확인)
     deadline = time.time() + timeout
+    seen_id = command_watcher.latest_id
     while True:
         cmds = CommandModel.get_pending_for_pc(pc_id)
         if cmds:
             cmd = cmds[0]
             logger.info(f"[명령조회] 명령 발견: PC {pc_id}, 명령 {cmd['id']} ({cmd['command_type']})")
             CommandModel.start_execution(cmd['id'])
-
-            command_data = cmd['command_data']
-            if isinstance(command_data, str):
-                try:
-                    command_data = json.loads(command_data)
-                except Exception:
-                    command_data = {}
-
             return jsonify({
                 'status': 'success',
-                'data': {
-                    'has_command': True,
-                    'command': {
-                        'id': cmd['id'],
-                        'type': cmd['command_type'],
-                        'parameters': command_data,
-                        'timeout': cmd.get('timeout_seconds', 300),
-                        'priority': cmd.get('priority', 5),
-                        'created_at': cmd.get('created_at')
-                    }
-                }
+                'data': {'has_command': True, 'command': _command_payload(cmd)}
             }), 200
-        if time.time() >= deadline:
+        remaining = deadline - time.time()
+        if remaining <= 0:
             break
-        time.sleep(0.5)
+        # 대기하는 동안 풀 연결을 반납 (long-poll이 연결을 붙잡으면 풀 크기만큼만 동시 대기 가능)
+        close_db()
+        seen_id = command_watcher.wait(seen_id, remaining, _latest_command_id)
+        if drain.draining:
+            # 재시작: 연결을 끊기 전에 재연결 시점을 알려줌 (ConnectionError/오프라인 신호 방지)
+            return jsonify({'status': 'success', 'data': {
+                'has_command': False, 'command': None,
+                'reconnect_after_ms': drain.reconnect_after_ms(),
+            }}), 200
 
     # timeout 만료 - 명령 없음, 클라이언트 즉시 재연결
     return jsonify({'status': 'success', 'data': {'has_command': False, 'command': None}}), 200
 
 
+def _command_payload(cmd: dict) -> dict:
+    """long-poll 응답의 명령 본문"""
+    command_data = cmd['command_data']
+    if isinstance(command_data, str):
+        try:
+            command_data = json.loads(command_data)
+        except Exception:
+            command_data = {}
+
+    return {
+        'id': cmd['id'],
+        'type': cmd['command_type'],
+        'parameters': command_data,
+        'timeout': cmd.get('timeout_seconds', 300),
+        'priority': cmd.get('priority', 5),
+        'created_at': cmd.get('created_at')
+    }
+
+
+def _restore_online(pc_id: int, machine_id: str) -> bool:
+    """재연결한 PC를 온라인으로 복원 + 열린 network_events 닫기
+
+    shutdown 신호 직후 Long-poll이 도달하는 경쟁 조건 방지:
+    shutdown 신호 후 5초 이내에 폴링이 오면 실제 재연결이 아닌 것으로 보고 False 반환
+    """
+    recent_shutdown = get_read_db().execute('''
+        SELECT id FROM network_events
+        WHERE pc_id=? AND online_at IS NULL AND reason='shutdown'
+          AND (julianday('now') - julianday(offline_at)) * 86400 < 5
+        ORDER BY offline_at DESC LIMIT 1
+    ''', (pc_id,)).fetchone()
+    if recent_shutdown:
+        logger.debug(f"[폴링무시] PC {pc_id} shutdown 직후 폴링 무시 (경쟁 조건)")
+        return False
+
+    def mark_online(db):
+        db.execute('UPDATE pc_info SET is_online=1, last_seen=CURRENT_TIMESTAMP WHERE id=?',
+                   (pc_id,))
+        open_event = db.execute(
+            'SELECT id, offline_at FROM network_events WHERE pc_id=? AND online_at IS NULL '
+            'ORDER BY offline_at DESC LIMIT 1',
+            (pc_id,)
+        ).fetchone()
+        if open_event:
+            db.execute('''
+                UPDATE network_events
+                SET online_at=CURRENT_TIMESTAMP,
+                    duration_sec=CAST((julianday('now') - julianday(offline_at)) * 86400 AS INTEGER)
+                WHERE id=?
+            ''', (open_event['id'],))
+
+    run_write(mark_online)
+    pc_identity.update(machine_id, is_online=True)
+    logger.info(f"[재연결] PC {pc_id} ({machine_id}) 온라인 복원")
+    return True
+
+
+def _touch_last_seen(machine_id: str, pc: dict):
+    """온라인 PC는 조회 없이 조건부 UPDATE 한 번으로 last_seen 갱신
+
+    0행이면 다른 워커/오프라인 체커가 오프라인으로 바꿨거나 PC가 삭제된 것 → DB에서 다시 읽음.
+    최신 식별 정보를 반환 (삭제됐으면 None).
+    """
+    def touch(pc_id: int) -> int:
+        return run_write(lambda db: db.execute(
+            'UPDATE pc_info SET last_seen=CURRENT_TIMESTAMP WHERE id=? AND is_online=1', (pc_id,)
+        ).rowcount)
+
+    if pc['is_online'] and touch(pc['id']):
+        return pc
+    pc = pc_identity.refresh(machine_id)
+    if pc and pc['is_online']:
+        touch(pc['id'])  # 맵만 늦었던 경우 (다른 워커가 이미 온라인 처리)
+    return pc
+
+
+def _draining_response():
+    """drain 중 새 long-poll 거절 (503 + 지터 있는 Retry-After)"""
+    reconnect_ms = drain.reconnect_after_ms()
+    response = jsonify({
+        'status': 'error',
+        'error': {'code': 'SERVER_DRAINING', 'message': 'Server restarting, reconnect later'},
+        'retry_after_ms': reconnect_ms
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(-(-reconnect_ms // 1000))
+    return response
+
+
+def _pc_not_registered(machine_id: str):
+    return jsonify({
+        'status': 'error',
+        'error': {'code': 'PC_NOT_FOUND', 'message': f'PC not registered: {machine_id}'}
+    }), 404
+
+
+def _latest_command_id() -> int:
+    """command_watcher 조회 함수 (빌린 읽기 연결은 바로 반납)"""
+    try:
+        return CommandModel.get_latest_id()
+    finally:
+        close_db()
+
+
 @client_bp.route('/offline', methods=['POST'])
 def report_offline():
-    """클라이언트 네트워크 오프라인 신호 (즉시 오프라인 처리)"""
+    """클라이언트 네트워크 오프라인 신호 (즉시 오프라인 처리, 서버 재시작 유예 구간에는 무시)"""
     data = request.json or {}
     machine_id = data.get('machine_id')
     if not machine_id:
         return jsonify({'status': 'error', 'message': 'machine_id required'}), 400
 
-    pc = PCModel.get_by_machine_id(machine_id)
+    pc = pc_identity.get(machine_id)
     if not pc:
         return jsonify({'status': 'error', 'message': 'PC not found'}), 404
 
     pc_id = pc['id']
-    db = get_db()
-    db.execute('UPDATE pc_info SET is_online=0 WHERE id=?', (pc_id,))
-
-    # 열린 이벤트가 없으면 새로 생성
-    existing = db.execute(
-        'SELECT id FROM network_events WHERE pc_id=? AND online_at IS NULL',
-        (pc_id,)
-    ).fetchone()
-    if not existing:
-        db.execute(
-            'INSERT INTO network_events (pc_id, offline_at, reason) VALUES (?, CURRENT_TIMESTAMP, ?)',
-            (pc_id, 'network_error')
-        )
-    db.commit()
+
+    if in_restart_window():
+        # 서버 재시작으로 long-poll이 끊긴 것 → 네트워크 장애로 기록하지 않음
+        logger.debug(f"[오프라인무시] PC {pc_id} 재시작 유예 구간")
+        return jsonify({'status': 'success', 'ignored': True}), 200
+
+    pc_id = _mark_offline(machine_id, pc, 'network_error')
+    if pc_id is None:
+        return jsonify({'status': 'error', 'message': 'PC not found'}), 404
 
     logger.info(f"[오프라인] PC {pc_id} ({machine_id}) 네트워크 오프라인 신호")
     return jsonify({'status': 'success'}), 200
@@ -414,43 +486,102 @@ def submit_command_result(command_id: int):
         }), 500
 
 
-@client_bp.route('/version', methods=['GET'])
-def get_version():
-    """클라이언트 최신 버전 확인"""
-    db = get_db()
+@client_bp.route('/commands/<int:command_id>/output', methods=['POST'])
+def append_command_output(command_id: int):
+    """실행 중인 명령의 출력 조각 업로드 (install/uninstall 진행 상황)
+
+    요청: {"seq": 1, "data": "..."}  seq는 명령마다 1부터 증가 (같은 seq 재전송은 무시)
+    명령별로 최근 COMMAND_OUTPUT_MAX_BYTES만 보관한다.
+    """
+    data = request.get_json(silent=True) or {}
+    seq = data.get('seq')
+    chunk = data.get('data')
+    if not isinstance(seq, int) or seq < 1 or not isinstance(chunk, str):
+        return jsonify({
+            'status': 'error',
+            'error': {'code': 'INVALID_REQUEST', 'message': 'seq (>= 1) and data are required'}
+        }), 400
+
+    cmd = CommandModel.get_by_id(command_id)
+    if not cmd:
+        return jsonify({
+            'status': 'error',
+            'error': {'code': 'COMMAND_NOT_FOUND', 'message': f'Command not found: {command_id}'}
+        }), 404
+
+    outcome = CommandOutputModel.append(
+        command_id, seq, chunk, current_app.config.get('COMMAND_OUTPUT_MAX_BYTES', 256 * 1024)
+    )
+    return jsonify({'status': 'success', 'data': outcome}), 200
+
+
+@client_bp.route('/commands/results', methods=['POST'])
+def submit_command_results():
+    """명령 실행 결과 일괄 제출 (한 트랜잭션, 항목별 상태 반환)
+
+    요청: {"results": [{"command_id": 1, "status": "success", "output": "..."}, ...]}
+    장애 후 스풀 재전송이나 짧은 시간에 끝난 명령 여러 개를 한 번에 보고할 때 사용.
+    없는 명령은 not_found로 표시하고 나머지는 그대로 반영한다.
+    """
+    data = request.get_json(silent=True) or {}
+    results = data.get('results')
+    if not isinstance(results, list) or not results:
+        return jsonify({
+            'status': 'error',
+            'error': {'code': 'INVALID_REQUEST', 'message': 'results must be a non-empty list'}
+        }), 400
+
+    max_items = current_app.config.get('RESULT_BATCH_MAX', 200)
+    if len(results) > max_items:
+        return jsonify({
+            'status': 'error',
+            'error': {'code': 'BATCH_TOO_LARGE',
+                      'message': f'Too many results: {len(results)} > {max_items}'}
+        }), 413
 
     try:
-        version_info = db.execute('''
-            SELECT version, download_url, changelog, released_at 
-            FROM client_versions 
-            ORDER BY released_at DESC 
-            LIMIT 1
-        ''').fetchone()
-
-        if version_info:
-            return jsonify({
-                'status': 'success',
-                'version': version_info['version'],
-                'download_url': version_info['download_url'],
-                'changelog': version_info['changelog'],
-                'released_at': version_info['released_at']
-            })
-        else:
-            return jsonify({
-                'status': 'success',
-                'version': '1.0.0',
-                'download_url': None,
-                'changelog': 'Initial version',
-                'released_at': None
-            })
-    except Exception:
+        outcomes = CommandModel.submit_results(results)
+    except Exception as e:
+        logger.error(f"[명령결과] 일괄 제출 예외: {len(results)}건, {e}", exc_info=True)
         return jsonify({
-            'status': 'success',
-            'version': '1.0.0',
-            'download_url': None,
-            'changelog': 'Initial version',
-            'released_at': None
-        })
+            'status': 'error',
+            'error': {'code': 'INTERNAL_ERROR', 'message': str(e)}
+        }), 500
+
+    recorded = sum(1 for outcome in outcomes if outcome['status'] == 'recorded')
+    logger.info(f"[명령결과] 일괄 제출: {recorded}/{len(outcomes)}건 반영")
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'total': len(outcomes),
+            'recorded': recorded,
+            'failed': len(outcomes) - recorded,
+            'results': outcomes
+        }
+    }), 200
+
+
+@client_bp.route('/version', methods=['GET'])
+def get_version():
+    """클라이언트 최신 버전 확인
+
+    모든 클라이언트가 시작할 때 호출하므로 프로세스 캐시에서 응답하고 ETag로 304를 돌려준다.
+    서버 미러가 준비되면 sha256/size/mirror_url이 채워진다 (업데이터가 이어받기 + 해시 검증).
+
+    Query Parameters:
+        machine_id, current: 단계적 배포 중이면 클라이언트별로 답함
+            (차례가 아니거나 동시 업데이트 상한이면 현재 버전 + Retry-After)
+    """
+    body, etag, _ = get_latest_version()
+    answer, retry_after = RolloutService.answer(
+        body, request.args.get('machine_id'), request.args.get('current'), current_app.config
+    )
+    response = jsonify(answer)
+    response.set_etag(etag if answer is body else body_etag(answer))
+    response.headers['Cache-Control'] = 'no-cache'
+    if retry_after:
+        response.headers['Retry-After'] = str(retry_after)
+    return response.make_conditional(request)
 
 
 @client_bp.route('/version', methods=['POST'])
@@ -474,6 +605,11 @@ def register_version():
     if not data or 'version' not in data or 'download_url' not in data:
         return jsonify({'status': 'error', 'message': 'version과 download_url이 필요합니다'}), 400
 
+    try:
+        rollout_options = RolloutService.release_options(data, current_app.config)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
     db = get_db()
     try:
         db.execute('''
@@ -485,8 +621,13 @@ def register_version():
             data.get('changelog', '')
         ))
         db.commit()
+        invalidate_version_cache()
+        rollout_id = RolloutService.release(data.get('version'), rollout_options,
+                                            current_app.config)
+        ArtifactService.mirror_release(data.get('download_url'), current_app._get_current_object())
         logger.info(f"클라이언트 버전 등록 (token): {data.get('version')}")
-        return jsonify({'status': 'success', 'message': f"버전 {data.get('version')} 등록 완료"}), 200
+        return jsonify({'status': 'success', 'message': f"버전 {data.get('version')} 등록 완료",
+                        'rollout_id': rollout_id}), 200
     except Exception as e:
         logger.error(f"버전 등록 실패: {e}", exc_info=True)
         return jsonify({'status': 'error', 'message': str(e)}), 500
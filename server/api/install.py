@@ -3,10 +3,15 @@ WCMS 설치 API
 
 클라이언트 자동 설치를 위한 스크립트 제공
 실제 EXE는 GitHub Releases에서 다운로드
+install/download 명령용 아티팩트 캐시 (/install/artifacts) 제공
 """
-from flask import Blueprint, Response, current_app, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
 from urllib.parse import urlparse
 import logging
+import os
+from models import ArtifactModel
+from services import ArtifactService
+from utils import require_admin
 
 logger = logging.getLogger('wcms.install')
 
@@ -668,3 +673,96 @@ def get_version():
     # (중복 코드 방지)
     from flask import redirect, url_for
     return redirect(url_for('client.get_version'))
+
+
+# ==================== 아티팩트 캐시 ====================
+
+@install_bp.route('/artifacts', methods=['GET'])
+def resolve_artifact():
+    """
+    원본 URL의 캐시 상태 조회 (클라이언트가 다운로드 전에 호출)
+
+    Query Parameters:
+        url: 원본 URL (관리자 명령으로 등록된 URL만 조회됨)
+
+    Returns:
+        200: {sha256, size, download_url} - 캐시에서 받으면 됨
+        202: 서버가 아직 받는 중 (Retry-After 후 다시 조회)
+        404: 캐시 없음/실패 - 원본 URL에서 직접 받음
+    """
+    source_url = request.args.get('url')
+    if not source_url:
+        return jsonify({'status': 'error', 'message': 'url is required'}), 400
+    if not current_app.config['ARTIFACT_CACHE_ENABLED']:
+        return jsonify({'status': 'error', 'message': '아티팩트 캐시가 비활성화되어 있습니다'}), 404
+
+    entry = ArtifactModel.get_by_url(source_url)
+    if not entry or entry['status'] == 'error':
+        return jsonify({'status': 'error', 'message': '캐시된 아티팩트가 없습니다'}), 404
+    if entry['status'] != 'ready':
+        response = jsonify({'status': entry['status']})
+        response.headers['Retry-After'] = str(current_app.config['ARTIFACT_RETRY_AFTER'])
+        return response, 202
+    return jsonify({
+        'status': 'ready',
+        'sha256': entry['sha256'],
+        'size': entry['size'],
+        'download_url': f"/install/artifacts/{entry['sha256']}",
+    }), 200
+
+
+@install_bp.route('/artifacts/<sha256>', methods=['GET'])
+def download_artifact(sha256: str):
+    """
+    캐시된 아티팩트 다운로드
+
+    해시가 곧 내용이므로 ETag는 해시(강한 검증자)이고 영구 캐시 가능.
+    Range/If-Range 요청은 206으로 이어받기를 지원한다.
+    """
+    if not current_app.config['ARTIFACT_CACHE_ENABLED']:
+        return jsonify({'status': 'error', 'message': 'Not found'}), 404
+    if not ArtifactService.is_valid_hash(sha256):
+        return jsonify({'status': 'error', 'message': 'Not found'}), 404
+    path = ArtifactService.path_for(current_app.config['ARTIFACT_CACHE_DIR'], sha256)
+    if not os.path.isfile(path) or not ArtifactModel.is_referenced(sha256):
+        return jsonify({'status': 'error', 'message': 'Not found'}), 404
+
+    if 'Range' not in request.headers:
+        # 이어받기 요청마다 갱신하면 PC 수 × 조각 수만큼 쓰기가 생기므로 처음 받을 때만
+        ArtifactModel.touch(sha256)
+    response = send_file(
+        path,
+        mimetype='application/octet-stream',
+        conditional=True,
+        etag=sha256,
+        max_age=365 * 24 * 3600,
+    )
+    response.headers['X-Content-SHA256'] = sha256
+    response.cache_control.immutable = True
+    return response
+
+
+@install_bp.route('/artifacts', methods=['POST'])
+@require_admin
+def prefetch_artifact():
+    """
+    원본 URL을 캐시에 등록하고 미리 받기 (관리자 전용)
+
+    Request Body:
+        {"url": "https://..."}
+
+    Returns:
+        캐시 항목 (status: pending|fetching|ready|error)
+    """
+    data = request.get_json(silent=True) or {}
+    source_url = data.get('url')
+    if not source_url:
+        return jsonify({'status': 'error', 'message': 'url is required'}), 400
+    if not current_app.config['ARTIFACT_CACHE_ENABLED']:
+        return jsonify({'status': 'error', 'message': '아티팩트 캐시가 비활성화되어 있습니다'}), 400
+
+    entry = ArtifactService.prefetch(source_url, current_app._get_current_object())
+    if entry is None:
+        return jsonify({'status': 'error', 'message': '허용되지 않는 URL입니다'}), 400
+    status_code = 200 if entry['status'] == 'ready' else 202
+    return jsonify({'status': 'success', 'artifact': entry}), status_code
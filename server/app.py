@@ -15,23 +15,29 @@ import time
 from pathlib import Path
 
 from flask import Flask, render_template, redirect, url_for, session, request
-from flask_cors import CORS
-from flask_session import Session
-from flask_talisman import Talisman
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
-from flask_wtf.csrf import CSRFProtect
-from werkzeug.middleware.proxy_fix import ProxyFix
-import cachelib
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / 'server'))
 
 from config import get_config
-from utils import get_db, close_db, init_db_manager, require_admin
+from utils import (
+    get_db, close_db, init_db_manager, set_statement_hook, require_admin,
+    get_active_room_names, invalidate_room_cache,
+)
+from utils.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, count_statement, init_metrics, render_metrics,
+)
+from utils.session_store import SQLiteSessionCache
+from utils.log_reader import tail_lines
+from utils.version_cache import invalidate_version_cache
+from utils.admission import admission
+from utils.drain import drain, install_drain_handler
+from utils.pc_identity import pc_identity
+from services.rollout_service import invalidate_rollout_cache
 from api import client_bp, admin_bp, install_bp
-from services import PCService
+from models import PCModel, AdminModel, CommandResultModel
+from services import PCService, MaintenanceService, RolloutService, ArtifactService
 
 
 # 로깅 설정
@@ -66,6 +72,139 @@ else:
     logging.getLogger('werkzeug').setLevel(logging.WARNING)
 
 
+def _load_version_info():
+    """VERSION 파일에서 (버전, 릴리스 날짜) 읽기"""
+    try:
+        lines = (PROJECT_ROOT / 'VERSION').read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return '', ''
+    return (lines[0] if lines else '', lines[1] if len(lines) > 1 else '')
+
+
+def _init_limiter(app):
+    """Rate Limiter 생성 (RATELIMIT_ENABLED=False면 flask_limiter를 임포트하지 않고 None)
+
+    기본 한도: LAN 환경에서 여러 PC가 프록시 IP를 공유하므로 넉넉하게 설정
+    """
+    if not app.config['RATELIMIT_ENABLED']:
+        return None
+    from flask_limiter import Limiter
+    from flask_limiter.util import get_remote_address
+    storage_uri = app.config['RATELIMIT_STORAGE_URI']
+    if storage_uri.startswith('sqlite:'):
+        import utils.limiter_storage  # noqa: F401 - 'sqlite' 저장소 스킴 등록
+    return Limiter(
+        app=app,
+        key_func=get_remote_address,
+        default_limits=["2000 per day", "500 per hour"],
+        storage_uri=storage_uri
+    )
+
+
+def _init_talisman(app, config_name):
+    """보안 헤더 설정 (Flask-Talisman, 프로덕션/개발 환경만)"""
+    if config_name == 'production':
+        # 프로덕션: 보안 헤더 전체 적용
+        # HTTPS 강제는 SSL 인증서 설정 시에만 활성화 (리다이렉트 루프 방지)
+        ssl_configured = bool(os.getenv('WCMS_SSL_CERT') and os.getenv('WCMS_SSL_KEY'))
+        csp = {
+            'default-src': "'self'",
+            'script-src': ["'self'", "'unsafe-inline'", "cdn.jsdelivr.net"],
+            'style-src': ["'self'", "'unsafe-inline'", "cdn.jsdelivr.net", "cdnjs.cloudflare.com"],
+            'img-src': ["'self'", "data:"],
+            'font-src': ["'self'", "cdnjs.cloudflare.com"],
+        }
+        options = dict(force_https=ssl_configured,
+                       strict_transport_security=ssl_configured,
+                       session_cookie_secure=ssl_configured,
+                       content_security_policy=csp)
+    elif config_name == 'development':
+        # 개발 환경: HTTPS 강제 없이 보안 헤더만 적용
+        options = dict(force_https=False,
+                       strict_transport_security=False,
+                       content_security_policy=False)
+    else:
+        return
+    from flask_talisman import Talisman
+    Talisman(app, **options)
+
+
+def _init_database(app):
+    """DB 연결 관리자 초기화 (메트릭 활성 시 연결마다 SQL 문 수 집계 콜백 설치)"""
+    config = app.config
+    set_statement_hook(count_statement if config['METRICS_ENABLED'] else None)
+    init_db_manager(
+        config['DB_PATH'],
+        config['DB_TIMEOUT'],
+        config['DB_BUSY_TIMEOUT'],
+        pool_size=config['DB_POOL_SIZE'],
+        statement_cache_size=config['DB_STATEMENT_CACHE_SIZE'],
+        read_pool_size=config['DB_READ_POOL_SIZE'],
+        use_writer=config['DB_WRITE_QUEUE'],
+        write_batch_size=config['DB_WRITE_BATCH_SIZE'],
+        slow_query_ms=config['DB_SLOW_QUERY_MS'] if config['DB_QUERY_STATS'] else None
+    )
+
+
+def _init_process_state(app):
+    """프로세스 단위 상태 설정 (입장 제어, drain) + 이전 앱 인스턴스(다른 DB)의 캐시 제거"""
+    config = app.config
+    CommandResultModel.max_bytes = config['COMMAND_RESULT_MAX_BYTES']
+    admission.configure(config['ADMISSION_MAX_CONCURRENT'])
+    drain.configure(config['DRAIN_RECONNECT_MIN_MS'], config['DRAIN_RECONNECT_MAX_MS'])
+    drain.reset()
+    pc_identity.clear()
+    invalidate_version_cache()
+    invalidate_rollout_cache()
+
+
+def _start_background_jobs(app):
+    """백그라운드 작업 시작 (오프라인 체크, DB 유지보수, 배포 컨트롤러, drain 핸들러, 릴리스 미러)"""
+    config = app.config
+    PCService.start_background_checker(app, config['BACKGROUND_CHECK_INTERVAL'])
+    MaintenanceService.start_background_maintenance(app, config['MAINTENANCE_INTERVAL'])
+    RolloutService.start_background_controller(app, config['ROLLOUT_CHECK_INTERVAL'])
+    install_drain_handler(app)
+    ArtifactService.mirror_latest_release(app)
+
+
+def _exempt_polling_views(app, limiter):
+    """Rate Limit 면제 (Blueprint 등록 후 호출)"""
+    # - admin_bp: 세션 인증으로 보호되므로 IP 기반 제한 불필요
+    limiter.exempt(admin_bp)
+
+    # client_bp: 폴링 엔드포인트만 개별 면제 (2초 주기 = 시간당 1,800회)
+    polling_views = [
+        'client.heartbeat',
+        'client.poll_commands',
+        'client.shutdown_signal',
+        'client.report_offline',
+        'client.submit_command_result',
+        'client.submit_command_results',
+        'client.append_command_output',
+        'client.get_version',
+        'install.resolve_artifact',
+        'install.download_artifact',
+    ]
+    for view_name in polling_views:
+        if view_name in app.view_functions:
+            limiter.exempt(app.view_functions[view_name])
+
+
+def _register_metrics_endpoint(app, limiter):
+    """Prometheus 수집 엔드포인트 (/metrics)"""
+    @app.route('/metrics')
+    def metrics():
+        """요청/플릿 메트릭 (텍스트 노출 형식, WCMS_METRICS_TOKEN 설정 시 Bearer 토큰 필요)"""
+        token = app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return 'unauthorized\n', 401, {'Content-Type': METRICS_CONTENT_TYPE}
+        return render_metrics(), 200, {'Content-Type': METRICS_CONTENT_TYPE}
+
+    if limiter is not None:
+        limiter.exempt(metrics)
+
+
 def create_app(config_name='development'):
     """Flask 애플리케이션 팩토리"""
     app = Flask(__name__, template_folder='../server/templates')
@@ -74,19 +213,31 @@ def create_app(config_name='development'):
     config = get_config(config_name)
     app.config.from_object(config)
 
+    # 요청 메트릭 (다른 확장의 before_request보다 먼저 등록해야 전체 처리 시간이 잡힘)
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+
+    # 확장 모듈은 앱을 만들 때만 임포트 (app 모듈 임포트 비용 절감)
+    from flask_cors import CORS
+    from flask_session import Session
+    from flask_wtf.csrf import CSRFProtect
+
     # CORS 활성화 (Z-02: 환경변수로 허용 오리진 제한)
     allowed_origins = [o.strip() for o in os.getenv('WCMS_ALLOWED_ORIGINS', '*').split(',')]
     CORS(app, resources={r"/api/*": {"origins": allowed_origins}})
 
-    # 세션 설정 (flask_session DeprecationWarning 해결)
-    # FileSystemSessionInterface 대신 cachelib 직접 사용
-    session_dir = os.path.join(app.root_path, 'flask_session')
-    if not os.path.exists(session_dir):
-        os.makedirs(session_dir)
+    # 세션 설정 (flask_session cachelib 백엔드 + SQLite 저장소)
+    # FileSystemCache는 요청마다 파일 I/O + 500개 초과 시 디렉터리 스캔 → 인덱스 조회로 대체
+    session_db_path = app.config['SESSION_DB_PATH']
+    if session_db_path != ':memory:':
+        os.makedirs(os.path.dirname(session_db_path), exist_ok=True)
 
     app.config['SESSION_TYPE'] = 'cachelib'
     app.config['SESSION_SERIALIZATION_FORMAT'] = 'json'
-    app.config['SESSION_CACHELIB'] = cachelib.FileSystemCache(threshold=500, cache_dir=session_dir)
+    app.config['SESSION_CACHELIB'] = SQLiteSessionCache(
+        session_db_path,
+        default_timeout=app.config['PERMANENT_SESSION_LIFETIME']
+    )
 
     Session(app)
 
@@ -94,44 +245,24 @@ def create_app(config_name='development'):
     csrf = CSRFProtect(app)
 
     # 보안 헤더 설정 (Flask-Talisman) - 개발 환경에서는 선택적 활성화
-    if config_name == 'production':
-        # 프로덕션: 보안 헤더 전체 적용
-        # HTTPS 강제는 SSL 인증서 설정 시에만 활성화 (리다이렉트 루프 방지)
-        ssl_configured = bool(os.getenv('WCMS_SSL_CERT') and os.getenv('WCMS_SSL_KEY'))
-        csp = {
-            'default-src': "'self'",
-            'script-src': ["'self'", "'unsafe-inline'", "cdn.jsdelivr.net"],
-            'style-src': ["'self'", "'unsafe-inline'", "cdn.jsdelivr.net", "cdnjs.cloudflare.com"],
-            'img-src': ["'self'", "data:"],
-            'font-src': ["'self'", "cdnjs.cloudflare.com"],
-        }
-        Talisman(app,
-                 force_https=ssl_configured,
-                 strict_transport_security=ssl_configured,
-                 session_cookie_secure=ssl_configured,
-                 content_security_policy=csp)
-    elif config_name == 'development':
-        # 개발 환경: HTTPS 강제 없이 보안 헤더만 적용
-        Talisman(app,
-                 force_https=False,
-                 strict_transport_security=False,
-                 content_security_policy=False)
+    _init_talisman(app, config_name)
 
     # Rate Limiting 설정
-    # 기본 한도: LAN 환경에서 여러 PC가 프록시 IP를 공유하므로 넉넉하게 설정
-    limiter = Limiter(
-        app=app,
-        key_func=get_remote_address,
-        default_limits=["2000 per day", "500 per hour"],
-        storage_uri="memory://"
-    )
+    limiter = _init_limiter(app)
+
+    def rate_limit(limit_value):
+        """limiter.limit 데코레이터 (Rate Limit 비활성 시 그대로 반환)"""
+        if limiter is None:
+            return lambda view: view
+        return limiter.limit(limit_value)
 
     # 파일 로깅 설정 (테스트 환경 제외)
     if config_name != 'test':
         _setup_file_logging(config.LOG_FILE)
 
     # DB 초기화/정리
-    init_db_manager(app.config['DB_PATH'], app.config['DB_TIMEOUT'])
+    _init_database(app)
+    _init_process_state(app)
 
     with app.app_context():
         app.teardown_appcontext(close_db)
@@ -142,7 +273,7 @@ def create_app(config_name='development'):
         if not app.config['TESTING']:
             is_reloader_child = os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
             if config_name == 'production' or is_reloader_child:
-                PCService.start_background_checker(app, app.config['BACKGROUND_CHECK_INTERVAL'])
+                _start_background_jobs(app)
 
     # Blueprint 등록
     app.register_blueprint(client_bp)
@@ -150,21 +281,8 @@ def create_app(config_name='development'):
     app.register_blueprint(install_bp)
 
     # Rate Limit 면제 설정
-    # - admin_bp: 세션 인증으로 보호되므로 IP 기반 제한 불필요
-    limiter.exempt(admin_bp)
-
-    # client_bp: 폴링 엔드포인트만 개별 면제 (2초 주기 = 시간당 1,800회)
-    _polling_views = [
-        'client.heartbeat',
-        'client.poll_commands',
-        'client.shutdown_signal',
-        'client.report_offline',
-        'client.submit_command_result',
-        'client.get_version',
-    ]
-    for view_name in _polling_views:
-        if view_name in app.view_functions:
-            limiter.exempt(app.view_functions[view_name])
+    if limiter is not None:
+        _exempt_polling_views(app, limiter)
 
     # API Blueprint는 CSRF 제외 (Z-03: 토큰/세션 인증으로 대체)
     # - client_bp: 클라이언트 토큰 인증
@@ -197,7 +315,6 @@ def create_app(config_name='development'):
                 pass
             # 실습실이 아예 없으면 그냥 진행
 
-        from models import PCModel
         if room_name:
             pcs = PCModel.get_all_by_room(room_name)
         else:
@@ -218,14 +335,13 @@ def create_app(config_name='development'):
 
     @app.route('/login', methods=['GET', 'POST'])
     @csrf.exempt  # 프록시 환경에서 세션 기반 CSRF 미작동, rate limit(5/min)으로 보호
-    @limiter.limit("5 per minute")  # Brute-force 방어
+    @rate_limit("5 per minute")  # Brute-force 방어
     def login():
         """관리자 로그인"""
         if request.method == 'POST':
             username = request.form.get('username')
             password = request.form.get('password')
 
-            from models import AdminModel
             admin = AdminModel.authenticate(username, password)
 
             if admin:
@@ -273,7 +389,6 @@ def create_app(config_name='development'):
     @require_admin
     def manage_rooms():
         """실습실 관리 페이지"""
-        from models import PCModel
         db = get_db()
         try:
             rooms = db.execute('SELECT room_name FROM seat_layout WHERE is_active=1 ORDER BY room_name').fetchall()
@@ -288,7 +403,6 @@ def create_app(config_name='development'):
     @require_admin
     def system_status():
         """시스템 상태 페이지"""
-        from models import PCModel
         pcs = PCModel.get_all()
         stats = {
             'total': len(pcs),
@@ -303,7 +417,6 @@ def create_app(config_name='development'):
     @require_admin
     def pc_history_page(pc_id):
         """PC 프로세스 기록 페이지"""
-        from models import PCModel
         pc = PCModel.get_by_id(pc_id)
         if not pc:
             return "PC not found", 404
@@ -331,23 +444,16 @@ def create_app(config_name='development'):
         return render_template('registration_tokens.html', username=session.get('username'))
 
     # 컨텍스트 프로세서 (모든 템플릿에 실습실 목록 및 서버 버전 주입)
+    # 실습실 목록은 room_cache, 버전 정보는 앱 생성 시 1회만 읽음
+    invalidate_room_cache()
+    server_version, server_version_date = _load_version_info()
+
     @app.context_processor
     def inject_rooms():
         try:
-            db = get_db()
-            rooms = db.execute('SELECT room_name FROM seat_layout WHERE is_active=1 ORDER BY room_name').fetchall()
-            room_list = [r['room_name'] for r in rooms]
+            room_list = get_active_room_names()
         except Exception:
             room_list = []
-        server_version = ''
-        server_version_date = ''
-        try:
-            version_path = os.path.join(os.path.dirname(__file__), '..', 'VERSION')
-            lines = open(version_path, encoding='utf-8').read().splitlines()
-            server_version = lines[0] if lines else ''
-            server_version_date = lines[1] if len(lines) > 1 else ''
-        except Exception:
-            pass
         return {'all_rooms': room_list, 'server_version': server_version, 'server_version_date': server_version_date}
 
     # 404 중복 로그 억제 (같은 경로는 1분에 1번만 기록)
@@ -378,6 +484,10 @@ def create_app(config_name='development'):
 Disallow: /
 """, 200, {'Content-Type': 'text/plain'}
 
+    # Prometheus 수집 엔드포인트
+    if app.config['METRICS_ENABLED']:
+        _register_metrics_endpoint(app, limiter)
+
     # 서버 로그 페이지
     @app.route('/admin/server-log')
     @require_admin
@@ -387,9 +497,7 @@ Disallow: /
         log_lines = []
         if os.path.exists(log_file):
             try:
-                with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()
-                    log_lines = lines[-200:]
+                log_lines = tail_lines(log_file, 200)
             except Exception as e:
                 log_lines = [f"로그 파일 읽기 실패: {e}\n"]
 
@@ -417,17 +525,38 @@ Disallow: /
     # 리버스 프록시(nginx 등) 뒤에서 실행 시 실제 클라이언트 IP 복원
     # 없으면 모든 요청이 127.0.0.1로 보여 Rate Limit, 로깅 무력화
     if config_name == 'production':
+        from werkzeug.middleware.proxy_fix import ProxyFix
         app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
 
     logger.info(f"앱 생성: {config_name} 모드")
     return app
 
-# Gunicorn 진입점 (전역 app 객체 생성)
-import os
-mode = os.getenv('WCMS_ENV', 'development')
-app = create_app(mode)
+
+_app = None
+
+
+def get_app():
+    """WCMS_ENV 모드의 전역 앱 (처음 호출할 때 1회 생성)"""
+    global _app
+    if _app is None:
+        _app = create_app(os.getenv('WCMS_ENV', 'development'))
+    return _app
+
+
+def __getattr__(name):
+    """Gunicorn 진입점 (app:app)
+
+    모듈 임포트 시점에 앱을 만들지 않고 app 속성에 처음 접근할 때 생성한다.
+    create_app()만 쓰는 테스트/CLI는 개발 모드 앱 생성(DB 연결, 로그 파일 등) 비용을 내지 않는다.
+    """
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
+    mode = os.getenv('WCMS_ENV', 'development')
+    app = get_app()
     debug = mode == 'development'
 
     logger.info(f"WCMS 서버 시작 (모드: {mode})")
@@ -3,9 +3,27 @@ WCMS 서버 설정 관리
 환경변수 및 설정 값 중앙화
 """
 import os
+import shlex
+import sys
 from pathlib import Path
 
 
+def _gunicorn_workers():
+    """gunicorn 명령줄(-w/--workers, GUNICORN_CMD_ARGS) 또는 WEB_CONCURRENCY의 워커 수 (없으면 None)"""
+    args = shlex.split(os.getenv('GUNICORN_CMD_ARGS', ''))
+    if os.path.basename(sys.argv[0]) == 'gunicorn':
+        args += sys.argv[1:]
+    workers = os.getenv('WEB_CONCURRENCY')
+    for i, arg in enumerate(args):
+        if arg in ('-w', '--workers') and i + 1 < len(args):
+            workers = args[i + 1]
+        elif arg.startswith('--workers='):
+            workers = arg.split('=', 1)[1]
+        elif arg.startswith('-w') and arg[2:].isdigit():
+            workers = arg[2:]
+    return int(workers) if workers and workers.isdigit() else None
+
+
 class Config:
     """기본 설정"""
 
@@ -22,15 +40,44 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True  # JavaScript 접근 차단
     SESSION_COOKIE_SAMESITE = 'Lax'  # CSRF 보호
     PERMANENT_SESSION_LIFETIME = 3600  # 세션 만료 시간 (1시간)
+    ADMIN_CACHE_TTL = int(os.getenv('WCMS_ADMIN_CACHE_TTL', '30'))  # 관리자 활성 확인 캐시 (초)
+    ROOM_CACHE_TTL = int(os.getenv('WCMS_ROOM_CACHE_TTL', '5'))  # 실습실 목록 캐시 (다른 워커의 변경 반영 주기, 초)
+    # /api/client/version 응답 캐시 (초)
+    VERSION_CACHE_TTL = int(os.getenv('WCMS_VERSION_CACHE_TTL', '30'))
+    SESSION_DB_PATH = os.getenv('WCMS_SESSION_DB',
+                                str(BASE_DIR / 'flask_session' / 'sessions.sqlite3'))
 
     # CSRF 설정 — 모든 라우트는 csrf.exempt 처리됨.
     # 프록시 환경(nginx→Apache2→Flask)에서 Referer 불일치 오류 방지
     WTF_CSRF_SSL_STRICT = False
 
+    # Gunicorn 워커 수 (manage.py run --prod에서 사용)
+    # 지정하지 않으면 gunicorn -w N으로 직접 띄운 경우도 워커 수를 읽어 공유 저장소를 선택
+    WORKERS = int(os.getenv('WCMS_WORKERS') or _gunicorn_workers() or 1)
+
+    # Rate Limit (flask_limiter 설정 키, False면 Limiter를 생성하지 않음)
+    RATELIMIT_ENABLED = os.getenv('WCMS_RATELIMIT_ENABLED', '1') == '1'
+    # 워커가 여러 개면 카운터를 SQLite 파일로 공유 (memory://는 워커마다 따로 셈)
+    RATELIMIT_STORAGE_URI = os.getenv(
+        'WCMS_RATELIMIT_STORAGE',
+        'memory://' if WORKERS <= 1
+        else f"sqlite:///{BASE_DIR / 'flask_session' / 'ratelimit.sqlite3'}"
+    )
+
     # 데이터베이스 설정
     DB_PATH = os.getenv('WCMS_DB_PATH', str(BASE_DIR / 'db.sqlite3'))
     DB_TIMEOUT = int(os.getenv('WCMS_DB_TIMEOUT', '10'))
     DB_BUSY_TIMEOUT = int(os.getenv('WCMS_DB_BUSY_TIMEOUT', '5000'))
+    DB_POOL_SIZE = int(os.getenv('WCMS_DB_POOL_SIZE', '8'))  # 동시에 대여 가능한 최대 연결 수
+    # 연결당 prepared statement 캐시
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('WCMS_DB_STATEMENT_CACHE', '256'))
+    DB_READ_POOL_SIZE = int(os.getenv('WCMS_DB_READ_POOL_SIZE', '8'))  # query_only 조회용 연결 수
+    DB_WRITE_QUEUE = os.getenv('WCMS_DB_WRITE_QUEUE', 'true').lower() == 'true'  # 단일 writer 큐 사용
+    DB_WRITE_BATCH_SIZE = int(os.getenv('WCMS_DB_WRITE_BATCH', '64'))  # writer 트랜잭션당 최대 작업 수
+    # SQL 문장별 시간/실행 계획 집계
+    DB_QUERY_STATS = os.getenv('WCMS_DB_QUERY_STATS', 'false').lower() == 'true'
+    # 느린 쿼리 로그 임계값 (DB_QUERY_STATS 활성 시)
+    DB_SLOW_QUERY_MS = float(os.getenv('WCMS_DB_SLOW_QUERY_MS', '100'))
 
     # 서버 설정
     HOST = os.getenv('WCMS_HOST', '0.0.0.0')
@@ -40,13 +87,73 @@ class Config:
     OFFLINE_THRESHOLD_SECONDS = int(os.getenv('WCMS_OFFLINE_THRESHOLD', '40'))  # PC 오프라인 판단 기준 (long-poll 30s + 여유 10s)
     BACKGROUND_CHECK_INTERVAL = int(os.getenv('WCMS_BG_CHECK_INTERVAL', '30'))  # 백그라운드 체크 주기
 
+    # 입장 제어 (등록/전체 하트비트 동시 처리 수, 넘치면 503 + Retry-After)
+    # 워커당 상한 (0이면 제한 없음)
+    ADMISSION_MAX_CONCURRENT = int(os.getenv('WCMS_ADMISSION_MAX_CONCURRENT', '8'))
+    ADMISSION_QUEUE_WAIT = float(os.getenv('WCMS_ADMISSION_QUEUE_WAIT', '0.25'))  # 거절 전 슬롯 대기 (초)
+    # 재시도 힌트 기준 (초, 1~3배 지터)
+    ADMISSION_RETRY_AFTER = float(os.getenv('WCMS_ADMISSION_RETRY_AFTER', '5'))
+
+    # 재시작 drain (SIGTERM 시 long-poll을 재연결 지시로 돌려보내고 오프라인 전환 유예)
+    # 오프라인 전환/신호 무시 구간 (초)
+    DRAIN_GRACE_SECONDS = int(os.getenv('WCMS_DRAIN_GRACE', '120'))
+    DRAIN_RECONNECT_MIN_MS = int(os.getenv('WCMS_DRAIN_RECONNECT_MIN_MS', '2000'))  # 재연결 지시 최소 (ms)
+    # 재연결 지시 최대 (ms, 균등 지터)
+    DRAIN_RECONNECT_MAX_MS = int(os.getenv('WCMS_DRAIN_RECONNECT_MAX_MS', '15000'))
+
     # 명령 설정
     COMMAND_TIMEOUT_SECONDS = int(os.getenv('WCMS_COMMAND_TIMEOUT', '300'))
     MAX_COMMAND_RETRIES = int(os.getenv('WCMS_MAX_RETRIES', '3'))
+    # 결과 일괄 제출 1회 최대 항목 수
+    RESULT_BATCH_MAX = int(os.getenv('WCMS_RESULT_BATCH_MAX', '200'))
+    # 명령별 출력 스트림 보관 상한
+    COMMAND_OUTPUT_MAX_BYTES = int(os.getenv('WCMS_COMMAND_OUTPUT_MAX_BYTES', str(256 * 1024)))
+    # 명령 결과 보관 상한 (압축 전, 넘으면 잘림)
+    COMMAND_RESULT_MAX_BYTES = int(os.getenv('WCMS_COMMAND_RESULT_MAX_BYTES', str(256 * 1024)))
+
+    # 아티팩트 캐시 (install/download 명령 파일을 서버가 한 번만 받아 PC들에 제공)
+    ARTIFACT_CACHE_ENABLED = os.getenv('WCMS_ARTIFACT_CACHE', 'true').lower() == 'true'
+    ARTIFACT_CACHE_DIR = os.getenv('WCMS_ARTIFACT_CACHE_DIR', str(BASE_DIR / 'artifacts'))
+    # 파일 하나 상한
+    ARTIFACT_MAX_BYTES = int(os.getenv('WCMS_ARTIFACT_MAX_BYTES', str(4 * 1024 * 1024 * 1024)))
+    # 원본 URL scheme
+    ARTIFACT_ALLOWED_SCHEMES = tuple(os.getenv('WCMS_ARTIFACT_SCHEMES', 'http,https').split(','))
+    ARTIFACT_FETCH_TIMEOUT = int(os.getenv('WCMS_ARTIFACT_FETCH_TIMEOUT', '60'))  # 원본 소켓 타임아웃 (초)
+    # 받아 둔 항목을 다시 받기까지의 시간 (Chocolatey URL은 항상 최신 버전을 가리킴, 0이면 안 받음)
+    ARTIFACT_MAX_AGE_SECONDS = int(os.getenv('WCMS_ARTIFACT_MAX_AGE', '86400'))
+    # 받던 워커가 멈춘 것으로 보는 시간
+    ARTIFACT_FETCH_STALE_SECONDS = int(os.getenv('WCMS_ARTIFACT_FETCH_STALE', '1800'))
+    # 받는 중일 때 클라이언트 재조회 간격 (초)
+    ARTIFACT_RETRY_AFTER = int(os.getenv('WCMS_ARTIFACT_RETRY_AFTER', '5'))
+    ARTIFACT_RETENTION_DAYS = int(os.getenv('WCMS_ARTIFACT_RETENTION', '30'))  # 마지막 사용 후 보관 기간
+    ARTIFACT_CHOCO_PACKAGE_URL = os.getenv(
+        'WCMS_ARTIFACT_CHOCO_URL', 'https://community.chocolatey.org/api/v2/package/{app_id}'
+    )  # install 명령의 .nupkg 원본
+
+    # 클라이언트 단계적 배포 (새 버전을 웨이브 단위로, 동시 업데이트 수 제한)
+    ROLLOUT_AUTO = os.getenv('WCMS_ROLLOUT_AUTO', 'true').lower() == 'true'  # 버전 등록 시 배포 자동 생성
+    ROLLOUT_DEFAULT_WAVES = os.getenv('WCMS_ROLLOUT_WAVES', '10,50,100')  # 누적 비율 (%)
+    ROLLOUT_MAX_CONCURRENT = int(os.getenv('WCMS_ROLLOUT_MAX_CONCURRENT', '20'))  # 동시에 업데이트하는 PC 수
+    ROLLOUT_MAX_FAILURE_RATIO = float(os.getenv('WCMS_ROLLOUT_MAX_FAILURE', '0.2'))  # 넘으면 배포 중지
+    ROLLOUT_SOAK_SECONDS = int(os.getenv('WCMS_ROLLOUT_SOAK', '600'))  # 다음 웨이브 전 관찰 시간 (초)
+    # 새 버전으로 돌아오지 않으면 실패 (초)
+    ROLLOUT_SLOT_TIMEOUT = int(os.getenv('WCMS_ROLLOUT_SLOT_TIMEOUT', '1800'))
+    ROLLOUT_HEALTH_GRACE = int(os.getenv('WCMS_ROLLOUT_HEALTH_GRACE', '600'))  # 업데이트 후 하트비트 대기 (초)
+    ROLLOUT_RETRY_AFTER = int(os.getenv('WCMS_ROLLOUT_RETRY_AFTER', '1800'))  # 차례가 아닌 PC 재확인 간격 (초)
+    # 동시 상한일 때 재확인 간격 (초)
+    ROLLOUT_SLOT_RETRY_AFTER = int(os.getenv('WCMS_ROLLOUT_SLOT_RETRY_AFTER', '300'))
+    ROLLOUT_CACHE_TTL = int(os.getenv('WCMS_ROLLOUT_CACHE_TTL', '5'))  # 진행 중 배포 캐시 (초)
+    ROLLOUT_CHECK_INTERVAL = int(os.getenv('WCMS_ROLLOUT_CHECK_INTERVAL', '30'))  # 컨트롤러 주기 (초)
 
     # 로깅 설정
     LOG_LEVEL = os.getenv('WCMS_LOG_LEVEL', 'INFO')
     LOG_FILE = os.getenv('WCMS_LOG_FILE', str(BASE_DIR / 'logs' / 'server.log'))
+    # 로그 검색 색인
+    LOG_INDEX_PATH = os.getenv('WCMS_LOG_INDEX', str(BASE_DIR / 'logs' / 'log_index.sqlite3'))
+
+    # 메트릭 (/metrics, Prometheus 텍스트 형식, 워커가 여러 개면 워커별 시계열에 worker 라벨)
+    METRICS_ENABLED = os.getenv('WCMS_METRICS', 'true').lower() == 'true'
+    METRICS_TOKEN = os.getenv('WCMS_METRICS_TOKEN')  # 설정 시 Authorization: Bearer 토큰 필요
 
     # 클라이언트 버전 관리
     UPDATE_TOKEN = os.getenv('UPDATE_TOKEN', 'default-secret-token')
@@ -55,6 +162,15 @@ class Config:
     STATUS_RETENTION_MONTHS = int(os.getenv('WCMS_STATUS_RETENTION', '3'))
     COMMAND_RETENTION_DAYS = int(os.getenv('WCMS_COMMAND_RETENTION', '30'))
 
+    # DB 유지보수 (보관 기간 정리 + WAL 체크포인트 + incremental vacuum)
+    MAINTENANCE_INTERVAL = int(os.getenv('WCMS_MAINTENANCE_INTERVAL', '3600'))  # 실행 주기 (초)
+    MAINTENANCE_BATCH_SIZE = int(os.getenv('WCMS_MAINTENANCE_BATCH', '500'))  # 삭제 배치당 행 수
+    # 테이블당 1회 최대 배치 수
+    MAINTENANCE_MAX_BATCHES = int(os.getenv('WCMS_MAINTENANCE_MAX_BATCHES', '200'))
+    MAINTENANCE_VACUUM_PAGES = int(os.getenv('WCMS_VACUUM_PAGES', '2000'))  # 1회 회수 최대 페이지 수
+    # 이보다 크면 TRUNCATE 체크포인트
+    MAINTENANCE_WAL_TRUNCATE_MB = int(os.getenv('WCMS_WAL_TRUNCATE_MB', '64'))
+
 
 class DevelopmentConfig(Config):
     """개발 환경 설정"""
@@ -74,7 +190,11 @@ class TestConfig(Config):
     """테스트 환경 설정"""
     TESTING = True
     DB_PATH = ':memory:'  # 인메모리 DB 사용
+    SESSION_DB_PATH = ':memory:'
     SECRET_KEY = 'test-secret-key'
+    RATELIMIT_ENABLED = False
+    ARTIFACT_CACHE_ENABLED = False  # 테스트 중 외부로 받지 않음
+    ROLLOUT_AUTO = False  # 버전 등록 테스트는 즉시 배포
 
 
 # 환경에 따른 설정 선택
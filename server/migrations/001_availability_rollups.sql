@@ -0,0 +1,31 @@
+-- 가용성 일별 롤업 (network_events 집계, UTC 일자)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE INDEX IF NOT EXISTS idx_network_events_online ON network_events(online_at);
+
+-- cum_* = (PC, 사유)별 해당 일자까지의 누적합 → 기간 집계는 두 시점의 차
+CREATE TABLE IF NOT EXISTS availability_daily (
+    pc_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    day TEXT NOT NULL,
+    downtime_sec INTEGER NOT NULL DEFAULT 0,
+    outage_count INTEGER NOT NULL DEFAULT 0,
+    recovered_count INTEGER NOT NULL DEFAULT 0,
+    recovery_sec INTEGER NOT NULL DEFAULT 0,
+    cum_downtime_sec INTEGER NOT NULL DEFAULT 0,
+    cum_outage_count INTEGER NOT NULL DEFAULT 0,
+    cum_recovered_count INTEGER NOT NULL DEFAULT 0,
+    cum_recovery_sec INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (pc_id, reason, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS availability_series (
+    pc_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    PRIMARY KEY (pc_id, reason)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS availability_rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    rolled_up_until TEXT NOT NULL
+);
@@ -0,0 +1,11 @@
+-- 실행 중 명령 출력 스트림 (install/uninstall 진행 상황, 명령별 최근 N바이트만 보관)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS command_output (
+    command_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    chunk TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (command_id, seq)
+) WITHOUT ROWID;
@@ -0,0 +1,11 @@
+-- 명령 출력 (zlib 압축, commands 행을 좁게 유지)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+-- commands.result/error_message에 남은 인라인 출력은 유지보수 작업이 배치로 옮김
+
+CREATE TABLE IF NOT EXISTS command_results (
+    command_id INTEGER PRIMARY KEY,
+    result BLOB,
+    error_message BLOB,
+    original_size INTEGER NOT NULL DEFAULT 0,
+    truncated INTEGER NOT NULL DEFAULT 0
+);
@@ -0,0 +1,15 @@
+-- 아티팩트 캐시 (install/download 명령 파일, 파일은 ARTIFACT_CACHE_DIR/<sha256 앞 2자리>/<sha256>)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    source_url TEXT PRIMARY KEY,
+    sha256 TEXT,
+    size INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_artifacts_sha256 ON artifacts(sha256);
@@ -0,0 +1,30 @@
+-- 클라이언트 단계적 배포 (진행 중(active/paused)인 배포는 최대 하나)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS rollouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT NOT NULL,
+    base_version TEXT,
+    strategy TEXT NOT NULL,
+    waves TEXT NOT NULL,
+    current_wave INTEGER NOT NULL DEFAULT 0,
+    max_concurrent INTEGER NOT NULL,
+    max_failure_ratio REAL NOT NULL,
+    soak_seconds INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    status_reason TEXT,
+    wave_started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 업데이트 슬롯을 받은 PC (updating → updated / failed)
+CREATE TABLE IF NOT EXISTS rollout_clients (
+    rollout_id INTEGER NOT NULL,
+    machine_id TEXT NOT NULL,
+    wave INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    PRIMARY KEY (rollout_id, machine_id)
+) WITHOUT ROWID;
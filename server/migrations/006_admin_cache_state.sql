@@ -0,0 +1,23 @@
+-- 관리자 변경 세대 (require_admin 활성 관리자 캐시를 워커 간 무효화)
+-- 다른 워커가 관리자를 비활성화/삭제하거나 비밀번호를 바꾸면 트리거가 세대를 올리고,
+-- 각 워커는 캐시한 세대와 다르면 admins를 다시 조회한다
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS admin_cache_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO admin_cache_state (id, generation) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS bump_admin_generation_update
+AFTER UPDATE OF username, password_hash, is_active ON admins
+BEGIN
+    UPDATE admin_cache_state SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS bump_admin_generation_delete
+AFTER DELETE ON admins
+BEGIN
+    UPDATE admin_cache_state SET generation = generation + 1 WHERE id = 1;
+END;
@@ -0,0 +1,8 @@
+-- 워커 간 리더 임대 (백그라운드 작업은 임대를 가진 워커 하나만 실행)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS worker_leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
@@ -0,0 +1,9 @@
+-- 재시작 유예 구간 (drain 중 기록, 그동안 오프라인 전환/오프라인 신호 무시)
+-- schema.sql 이전 버전으로 만든 DB용: python manage.py migrate
+
+CREATE TABLE IF NOT EXISTS restart_windows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reason TEXT,
+    started_at REAL NOT NULL,
+    grace_until REAL NOT NULL
+);
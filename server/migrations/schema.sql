@@ -2,6 +2,9 @@
 -- 버전: 3.0 (v0.9.2)
 -- 변경: admin_logs 제거, 미사용 뷰 제거, retry 필드 제거, network_events 추가
 
+-- auto_vacuum은 테이블 생성 전에 설정해야 적용됨 (MaintenanceService가 incremental_vacuum 실행)
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- ==================== 관리자 ====================
 CREATE TABLE admins (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -16,6 +19,12 @@ CREATE TABLE admins (
 CREATE INDEX idx_admins_username ON admins(username);
 CREATE INDEX idx_admins_active ON admins(is_active);
 
+-- 관리자 변경 세대 (require_admin 캐시를 워커 간 무효화, admins 트리거가 증가)
+CREATE TABLE admin_cache_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL DEFAULT 0
+);
+
 -- ==================== 등록 토큰 (v0.8.0 PIN 인증) ====================
 CREATE TABLE pc_registration_tokens (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -101,8 +110,8 @@ CREATE TABLE commands (
     command_data TEXT,                 -- JSON 파라미터
     priority INTEGER DEFAULT 5,        -- 1(긴급) ~ 10(낮음)
     status TEXT DEFAULT 'pending',     -- pending, executing, completed, error, timeout
-    result TEXT,
-    error_message TEXT,
+    result TEXT,                       -- 이전 버전 호환 (새 출력은 command_results에 압축 저장)
+    error_message TEXT,                -- 이전 버전 호환
     timeout_seconds INTEGER DEFAULT 300,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     started_at TIMESTAMP,
@@ -116,6 +125,25 @@ CREATE INDEX idx_commands_pending ON commands(pc_id, priority ASC, created_at AS
 CREATE INDEX idx_commands_pc_status ON commands(pc_id, status, created_at DESC);
 CREATE INDEX idx_commands_admin ON commands(admin_username, created_at DESC);
 
+-- 명령 출력 (zlib 압축, commands 행을 좁게 유지)
+CREATE TABLE command_results (
+    command_id INTEGER PRIMARY KEY,    -- commands.id
+    result BLOB,
+    error_message BLOB,
+    original_size INTEGER NOT NULL DEFAULT 0,   -- 압축 전 바이트 수 (result + error_message)
+    truncated INTEGER NOT NULL DEFAULT 0        -- COMMAND_RESULT_MAX_BYTES 초과로 잘림
+);
+
+-- 실행 중 명령 출력 스트림 (install/uninstall 진행 상황, 명령별 최근 N바이트만 보관)
+CREATE TABLE command_output (
+    command_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,              -- 클라이언트가 붙이는 조각 번호 (1부터, 관리자 조회 커서)
+    chunk TEXT NOT NULL,
+    size INTEGER NOT NULL,             -- chunk UTF-8 바이트 수
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (command_id, seq)
+) WITHOUT ROWID;
+
 -- ==================== 좌석 배치 ====================
 CREATE TABLE seat_layout (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -161,6 +189,37 @@ CREATE TABLE network_events (
 CREATE INDEX idx_network_events_pc ON network_events(pc_id, offline_at DESC);
 CREATE INDEX idx_network_events_open ON network_events(pc_id, offline_at DESC)
     WHERE online_at IS NULL;
+CREATE INDEX idx_network_events_online ON network_events(online_at);  -- 가용성 집계 구간 조회
+
+-- 가용성 일별 롤업 (network_events 집계, UTC 일자)
+-- cum_* = (PC, 사유)별 해당 일자까지의 누적합 → 기간 집계는 두 시점의 차
+CREATE TABLE availability_daily (
+    pc_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    day TEXT NOT NULL,                           -- 'YYYY-MM-DD'
+    downtime_sec INTEGER NOT NULL DEFAULT 0,
+    outage_count INTEGER NOT NULL DEFAULT 0,     -- 오프라인 시작일 기준
+    recovered_count INTEGER NOT NULL DEFAULT 0,  -- 온라인 복원일 기준
+    recovery_sec INTEGER NOT NULL DEFAULT 0,
+    cum_downtime_sec INTEGER NOT NULL DEFAULT 0,
+    cum_outage_count INTEGER NOT NULL DEFAULT 0,
+    cum_recovered_count INTEGER NOT NULL DEFAULT 0,
+    cum_recovery_sec INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (pc_id, reason, day)
+) WITHOUT ROWID;
+
+-- 롤업에 등장한 (PC, 사유) 조합
+CREATE TABLE availability_series (
+    pc_id INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    PRIMARY KEY (pc_id, reason)
+) WITHOUT ROWID;
+
+-- 롤업 완료 지점 (rolled_up_until 이전 일자는 집계 완료)
+CREATE TABLE availability_rollup_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    rolled_up_until TEXT NOT NULL
+);
 
 -- ==================== 클라이언트 버전 관리 ====================
 CREATE TABLE client_versions (
@@ -173,6 +232,66 @@ CREATE TABLE client_versions (
 
 CREATE INDEX idx_client_versions_released ON client_versions(released_at DESC);
 
+-- 클라이언트 단계적 배포 (진행 중(active/paused)인 배포는 최대 하나)
+CREATE TABLE rollouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT NOT NULL,             -- 대상 버전
+    base_version TEXT,                 -- 차례가 아닌 PC에 알려주는 이전 버전
+    strategy TEXT NOT NULL,            -- percent, room
+    waves TEXT NOT NULL,               -- JSON: 누적 비율 목록 또는 실습실 목록의 목록
+    current_wave INTEGER NOT NULL DEFAULT 0,
+    max_concurrent INTEGER NOT NULL,   -- 동시에 업데이트하는 PC 수 상한
+    max_failure_ratio REAL NOT NULL,
+    soak_seconds INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',      -- active, paused, completed, cancelled
+    status_reason TEXT,
+    wave_started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 업데이트 슬롯을 받은 PC (updating → updated / failed)
+CREATE TABLE rollout_clients (
+    rollout_id INTEGER NOT NULL,
+    machine_id TEXT NOT NULL,
+    wave INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP,
+    PRIMARY KEY (rollout_id, machine_id)
+) WITHOUT ROWID;
+
+-- ==================== 아티팩트 캐시 ====================
+-- install/download 명령 파일 (파일은 ARTIFACT_CACHE_DIR/<sha256 앞 2자리>/<sha256>)
+CREATE TABLE artifacts (
+    source_url TEXT PRIMARY KEY,       -- 원본 URL (관리자 명령으로 등록)
+    sha256 TEXT,                       -- 받은 뒤 채움
+    size INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',     -- pending, fetching, ready, error
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP  -- ARTIFACT_RETENTION_DAYS 정리 기준
+);
+
+CREATE INDEX idx_artifacts_sha256 ON artifacts(sha256);
+
+-- ==================== 워커 공유 상태 ====================
+-- 워커 간 리더 임대 (백그라운드 작업은 임대를 가진 워커 하나만 실행, 만료 시 다른 워커가 이어받음)
+CREATE TABLE worker_leases (
+    name TEXT PRIMARY KEY,             -- 작업 이름 (offline-checker, db-maintenance, ...)
+    holder TEXT NOT NULL,              -- 호스트:PID:임의값
+    expires_at REAL NOT NULL           -- time.time() 기준
+);
+
+-- 재시작 유예 구간 (drain 중 기록, grace_until까지 오프라인 전환/오프라인 신호 무시)
+CREATE TABLE restart_windows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reason TEXT,                       -- shutdown 등
+    started_at REAL NOT NULL,          -- time.time() 기준
+    grace_until REAL NOT NULL
+);
+
 -- ==================== 트리거 ====================
 
 -- pc_info 업데이트 시 updated_at 갱신
@@ -248,8 +367,23 @@ BEGIN
     UPDATE commands SET completed_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
 
+-- 관리자 활성/비밀번호/이름 변경, 삭제 시 세대 증가 (다른 워커의 활성 관리자 캐시 무효화)
+CREATE TRIGGER bump_admin_generation_update
+AFTER UPDATE OF username, password_hash, is_active ON admins
+BEGIN
+    UPDATE admin_cache_state SET generation = generation + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER bump_admin_generation_delete
+AFTER DELETE ON admins
+BEGIN
+    UPDATE admin_cache_state SET generation = generation + 1 WHERE id = 1;
+END;
+
 -- ==================== 초기 데이터 ====================
 
+INSERT INTO admin_cache_state (id, generation) VALUES (1, 0);
+
 INSERT INTO seat_layout (room_name, rows, cols, description) VALUES
 ('1실습실', 6, 8, '소프트웨어학과 실습실 1'),
 ('2실습실', 6, 8, '소프트웨어학과 실습실 2');
@@ -258,6 +392,5 @@ INSERT INTO seat_layout (room_name, rows, cols, description) VALUES
 
 PRAGMA journal_mode = WAL;
 PRAGMA foreign_keys = ON;
-PRAGMA auto_vacuum = INCREMENTAL;
 PRAGMA cache_size = 2000;
 PRAGMA synchronous = NORMAL;
\ No newline at end of file
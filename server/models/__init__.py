@@ -5,11 +5,21 @@ from .pc import PCModel
 from .command import CommandModel
 from .admin import AdminModel
 from .registration import RegistrationTokenModel
+from .availability import AvailabilityModel
+from .command_output import CommandOutputModel
+from .command_result import CommandResultModel
+from .artifact import ArtifactModel
+from .rollout import RolloutModel
 
 __all__ = [
     'PCModel',
     'CommandModel',
     'AdminModel',
     'RegistrationTokenModel',
+    'AvailabilityModel',
+    'CommandOutputModel',
+    'CommandResultModel',
+    'ArtifactModel',
+    'RolloutModel',
 ]
 
@@ -4,7 +4,7 @@
 """
 from typing import Optional, Dict, Any
 from utils.database import get_db
-from utils.auth import hash_password, check_password
+from utils.auth import hash_password, check_password, invalidate_admin_cache
 
 
 class AdminModel:
@@ -91,6 +91,7 @@ class AdminModel:
                 (password_hash, admin_id)
             )
             db.commit()
+            invalidate_admin_cache()
             return True
         except Exception:
             return False
@@ -119,6 +120,7 @@ class AdminModel:
                 (1 if is_active else 0, admin_id)
             )
             db.commit()
+            invalidate_admin_cache()
             return True
         except Exception:
             return False
@@ -163,6 +165,7 @@ class AdminModel:
                 (admin_id,)
             )
             db.commit()
+            invalidate_admin_cache()
             return True
         except Exception:
             return False
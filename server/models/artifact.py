@@ -0,0 +1,119 @@
+"""
+아티팩트 캐시 모델 (Repository 패턴)
+install/download 명령이 받는 외부 파일(원본 URL)을 서버가 한 번만 받아
+SHA-256 이름으로 보관하고, 실습실 PC들은 서버에서 받아 간다.
+
+- status: pending(받기 대기) → fetching(워커 하나가 받는 중) → ready / error
+- ready 항목도 max_age가 지나면 다시 받음 (Chocolatey 최신 버전 URL처럼 내용이 바뀌는 원본)
+- fetching 선점은 UPDATE rowcount로 판단해 여러 워커 중 하나만 원본을 받음
+- 파일 자체는 ArtifactService가 캐시 디렉토리에 저장 (여기는 메타데이터만)
+- 테이블은 schema.sql (기존 DB는 migrations/004_artifacts.sql)
+"""
+from typing import Any, Dict, List, Optional
+from utils.database import get_read_db, run_write
+
+
+class ArtifactModel:
+    """아티팩트 캐시 메타데이터 관리 모델"""
+
+    @staticmethod
+    def register(source_url: str, max_age: int = 0) -> bool:
+        """원본 URL 등록 (이미 있으면 유지, 실패했던 항목과 max_age초 넘게 지난 ready 항목은 pending으로)
+
+        Args:
+            max_age: ready 항목을 다시 받기까지의 시간 (0이면 다시 받지 않음)
+
+        Returns:
+            새로 받아야 하면 True (pending 상태)
+        """
+        def job(db) -> bool:
+            db.execute('INSERT OR IGNORE INTO artifacts (source_url) VALUES (?)', (source_url,))
+            db.execute('''
+                UPDATE artifacts SET status='pending', error=NULL, updated_at=CURRENT_TIMESTAMP
+                WHERE source_url=? AND (
+                    status='error'
+                    OR (? > 0 AND status='ready'
+                        AND updated_at < datetime('now', '-' || ? || ' seconds'))
+                )
+            ''', (source_url, max_age, max_age))
+            row = db.execute('SELECT status FROM artifacts WHERE source_url=?',
+                             (source_url,)).fetchone()
+            return row['status'] == 'pending'
+
+        return run_write(job)
+
+    @staticmethod
+    def claim(source_url: str, stale_seconds: int) -> bool:
+        """받기 작업 선점 (pending 이거나, 받던 워커가 stale_seconds 넘게 멈춘 항목)"""
+        def job(db) -> int:
+            return db.execute('''
+                UPDATE artifacts SET status='fetching', updated_at=CURRENT_TIMESTAMP
+                WHERE source_url=? AND (
+                    status='pending'
+                    OR (status='fetching' AND updated_at < datetime('now', '-' || ? || ' seconds'))
+                )
+            ''', (source_url, stale_seconds)).rowcount
+
+        return run_write(job) > 0
+
+    @staticmethod
+    def mark_ready(source_url: str, sha256: str, size: int) -> None:
+        run_write(lambda db: db.execute('''
+            UPDATE artifacts SET status='ready', sha256=?, size=?, error=NULL,
+                updated_at=CURRENT_TIMESTAMP, last_used_at=CURRENT_TIMESTAMP
+            WHERE source_url=?
+        ''', (sha256, size, source_url)).rowcount)
+
+    @staticmethod
+    def mark_error(source_url: str, error: str) -> None:
+        run_write(lambda db: db.execute('''
+            UPDATE artifacts SET status='error', error=?, updated_at=CURRENT_TIMESTAMP
+            WHERE source_url=?
+        ''', (error[:500], source_url)).rowcount)
+
+    @staticmethod
+    def touch(sha256: str) -> None:
+        """마지막 사용 시각 갱신 (보관 기간 정리 기준)"""
+        run_write(lambda db: db.execute(
+            'UPDATE artifacts SET last_used_at=CURRENT_TIMESTAMP WHERE sha256=?', (sha256,)
+        ).rowcount)
+
+    @staticmethod
+    def get_by_url(source_url: str) -> Optional[Dict[str, Any]]:
+        db = get_read_db()
+        row = db.execute('SELECT * FROM artifacts WHERE source_url=?', (source_url,)).fetchone()
+        return dict(row) if row else None
+
+    @staticmethod
+    def is_referenced(sha256: str) -> bool:
+        """ready 상태 항목이 참조하는 해시인지 (파일 제공/삭제 판단)"""
+        db = get_read_db()
+        row = db.execute(
+            "SELECT 1 FROM artifacts WHERE sha256=? AND status='ready' LIMIT 1", (sha256,)
+        ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def get_all() -> List[Dict[str, Any]]:
+        db = get_read_db()
+        rows = db.execute('SELECT * FROM artifacts ORDER BY updated_at DESC').fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def purge_unused(days: int, batch_size: Optional[int] = None) -> List[str]:
+        """days일 넘게 쓰이지 않은 항목 삭제
+
+        Returns:
+            삭제된 항목의 sha256 목록 (다른 항목이 여전히 참조하는지는 호출자가 확인)
+        """
+        def job(db) -> List[str]:
+            rows = db.execute('''
+                SELECT source_url, sha256 FROM artifacts
+                WHERE last_used_at < datetime('now', '-' || ? || ' days')
+                LIMIT ?
+            ''', (days, batch_size or -1)).fetchall()
+            db.executemany('DELETE FROM artifacts WHERE source_url=?',
+                           [(row['source_url'],) for row in rows])
+            return [row['sha256'] for row in rows]
+
+        return run_write(job)
@@ -0,0 +1,336 @@
+"""
+가용성 모델 (Repository 패턴)
+network_events(오프라인/온라인 구간)를 일별로 집계한 availability_daily 테이블 관리 및
+PC/실습실별 가용률·장애 횟수·MTTR 리포트
+
+- 일자는 CURRENT_TIMESTAMP와 같은 UTC 기준
+- 어제까지는 롤업 테이블에 저장(완료된 날은 이후 이벤트로 바뀌지 않음), 오늘은 원본에서 즉석 계산
+- 롤업 행은 (PC, 사유)별 누적합(cum_*)을 함께 저장 → 임의 기간 = 종료 누적 - 시작 누적 (인덱스 탐색 2회)
+- 장애 횟수는 오프라인 시작일, 복구(MTTR)는 온라인 복원일에 집계
+- 롤업 테이블은 schema.sql (기존 DB는 migrations/001_availability_rollups.sql)
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+from utils.database import get_read_db, run_write
+
+# [:from_ts, :to_ts) 구간의 ('YYYY-MM-DD[ HH:MM:SS]', UTC) (pc_id, day, reason)별 집계
+# - 같은 PC의 겹치는 이벤트는 앞선 이벤트들의 최대 종료 시점(윈도 함수) 이후만 다운타임으로 계산
+# - 재귀 CTE로 여러 날에 걸친 구간을 자정 단위로 분할
+_DAILY_SQL = '''
+WITH ev AS (
+    SELECT pc_id, reason, online_at,
+           julianday(offline_at) AS s,
+           julianday(COALESCE(online_at, :now)) AS e
+    FROM network_events
+    WHERE offline_at < :to_ts
+      AND (online_at IS NULL OR online_at >= :from_ts)
+),
+clipped AS (
+    SELECT pc_id, reason, e,
+           MAX(s, COALESCE(MAX(e) OVER (
+               PARTITION BY pc_id ORDER BY s, e
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+           ), s)) AS cs
+    FROM ev
+),
+seg(pc_id, reason, seg_start, seg_end) AS (
+    SELECT pc_id, reason, MAX(cs, julianday(:from_ts)), MIN(e, julianday(:to_ts))
+    FROM clipped
+    WHERE MIN(e, julianday(:to_ts)) > MAX(cs, julianday(:from_ts))
+    UNION ALL
+    SELECT pc_id, reason, CAST(seg_start - 0.5 AS INTEGER) + 1.5, seg_end
+    FROM seg
+    WHERE CAST(seg_start - 0.5 AS INTEGER) + 1.5 < seg_end
+),
+parts AS (
+    SELECT pc_id, date(seg_start) AS day, reason,
+           (MIN(seg_end, CAST(seg_start - 0.5 AS INTEGER) + 1.5) - seg_start) * 86400 AS downtime,
+           0 AS outages, 0 AS recovered, 0 AS recovery
+    FROM seg
+    UNION ALL
+    SELECT pc_id, date(s), reason, 0, 1, 0, 0
+    FROM ev WHERE s >= julianday(:from_ts)
+    UNION ALL
+    SELECT pc_id, date(online_at), reason, 0, 0, 1, (julianday(online_at) - s) * 86400
+    FROM ev WHERE online_at IS NOT NULL AND julianday(online_at) < julianday(:to_ts)
+)
+SELECT pc_id, day, reason,
+       CAST(ROUND(SUM(downtime)) AS INTEGER) AS downtime_sec,
+       SUM(outages) AS outage_count,
+       SUM(recovered) AS recovered_count,
+       CAST(ROUND(SUM(recovery)) AS INTEGER) AS recovery_sec
+FROM parts
+GROUP BY pc_id, day, reason
+'''
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+class AvailabilityModel:
+    """PC 가용성 집계 모델"""
+
+    @staticmethod
+    def rolled_up_until() -> Optional[str]:
+        """롤업 완료 지점 ('YYYY-MM-DD', 이 날짜 이전은 집계 완료, 아직 없으면 None)"""
+        row = get_read_db().execute(
+            'SELECT rolled_up_until FROM availability_rollup_state WHERE id=1'
+        ).fetchone()
+        return row['rolled_up_until'] if row else None
+
+    @staticmethod
+    def refresh_rollup(now: Optional[datetime] = None) -> int:
+        """어제까지의 미집계 일자를 availability_daily에 저장
+
+        Args:
+            now: 기준 시각 (UTC, 테스트용)
+
+        Returns:
+            새로 집계한 일수
+        """
+        now = now or _utcnow()
+        today = now.date().isoformat()
+        # 어제까지 집계돼 있으면 writer 트랜잭션 없이 반환 (리포트 GET마다 호출됨)
+        rolled_up_until = AvailabilityModel.rolled_up_until()
+        if rolled_up_until is not None and rolled_up_until >= today:
+            return 0
+
+        def job(db):
+            state = db.execute(
+                'SELECT rolled_up_until FROM availability_rollup_state WHERE id=1'
+            ).fetchone()
+            start = state['rolled_up_until'] if state else db.execute(
+                'SELECT date(MIN(offline_at)) AS day FROM network_events'
+            ).fetchone()['day']
+            if not start or start >= today:
+                if not state:
+                    db.execute(
+                        'INSERT INTO availability_rollup_state (id, rolled_up_until) VALUES (1, ?)',
+                        (today,)
+                    )
+                return 0
+
+            db.execute('DELETE FROM availability_daily WHERE day >= ?', (start,))
+            db.execute('DROP TABLE IF EXISTS temp.availability_new')
+            db.execute(f'CREATE TEMP TABLE availability_new AS {_DAILY_SQL}', {
+                'from_ts': start,
+                'to_ts': today,
+                'now': now.strftime('%Y-%m-%d %H:%M:%S'),
+            })
+            db.execute('''
+                INSERT OR IGNORE INTO availability_series (pc_id, reason)
+                SELECT DISTINCT pc_id, reason FROM temp.availability_new
+            ''')
+            # 누적합 = 시작일 이전 마지막 누적값 + 윈도 누적
+            db.execute('''
+                INSERT INTO availability_daily
+                    (pc_id, reason, day, downtime_sec, outage_count, recovered_count, recovery_sec,
+                     cum_downtime_sec, cum_outage_count, cum_recovered_count, cum_recovery_sec)
+                SELECT n.pc_id, n.reason, n.day,
+                       n.downtime_sec, n.outage_count, n.recovered_count, n.recovery_sec,
+                       COALESCE(p.cum_downtime_sec, 0) + SUM(n.downtime_sec) OVER w,
+                       COALESCE(p.cum_outage_count, 0) + SUM(n.outage_count) OVER w,
+                       COALESCE(p.cum_recovered_count, 0) + SUM(n.recovered_count) OVER w,
+                       COALESCE(p.cum_recovery_sec, 0) + SUM(n.recovery_sec) OVER w
+                FROM temp.availability_new n
+                LEFT JOIN availability_daily p
+                  ON p.pc_id = n.pc_id AND p.reason = n.reason
+                 AND p.day = (SELECT MAX(day) FROM availability_daily
+                              WHERE pc_id = n.pc_id AND reason = n.reason AND day < ?)
+                WINDOW w AS (PARTITION BY n.pc_id, n.reason ORDER BY n.day)
+            ''', (start,))
+            db.execute('DROP TABLE temp.availability_new')
+            db.execute('''
+                INSERT INTO availability_rollup_state (id, rolled_up_until) VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET rolled_up_until=excluded.rolled_up_until
+            ''', (today,))
+            return (date.fromisoformat(today) - date.fromisoformat(start)).days
+
+        return run_write(job)
+
+    @staticmethod
+    def purge_events(months: int, batch_size: Optional[int] = None) -> int:
+        """보관 기간이 지난 종료된 network_events 삭제
+
+        롤업이 끝난 날짜의 이벤트만 지우므로 가용성 리포트는 그대로 유지된다.
+
+        Args:
+            months: 보관 기간 (개월, STATUS_RETENTION_MONTHS)
+            batch_size: 한 번에 삭제할 최대 행 수 (None이면 전부)
+
+        Returns:
+            삭제된 이벤트 수
+        """
+        AvailabilityModel.refresh_rollup()
+        return run_write(lambda db: db.execute('''
+            DELETE FROM network_events WHERE id IN (
+                SELECT id FROM network_events
+                WHERE online_at IS NOT NULL
+                  AND online_at < datetime('now', '-' || ? || ' months')
+                  AND online_at < (SELECT rolled_up_until FROM availability_rollup_state WHERE id=1)
+                LIMIT ?
+            )
+        ''', (months, batch_size or -1)).rowcount)
+
+    @staticmethod
+    def get_report(
+        start: date,
+        end: date,
+        room_name: Optional[str] = None,
+        pc_id: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """PC/실습실별 가용성 리포트
+
+        Args:
+            start: 시작일 (포함, UTC)
+            end: 종료일 (포함, UTC)
+            room_name: 실습실 필터
+            pc_id: PC 필터
+            now: 기준 시각 (UTC, 테스트용)
+
+        Returns:
+            {'start', 'end', 'pcs': [...], 'rooms': [...]}
+            PC 항목: uptime_percent, downtime_sec, outage_count, mttr_sec, by_reason
+        """
+        now = now or _utcnow()
+        AvailabilityModel.refresh_rollup(now)
+        db = get_read_db()
+
+        range_start = start.isoformat()
+        range_end = (end + timedelta(days=1)).isoformat()  # 배타적 경계
+        now_str = now.strftime('%Y-%m-%d %H:%M:%S')
+
+        pcs = _load_pcs(db, range_start, range_end, now_str, room_name, pc_id)
+        if not pcs:
+            return {'start': start.isoformat(), 'end': end.isoformat(), 'pcs': [], 'rooms': []}
+
+        _add_event_rows(pcs, _load_event_rows(db, range_start, range_end, now.date(), now_str))
+        for pc in pcs.values():
+            _finish(pc)
+        rooms = _room_totals(pcs.values())
+        for room in rooms.values():
+            _finish(room)
+
+        return {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'pcs': sorted(pcs.values(),
+                          key=lambda p: (p['uptime_percent'] is None, p['uptime_percent'] or 0)),
+            'rooms': sorted(rooms.values(), key=lambda r: r['room_name'] or ''),
+        }
+
+
+_TOTAL_KEYS = ('downtime_sec', 'outage_count', 'recovered_count', 'recovery_sec')
+
+# 조회 범위의 (PC, 사유)별 집계 = 종료 시점 누적 - 시작 시점 누적
+_ROLLUP_RANGE_SQL = '''
+SELECT s.pc_id, s.reason,
+       COALESCE(e.cum_downtime_sec, 0) - COALESCE(b.cum_downtime_sec, 0) AS downtime_sec,
+       COALESCE(e.cum_outage_count, 0) - COALESCE(b.cum_outage_count, 0) AS outage_count,
+       COALESCE(e.cum_recovered_count, 0)
+           - COALESCE(b.cum_recovered_count, 0) AS recovered_count,
+       COALESCE(e.cum_recovery_sec, 0) - COALESCE(b.cum_recovery_sec, 0) AS recovery_sec
+FROM availability_series s
+LEFT JOIN availability_daily e
+  ON e.pc_id = s.pc_id AND e.reason = s.reason
+ AND e.day = (SELECT MAX(day) FROM availability_daily
+              WHERE pc_id = s.pc_id AND reason = s.reason AND day < :end)
+LEFT JOIN availability_daily b
+  ON b.pc_id = s.pc_id AND b.reason = s.reason
+ AND b.day = (SELECT MAX(day) FROM availability_daily
+              WHERE pc_id = s.pc_id AND reason = s.reason AND day < :start)
+'''
+
+
+def _load_pcs(db, range_start: str, range_end: str, now_str: str,
+              room_name: Optional[str], pc_id: Optional[int]) -> Dict[int, Dict[str, Any]]:
+    """리포트 대상 PC (관측 기간: 조회 범위 ∩ [PC 등록 시각, 현재])"""
+    conditions, params = [], []
+    if room_name:
+        conditions.append('room_name=?')
+        params.append(room_name)
+    if pc_id is not None:
+        conditions.append('id=?')
+        params.append(pc_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    rows = db.execute(f'''
+        SELECT id, hostname, room_name,
+               (MIN(julianday(?), julianday(?))
+                - MAX(julianday(?), julianday(COALESCE(created_at, ?)))) * 86400 AS period_sec
+        FROM pc_info {where}
+    ''', (range_end, now_str, range_start, range_start, *params))
+    return {
+        row['id']: {
+            'pc_id': row['id'],
+            'hostname': row['hostname'],
+            'room_name': row['room_name'],
+            'period_sec': max(0, int(round(row['period_sec'] or 0))),
+            **dict.fromkeys(_TOTAL_KEYS, 0),
+            'by_reason': {},
+        }
+        for row in rows
+    }
+
+
+def _load_event_rows(db, range_start: str, range_end: str, today: date, now_str: str) -> list:
+    """(PC, 사유)별 집계 행: 어제까지는 롤업 누적의 차, 오늘은 network_events에서 즉석 계산"""
+    rows = []
+    rollup_end = min(range_end, today.isoformat())
+    if range_start < rollup_end:
+        rows += db.execute(_ROLLUP_RANGE_SQL, {'start': range_start, 'end': rollup_end}).fetchall()
+    if range_start <= today.isoformat() < range_end:
+        rows += db.execute(_DAILY_SQL, {
+            'from_ts': today.isoformat(),
+            'to_ts': now_str,
+            'now': now_str,
+        }).fetchall()
+    return rows
+
+
+def _add_reason(by_reason: Dict[str, Dict[str, int]], reason: str, stats) -> None:
+    total = by_reason.setdefault(reason, {'outage_count': 0, 'downtime_sec': 0})
+    total['outage_count'] += stats['outage_count']
+    total['downtime_sec'] += stats['downtime_sec']
+
+
+def _add_event_rows(pcs: Dict[int, Dict[str, Any]], rows) -> None:
+    """집계 행을 PC별 합계와 사유별 합계에 더함"""
+    for row in rows:
+        pc = pcs.get(row['pc_id'])
+        if pc is None:
+            continue
+        _add_reason(pc['by_reason'], row['reason'], row)
+        for key in _TOTAL_KEYS:
+            pc[key] += row[key]
+
+
+def _room_totals(pcs: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """실습실별 합계 (관측 기간도 PC 합)"""
+    rooms: Dict[str, Dict[str, Any]] = {}
+    for pc in pcs:
+        room = rooms.setdefault(pc['room_name'] or '', {
+            'room_name': pc['room_name'],
+            'pc_count': 0,
+            'period_sec': 0,
+            **dict.fromkeys(_TOTAL_KEYS, 0),
+            'by_reason': {},
+        })
+        room['pc_count'] += 1
+        for key in ('period_sec', *_TOTAL_KEYS):
+            room[key] += pc[key]
+        for reason, stats in pc['by_reason'].items():
+            _add_reason(room['by_reason'], reason, stats)
+    return rooms
+
+
+def _finish(stats: Dict[str, Any]) -> None:
+    """가용률(%) 및 MTTR(초) 계산"""
+    downtime = min(stats['downtime_sec'], stats['period_sec'])
+    stats['uptime_percent'] = (
+        round(100.0 * (1 - downtime / stats['period_sec']), 3) if stats['period_sec'] else None
+    )
+    recovered = stats['recovered_count']
+    stats['mttr_sec'] = round(stats['recovery_sec'] / recovered) if recovered else None
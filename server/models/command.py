@@ -4,7 +4,9 @@ PC 명령 관련 데이터베이스 작업을 캡슐화
 """
 import json
 from typing import Optional, List, Dict, Any
-from utils.database import get_db
+from utils.database import get_db, get_read_db, run_write
+from utils.command_watcher import command_watcher
+from .command_result import CommandResultModel
 
 
 class CommandModel:
@@ -22,22 +24,29 @@ class CommandModel:
             VALUES (?, ?, ?, ?, ?, 'pending', ?)
         ''', (pc_id, admin_username, command_type, command_data_str, priority, timeout_seconds))
         db.commit()
+        command_watcher.notify(cursor.lastrowid)
         return cursor.lastrowid
 
+    @staticmethod
+    def get_latest_id() -> int:
+        """가장 최근 명령 ID (다른 워커가 만든 명령 감지용, rowid 조회라 O(1))"""
+        db = get_read_db()
+        return db.execute('SELECT COALESCE(MAX(id), 0) FROM commands').fetchone()[0]
+
     @staticmethod
     def get_by_id(command_id: int) -> Optional[Dict[str, Any]]:
         """명령 ID로 조회"""
-        db = get_db()
+        db = get_read_db()
         row = db.execute(
             'SELECT * FROM commands WHERE id=?',
             (command_id,)
         ).fetchone()
-        return dict(row) if row else None
+        return CommandResultModel.attach([dict(row)])[0] if row else None
 
     @staticmethod
     def get_pending_for_pc(pc_id: int) -> List[Dict[str, Any]]:
         """특정 PC의 대기 중인 명령 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('''
             SELECT * FROM commands 
             WHERE pc_id=? AND status='pending' 
@@ -48,7 +57,7 @@ class CommandModel:
     @staticmethod
     def get_all_pending() -> List[Dict[str, Any]]:
         """모든 대기 중인 명령 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('''
             SELECT * FROM commands 
             WHERE status='pending' 
@@ -60,17 +69,26 @@ class CommandModel:
     def start_execution(command_id: int) -> bool:
         """명령 실행 시작"""
         try:
-            db = get_db()
-            db.execute('''
+            run_write(lambda db: db.execute('''
                 UPDATE commands 
                 SET status='executing', started_at=CURRENT_TIMESTAMP 
                 WHERE id=?
-            ''', (command_id,))
-            db.commit()
+            ''', (command_id,)).rowcount)
             return True
         except Exception:
             return False
 
+    @staticmethod
+    def _finish(db, command_id: int, status: str, result: Optional[str] = None,
+                error_message: Optional[str] = None) -> int:
+        """명령 종료 상태 기록 + 출력은 압축 저장소에 (run_write 작업 안에서 호출, 변경 행 수 반환)"""
+        rows_affected = db.execute('''
+            UPDATE commands SET status=?, completed_at=CURRENT_TIMESTAMP WHERE id=?
+        ''', (status, command_id)).rowcount
+        if rows_affected:
+            CommandResultModel.save(db, command_id, result, error_message)
+        return rows_affected
+
     @staticmethod
     def complete(command_id: int, result: str) -> bool:
         """명령 완료"""
@@ -78,15 +96,9 @@ class CommandModel:
             import logging
             logger = logging.getLogger('wcms.command_model')
 
-            db = get_db()
-            cursor = db.execute('''
-                UPDATE commands 
-                SET status='completed', result=?, completed_at=CURRENT_TIMESTAMP 
-                WHERE id=?
-            ''', (result, command_id))
-            db.commit()
-
-            rows_affected = cursor.rowcount
+            rows_affected = run_write(
+                lambda db: CommandModel._finish(db, command_id, 'completed', result=result)
+            )
             logger.info(f"명령 완료 처리: cmd_id={command_id}, rows_affected={rows_affected}")
             return rows_affected > 0
         except Exception as e:
@@ -102,15 +114,10 @@ class CommandModel:
             import logging
             logger = logging.getLogger('wcms.command_model')
 
-            db = get_db()
-            cursor = db.execute('''
-                UPDATE commands 
-                SET status='error', error_message=?, completed_at=CURRENT_TIMESTAMP 
-                WHERE id=?
-            ''', (error_message, command_id))
-            db.commit()
-
-            rows_affected = cursor.rowcount
+            rows_affected = run_write(
+                lambda db: CommandModel._finish(db, command_id, 'error',
+                                                error_message=error_message)
+            )
             logger.info(f"명령 오류 처리: cmd_id={command_id}, rows_affected={rows_affected}")
             return rows_affected > 0
         except Exception as e:
@@ -123,32 +130,74 @@ class CommandModel:
     def set_timeout(command_id: int) -> bool:
         """명령 타임아웃 설정"""
         try:
-            db = get_db()
-            db.execute('''
-                UPDATE commands 
-                SET status='timeout', error_message='Command execution timeout', completed_at=CURRENT_TIMESTAMP 
-                WHERE id=?
-            ''', (command_id,))
-            db.commit()
+            run_write(lambda db: CommandModel._finish(
+                db, command_id, 'timeout', error_message='Command execution timeout'
+            ))
             return True
         except Exception:
             return False
 
+    @staticmethod
+    def submit_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 명령 결과를 한 트랜잭션으로 반영 (클라이언트 일괄 제출용)
+
+        명령마다 SELECT 후 UPDATE/커밋하는 대신 UPDATE의 rowcount로 존재 여부를 판단한다.
+        항목 형식은 단건 결과 API와 같다: {command_id, status, output, error_message}
+
+        Returns:
+            항목별 처리 결과 [{command_id, status: recorded|not_found|invalid, final_status}]
+        """
+        def job(db) -> List[Dict[str, Any]]:
+            outcomes = []
+            for item in results:
+                command_id = item.get('command_id') if isinstance(item, dict) else None
+                if not isinstance(command_id, int) or isinstance(command_id, bool):
+                    outcomes.append({'command_id': command_id, 'status': 'invalid'})
+                    continue
+
+                result_status = item.get('status', 'completed')
+                output = item.get('output', '')
+                if result_status in ('success', 'completed'):
+                    final_status = 'completed'
+                    updated = CommandModel._finish(db, command_id, final_status, result=output)
+                elif result_status == 'timeout':
+                    final_status = 'timeout'
+                    updated = CommandModel._finish(db, command_id, final_status,
+                                                   error_message='Command execution timeout')
+                else:
+                    # error/failed, 알 수 없는 상태는 에러로 처리
+                    if result_status in ('error', 'failed'):
+                        error_message = item.get('error_message') or output or 'Unknown error'
+                    else:
+                        error_message = f'Unknown status: {result_status}'
+                    final_status = 'error'
+                    updated = CommandModel._finish(db, command_id, final_status,
+                                                   error_message=error_message)
+
+                if updated:
+                    outcomes.append({'command_id': command_id, 'status': 'recorded',
+                                     'final_status': final_status})
+                else:
+                    outcomes.append({'command_id': command_id, 'status': 'not_found'})
+            return outcomes
+
+        return run_write(job)
+
     @staticmethod
     def get_by_status(status: str) -> List[Dict[str, Any]]:
         """상태별 명령 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('''
             SELECT * FROM commands 
             WHERE status=? 
             ORDER BY created_at DESC
         ''', (status,)).fetchall()
-        return [dict(row) for row in rows]
+        return CommandResultModel.attach([dict(row) for row in rows])
 
     @staticmethod
     def get_statistics() -> Dict[str, Any]:
         """명령 통계 조회"""
-        db = get_db()
+        db = get_read_db()
 
         total = db.execute('SELECT COUNT(*) as count FROM commands').fetchone()
         pending = db.execute("SELECT COUNT(*) as count FROM commands WHERE status='pending'").fetchone()
@@ -165,26 +214,39 @@ class CommandModel:
     @staticmethod
     def get_recent(limit: int = 100) -> List[Dict[str, Any]]:
         """최근 명령 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('''
             SELECT * FROM commands 
             ORDER BY created_at DESC 
             LIMIT ?
         ''', (limit,)).fetchall()
-        return [dict(row) for row in rows]
+        return CommandResultModel.attach([dict(row) for row in rows])
 
     @staticmethod
-    def cleanup_old(days: int = 30) -> int:
-        """오래된 명령 삭제"""
-        try:
-            db = get_db()
-            cursor = db.execute('''
-                DELETE FROM commands 
+    def cleanup_old(days: int = 30, batch_size: Optional[int] = None) -> int:
+        """오래된 명령 삭제
+
+        Args:
+            days: 보관 기간 (일)
+            batch_size: 한 번에 삭제할 최대 행 수 (None이면 전부, 쓰기 잠금을 짧게 유지할 때 사용)
+
+        Returns:
+            삭제된 명령 수
+        """
+        def job(db) -> int:
+            ids = [row[0] for row in db.execute('''
+                SELECT id FROM commands
                 WHERE created_at < datetime('now', '-' || ? || ' days')
                 AND status IN ('completed', 'error', 'timeout')
-            ''', (days,))
-            db.commit()
-            return cursor.rowcount
+                LIMIT ?
+            ''', (days, batch_size or -1)).fetchall()]
+            # 압축 결과 저장소의 행도 같은 트랜잭션에서 삭제
+            CommandResultModel.delete(db, ids)
+            db.executemany('DELETE FROM commands WHERE id=?', [(command_id,) for command_id in ids])
+            return len(ids)
+
+        try:
+            return run_write(job)
         except Exception:
             return 0
 
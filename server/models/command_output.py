@@ -0,0 +1,90 @@
+"""
+명령 출력 스트림 모델 (Repository 패턴)
+오래 걸리는 명령(install/uninstall)의 출력을 클라이언트가 조각(chunk) 단위로 올리면
+명령별로 최근 max_bytes만 남기고 보관하며, 관리자 화면은 seq 커서로 이어서 읽는다.
+
+- seq: 클라이언트가 명령마다 1부터 붙이는 조각 번호 (재전송된 조각은 무시)
+- 용량 초과 시 오래된 조각부터 삭제 → 커서가 남은 첫 조각보다 앞이면 truncated
+- 테이블은 schema.sql (기존 DB는 migrations/002_command_output.sql)
+"""
+from typing import Any, Dict, Optional
+from utils.database import get_read_db, run_write
+
+
+class CommandOutputModel:
+    """명령 출력 조각 관리 모델"""
+
+    @staticmethod
+    def append(command_id: int, seq: int, chunk: str, max_bytes: int) -> Dict[str, Any]:
+        """출력 조각 추가 후 명령별 보관 용량(max_bytes)을 넘는 오래된 조각 삭제
+
+        Returns:
+            {'stored': 새로 저장했는지(중복 seq면 False), 'dropped': 삭제한 조각 수}
+        """
+        data = chunk.encode('utf-8')
+        if len(data) > max_bytes:
+            # 조각 하나가 상한보다 크면 뒷부분만 보관
+            chunk = data[-max_bytes:].decode('utf-8', errors='ignore')
+            data = chunk.encode('utf-8')
+
+        def job(db) -> Dict[str, Any]:
+            stored = db.execute('''
+                INSERT OR IGNORE INTO command_output (command_id, seq, chunk, size)
+                VALUES (?, ?, ?, ?)
+            ''', (command_id, seq, chunk, len(data))).rowcount
+            # 최신 조각부터 누적 크기를 세어 상한을 넘는 지점 이전을 삭제
+            dropped = db.execute('''
+                DELETE FROM command_output
+                WHERE command_id = :command_id AND seq <= (
+                    SELECT MAX(seq) FROM (
+                        SELECT seq, SUM(size) OVER (ORDER BY seq DESC) AS tail_bytes
+                        FROM command_output WHERE command_id = :command_id
+                    ) WHERE tail_bytes > :max_bytes
+                )
+            ''', {'command_id': command_id, 'max_bytes': max_bytes}).rowcount
+            return {'stored': stored > 0, 'dropped': dropped}
+
+        return run_write(job)
+
+    @staticmethod
+    def read(command_id: int, cursor: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """cursor(마지막으로 읽은 seq) 이후 조각 조회
+
+        Returns:
+            {'chunks': [{seq, data}], 'next_cursor', 'truncated'}
+            truncated: cursor 다음 조각이 용량 초과로 이미 삭제됨 (중간 출력 일부 누락)
+        """
+        db = get_read_db()
+        rows = db.execute('''
+            SELECT seq, chunk FROM command_output
+            WHERE command_id=? AND seq > ?
+            ORDER BY seq LIMIT ?
+        ''', (command_id, cursor, limit)).fetchall()
+
+        chunks = [{'seq': row['seq'], 'data': row['chunk']} for row in rows]
+        return {
+            'chunks': chunks,
+            'next_cursor': chunks[-1]['seq'] if chunks else cursor,
+            'truncated': bool(chunks) and chunks[0]['seq'] > cursor + 1,
+        }
+
+    @staticmethod
+    def purge_orphans(batch_size: Optional[int] = None) -> int:
+        """삭제된 명령의 출력 조각 정리 (외래 키 CASCADE가 꺼져 있으므로 유지보수에서 호출)
+
+        Args:
+            batch_size: 한 번에 정리할 최대 명령 수 (None이면 전부)
+
+        Returns:
+            삭제된 조각 수
+        """
+        def job(db) -> int:
+            return db.execute('''
+                DELETE FROM command_output WHERE command_id IN (
+                    SELECT DISTINCT o.command_id FROM command_output o
+                    WHERE NOT EXISTS (SELECT 1 FROM commands c WHERE c.id = o.command_id)
+                    LIMIT ?
+                )
+            ''', (batch_size or -1,)).rowcount
+
+        return run_write(job)
@@ -0,0 +1,128 @@
+"""
+명령 결과 저장소 (Repository 패턴)
+명령 출력(result/error_message)을 commands 테이블 밖의 command_results 테이블에
+zlib 압축해 보관한다. commands 행이 좁아져 get_recent/get_by_status/get_statistics가
+큰 출력 텍스트를 페이지 캐시로 끌어오지 않는다.
+
+- 압축 전 기준 max_bytes를 넘는 출력은 앞부분만 남기고 잘림 표시를 붙임
+- 이전 버전 DB의 commands.result/error_message(인라인)는 유지보수에서 배치로 옮김
+  (옮기기 전 행은 읽을 때 인라인 값을 그대로 사용)
+- 테이블은 schema.sql (기존 DB는 migrations/003_command_results.sql)
+"""
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from utils.database import get_read_db, run_write
+
+TRUNCATION_MARKER = '\n... [출력이 너무 커서 잘림: 원본 {size}바이트]'
+
+# SQLite 바인딩 변수 상한(구버전 999)보다 작게
+_IN_CHUNK = 500
+
+
+class CommandResultModel:
+    """압축 명령 결과 저장소"""
+
+    # 명령별 출력 상한 (압축 전 UTF-8 바이트, create_app에서 COMMAND_RESULT_MAX_BYTES로 설정)
+    max_bytes = 256 * 1024
+
+    @staticmethod
+    def _pack(text: Optional[str], max_bytes: int) -> Tuple[Optional[bytes], int, bool]:
+        """(압축 데이터, 원본 바이트 수, 잘림 여부)"""
+        if text is None:
+            return None, 0, False
+        if not isinstance(text, str):
+            text = str(text)
+        data = text.encode('utf-8')
+        size = len(data)
+        truncated = size > max_bytes
+        if truncated:
+            data = data[:max_bytes].decode('utf-8', errors='ignore').encode('utf-8')
+            data += TRUNCATION_MARKER.format(size=size).encode('utf-8')
+        return zlib.compress(data, 6), size, truncated
+
+    @staticmethod
+    def _unpack(blob: Optional[bytes]) -> Optional[str]:
+        if blob is None:
+            return None
+        return zlib.decompress(blob).decode('utf-8', errors='replace')
+
+    @staticmethod
+    def save(db, command_id: int, result: Optional[str] = None,
+             error_message: Optional[str] = None) -> None:
+        """결과 저장/교체 (run_write 작업 안에서 명령 상태 UPDATE와 같은 트랜잭션으로 호출)"""
+        max_bytes = CommandResultModel.max_bytes
+        result_blob, result_size, result_cut = CommandResultModel._pack(result, max_bytes)
+        error_blob, error_size, error_cut = CommandResultModel._pack(error_message, max_bytes)
+        db.execute('''
+            INSERT OR REPLACE INTO command_results
+                (command_id, result, error_message, original_size, truncated)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (command_id, result_blob, error_blob, result_size + error_size,
+              int(result_cut or error_cut)))
+
+    @staticmethod
+    def load(command_ids: Iterable[int]) -> Dict[int, Dict[str, Optional[str]]]:
+        """명령 ID별 {result, error_message} (저장된 것만)"""
+        ids = list(command_ids)
+        if not ids:
+            return {}
+        db = get_read_db()
+        loaded = {}
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start:start + _IN_CHUNK]
+            rows = db.execute(f'''
+                SELECT command_id, result, error_message FROM command_results
+                WHERE command_id IN ({','.join('?' * len(chunk))})
+            ''', chunk).fetchall()
+            for row in rows:
+                loaded[row['command_id']] = {
+                    'result': CommandResultModel._unpack(row['result']),
+                    'error_message': CommandResultModel._unpack(row['error_message']),
+                }
+        return loaded
+
+    @staticmethod
+    def attach(commands: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """commands 행 dict에 압축 해제한 result/error_message를 채움 (없으면 인라인 값 유지)"""
+        loaded = CommandResultModel.load(cmd['id'] for cmd in commands)
+        for cmd in commands:
+            stored = loaded.get(cmd['id'])
+            if stored is not None:
+                cmd.update(stored)
+        return commands
+
+    @staticmethod
+    def delete(db, command_ids: List[int]) -> int:
+        """명령 삭제 시 결과도 함께 삭제 (run_write 작업 안에서 호출)"""
+        deleted = 0
+        for start in range(0, len(command_ids), _IN_CHUNK):
+            chunk = command_ids[start:start + _IN_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            deleted += db.execute(
+                f"DELETE FROM command_results WHERE command_id IN ({placeholders})", chunk
+            ).rowcount
+        return deleted
+
+    @staticmethod
+    def migrate_inline(batch_size: Optional[int] = None) -> int:
+        """이전 버전에서 commands에 인라인으로 저장된 출력을 압축 저장소로 옮김
+
+        Args:
+            batch_size: 한 번에 옮길 최대 명령 수 (None이면 전부)
+
+        Returns:
+            옮긴 명령 수
+        """
+        def job(db) -> int:
+            rows = db.execute('''
+                SELECT id, result, error_message FROM commands
+                WHERE result IS NOT NULL OR error_message IS NOT NULL
+                LIMIT ?
+            ''', (batch_size or -1,)).fetchall()
+            for row in rows:
+                CommandResultModel.save(db, row['id'], row['result'], row['error_message'])
+            db.executemany('UPDATE commands SET result=NULL, error_message=NULL WHERE id=?',
+                           [(row['id'],) for row in rows])
+            return len(rows)
+
+        return run_write(job)
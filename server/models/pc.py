@@ -5,7 +5,7 @@ PC 정보 관련 데이터베이스 작업을 캡슐화
 import sqlite3
 import json
 from typing import Optional, List, Dict, Any
-from utils.database import get_db
+from utils.database import get_db, get_read_db, run_write
 from utils.validators import validate_not_null
 
 
@@ -24,7 +24,7 @@ class PCModel:
     @staticmethod
     def get_by_id(pc_id: int) -> Optional[Dict[str, Any]]:
         """PC ID로 PC 정보 조회"""
-        db = get_db()
+        db = get_read_db()
         row = db.execute(
             'SELECT * FROM pc_info WHERE id=?',
             (pc_id,)
@@ -34,7 +34,7 @@ class PCModel:
     @staticmethod
     def get_by_machine_id(machine_id: str) -> Optional[Dict[str, Any]]:
         """Machine ID로 PC 정보 조회"""
-        db = get_db()
+        db = get_read_db()
         row = db.execute(
             'SELECT id, is_online FROM pc_info WHERE machine_id=?',
             (machine_id,)
@@ -44,7 +44,7 @@ class PCModel:
     @staticmethod
     def get_all_by_room(room_name: str) -> List[Dict[str, Any]]:
         """실습실별 모든 PC 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute(
             'SELECT * FROM pc_info WHERE room_name=? ORDER BY seat_number',
             (room_name,)
@@ -54,14 +54,14 @@ class PCModel:
     @staticmethod
     def get_all() -> List[Dict[str, Any]]:
         """모든 PC 조회"""
-        db = get_db()
+        db = get_read_db()
         rows = db.execute('SELECT * FROM pc_info ORDER BY hostname').fetchall()
         return [dict(row) for row in rows]
 
     @staticmethod
     def get_online_count() -> int:
         """온라인 PC 개수 조회"""
-        db = get_db()
+        db = get_read_db()
         result = db.execute(
             'SELECT COUNT(*) as count FROM pc_info WHERE is_online=1'
         ).fetchone()
@@ -186,48 +186,145 @@ class PCModel:
                 disk_info, os_edition, os_version
             )
 
+    @staticmethod
+    def upsert_verified(
+        machine_id: str,
+        hostname: str,
+        mac_address: str,
+        token: str,
+        ip_address: Optional[str] = None,
+        cpu_model: Optional[str] = None,
+        cpu_cores: Optional[int] = None,
+        cpu_threads: Optional[int] = None,
+        ram_total: Optional[float] = None,
+        disk_info: Optional[Dict] = None,
+        os_edition: Optional[str] = None,
+        os_version: Optional[str] = None,
+        dynamic_data: Optional[Dict[str, Any]] = None,
+        db: Optional[sqlite3.Connection] = None
+    ) -> int:
+        """검증된 PC 등록/갱신 (UPSERT, 커밋하지 않음)
+
+        pc_info, pc_specs, pc_dynamic_info를 UPSERT로 기록한다.
+        호출자가 연 트랜잭션(또는 run_write 작업) 안에서 사용한다.
+        """
+        db = db or get_db()
+
+        db.execute('''
+            INSERT INTO pc_info
+                (machine_id, hostname, ip_address, mac_address, is_online, last_seen,
+                 is_verified, registered_with_token, verified_at)
+            VALUES (?, ?, ?, ?, 1, CURRENT_TIMESTAMP, 1, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(machine_id) DO UPDATE SET
+                hostname=excluded.hostname,
+                ip_address=excluded.ip_address,
+                mac_address=excluded.mac_address,
+                is_online=1,
+                last_seen=CURRENT_TIMESTAMP,
+                updated_at=CURRENT_TIMESTAMP,
+                is_verified=1,
+                registered_with_token=excluded.registered_with_token,
+                verified_at=CURRENT_TIMESTAMP
+        ''', (machine_id, hostname, ip_address, mac_address, token))
+
+        pc_id = db.execute(
+            'SELECT id FROM pc_info WHERE machine_id=?',
+            (machine_id,)
+        ).fetchone()['id']
+
+        db.execute('''
+            INSERT INTO pc_specs (pc_id, cpu_model, cpu_cores, cpu_threads, ram_total, disk_info,
+                                  os_edition, os_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(pc_id) DO UPDATE SET
+                cpu_model=excluded.cpu_model,
+                cpu_cores=excluded.cpu_cores,
+                cpu_threads=excluded.cpu_threads,
+                ram_total=excluded.ram_total,
+                disk_info=excluded.disk_info,
+                os_edition=excluded.os_edition,
+                os_version=excluded.os_version,
+                updated_at=CURRENT_TIMESTAMP
+        ''', (
+            pc_id,
+            cpu_model or 'Unknown CPU',
+            validate_not_null(cpu_cores, 0),
+            validate_not_null(cpu_threads, 0),
+            validate_not_null(ram_total, 0),
+            PCModel._to_json(disk_info),
+            os_edition or 'Unknown',
+            os_version or 'Unknown'
+        ))
+
+        if dynamic_data:
+            db.execute('''
+                INSERT INTO pc_dynamic_info
+                (pc_id, cpu_usage, ram_used, ram_usage_percent, disk_usage, current_user, uptime,
+                 processes, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(pc_id) DO UPDATE SET
+                    cpu_usage=excluded.cpu_usage,
+                    ram_used=excluded.ram_used,
+                    ram_usage_percent=excluded.ram_usage_percent,
+                    disk_usage=excluded.disk_usage,
+                    current_user=excluded.current_user,
+                    uptime=excluded.uptime,
+                    processes=excluded.processes,
+                    updated_at=CURRENT_TIMESTAMP
+            ''', (
+                pc_id,
+                validate_not_null(dynamic_data.get('cpu_usage'), 0.0),
+                validate_not_null(dynamic_data.get('ram_used'), 0.0),
+                validate_not_null(dynamic_data.get('ram_usage_percent'), 0.0),
+                PCModel._to_json(dynamic_data.get('disk_usage')),
+                dynamic_data.get('current_user'),
+                validate_not_null(dynamic_data.get('uptime'), 0),
+                PCModel._to_json(dynamic_data.get('processes'), '[]')
+            ))
+
+        return pc_id
+
     @staticmethod
     def update_heartbeat(pc_id: int, cpu_usage: float, ram_used: float, ram_usage_percent: float,
                         disk_usage: Optional[Dict] = None, current_user: Optional[str] = None,
                         uptime: int = 0, processes: Optional[List[str]] = None) -> bool:
-        """하트비트 업데이트 (동적 상태)"""
-        try:
-            db = get_db()
+        """하트비트 업데이트 (동적 상태, PC가 없으면 False)"""
+        # pc_dynamic_info 업데이트 (UNIQUE pc_id 제약으로 최신 상태만 유지)
+        disk_usage_str = PCModel._to_json(disk_usage)
+        processes_str = PCModel._to_json(processes, '[]')
 
+        def job(db: sqlite3.Connection) -> bool:
             # pc_info 업데이트
-            db.execute('''
+            if db.execute('''
                 UPDATE pc_info 
                 SET is_online=1, last_seen=CURRENT_TIMESTAMP
                 WHERE id=?
-            ''', (pc_id,))
-
-            # pc_dynamic_info 업데이트 (UNIQUE pc_id 제약으로 최신 상태만 유지)
-            disk_usage_str = PCModel._to_json(disk_usage)
-            processes_str = PCModel._to_json(processes, '[]')
+            ''', (pc_id,)).rowcount == 0:
+                return False  # 다른 워커에서 삭제된 PC
 
             db.execute('''
                 INSERT OR REPLACE INTO pc_dynamic_info 
                 (pc_id, cpu_usage, ram_used, ram_usage_percent, disk_usage, current_user, uptime, processes, updated_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
             ''', (pc_id, cpu_usage, ram_used, ram_usage_percent, disk_usage_str, current_user, uptime, processes_str))
-
-            db.commit()
             return True
+
+        try:
+            return run_write(job)
         except Exception as e:
             return False
 
     @staticmethod
     def update_light_heartbeat(pc_id: int, cpu_usage: float, ram_usage_percent: float) -> bool:
-        """경량 하트비트 업데이트 (CPU, RAM만 업데이트, 나머지는 유지)"""
-        try:
-            db = get_db()
-
+        """경량 하트비트 업데이트 (CPU, RAM만 업데이트, 나머지는 유지, PC가 없으면 False)"""
+        def job(db: sqlite3.Connection) -> bool:
             # pc_info 업데이트
-            db.execute('''
+            if db.execute('''
                 UPDATE pc_info 
                 SET is_online=1, last_seen=CURRENT_TIMESTAMP
                 WHERE id=?
-            ''', (pc_id,))
+            ''', (pc_id,)).rowcount == 0:
+                return False  # 다른 워커에서 삭제된 PC
 
             # pc_dynamic_info 업데이트 (부분 업데이트)
             # 1. UPDATE 시도
@@ -255,9 +352,10 @@ class PCModel:
                     (pc_id, cpu_usage, ram_used, ram_usage_percent, disk_usage, current_user, uptime, processes, updated_at)
                     VALUES (?, ?, 0, ?, ?, NULL, 0, '[]', CURRENT_TIMESTAMP)
                 ''', (pc_id, cpu_usage, ram_usage_percent, json.dumps(initial_disk_usage)))
-
-            db.commit()
             return True
+
+        try:
+            return run_write(job)
         except Exception as e:
             import logging
             logger = logging.getLogger('wcms.pc_model')
@@ -299,7 +397,7 @@ class PCModel:
         if not pc:
             return None
 
-        db = get_db()
+        db = get_read_db()
 
         # 최신 상태 정보 (UNIQUE pc_id 제약으로 항상 1개만 존재)
         status = db.execute(
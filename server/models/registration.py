@@ -3,9 +3,10 @@
 PC 등록 시 사용하는 PIN 토큰 관리
 """
 import secrets
+import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
-from utils.database import get_db
+from utils.database import get_db, run_write
 
 
 class RegistrationTokenModel:
@@ -107,6 +108,31 @@ class RegistrationTokenModel:
 
         return (True, None)
 
+    @staticmethod
+    def consume(token: str, db: Optional[sqlite3.Connection] = None) -> bool:
+        """토큰 검증 + used_count 증가를 단일 UPDATE로 처리 (커밋하지 않음)
+
+        호출자가 연 트랜잭션 안에서 사용한다. 조건부 UPDATE라서
+        동시에 등록하는 PC들이 1회용 토큰을 중복 사용할 수 없다.
+
+        Args:
+            token: 6자리 PIN
+            db: 사용할 연결 (None이면 현재 컨텍스트 연결)
+
+        Returns:
+            사용 처리 여부 (False면 validate()로 실패 사유 확인)
+        """
+        db = db or get_db()
+        cursor = db.execute('''
+            UPDATE pc_registration_tokens
+            SET used_count = used_count + 1
+            WHERE token = ?
+              AND is_expired = 0
+              AND julianday(expires_at) > julianday(?)
+              AND (usage_type != 'single' OR used_count = 0)
+        ''', (token, datetime.now()))
+        return cursor.rowcount > 0
+
     @staticmethod
     def mark_used(token: str) -> bool:
         """토큰 사용 처리 (used_count 증가)
@@ -215,24 +241,24 @@ class RegistrationTokenModel:
             return False
 
     @staticmethod
-    def cleanup_expired() -> int:
+    def cleanup_expired(batch_size: Optional[int] = None) -> int:
         """만료된 토큰 자동 정리 (24시간 이상 지난 것만)
 
+        Args:
+            batch_size: 한 번에 삭제할 최대 행 수 (None이면 전부)
+
         Returns:
             삭제된 토큰 개수
         """
-        db = get_db()
-
         try:
-            cursor = db.execute('''
-                DELETE FROM pc_registration_tokens
-                WHERE datetime(expires_at) < datetime('now', '-1 day')
-            ''')
-            db.commit()
-
-            return cursor.rowcount
+            return run_write(lambda db: db.execute('''
+                DELETE FROM pc_registration_tokens WHERE id IN (
+                    SELECT id FROM pc_registration_tokens
+                    WHERE datetime(expires_at) < datetime('now', '-1 day')
+                    LIMIT ?
+                )
+            ''', (batch_size or -1,)).rowcount)
         except Exception:
-            db.rollback()
             return 0
 
     @staticmethod
@@ -0,0 +1,180 @@
+"""
+클라이언트 단계적 배포 모델 (Repository 패턴)
+새 클라이언트 버전을 웨이브(실습실 또는 비율) 단위로 나눠 배포한다.
+
+- rollouts: 배포 하나 (대상 버전, 웨이브 정의, 현재 웨이브, 동시 업데이트 상한, 상태)
+- rollout_clients: 업데이트 슬롯을 받은 클라이언트 (updating → updated / failed)
+  슬롯을 받지 않은 클라이언트는 행이 없다 (조회만 하고 쓰기 없음)
+- 테이블은 schema.sql (기존 DB는 migrations/005_rollouts.sql)
+"""
+import json
+from typing import Any, Dict, List, Optional
+from utils.database import get_read_db, run_write
+
+# 진행 중인 배포 (paused도 새 업데이트만 멈춘 진행 중 상태)
+OPEN_STATUSES = ('active', 'paused')
+
+
+def _cancel_open(db, reason: str) -> int:
+    return db.execute(f'''
+        UPDATE rollouts SET status='cancelled', status_reason=?, updated_at=CURRENT_TIMESTAMP
+        WHERE status IN ({','.join('?' * len(OPEN_STATUSES))})
+    ''', (reason, *OPEN_STATUSES)).rowcount
+
+
+def _row_to_rollout(row) -> Dict[str, Any]:
+    rollout = dict(row)
+    rollout['waves'] = json.loads(rollout['waves'])
+    return rollout
+
+
+class RolloutModel:
+    """단계적 배포 관리 모델"""
+
+    @staticmethod
+    def create(version: str, strategy: str, waves: List[Any], max_concurrent: int,
+               max_failure_ratio: float, soak_seconds: int) -> int:
+        """배포 생성 (진행 중인 다른 배포는 취소)
+
+        base_version은 대상 버전 직전에 등록된 버전으로, 아직 차례가 아닌 클라이언트에 알려준다.
+        """
+        def job(db) -> int:
+            _cancel_open(db, '새 배포로 대체')
+            base = db.execute('''
+                SELECT version FROM client_versions WHERE version != ?
+                ORDER BY released_at DESC, id DESC LIMIT 1
+            ''', (version,)).fetchone()
+            return db.execute('''
+                INSERT INTO rollouts (version, base_version, strategy, waves, max_concurrent,
+                                      max_failure_ratio, soak_seconds)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (version, base['version'] if base else None, strategy,
+                  json.dumps(waves, ensure_ascii=False),
+                  max_concurrent, max_failure_ratio, soak_seconds)).lastrowid
+
+        return run_write(job)
+
+    @staticmethod
+    def cancel_open(reason: str) -> int:
+        """진행 중인 배포 취소 (단계적 배포 없이 새 버전을 등록할 때)"""
+        def job(db) -> int:
+            return _cancel_open(db, reason)
+
+        return run_write(job)
+
+    @staticmethod
+    def get_by_id(rollout_id: int) -> Optional[Dict[str, Any]]:
+        db = get_read_db()
+        row = db.execute('SELECT * FROM rollouts WHERE id=?', (rollout_id,)).fetchone()
+        return _row_to_rollout(row) if row else None
+
+    @staticmethod
+    def get_open() -> Optional[Dict[str, Any]]:
+        """진행 중(active/paused)인 배포 (최대 하나)"""
+        db = get_read_db()
+        row = db.execute(f'''
+            SELECT * FROM rollouts WHERE status IN ({','.join('?' * len(OPEN_STATUSES))})
+            ORDER BY id DESC LIMIT 1
+        ''', OPEN_STATUSES).fetchone()
+        return _row_to_rollout(row) if row else None
+
+    @staticmethod
+    def get_all(limit: int = 20) -> List[Dict[str, Any]]:
+        db = get_read_db()
+        rows = db.execute('SELECT * FROM rollouts ORDER BY id DESC LIMIT ?',
+                          (limit,)).fetchall()
+        return [_row_to_rollout(row) for row in rows]
+
+    @staticmethod
+    def set_status(rollout_id: int, status: str, reason: Optional[str] = None,
+                   from_statuses: tuple = OPEN_STATUSES) -> bool:
+        """상태 변경 (from_statuses 상태일 때만)"""
+        def job(db) -> int:
+            return db.execute(f'''
+                UPDATE rollouts SET status=?, status_reason=?, updated_at=CURRENT_TIMESTAMP
+                WHERE id=? AND status IN ({','.join('?' * len(from_statuses))})
+            ''', (status, reason, rollout_id, *from_statuses)).rowcount
+
+        return run_write(job) > 0
+
+    @staticmethod
+    def advance(rollout_id: int, from_wave: int) -> bool:
+        """다음 웨이브로 (from_wave에서만, 여러 워커가 동시에 올려도 한 번만 적용)"""
+        return run_write(lambda db: db.execute('''
+            UPDATE rollouts SET current_wave=current_wave + 1, wave_started_at=CURRENT_TIMESTAMP,
+                updated_at=CURRENT_TIMESTAMP
+            WHERE id=? AND current_wave=?
+        ''', (rollout_id, from_wave)).rowcount) > 0
+
+    @staticmethod
+    def get_client(rollout_id: int, machine_id: str) -> Optional[Dict[str, Any]]:
+        db = get_read_db()
+        row = db.execute('SELECT * FROM rollout_clients WHERE rollout_id=? AND machine_id=?',
+                         (rollout_id, machine_id)).fetchone()
+        return dict(row) if row else None
+
+    @staticmethod
+    def acquire_slot(rollout_id: int, machine_id: str, wave: int, max_concurrent: int,
+                     slot_timeout: int) -> bool:
+        """업데이트 슬롯 획득 (동시에 updating인 클라이언트가 max_concurrent 미만일 때만)"""
+        def job(db) -> bool:
+            in_flight = db.execute('''
+                SELECT COUNT(*) FROM rollout_clients
+                WHERE rollout_id=? AND state='updating'
+                AND started_at >= datetime('now', '-' || ? || ' seconds')
+            ''', (rollout_id, slot_timeout)).fetchone()[0]
+            if in_flight >= max_concurrent:
+                return False
+            db.execute('''
+                INSERT OR REPLACE INTO rollout_clients (rollout_id, machine_id, wave, state)
+                VALUES (?, ?, ?, 'updating')
+            ''', (rollout_id, machine_id, wave))
+            return True
+
+        return run_write(job)
+
+    @staticmethod
+    def mark_updated(rollout_id: int, machine_id: str) -> bool:
+        """새 버전으로 다시 접속한 클라이언트 기록 (슬롯 반납)"""
+        def job(db) -> int:
+            return db.execute('''
+                UPDATE rollout_clients SET state='updated', finished_at=CURRENT_TIMESTAMP
+                WHERE rollout_id=? AND machine_id=? AND state IN ('updating', 'failed')
+            ''', (rollout_id, machine_id)).rowcount
+
+        return run_write(job) > 0
+
+    @staticmethod
+    def expire_slots(rollout_id: int, slot_timeout: int) -> int:
+        """slot_timeout초 안에 새 버전으로 돌아오지 않은 클라이언트를 실패로 처리"""
+        def job(db) -> int:
+            return db.execute('''
+                UPDATE rollout_clients SET state='failed', finished_at=CURRENT_TIMESTAMP
+                WHERE rollout_id=? AND state='updating'
+                AND started_at < datetime('now', '-' || ? || ' seconds')
+            ''', (rollout_id, slot_timeout)).rowcount
+
+        return run_write(job)
+
+    @staticmethod
+    def wave_stats(rollout_id: int, health_grace: int) -> Dict[int, Dict[str, Any]]:
+        """웨이브별 {updating, updated, failed, unhealthy, last_finished_at}
+
+        unhealthy: 업데이트 후 health_grace초가 지나도록 하트비트(last_seen)가 없는 클라이언트
+        """
+        db = get_read_db()
+        rows = db.execute('''
+            SELECT rc.wave,
+                   SUM(rc.state = 'updating') AS updating,
+                   SUM(rc.state = 'updated') AS updated,
+                   SUM(rc.state = 'failed') AS failed,
+                   SUM(rc.state = 'updated'
+                       AND rc.finished_at < datetime('now', '-' || :grace || ' seconds')
+                       AND (p.last_seen IS NULL OR p.last_seen <= rc.finished_at)) AS unhealthy,
+                   MAX(rc.finished_at) AS last_finished_at
+            FROM rollout_clients rc
+            LEFT JOIN pc_info p ON p.machine_id = rc.machine_id
+            WHERE rc.rollout_id = :rollout_id
+            GROUP BY rc.wave
+        ''', {'rollout_id': rollout_id, 'grace': health_grace}).fetchall()
+        return {row['wave']: {key: row[key] for key in row.keys() if key != 'wave'} for row in rows}
@@ -1,3 +1,6 @@
 from .pc_service import PCService
+from .maintenance_service import MaintenanceService
+from .artifact_service import ArtifactService
+from .rollout_service import RolloutService
 
-__all__ = ['PCService']
+__all__ = ['PCService', 'MaintenanceService', 'ArtifactService', 'RolloutService']
@@ -0,0 +1,200 @@
+"""
+아티팩트 캐시 서비스
+install/download 명령이 가리키는 외부 파일을 서버가 한 번만 받아 캐시 디렉토리에
+SHA-256 이름(<앞 2자리>/<해시>)으로 저장한다. PC 200대에 같은 프로그램을 배포해도
+캠퍼스 외부 회선으로는 한 번만 내려받고, 나머지는 서버가 Range/ETag로 제공한다.
+
+- 관리자 명령 생성 시 prefetch로 등록 → 워커 하나가 백그라운드로 받음
+- 클라이언트 릴리스 EXE도 같은 캐시로 미러링 (버전 등록 시 mirror_release, 서버 시작 시
+  미러 없는 최신 릴리스는 mirror_latest_release → /api/client/version의 mirror_url)
+- 등록된 URL만 받음 (클라이언트가 임의 URL을 서버에 받게 할 수 없음)
+- 받는 중 실패하면 error 상태 → 클라이언트는 원본 URL에서 직접 받음
+- ARTIFACT_MAX_AGE_SECONDS가 지난 항목은 다음 등록 때 다시 받음 (내용이 바뀌었으면 이전 파일 삭제)
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from models.artifact import ArtifactModel
+from utils.version_cache import get_latest_version, invalidate_version_cache
+
+logger = logging.getLogger('wcms')
+
+_READ_BLOCK = 1024 * 1024
+
+
+class ArtifactService:
+    """콘텐츠 주소(SHA-256) 기반 아티팩트 캐시"""
+
+    @staticmethod
+    def path_for(cache_dir: str, sha256: str) -> str:
+        return os.path.join(cache_dir, sha256[:2], sha256)
+
+    @staticmethod
+    def is_valid_hash(value: str) -> bool:
+        return len(value) == 64 and all(c in '0123456789abcdef' for c in value)
+
+    @staticmethod
+    def fetch(source_url: str, config) -> Tuple[str, int]:
+        """원본을 받아 해시 이름으로 저장 (임시 파일에 받은 뒤 rename, 같은 내용이면 덮어써도 무해)
+
+        Returns:
+            (sha256, 크기)
+        """
+        scheme = urlparse(source_url).scheme
+        if scheme not in config['ARTIFACT_ALLOWED_SCHEMES']:
+            raise ValueError(f"허용되지 않는 scheme: {scheme}")
+
+        cache_dir = config['ARTIFACT_CACHE_DIR']
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.fetch-', dir=cache_dir)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            request = urllib.request.Request(source_url, headers={'User-Agent': 'WCMS-Server'})
+            timeout = config['ARTIFACT_FETCH_TIMEOUT']
+            with os.fdopen(fd, 'wb') as out, \
+                    urllib.request.urlopen(request, timeout=timeout) as response:
+                while True:
+                    block = response.read(_READ_BLOCK)
+                    if not block:
+                        break
+                    size += len(block)
+                    if size > config['ARTIFACT_MAX_BYTES']:
+                        raise ValueError(f"아티팩트 크기 상한 초과: {config['ARTIFACT_MAX_BYTES']}바이트")
+                    digest.update(block)
+                    out.write(block)
+                out.flush()
+                os.fsync(out.fileno())
+
+            sha256 = digest.hexdigest()
+            path = ArtifactService.path_for(cache_dir, sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            return sha256, size
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def _fetch_claimed(source_url: str, config) -> None:
+        """선점한 항목을 받아 ready/error로 기록"""
+        previous = (ArtifactModel.get_by_url(source_url) or {}).get('sha256')
+        try:
+            sha256, size = ArtifactService.fetch(source_url, config)
+            ArtifactModel.mark_ready(source_url, sha256, size)
+            logger.info(f"아티팩트 캐시 완료: {source_url} ({size:,} bytes, {sha256[:12]})")
+        except Exception as e:
+            ArtifactModel.mark_error(source_url, str(e))
+            logger.warning(f"아티팩트 캐시 실패: {source_url} - {e}")
+            return
+        if previous and previous != sha256:
+            # 원본이 바뀜 (새 패키지 버전) → 더 참조되지 않는 이전 파일 삭제
+            ArtifactService._remove_unreferenced(config['ARTIFACT_CACHE_DIR'], previous)
+
+    @staticmethod
+    def _remove_unreferenced(cache_dir: str, sha256: str) -> None:
+        if ArtifactModel.is_referenced(sha256):
+            return
+        try:
+            os.unlink(ArtifactService.path_for(cache_dir, sha256))
+        except OSError:
+            pass
+
+    @staticmethod
+    def prefetch(source_url: str, app, background: bool = True) -> Optional[Dict[str, Any]]:
+        """원본 URL 등록 후 (이 워커가 선점하면) 받기 시작
+
+        Args:
+            source_url: 원본 URL
+            app: Flask 앱 (백그라운드 스레드의 app context용)
+            background: False면 현재 스레드에서 받음 (테스트, 관리 스크립트)
+
+        Returns:
+            현재 캐시 항목
+        """
+        config = app.config
+        if urlparse(source_url).scheme not in config['ARTIFACT_ALLOWED_SCHEMES']:
+            return None
+        ArtifactModel.register(source_url, config['ARTIFACT_MAX_AGE_SECONDS'])
+        if ArtifactModel.claim(source_url, config['ARTIFACT_FETCH_STALE_SECONDS']):
+            if background:
+                def worker():
+                    with app.app_context():
+                        ArtifactService._fetch_claimed(source_url, config)
+
+                threading.Thread(target=worker, name='wcms-artifact-fetch', daemon=True).start()
+            else:
+                ArtifactService._fetch_claimed(source_url, config)
+        return ArtifactModel.get_by_url(source_url)
+
+    @staticmethod
+    def prefetch_for_command(command_type: str, command_data: Optional[Dict[str, Any]],
+                             app) -> None:
+        """install/download 명령이 받을 파일을 미리 캐시 (캐시 비활성이면 무시)
+
+        install은 Chocolatey 패키지(.nupkg) URL을 command_data['package_url']에 채운다.
+        """
+        config = app.config
+        if not config['ARTIFACT_CACHE_ENABLED'] or not isinstance(command_data, dict):
+            return
+        try:
+            if command_type == 'download' and command_data.get('url'):
+                ArtifactService.prefetch(command_data['url'], app)
+            elif command_type == 'install' and command_data.get('app_id'):
+                package_url = command_data.get('package_url') or \
+                    config['ARTIFACT_CHOCO_PACKAGE_URL'].format(app_id=command_data['app_id'])
+                command_data['package_url'] = package_url
+                ArtifactService.prefetch(package_url, app)
+        except Exception as e:
+            # 캐시는 최적화일 뿐이므로 명령 생성은 계속 (클라이언트가 원본에서 받음)
+            logger.warning(f"아티팩트 사전 캐시 실패 ({command_type}): {e}")
+
+    @staticmethod
+    def mirror_release(download_url: Optional[str], app) -> Optional[Dict[str, Any]]:
+        """클라이언트 릴리스 EXE를 미러링 (업데이터가 GitHub 대신 서버에서 이어받기 + 해시 검증)
+
+        Returns:
+            등록된 캐시 항목 (캐시 비활성, 허용되지 않은 scheme, 실패 시 None)
+        """
+        if not download_url or not app.config['ARTIFACT_CACHE_ENABLED']:
+            return None
+        try:
+            return ArtifactService.prefetch(download_url, app)
+        except Exception as e:
+            # 미러는 최적화일 뿐이므로 실패해도 클라이언트는 download_url에서 받음
+            logger.warning(f"릴리스 미러 등록 실패: {download_url} - {e}")
+            return None
+
+    @staticmethod
+    def mirror_latest_release(app) -> None:
+        """서버 시작 시 미러 없이 등록된 최신 릴리스(이전 버전 서버에서 등록) 미러링"""
+        try:
+            with app.app_context():
+                body, _, mirror_status = get_latest_version()
+                if mirror_status is not None or not body['download_url']:
+                    return
+                if ArtifactService.mirror_release(body['download_url'], app) is not None:
+                    invalidate_version_cache()
+        except Exception as e:
+            logger.warning(f"최신 릴리스 미러 확인 실패: {e}")
+
+    @staticmethod
+    def purge_unused(config, batch_size: Optional[int] = None) -> int:
+        """보관 기간 동안 쓰이지 않은 항목과 (더 참조되지 않는) 파일 삭제
+
+        Returns:
+            삭제된 항목 수
+        """
+        hashes = ArtifactModel.purge_unused(config['ARTIFACT_RETENTION_DAYS'], batch_size)
+        for sha256 in set(filter(None, hashes)):
+            ArtifactService._remove_unreferenced(config['ARTIFACT_CACHE_DIR'], sha256)
+        return len(hashes)
@@ -0,0 +1,187 @@
+"""
+DB 유지보수 서비스
+보관 기간이 지난 행 삭제(작은 배치), WAL 체크포인트, incremental vacuum을
+주기적으로 실행하고 회수한 페이지 수와 소요 시간을 기록한다.
+"""
+import os
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+from utils import get_db, run_write
+from .artifact_service import ArtifactService
+
+logger = logging.getLogger('wcms')
+
+_last_report: Optional[Dict[str, Any]] = None
+_run_lock = threading.Lock()
+
+
+class MaintenanceService:
+    """DB 유지보수 (보관 정책 + 압축)"""
+
+    @staticmethod
+    def purge_in_batches(purge: Callable[[int], int], batch_size: int, max_batches: int) -> int:
+        """purge(batch_size)를 삭제 행이 batch_size 미만이 될 때까지 반복
+
+        배치마다 별도 쓰기 트랜잭션이므로 클라이언트 쓰기가 오래 막히지 않는다.
+
+        Returns:
+            삭제된 총 행 수
+        """
+        total = 0
+        for _ in range(max_batches):
+            deleted = purge(batch_size)
+            total += deleted
+            if deleted < batch_size:
+                break
+            time.sleep(0)  # 배치 사이에 다른 스레드(greenlet)에 양보
+        return total
+
+    @staticmethod
+    def checkpoint(truncate_threshold_bytes: int) -> Dict[str, Any]:
+        """WAL 체크포인트 (WAL이 임계값보다 크면 TRUNCATE, 아니면 PASSIVE)"""
+        db = get_db()
+        db_path = db.execute('PRAGMA database_list').fetchone()['file']
+        wal_path = db_path + '-wal' if db_path else None
+        wal_size = os.path.getsize(wal_path) if wal_path and os.path.exists(wal_path) else 0
+        mode = 'TRUNCATE' if wal_size > truncate_threshold_bytes else 'PASSIVE'
+
+        busy, log_frames, checkpointed = db.execute(f'PRAGMA wal_checkpoint({mode})').fetchone()
+        return {
+            'mode': mode,
+            'wal_bytes_before': wal_size,
+            'busy': bool(busy),
+            'log_frames': log_frames,
+            'checkpointed_frames': checkpointed,
+        }
+
+    @staticmethod
+    def incremental_vacuum(max_pages: int) -> Dict[str, Any]:
+        """빈 페이지를 최대 max_pages개까지 파일에서 회수
+
+        auto_vacuum=INCREMENTAL이 아닌 DB(기존 설치본)는 건너뛴다.
+        전환하려면 점검 시간에 PRAGMA auto_vacuum=INCREMENTAL; VACUUM; 을 1회 실행해야 한다.
+        """
+        db = get_db()
+        auto_vacuum = db.execute('PRAGMA auto_vacuum').fetchone()[0]
+        free_before = db.execute('PRAGMA freelist_count').fetchone()[0]
+        result = {
+            'auto_vacuum': {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}.get(auto_vacuum,
+                                                                        str(auto_vacuum)),
+            'freelist_before': free_before,
+            'pages_reclaimed': 0,
+        }
+        if auto_vacuum != 2 or free_before == 0:
+            result['freelist_after'] = free_before
+            return result
+
+        # incremental_vacuum은 sqlite3_step 1회에 한 페이지를 해제하는데, 결과 컬럼이 없는
+        # 문장은 파이썬 sqlite3가 첫 스텝 후 바로 reset 하므로 페이지 수만큼 반복 실행
+        def job(conn):
+            for _ in range(min(max_pages, free_before)):
+                conn.execute('PRAGMA incremental_vacuum')
+
+        run_write(job)
+        free_after = db.execute('PRAGMA freelist_count').fetchone()[0]
+        result['freelist_after'] = free_after
+        result['pages_reclaimed'] = free_before - free_after
+        return result
+
+    @staticmethod
+    def run(config: Dict[str, Any]) -> Dict[str, Any]:
+        """유지보수 1회 실행
+
+        Args:
+            config: app.config (보관 기간, 배치 크기, vacuum 예산)
+
+        Returns:
+            삭제 행 수, 체크포인트 결과, 회수 페이지 수, 소요 시간 리포트
+        """
+        global _last_report
+        from models import (AvailabilityModel, CommandModel, CommandOutputModel, CommandResultModel,
+                            RegistrationTokenModel)
+
+        with _run_lock:
+            started = time.perf_counter()
+            batch_size = config['MAINTENANCE_BATCH_SIZE']
+            max_batches = config['MAINTENANCE_MAX_BATCHES']
+
+            deleted = {
+                'commands': MaintenanceService.purge_in_batches(
+                    lambda n: CommandModel.cleanup_old(config['COMMAND_RETENTION_DAYS'],
+                                                       batch_size=n),
+                    batch_size, max_batches
+                ),
+                'network_events': MaintenanceService.purge_in_batches(
+                    lambda n: AvailabilityModel.purge_events(config['STATUS_RETENTION_MONTHS'],
+                                                             batch_size=n),
+                    batch_size, max_batches
+                ),
+                'registration_tokens': MaintenanceService.purge_in_batches(
+                    lambda n: RegistrationTokenModel.cleanup_expired(batch_size=n),
+                    batch_size, max_batches
+                ),
+                'command_output': MaintenanceService.purge_in_batches(
+                    lambda n: CommandOutputModel.purge_orphans(batch_size=n),
+                    batch_size, max_batches
+                ),
+            }
+            if config['ARTIFACT_CACHE_ENABLED']:
+                deleted['artifacts'] = MaintenanceService.purge_in_batches(
+                    lambda n: ArtifactService.purge_unused(config, batch_size=n),
+                    batch_size, max_batches
+                )
+            # 이전 버전 DB: commands에 인라인으로 남은 출력을 압축 저장소로 이동
+            migrated_results = MaintenanceService.purge_in_batches(
+                lambda n: CommandResultModel.migrate_inline(batch_size=n),
+                batch_size, max_batches
+            )
+            purge_ms = (time.perf_counter() - started) * 1000
+
+            vacuum = MaintenanceService.incremental_vacuum(config['MAINTENANCE_VACUUM_PAGES'])
+            truncate_bytes = config['MAINTENANCE_WAL_TRUNCATE_MB'] * 1024 * 1024
+            checkpoint = MaintenanceService.checkpoint(truncate_bytes)
+
+            report = {
+                'finished_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'deleted': deleted,
+                'migrated_results': migrated_results,
+                'vacuum': vacuum,
+                'checkpoint': checkpoint,
+                'purge_ms': round(purge_ms, 1),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+            }
+            _last_report = report
+
+        logger.info(
+            f"[유지보수] 삭제 {sum(deleted.values())}행 {deleted}, "
+            f"회수 {vacuum['pages_reclaimed']}페이지, 체크포인트 {checkpoint['mode']}, "
+            f"{report['duration_ms']}ms"
+        )
+        return report
+
+    @staticmethod
+    def get_last_report() -> Optional[Dict[str, Any]]:
+        """마지막 유지보수 실행 결과"""
+        return _last_report
+
+    @staticmethod
+    def start_background_maintenance(app, interval: int = 3600):
+        """백그라운드 유지보수 스레드 시작 (여러 워커 중 임대를 가진 워커만 실행)"""
+        from utils.worker_lease import WorkerLease
+        lease = WorkerLease('db-maintenance', ttl=interval * 3)
+
+        def worker():
+            logger.info(f"[*] 백그라운드 DB 유지보수 스레드 시작 ({interval}초 주기)")
+            while True:
+                try:
+                    time.sleep(interval)
+                    with app.app_context():
+                        if lease.try_acquire():
+                            MaintenanceService.run(app.config)
+                except Exception as e:
+                    logger.error(f"[!] DB 유지보수 오류: {e}")
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
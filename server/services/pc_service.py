@@ -3,9 +3,11 @@ PC 관리 서비스
 비즈니스 로직 처리
 """
 import time
+import sqlite3
 import threading
 import logging
-from utils import get_db
+from typing import Any, Dict, Optional, Tuple
+from utils import get_db, run_write
 
 logger = logging.getLogger('wcms')
 
@@ -20,8 +22,12 @@ class PCService:
 
         long-poll timeout 30s + 여유 10s = 기본 40초
         """
+        from utils.drain import in_restart_window
         try:
             db = get_db()
+            if in_restart_window(db):
+                # 서버 재시작 직후: long-poll이 끊겼던 PC들이 재연결할 시간을 줌
+                return 0
 
             # 오프라인으로 전환될 PC 목록 조회
             to_offline = db.execute("""
@@ -63,16 +69,62 @@ class PCService:
             logger.error(f"[!] 오프라인 상태 업데이트 실패: {e}")
             return 0
 
+    @staticmethod
+    def register_client(data: Dict[str, Any], pin: str) -> Tuple[Optional[int], Optional[str]]:
+        """
+        PIN 검증 + PC 등록을 단일 트랜잭션으로 처리
+
+        토큰 사용 처리, pc_info/pc_specs/pc_dynamic_info UPSERT를 하나의 쓰기
+        작업으로 묶어 부팅 폭주 시 쓰기 잠금 횟수를 줄인다.
+
+        Returns:
+            (pc_id, None) 또는 (None, 에러 메시지)
+        """
+        from models import PCModel, RegistrationTokenModel
+
+        def job(db: sqlite3.Connection) -> Optional[int]:
+            if not RegistrationTokenModel.consume(pin, db):
+                return None
+            return PCModel.upsert_verified(
+                machine_id=data['machine_id'],
+                hostname=data.get('hostname') or 'Unknown-PC',
+                mac_address=data.get('mac_address') or '00:00:00:00:00:00',
+                token=pin,
+                ip_address=data.get('ip_address'),
+                cpu_model=data.get('cpu_model'),
+                cpu_cores=data.get('cpu_cores'),
+                cpu_threads=data.get('cpu_threads'),
+                ram_total=data.get('ram_total'),
+                disk_info=data.get('disk_info'),
+                os_edition=data.get('os_edition'),
+                os_version=data.get('os_version'),
+                dynamic_data=data.get('system_info'),
+                db=db
+            )
+
+        pc_id = run_write(job)
+        if pc_id is None:
+            _, error_msg = RegistrationTokenModel.validate(pin)
+            return None, error_msg or 'Invalid PIN'
+        return pc_id, None
+
     @staticmethod
     def start_background_checker(app, interval: int = 30):
-        """백그라운드 오프라인 체크 스레드 시작"""
+        """백그라운드 오프라인 체크 스레드 시작
+
+        워커가 여러 개면 모든 워커가 스레드를 띄우지만, 임대를 가진 워커 하나만 실행한다.
+        """
+        from utils.worker_lease import WorkerLease
+        lease = WorkerLease('offline-checker', ttl=interval * 3)
+
         def checker():
             logger.info(f"[*] 백그라운드 오프라인 체크 스레드 시작 ({interval}초 주기)")
             while True:
                 try:
                     time.sleep(interval)
                     with app.app_context():
-                        PCService.update_offline_status()
+                        if lease.try_acquire():
+                            PCService.update_offline_status()
                 except Exception as e:
                     logger.error(f"[!] 백그라운드 체크 오류: {e}")
 
@@ -0,0 +1,317 @@
+"""
+클라이언트 단계적 배포 서비스
+새 버전을 한 번에 모든 PC에 알리지 않고 웨이브 단위로 배포한다.
+
+- 웨이브: 비율(machine_id 해시 버킷, 예: [10, 50, 100]) 또는 실습실 목록
+  정의에 없는 실습실은 마지막 웨이브 뒤의 나머지 웨이브에 속함
+- 동시에 업데이트 중인 클라이언트 수를 max_concurrent로 제한 (대역폭 보호)
+- 업데이트한 클라이언트가 새 버전으로 돌아오고 하트비트가 이어지면 성공,
+  실패 비율이 max_failure_ratio를 넘으면 배포를 멈춤 (나머지 PC는 이전 버전 유지)
+- 현재 웨이브에 진행 중인 업데이트가 없고 soak_seconds가 지나면 다음 웨이브로
+
+/api/client/version은 클라이언트마다 다른 답을 준다. 진행 중인 배포는 프로세스 캐시에서 읽고,
+차례가 아닌 클라이언트는 DB 쓰기 없이 응답한다.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.rollout import RolloutModel
+from utils.database import get_read_db
+
+logger = logging.getLogger('wcms')
+
+STRATEGIES = ('percent', 'room')
+
+# (진행 중인 배포 또는 None, 읽은 시각)
+_open_rollout: Optional[Tuple[Optional[Dict[str, Any]], float]] = None
+_cache_lock = threading.Lock()
+
+
+def invalidate_rollout_cache() -> None:
+    """진행 중인 배포 캐시 비우기 (배포 생성/상태 변경/웨이브 이동 시)"""
+    global _open_rollout
+    with _cache_lock:
+        _open_rollout = None
+
+
+class RolloutService:
+    """웨이브 기반 클라이언트 배포 컨트롤러"""
+
+    @staticmethod
+    def normalize_waves(strategy: str, waves: Any) -> List[Any]:
+        """웨이브 정의 검증/정규화 (잘못되면 ValueError)
+
+        percent: 누적 비율 목록, 증가해야 하며 마지막은 100으로 채움
+        room: 실습실 이름 목록의 목록 (문자열 하나는 한 실습실짜리 웨이브)
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy는 {', '.join(STRATEGIES)} 중 하나여야 합니다")
+        if not isinstance(waves, list) or not waves:
+            raise ValueError("waves는 비어 있지 않은 목록이어야 합니다")
+
+        if strategy == 'percent':
+            if not all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in waves):
+                raise ValueError("percent 웨이브는 숫자 목록이어야 합니다")
+            percents = [int(p) for p in waves]
+            if any(p <= 0 or p > 100 for p in percents) or percents != sorted(set(percents)):
+                raise ValueError("percent 웨이브는 1~100 사이에서 증가해야 합니다")
+            return percents if percents[-1] == 100 else percents + [100]
+
+        normalized = []
+        for wave in waves:
+            rooms = [wave] if isinstance(wave, str) else wave
+            if (not isinstance(rooms, list) or not rooms
+                    or not all(isinstance(r, str) and r for r in rooms)):
+                raise ValueError("room 웨이브는 실습실 이름 목록이어야 합니다")
+            normalized.append(rooms)
+        return normalized
+
+    @staticmethod
+    def create(version: str, config, strategy: Optional[str] = None, waves: Any = None,
+               max_concurrent: Optional[int] = None) -> int:
+        """배포 생성 (생략한 값은 ROLLOUT_* 기본값)"""
+        strategy = strategy or 'percent'
+        if waves is None:
+            waves = [int(p) for p in config['ROLLOUT_DEFAULT_WAVES'].split(',')]
+        waves = RolloutService.normalize_waves(strategy, waves)
+        max_concurrent = int(max_concurrent or config['ROLLOUT_MAX_CONCURRENT'])
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent는 1 이상이어야 합니다")
+
+        rollout_id = RolloutModel.create(
+            version, strategy, waves, max_concurrent,
+            config['ROLLOUT_MAX_FAILURE_RATIO'], config['ROLLOUT_SOAK_SECONDS']
+        )
+        invalidate_rollout_cache()
+        logger.info(f"클라이언트 배포 시작: v{version} ({strategy} {waves}, 동시 {max_concurrent}대)")
+        return rollout_id
+
+    @staticmethod
+    def release_options(data: Dict[str, Any], config) -> Optional[Dict[str, Any]]:
+        """버전 등록 요청의 rollout 옵션 검증 (잘못되면 ValueError)
+
+        rollout: false면 즉시 배포, 생략하면 ROLLOUT_AUTO일 때 기본값으로 단계적 배포,
+        객체면 {strategy, waves, max_concurrent}로 단계적 배포
+
+        Returns:
+            create()에 넘길 옵션 (None이면 즉시 배포)
+        """
+        options = data.get('rollout')
+        if options is False or (options is None and not config['ROLLOUT_AUTO']):
+            return None
+        if options is True or options is None:
+            options = {}
+        if not isinstance(options, dict):
+            raise ValueError("rollout은 객체 또는 true/false여야 합니다")
+
+        release = {
+            'strategy': options.get('strategy'),
+            'waves': options.get('waves'),
+            'max_concurrent': options.get('max_concurrent'),
+        }
+        if release['waves'] is not None:
+            RolloutService.normalize_waves(release['strategy'] or 'percent', release['waves'])
+        elif release['strategy'] not in (None, 'percent'):
+            raise ValueError("room 배포는 waves가 필요합니다")
+        return release
+
+    @staticmethod
+    def release(version: str, options: Optional[Dict[str, Any]], config) -> Optional[int]:
+        """버전 등록 후 호출: 단계적 배포 생성 또는 (즉시 배포면) 진행 중인 배포 취소"""
+        if options is None:
+            if RolloutModel.cancel_open(f'v{version} 즉시 배포'):
+                invalidate_rollout_cache()
+            return None
+        return RolloutService.create(version, config, **options)
+
+    @staticmethod
+    def get_open(ttl: float) -> Optional[Dict[str, Any]]:
+        """진행 중인 배포 (프로세스 캐시, ttl초마다 다시 읽음)"""
+        global _open_rollout
+        cached = _open_rollout
+        if cached is not None and time.monotonic() - cached[1] < ttl:
+            return cached[0]
+        rollout = RolloutModel.get_open()
+        with _cache_lock:
+            _open_rollout = (rollout, time.monotonic())
+        return rollout
+
+    @staticmethod
+    def _room_of(machine_id: str) -> Optional[str]:
+        row = get_read_db().execute('SELECT room_name FROM pc_info WHERE machine_id=?',
+                                    (machine_id,)).fetchone()
+        return row['room_name'] if row else None
+
+    @staticmethod
+    def wave_of(rollout: Dict[str, Any], machine_id: str, room_name: Optional[str] = None) -> int:
+        """클라이언트가 속한 웨이브 번호 (0부터)"""
+        waves = rollout['waves']
+        if rollout['strategy'] == 'percent':
+            # 배포마다 다른 버킷 (같은 PC가 매번 첫 웨이브가 되지 않도록)
+            digest = hashlib.sha256(f"{rollout['id']}:{machine_id}".encode('utf-8')).digest()
+            bucket = int.from_bytes(digest[:4], 'big') % 100
+            return next(i for i, percent in enumerate(waves) if bucket < percent)
+
+        for i, rooms in enumerate(waves):
+            if room_name in rooms:
+                return i
+        return len(waves)  # 정의에 없는 실습실: 마지막 나머지 웨이브
+
+    @staticmethod
+    def wave_count(rollout: Dict[str, Any]) -> int:
+        return len(rollout['waves']) + (1 if rollout['strategy'] == 'room' else 0)
+
+    @staticmethod
+    def answer(body: Dict[str, Any], machine_id: Optional[str], current_version: Optional[str],
+               config) -> Tuple[Dict[str, Any], Optional[int]]:
+        """/api/client/version 응답을 클라이언트별로 결정
+
+        Args:
+            body: 최신 버전 응답 (version_cache)
+            machine_id, current_version: 클라이언트가 보낸 값 (이전 클라이언트는 없음)
+
+        Returns:
+            (응답 본문, Retry-After 초 또는 None)
+        """
+        rollout = RolloutService.get_open(config['ROLLOUT_CACHE_TTL'])
+        if rollout is None or rollout['version'] != body['version']:
+            return body, None
+
+        if machine_id and current_version == rollout['version']:
+            # 업데이트 후 새 버전으로 다시 접속 → 슬롯 반납 (슬롯을 받은 클라이언트만 쓰기)
+            client = RolloutModel.get_client(rollout['id'], machine_id)
+            if client and client['state'] != 'updated':
+                RolloutModel.mark_updated(rollout['id'], machine_id)
+            return body, None
+
+        retry_after = config['ROLLOUT_RETRY_AFTER']
+        wave = None
+        if machine_id and rollout['status'] == 'active':
+            by_room = rollout['strategy'] == 'room'
+            room_name = RolloutService._room_of(machine_id) if by_room else None
+            wave = RolloutService.wave_of(rollout, machine_id, room_name)
+            if wave <= rollout['current_wave']:
+                client = RolloutModel.get_client(rollout['id'], machine_id)
+                client_state = client['state'] if client else None
+                # 실패한 PC는 자동으로 다시 시도하지 않음 (관리자가 새 배포로 다시 시작)
+                go = client_state == 'updating' or (
+                    client_state != 'failed' and RolloutModel.acquire_slot(
+                        rollout['id'], machine_id, wave, rollout['max_concurrent'],
+                        config['ROLLOUT_SLOT_TIMEOUT']))
+                if go:
+                    return {**body, 'rollout': {'id': rollout['id'], 'state': 'go',
+                                                'wave': wave}}, None
+                if client_state != 'failed':
+                    # 동시 업데이트 상한: 잠시 뒤 다시 확인
+                    retry_after = config['ROLLOUT_SLOT_RETRY_AFTER']
+
+        hold_version = current_version or rollout['base_version'] or body['version']
+        held = {
+            **body,
+            'version': hold_version,
+            'download_url': None,
+            'sha256': None,
+            'size': None,
+            'mirror_url': None,
+            'rollout': {'id': rollout['id'], 'state': 'waiting', 'wave': wave,
+                        'retry_after': retry_after},
+        }
+        return held, retry_after
+
+    @staticmethod
+    def evaluate(config) -> Optional[Dict[str, Any]]:
+        """진행 중인 배포 한 단계 진행 (백그라운드 컨트롤러가 주기적으로 호출)
+
+        1. 제한 시간 안에 새 버전으로 돌아오지 않은 클라이언트 → failed
+        2. 현재 웨이브 실패 비율 초과 → paused
+        3. 현재 웨이브에 진행 중 업데이트가 없고 soak 시간 경과 → 다음 웨이브 (마지막이면 completed)
+
+        Returns:
+            진행 후 배포 상태 (진행 중인 배포가 없으면 None)
+        """
+        rollout = RolloutModel.get_open()
+        if rollout is None or rollout['status'] != 'active':
+            return rollout
+
+        RolloutModel.expire_slots(rollout['id'], config['ROLLOUT_SLOT_TIMEOUT'])
+        stats = RolloutModel.wave_stats(rollout['id'], config['ROLLOUT_HEALTH_GRACE'])
+        wave = rollout['current_wave']
+        current = stats.get(wave, {})
+        started = sum(current.get(state) or 0 for state in ('updating', 'updated', 'failed'))
+        failures = (current.get('failed') or 0) + (current.get('unhealthy') or 0)
+
+        if started and failures / started > rollout['max_failure_ratio']:
+            reason = f"웨이브 {wave + 1} 실패 {failures}/{started}대"
+            if RolloutModel.set_status(rollout['id'], 'paused', reason, from_statuses=('active',)):
+                logger.warning(f"클라이언트 배포 중지: v{rollout['version']} - {reason}")
+            invalidate_rollout_cache()
+            return RolloutModel.get_by_id(rollout['id'])
+
+        if current.get('updating'):
+            return rollout
+
+        # soak: 웨이브 시작 또는 마지막 업데이트 완료 후 일정 시간 관찰
+        row = get_read_db().execute('''
+            SELECT (julianday('now') - julianday(MAX(?, COALESCE(?, ?)))) * 86400 AS elapsed
+        ''', (rollout['wave_started_at'], current.get('last_finished_at'),
+              rollout['wave_started_at'])).fetchone()
+        if row['elapsed'] < rollout['soak_seconds']:
+            return rollout
+
+        if wave + 1 >= RolloutService.wave_count(rollout):
+            RolloutModel.set_status(rollout['id'], 'completed', from_statuses=('active',))
+            logger.info(f"클라이언트 배포 완료: v{rollout['version']}")
+        elif RolloutModel.advance(rollout['id'], wave):
+            logger.info(f"클라이언트 배포 웨이브 {wave + 2} 시작: v{rollout['version']}")
+        invalidate_rollout_cache()
+        return RolloutModel.get_by_id(rollout['id'])
+
+    @staticmethod
+    def progress(rollout_id: int, config) -> Optional[Dict[str, Any]]:
+        """배포 진행 상황 (웨이브별 대상 PC 수와 updating/updated/failed/unhealthy)"""
+        rollout = RolloutModel.get_by_id(rollout_id)
+        if rollout is None:
+            return None
+
+        targets: Dict[int, int] = {}
+        for pc in get_read_db().execute('SELECT machine_id, room_name FROM pc_info').fetchall():
+            wave = RolloutService.wave_of(rollout, pc['machine_id'], pc['room_name'])
+            targets[wave] = targets.get(wave, 0) + 1
+        stats = RolloutModel.wave_stats(rollout_id, config['ROLLOUT_HEALTH_GRACE'])
+
+        waves = []
+        for i in range(RolloutService.wave_count(rollout)):
+            wave_stats = stats.get(i, {})
+            waves.append({
+                'wave': i,
+                'definition': rollout['waves'][i] if i < len(rollout['waves']) else '나머지',
+                'targets': targets.get(i, 0),
+                'updating': wave_stats.get('updating') or 0,
+                'updated': wave_stats.get('updated') or 0,
+                'failed': wave_stats.get('failed') or 0,
+                'unhealthy': wave_stats.get('unhealthy') or 0,
+            })
+        return {**rollout, 'wave_progress': waves}
+
+    @staticmethod
+    def start_background_controller(app, interval: int = 30):
+        """배포 컨트롤러 스레드 시작 (여러 워커 중 임대를 가진 워커만 실행)"""
+        from utils.worker_lease import WorkerLease
+        lease = WorkerLease('rollout-controller', ttl=interval * 3)
+
+        def controller():
+            logger.info(f"[*] 클라이언트 배포 컨트롤러 시작 ({interval}초 주기)")
+            while True:
+                try:
+                    time.sleep(interval)
+                    with app.app_context():
+                        if lease.try_acquire():
+                            RolloutService.evaluate(app.config)
+                except Exception as e:
+                    logger.error(f"[!] 배포 컨트롤러 오류: {e}")
+
+        thread = threading.Thread(target=controller, daemon=True)
+        thread.start()
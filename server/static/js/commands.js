@@ -213,9 +213,17 @@ async function executeBulkCommand(commandType, commandData) {
 // ==================== 명령 결과 추적 ====================
 
 let resultPollingInterval = null;
+let outputCursors = {};
+// 출력 조회가 진행 중인 명령 (5초 주기보다 응답이 늦어도 같은 cursor로 두 번 읽지 않음)
+let outputInFlight = new Set();
+
+// 출력 스트림을 보내는 명령 (설치/삭제 진행 상황)
+const STREAMING_COMMAND_TYPES = ['install', 'uninstall'];
 
 function showCommandResultModal(commandIds, pcIds) {
     if (resultPollingInterval) { clearInterval(resultPollingInterval); resultPollingInterval = null; }
+    outputCursors = {};
+    outputInFlight = new Set();
 
     const modal = document.getElementById('commandResultModal');
     const resultList = document.getElementById('commandResultList');
@@ -274,7 +282,11 @@ async function startResultPolling(commandIds) {
 
             const data = await response.json();
             data.results.forEach(cmd => {
-                updateCommandResult(cmd);
+                if (cmd.status === 'executing' && STREAMING_COMMAND_TYPES.includes(cmd.command_type)) {
+                    tailCommandOutput(cmd.id);
+                } else {
+                    updateCommandResult(cmd);
+                }
                 if (['completed', 'error', 'skipped'].includes(cmd.status)) completedCommands.add(cmd.id);
             });
 
@@ -331,6 +343,42 @@ function updateCommandResult(cmd) {
     }
 }
 
+async function tailCommandOutput(cmdId) {
+    const item = document.getElementById(`result-${cmdId}`);
+    if (!item || outputInFlight.has(cmdId)) return;
+
+    const inFlight = outputInFlight;
+    inFlight.add(cmdId);
+    try {
+        const cursor = outputCursors[cmdId] || 0;
+        const response = await fetch(`/api/commands/${cmdId}/output?cursor=${cursor}`);
+        if (!response.ok) return;
+        const { data } = await response.json();
+        // 그사이 cursor가 바뀌었거나 모달을 다시 열었으면 이 응답은 버림
+        if (inFlight !== outputInFlight || (outputCursors[cmdId] || 0) !== cursor) return;
+
+        const badge = item.querySelector('.status-badge');
+        if (badge) { badge.style.background = '#4a9eff'; badge.textContent = '실행 중...'; }
+        item.className = 'result-item executing';
+
+        if (data.chunks.length === 0) return;
+        const resultContent = item.querySelector('.result-content');
+        if (!resultContent) return;
+        resultContent.style.display = 'block';
+        resultContent.style.whiteSpace = 'pre-wrap';
+        resultContent.style.maxHeight = '12em';
+        resultContent.style.overflowY = 'auto';
+        if (data.truncated) resultContent.textContent += '\n... (이전 출력 일부 생략)\n';
+        resultContent.textContent += data.chunks.map(c => c.data).join('');
+        resultContent.scrollTop = resultContent.scrollHeight;
+        outputCursors[cmdId] = data.next_cursor;
+    } catch (error) {
+        console.error('Output tail error:', error);
+    } finally {
+        inFlight.delete(cmdId);
+    }
+}
+
 function closeResultModal() {
     const modal = document.getElementById('commandResultModal');
     if (modal) modal.style.display = 'none';
@@ -4,6 +4,11 @@ Utils 패키지 초기화
 from .database import (
     init_db_manager,
     get_db,
+    get_read_db,
+    run_write,
+    set_statement_hook,
+    get_db_stats,
+    get_query_stats,
     close_db,
     execute_query,
     validate_not_null,
@@ -14,9 +19,14 @@ from .auth import (
     hash_password,
     check_password,
     require_admin,
+    invalidate_admin_cache,
     is_admin,
     get_current_admin,
 )
+from .room_cache import (
+    get_active_room_names,
+    invalidate_room_cache,
+)
 from .validators import (
     validate_machine_id,
     validate_ip_address,
@@ -31,6 +41,11 @@ __all__ = [
     # database
     'init_db_manager',
     'get_db',
+    'get_read_db',
+    'run_write',
+    'set_statement_hook',
+    'get_db_stats',
+    'get_query_stats',
     'close_db',
     'execute_query',
     'validate_not_null',
@@ -40,8 +55,12 @@ __all__ = [
     'hash_password',
     'check_password',
     'require_admin',
+    'invalidate_admin_cache',
     'is_admin',
     'get_current_admin',
+    # room cache
+    'get_active_room_names',
+    'invalidate_room_cache',
     # validators
     'validate_machine_id',
     'validate_ip_address',
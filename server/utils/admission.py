@@ -0,0 +1,93 @@
+"""
+클라이언트 API 입장 제어 (부하 차단)
+서버 재시작이나 캠퍼스 네트워크 장애 직후에는 모든 PC가 동시에 등록/전체 하트비트를 보낸다.
+비싼 요청의 동시 처리 수를 워커마다 제한하고, 넘치면 바로 503 + Retry-After로 돌려보내
+writer 큐가 밀리지 않게 한다. Retry-After에는 지터를 넣어 PC들이 다시 한꺼번에 오지 않게 한다.
+
+- 제한은 프로세스(워커) 단위 (gunicorn 워커 N개면 전체 상한은 N배)
+- 경량 요청(경량 하트비트, long-poll, 명령 결과)은 제한하지 않음
+- 거절 수는 /metrics의 wcms_http_requests_total{status="503"}에 잡힘
+"""
+import math
+import random
+import threading
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import current_app, jsonify
+
+
+class AdmissionController:
+    """비싼 요청 동시 처리 수 제한 (세마포어, 대기 시간이 지나면 거절)"""
+
+    def __init__(self):
+        self.limit = 0
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    def configure(self, limit: int) -> None:
+        """동시 처리 상한 설정 (0이면 제한 없음)"""
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    def try_acquire(self, wait: float = 0.0) -> bool:
+        """슬롯 획득 (wait초까지 대기)"""
+        with self._cond:
+            if self.limit <= 0:
+                self.in_use += 1
+                return True
+            if self.in_use >= self.limit and wait > 0:
+                self._cond.wait_for(lambda: self.in_use < self.limit, timeout=wait)
+            if self.in_use >= self.limit:
+                return False
+            self.in_use += 1
+            return True
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify()
+
+
+admission = AdmissionController()
+
+
+def retry_after_hint(base: float) -> float:
+    """재시도 대기 시간 (base ~ 3*base초, 균등 지터)"""
+    return random.uniform(base, base * 3)
+
+
+def overloaded_response(base: float):
+    """503 응답 (Retry-After 헤더는 정수 초, 본문에는 밀리초 단위 힌트)"""
+    hint = retry_after_hint(base)
+    response = jsonify({
+        'status': 'error',
+        'message': 'Server busy, retry later',
+        'retry_after_ms': int(hint * 1000),
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(math.ceil(hint))
+    return response
+
+
+def admission_controlled(when: Optional[Callable[[], bool]] = None):
+    """비싼 클라이언트 엔드포인트 데코레이터
+
+    Args:
+        when: 요청이 제한 대상인지 판단하는 함수 (None이면 항상 대상)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if when is not None and not when():
+                return view(*args, **kwargs)
+            config = current_app.config
+            if not admission.try_acquire(config['ADMISSION_QUEUE_WAIT']):
+                return overloaded_response(config['ADMISSION_RETRY_AFTER'])
+            try:
+                return view(*args, **kwargs)
+            finally:
+                admission.release()
+        return wrapper
+    return decorator
@@ -2,9 +2,18 @@
 인증 및 권한 관리 유틸리티
 """
 import bcrypt
+import threading
+import time
 from functools import wraps
 from flask import session, jsonify, current_app
-from typing import Callable
+from typing import Callable, Dict, Optional, Tuple
+
+
+# 활성 관리자 확인 캐시 (username → (admins 변경 세대, 확인 시각))
+# 활성 상태로 확인된 경우만 저장하고, AdminModel 변경 시 즉시 무효화
+# 다른 워커의 변경은 admin_cache_state.generation(admins 트리거가 증가)으로 감지
+_active_admin_cache: Dict[str, Tuple[int, float]] = {}
+_active_admin_lock = threading.Lock()
 
 
 def hash_password(password: str) -> str:
@@ -52,13 +61,7 @@ def require_admin(f: Callable) -> Callable:
             return jsonify({'status': 'error', 'message': 'Unauthorized'}), 401
 
         # 세션의 관리자가 DB에 여전히 존재하는지 확인 (삭제/비활성화 즉시 차단)
-        from utils.database import get_db
-        username = session.get('username')
-        db = get_db()
-        admin = db.execute(
-            'SELECT id FROM admins WHERE username=? AND is_active=1', (username,)
-        ).fetchone()
-        if not admin:
+        if not _is_active_admin(session.get('username')):
             session.clear()
             return jsonify({'status': 'error', 'message': 'Unauthorized'}), 401
 
@@ -67,6 +70,46 @@ def require_admin(f: Callable) -> Callable:
     return decorated_function
 
 
+def _admin_generation(db) -> Optional[int]:
+    """admins 변경 세대 (admin_cache_state 행이 없으면 None → 캐시 사용 안 함)"""
+    row = db.execute('SELECT generation FROM admin_cache_state WHERE id=1').fetchone()
+    return row['generation'] if row else None
+
+
+def _is_active_admin(username: Optional[str]) -> bool:
+    """관리자 활성 여부 확인 (ADMIN_CACHE_TTL초 동안 캐시, 요청마다 admins 변경 세대 확인)"""
+    if not username:
+        return False
+
+    from utils.database import get_read_db
+    db = get_read_db()
+    # 워커 수와 관계없이 세대를 확인 (다른 워커의 변경은 invalidate_admin_cache()가 닿지 않음)
+    generation = _admin_generation(db)
+
+    ttl = current_app.config.get('ADMIN_CACHE_TTL', 30)
+    cached = _active_admin_cache.get(username)
+    if (cached is not None and generation is not None and cached[0] == generation
+            and time.monotonic() - cached[1] < ttl):
+        return True
+
+    admin = db.execute(
+        'SELECT id FROM admins WHERE username=? AND is_active=1', (username,)
+    ).fetchone()
+
+    with _active_admin_lock:
+        if admin and generation is not None:
+            _active_admin_cache[username] = (generation, time.monotonic())
+        else:
+            _active_admin_cache.pop(username, None)
+    return admin is not None
+
+
+def invalidate_admin_cache() -> None:
+    """관리자 활성 캐시 비우기 (관리자 삭제/비활성화/비밀번호 변경 시 호출, 이 워커만 해당)"""
+    with _active_admin_lock:
+        _active_admin_cache.clear()
+
+
 def is_admin() -> bool:
     """
     현재 사용자가 관리자인지 확인
@@ -0,0 +1,92 @@
+"""
+새 명령 알림 (long-poll 대기용)
+long-poll마다 0.5초 간격으로 대기 명령을 조회하는 대신, 프로세스 안의 모든 long-poll이
+'가장 최근 명령 ID' 하나를 공유한다.
+- 같은 프로세스에서 명령 생성: notify()로 대기 중인 long-poll을 즉시 깨움
+- 다른 워커에서 명령 생성: 대기 중인 스레드 하나가 probe_interval마다 MAX(id)를 조회해 감지
+  (워커 간 공유 상태는 SQLite commands 테이블 자체)
+long-poll은 최근 ID가 바뀌었을 때만 자신의 대기 명령을 다시 조회한다.
+"""
+import threading
+import time
+from typing import Callable
+
+
+class CommandWatcher:
+    """프로세스 단위 최근 명령 ID 감시자"""
+
+    def __init__(self, probe_interval: float = 0.25):
+        self.probe_interval = probe_interval
+        self.latest_id = 0
+        self.probes = 0
+        self._probed_at = 0.0
+        self._probing = False
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def notify(self, command_id: int) -> None:
+        """명령 생성 직후 호출 (같은 프로세스의 대기자를 즉시 깨움)"""
+        with self._cond:
+            if command_id != self.latest_id:
+                self.latest_id = command_id
+                self._cond.notify_all()
+
+    def close(self) -> None:
+        """대기 중인 모든 long-poll을 깨우고 이후 wait는 바로 반환 (서버 drain)"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def reopen(self) -> None:
+        with self._cond:
+            self.closed = False
+
+    def wait(self, seen_id: int, timeout: float, probe: Callable[[], int]) -> int:
+        """latest_id가 seen_id와 달라지거나 timeout이 지날 때까지 대기
+
+        close()가 호출되면 즉시 반환한다.
+
+        ID는 AUTOINCREMENT라 보통 커지기만 하지만, DB가 바뀐 경우(테스트, 재설치)에도
+        놓치지 않도록 크기가 아니라 변경 여부로 판단한다.
+
+        Args:
+            seen_id: 호출자가 마지막으로 확인한 최근 명령 ID
+            timeout: 최대 대기 시간 (초)
+            probe: 현재 최근 명령 ID 조회 함수 (DB 연결을 빌렸다 반납해야 함)
+
+        Returns:
+            현재 latest_id
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self.latest_id == seen_id and not self.closed:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                if self._probing:
+                    # 다른 스레드가 조회 중 → 조회가 끝나면 notify_all로 깨어남
+                    self._cond.wait(deadline - now)
+                    continue
+                next_probe = self._probed_at + self.probe_interval
+                if now < next_probe:
+                    self._cond.wait(min(deadline, next_probe) - now)
+                    continue
+
+                self._probing = True
+                self._cond.release()
+                latest = None
+                try:
+                    latest = probe()
+                finally:
+                    self._cond.acquire()
+                    self._probing = False
+                    self._probed_at = time.monotonic()
+                    self.probes += 1
+                    if latest is not None and latest != self.latest_id:
+                        self.latest_id = latest
+                    self._cond.notify_all()
+            return self.latest_id
+
+
+# 프로세스 전역 감시자 (CommandModel.create → notify, long-poll → wait)
+command_watcher = CommandWatcher()
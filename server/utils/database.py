@@ -4,8 +4,12 @@ DB 연결 관리 및 쿼리 헬퍼 함수
 """
 import sqlite3
 import datetime
+import threading
+import time
 from flask import g
-from typing import Optional, List, Dict, Any, Union
+from typing import Callable, Optional, List, Dict, Any, Tuple, Union
+from .db_writer import DatabaseWriter, WriteJob
+from .query_stats import InstrumentedConnection, QueryStats
 
 
 # Python 3.12+ 호환성을 위한 datetime 어댑터 등록
@@ -21,39 +25,269 @@ sqlite3.register_adapter(datetime.datetime, adapt_datetime)
 sqlite3.register_converter("timestamp", convert_datetime)
 
 
+# 새 연결에 설치할 SQL 문 trace 콜백 (메트릭 수집용, None이면 설치하지 않음)
+_statement_hook: Optional[Callable[[str], None]] = None
+
+
+def set_statement_hook(hook: Optional[Callable[[str], None]]) -> None:
+    """이후 생성되는 모든 연결에 sqlite3 trace 콜백 설치 (init_db_manager 전에 호출)"""
+    global _statement_hook
+    _statement_hook = hook
+
+
+class ConnectionPool:
+    """사전 설정된 SQLite 연결 풀
+
+    - 연결마다 PRAGMA 설정은 생성 시 1회만 실행 (페이지 캐시가 요청 간 유지됨)
+    - 최대 크기 제한 (Semaphore) - gevent monkey patch 환경에서도 그대로 동작
+    - 오래 쉬던 연결은 반납받을 때 SELECT 1로 상태 확인 후 재사용
+    - ':memory:' DB는 연결마다 별도 DB가 되므로 단일 연결을 공유
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        timeout: int = 10,
+        busy_timeout: int = 5000,
+        max_size: int = 8,
+        statement_cache_size: int = 256,
+        health_check_interval: int = 30,
+        read_only: bool = False,
+        query_stats: Optional[QueryStats] = None
+    ):
+        self.db_path = db_path
+        self.timeout = timeout
+        self.busy_timeout = busy_timeout
+        self.max_size = max(1, max_size)
+        self.statement_cache_size = statement_cache_size
+        self.health_check_interval = health_check_interval
+        self.read_only = read_only
+        self.query_stats = query_stats
+
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._shared: Optional[sqlite3.Connection] = None
+        self.created = 0
+        self.discarded = 0
+
+    @property
+    def is_memory(self) -> bool:
+        return self.db_path == ':memory:'
+
+    def connect(self) -> sqlite3.Connection:
+        """새 연결 생성 + 1회성 초기화 (풀 밖에서 쓰는 전용 연결에도 사용)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit 모드 (성능 향상)
+            cached_statements=self.statement_cache_size,
+            factory=InstrumentedConnection if self.query_stats is not None else sqlite3.Connection
+        )
+        if self.query_stats is not None:
+            conn.query_stats = self.query_stats
+        conn.row_factory = sqlite3.Row
+
+        # SQLite 최적화 설정
+        conn.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging
+        conn.execute(f'PRAGMA busy_timeout={self.busy_timeout}')
+        conn.execute('PRAGMA synchronous=NORMAL')  # 성능 향상 (FULL → NORMAL)
+        conn.execute('PRAGMA cache_size=-64000')  # 64MB 캐시 (성능 향상)
+        conn.execute('PRAGMA temp_store=MEMORY')  # 임시 테이블 메모리 저장
+        if self.read_only:
+            conn.execute('PRAGMA query_only=1')  # 읽기 전용 (WAL에서 writer를 기다리지 않음)
+        if _statement_hook is not None:
+            conn.set_trace_callback(_statement_hook)
+
+        self.created += 1
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self) -> sqlite3.Connection:
+        """연결 대여 (풀이 가득 차면 timeout초까지 대기)"""
+        if self.is_memory:
+            with self._lock:
+                if self._shared is None:
+                    self._shared = self.connect()
+                return self._shared
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(
+                f"DB 연결 풀 고갈: {self.max_size}개 연결이 모두 사용 중입니다"
+            )
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    conn, released_at = self._idle.pop()
+                recently_used = time.monotonic() - released_at < self.health_check_interval
+                if recently_used or self._is_healthy(conn):
+                    return conn
+                self._discard(conn)
+            return self.connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """연결 반납 (열린 트랜잭션은 롤백)"""
+        if self.is_memory:
+            return
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        self.discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """풀 상태 (모니터링용)"""
+        with self._lock:
+            idle = len(self._idle)
+        return {
+            'max_size': self.max_size,
+            'idle': idle,
+            'created': self.created,
+            'discarded': self.discarded,
+        }
+
+    def close_all(self) -> None:
+        """유휴 연결 전부 닫기 (앱 종료/재초기화 시)"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            shared, self._shared = self._shared, None
+        for conn, _ in idle:
+            conn.close()
+        if shared is not None:
+            shared.close()
+
+
 class DatabaseManager:
-    """데이터베이스 연결 및 쿼리 관리 클래스"""
+    """데이터베이스 연결 및 쿼리 관리 클래스
+
+    - get_connection(): 읽기-쓰기 연결 (컨텍스트당 하나)
+    - get_read_connection(): query_only 연결 (대시보드/조회용)
+    - run_write(): 단일 writer 큐로 쓰기 작업 제출
+    - query_stats: slow_query_ms 지정 시 모든 연결의 SQL 문장별 시간/실행 계획 집계
+    """
 
-    def __init__(self, db_path: str, timeout: int = 10, busy_timeout: int = 5000):
+    def __init__(
+        self,
+        db_path: str,
+        timeout: int = 10,
+        busy_timeout: int = 5000,
+        pool_size: int = 8,
+        statement_cache_size: int = 256,
+        read_pool_size: int = 8,
+        use_writer: bool = False,
+        write_batch_size: int = 64,
+        slow_query_ms: Optional[float] = None
+    ):
         self.db_path = db_path
         self.timeout = timeout
         self.busy_timeout = busy_timeout
+        self.query_stats = QueryStats(slow_query_ms) if slow_query_ms is not None else None
+        self.pool = ConnectionPool(
+            db_path, timeout, busy_timeout,
+            max_size=pool_size,
+            statement_cache_size=statement_cache_size,
+            query_stats=self.query_stats
+        )
+        self.read_pool = ConnectionPool(
+            db_path, timeout, busy_timeout,
+            max_size=read_pool_size,
+            statement_cache_size=statement_cache_size,
+            read_only=True,
+            query_stats=self.query_stats
+        )
+        # ':memory:' DB는 연결 간 공유가 불가능하므로 writer 없이 현재 연결에서 실행
+        self.writer: Optional[DatabaseWriter] = None
+        if use_writer and not self.pool.is_memory:
+            self.writer = DatabaseWriter(
+                self.pool.connect,
+                max_batch=write_batch_size,
+                job_timeout=max(timeout, busy_timeout / 1000) * 3
+            )
 
     def get_connection(self) -> sqlite3.Connection:
-        """데이터베이스 연결 가져오기 (컨텍스트당 하나)"""
+        """데이터베이스 연결 가져오기 (컨텍스트당 하나, 풀에서 대여)"""
         if 'db' not in g:
-            g.db = sqlite3.connect(
-                self.db_path,
-                timeout=self.timeout,
-                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
-                check_same_thread=False,
-                isolation_level=None  # autocommit 모드 (성능 향상)
-            )
-            g.db.row_factory = sqlite3.Row
-
-            # SQLite 최적화 설정
-            g.db.execute('PRAGMA journal_mode=WAL')  # Write-Ahead Logging
-            g.db.execute(f'PRAGMA busy_timeout={self.busy_timeout}')
-            g.db.execute('PRAGMA synchronous=NORMAL')  # 성능 향상 (FULL → NORMAL)
-            g.db.execute('PRAGMA cache_size=-64000')  # 64MB 캐시 (성능 향상)
-            g.db.execute('PRAGMA temp_store=MEMORY')  # 임시 테이블 메모리 저장
+            g.db = self.pool.acquire()
         return g.db
 
+    def get_read_connection(self) -> sqlite3.Connection:
+        """읽기 전용 연결 가져오기 (컨텍스트당 하나)"""
+        if self.pool.is_memory:
+            return self.get_connection()
+        if 'read_db' not in g:
+            g.read_db = self.read_pool.acquire()
+        return g.read_db
+
+    def run_write(self, job: WriteJob) -> Any:
+        """쓰기 작업 실행 후 결과 반환 (커밋 완료 시점에 반환)
+
+        job은 연결을 인자로 받아 SQL을 실행하며 commit()을 호출하지 않는다.
+        writer가 없으면 현재 컨텍스트 연결에서 트랜잭션으로 실행한다.
+        """
+        if self.writer is not None:
+            return self.writer.execute(job)
+
+        db = self.get_connection()
+        if db.in_transaction:
+            return job(db)
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            result = job(db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+
     def close_connection(self, error=None):
-        """요청 종료 시 데이터베이스 연결 닫기"""
+        """요청 종료 시 데이터베이스 연결을 풀에 반납"""
         db = g.pop('db', None)
         if db is not None:
-            db.close()
+            self.pool.release(db)
+        read_db = g.pop('read_db', None)
+        if read_db is not None:
+            self.read_pool.release(read_db)
+
+    def stats(self) -> Dict[str, Any]:
+        """연결 풀 / writer 큐 상태 (모니터링용)"""
+        return {
+            'pool': self.pool.stats(),
+            'read_pool': self.read_pool.stats(),
+            'writer': self.writer.stats() if self.writer else None,
+        }
+
+    def close(self):
+        """writer 종료 및 풀의 모든 연결 닫기"""
+        if self.writer is not None:
+            self.writer.stop()
+        self.pool.close_all()
+        self.read_pool.close_all()
 
     def execute_query(
         self,
@@ -94,10 +328,28 @@ class DatabaseManager:
 _db_manager: Optional[DatabaseManager] = None
 
 
-def init_db_manager(db_path: str, timeout: int = 10, busy_timeout: int = 5000):
-    """데이터베이스 매니저 초기화"""
+def init_db_manager(
+    db_path: str,
+    timeout: int = 10,
+    busy_timeout: int = 5000,
+    pool_size: int = 8,
+    statement_cache_size: int = 256,
+    read_pool_size: int = 8,
+    use_writer: bool = False,
+    write_batch_size: int = 64,
+    slow_query_ms: Optional[float] = None
+):
+    """데이터베이스 매니저 초기화 (기존 매니저의 풀은 닫음)"""
     global _db_manager
-    _db_manager = DatabaseManager(db_path, timeout, busy_timeout)
+    if _db_manager is not None:
+        _db_manager.close()
+    _db_manager = DatabaseManager(
+        db_path, timeout, busy_timeout, pool_size, statement_cache_size,
+        read_pool_size=read_pool_size,
+        use_writer=use_writer,
+        write_batch_size=write_batch_size,
+        slow_query_ms=slow_query_ms
+    )
     return _db_manager
 
 
@@ -108,6 +360,34 @@ def get_db() -> sqlite3.Connection:
     return _db_manager.get_connection()
 
 
+def get_read_db() -> sqlite3.Connection:
+    """읽기 전용 데이터베이스 연결 가져오기 (writer를 기다리지 않는 조회용)"""
+    if _db_manager is None:
+        raise RuntimeError("DatabaseManager가 초기화되지 않았습니다. init_db_manager()를 먼저 호출하세요.")
+    return _db_manager.get_read_connection()
+
+
+def run_write(job: WriteJob) -> Any:
+    """쓰기 작업 실행 (단일 writer 큐 또는 현재 연결)"""
+    if _db_manager is None:
+        raise RuntimeError("DatabaseManager가 초기화되지 않았습니다. init_db_manager()를 먼저 호출하세요.")
+    return _db_manager.run_write(job)
+
+
+def get_db_stats() -> Dict[str, Any]:
+    """연결 풀 / writer 큐 상태"""
+    if _db_manager is None:
+        return {}
+    return _db_manager.stats()
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """SQL 문장 통계 (WCMS_DB_QUERY_STATS 비활성 시 None)"""
+    if _db_manager is None:
+        return None
+    return _db_manager.query_stats
+
+
 def close_db(error=None):
     """데이터베이스 연결 닫기"""
     if _db_manager:
@@ -0,0 +1,157 @@
+"""
+단일 writer 큐
+읽기-쓰기 연결을 하나만 소유하는 전용 스레드가 쓰기 작업을 모아서
+배치 트랜잭션으로 실행한다. 요청 처리 스레드(greenlet)는 SQLite 잠금을
+두고 경쟁하지 않고 큐에 작업을 넣은 뒤 결과만 기다린다.
+"""
+import contextvars
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger('wcms.db_writer')
+
+WriteJob = Callable[[sqlite3.Connection], Any]
+QueuedJob = Tuple[WriteJob, Future, float, contextvars.Context]
+
+
+class DatabaseWriter:
+    """전용 writer 스레드 + 작업 큐"""
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        max_batch: int = 64,
+        job_timeout: float = 30.0,
+        latency_window: int = 1024
+    ):
+        self._connect = connect
+        self.max_batch = max(1, max_batch)
+        self.job_timeout = job_timeout
+
+        self._queue: 'queue.Queue[Optional[QueuedJob]]' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self._latencies: deque = deque(maxlen=latency_window)
+        self.jobs_total = 0
+        self.errors_total = 0
+        self.batches_total = 0
+        self.max_latency = 0.0
+
+    def start(self) -> None:
+        """writer 스레드 시작 (최초 제출 시 자동 호출)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='wcms-db-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """대기 중인 작업을 모두 처리한 뒤 writer 종료"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, job: WriteJob) -> Future:
+        """쓰기 작업 제출. job(conn)의 반환값이 Future 결과가 된다.
+
+        job은 제출한 스레드의 contextvars 컨텍스트에서 실행된다 (요청별 메트릭 집계용).
+        """
+        self.start()
+        future: Future = Future()
+        self._queue.put((job, future, time.perf_counter(), contextvars.copy_context()))
+        return future
+
+    def execute(self, job: WriteJob) -> Any:
+        """쓰기 작업 제출 후 커밋될 때까지 대기"""
+        return self.submit(job).result(timeout=self.job_timeout)
+
+    def _next_batch(self) -> Tuple[List[QueuedJob], bool]:
+        """큐에서 최대 max_batch개 작업 꺼내기. (작업 목록, 종료 요청 여부)"""
+        item = self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        conn = self._connect()
+        logger.info("[*] DB writer 스레드 시작")
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._run_batch(conn, batch)
+        conn.close()
+        logger.info("[*] DB writer 스레드 종료")
+
+    def _run_batch(self, conn: sqlite3.Connection, batch: List[QueuedJob]) -> None:
+        """작업마다 SAVEPOINT를 두어 실패한 작업만 되돌리고 나머지는 함께 커밋"""
+        outcomes: List[Tuple[Future, float, Any, Optional[BaseException]]] = []
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for job, future, submitted_at, context in batch:
+                conn.execute('SAVEPOINT job')
+                try:
+                    result = context.run(job, conn)
+                    conn.execute('RELEASE SAVEPOINT job')
+                    outcomes.append((future, submitted_at, result, None))
+                except Exception as e:
+                    conn.execute('ROLLBACK TO SAVEPOINT job')
+                    conn.execute('RELEASE SAVEPOINT job')
+                    outcomes.append((future, submitted_at, None, e))
+            conn.execute('COMMIT')
+        except Exception as e:
+            logger.error(f"[!] DB writer 배치 커밋 실패: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            outcomes = [(future, submitted_at, None, e) for _, future, submitted_at, _ in batch]
+
+        finished_at = time.perf_counter()
+        self.batches_total += 1
+        for future, submitted_at, result, error in outcomes:
+            latency = finished_at - submitted_at
+            self._latencies.append(latency)
+            self.max_latency = max(self.max_latency, latency)
+            self.jobs_total += 1
+            if error is not None:
+                self.errors_total += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """큐 깊이 및 작업 지연 시간 (모니터링용, 단위 ms)"""
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'queue_depth': self._queue.qsize(),
+            'jobs_total': self.jobs_total,
+            'errors_total': self.errors_total,
+            'batches_total': self.batches_total,
+            'latency_p50_ms': pct(0.50),
+            'latency_p99_ms': pct(0.99),
+            'latency_max_ms': round(self.max_latency * 1000, 2),
+        }
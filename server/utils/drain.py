@@ -0,0 +1,113 @@
+"""
+서버 재시작 시 long-poll 정리 (drain)
+gunicorn을 재시작하면 열린 /api/client/commands long-poll이 모두 끊겨 PC 수백 대가
+동시에 ConnectionError → /offline 신호를 보내고, 가짜 network_events가 쌓인다.
+
+워커가 SIGTERM을 받으면:
+1. 새 long-poll은 받지 않음 (503 + 지터 있는 Retry-After)
+2. 대기 중인 long-poll은 즉시 "N밀리초 뒤 재연결"(지터) 응답으로 돌려보냄
+3. writer 큐에 남은 쓰기를 커밋
+4. 재시작 유예 구간(DRAIN_GRACE_SECONDS)을 DB에 기록 → 그동안 오프라인 전환/오프라인 신호 무시
+   (새로 뜬 워커도 같은 DB를 보므로 재시작 전후 모두 적용)
+
+- 테이블은 schema.sql (기존 DB는 migrations/008_restart_windows.sql)
+"""
+import logging
+import random
+import signal
+import threading
+import time
+from typing import Optional
+
+from .command_watcher import command_watcher
+from .database import get_read_db, run_write
+
+logger = logging.getLogger('wcms')
+
+
+class DrainController:
+    """프로세스 단위 drain 상태"""
+
+    def __init__(self):
+        self.draining = False
+        self.reconnect_min_ms = 2000
+        self.reconnect_max_ms = 15000
+
+    def configure(self, reconnect_min_ms: int, reconnect_max_ms: int) -> None:
+        self.reconnect_min_ms = reconnect_min_ms
+        self.reconnect_max_ms = max(reconnect_min_ms, reconnect_max_ms)
+
+    def reconnect_after_ms(self) -> int:
+        """재연결 대기 시간 (새 워커가 뜨는 동안 PC들이 한꺼번에 몰리지 않도록 균등 지터)"""
+        return random.randint(self.reconnect_min_ms, self.reconnect_max_ms)
+
+    def begin(self) -> bool:
+        """drain 시작: 대기 중인 long-poll을 깨움 (처음 호출만 True)"""
+        if self.draining:
+            return False
+        self.draining = True
+        command_watcher.close()
+        return True
+
+    def reset(self) -> None:
+        """drain 해제 (앱 재생성, 테스트)"""
+        self.draining = False
+        command_watcher.reopen()
+
+
+drain = DrainController()
+
+
+def record_restart_window(grace_seconds: float, reason: str) -> None:
+    """재시작 유예 구간 기록 (여러 워커가 기록하면 가장 늦은 끝 시각이 적용됨)"""
+    now = time.time()
+
+    def job(db):
+        db.execute('DELETE FROM restart_windows WHERE grace_until < ?', (now - 86400,))
+        db.execute('INSERT INTO restart_windows (reason, started_at, grace_until) VALUES (?, ?, ?)',
+                   (reason, now, now + grace_seconds))
+
+    run_write(job)
+
+
+def in_restart_window(db=None) -> bool:
+    """재시작 유예 구간인지 (오프라인 전환/오프라인 신호를 무시할지)"""
+    db = db or get_read_db()
+    row = db.execute('SELECT MAX(grace_until) FROM restart_windows').fetchone()
+    return row[0] is not None and row[0] > time.time()
+
+
+def drain_and_flush(app, reason: str = 'shutdown') -> None:
+    """drain 시작 + 유예 구간 기록 + 남은 쓰기 커밋 (시그널 핸들러 밖의 스레드에서 호출)"""
+    if not drain.begin():
+        return
+    logger.info(f"[drain] long-poll 정리 시작 ({reason})")
+    try:
+        with app.app_context():
+            record_restart_window(app.config['DRAIN_GRACE_SECONDS'], reason)
+            # writer 큐는 FIFO이므로 빈 작업이 끝나면 앞서 제출된 쓰기도 모두 커밋됨
+            run_write(lambda db: None)
+    except Exception as e:
+        logger.error(f"[drain] 유예 구간 기록/쓰기 정리 실패: {e}")
+
+
+def install_drain_handler(app, signum: int = signal.SIGTERM) -> Optional[object]:
+    """SIGTERM 시 drain (gunicorn 워커의 기존 종료 핸들러는 이어서 호출)
+
+    기존 핸들러가 Python 함수가 아니면(개발 서버 등) 설치하지 않는다.
+
+    Returns:
+        이전 핸들러 (설치하지 않았으면 None)
+    """
+    previous = signal.getsignal(signum)
+    if not callable(previous):
+        return None
+
+    def handler(sig, frame):
+        # 시그널 핸들러 안에서는 락/DB를 쓰지 않고 스레드로 넘김
+        threading.Thread(target=drain_and_flush, args=(app,), name='wcms-drain',
+                         daemon=True).start()
+        previous(sig, frame)
+
+    signal.signal(signum, handler)
+    return previous
@@ -0,0 +1,107 @@
+"""
+Flask-Limiter용 SQLite 저장소 (워커 간 Rate Limit 공유)
+memory:// 저장소는 워커마다 카운터가 따로 있어 워커 N개면 한도가 N배가 된다.
+이 모듈을 임포트하면 limits 저장소 레지스트리에 'sqlite' 스킴이 등록된다.
+
+    RATELIMIT_STORAGE_URI = 'sqlite:////var/lib/wcms/ratelimit.sqlite3'
+
+고정 윈도우(fixed-window) 전략만 지원한다 (Flask-Limiter 기본값).
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from limits.storage import Storage
+
+
+class SQLiteLimiterStorage(Storage):
+    """키별 (카운터, 만료 시각) 한 행. 연결은 스레드마다 하나"""
+
+    STORAGE_SCHEME = ['sqlite']
+
+    # incr 이 횟수마다 만료된 행 정리
+    PURGE_EVERY = 1000
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # sqlite:///relative/path, sqlite:////absolute/path
+        self.path = uri[len('sqlite:///'):]
+        if not self.path:
+            raise ValueError('sqlite Rate Limit 저장소에는 파일 경로가 필요합니다 (sqlite:////path/to/file)')
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.busy_timeout = int(options.get('busy_timeout', 5000))
+        self._local = threading.local()
+        self._incr_count = 0
+        self._connect().execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout / 1000,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f'PRAGMA busy_timeout={self.busy_timeout}')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        """카운터 증가 (만료된 키는 amount부터 다시 시작), 증가 후 값 반환"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('''
+                INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    count = CASE WHEN expires_at <= ? THEN excluded.count
+                                 ELSE count + excluded.count END,
+                    expires_at = CASE WHEN expires_at <= ? OR ? THEN excluded.expires_at
+                                      ELSE expires_at END
+            ''', (key, amount, now + expiry, now, now, int(elastic_expiry)))
+            count = conn.execute('SELECT count FROM rate_limits WHERE key=?', (key,)).fetchone()[0]
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._incr_count += 1
+        if self._incr_count % self.PURGE_EVERY == 0:
+            conn.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+        return count
+
+    def get(self, key: str) -> int:
+        row = self._connect().execute(
+            'SELECT count FROM rate_limits WHERE key=? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._connect().execute(
+            'SELECT expires_at FROM rate_limits WHERE key=? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connect().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._connect().execute('DELETE FROM rate_limits').rowcount
+
+    def clear(self, key: str) -> None:
+        self._connect().execute('DELETE FROM rate_limits WHERE key=?', (key,))
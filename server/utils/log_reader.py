@@ -0,0 +1,299 @@
+"""
+서버 로그 읽기 유틸리티
+- tail_lines(): 파일 끝에서부터 역방향으로 필요한 바이트만 읽어 마지막 N줄 반환
+- LogIndex: 로그 항목(시각, 레벨, PC ID, 명령 ID → 파일 오프셋)을 SQLite에 증분 색인
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .database import ConnectionPool
+
+# '[2026-01-01 12:00:00,123] INFO: 메시지' (app.py 로그 포맷)
+LOG_LINE_RE = re.compile(rb'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),\d+\] (\w+): ')
+PC_ID_RE = re.compile(r'(?:\bPC |pc_id=)(\d+)')
+COMMAND_ID_RE = re.compile(r'(?:명령 |cmd_id=|command_id=)(\d+)')
+
+MAX_ENTRY_BYTES = 16 * 1024  # 검색 결과 1건당 최대 읽기 크기 (traceback 포함)
+
+
+def tail_lines(path: str, count: int = 200, chunk_size: int = 64 * 1024) -> List[str]:
+    """파일의 마지막 count줄 (파일 전체를 읽지 않음)
+
+    Args:
+        path: 로그 파일 경로
+        count: 반환할 줄 수
+        chunk_size: 역방향으로 한 번에 읽을 바이트 수
+
+    Returns:
+        줄 리스트 (개행 포함, 오래된 순)
+    """
+    if count <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        # 마지막 줄이 개행으로 끝나면 count+1개의 개행이 필요
+        while position > 0 and data.count(b'\n') <= count:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+
+    lines = data.splitlines(keepends=True)
+    return [line.decode('utf-8', errors='replace') for line in lines[-count:]]
+
+
+class LogIndex:
+    """로테이션되는 로그 파일의 증분 색인
+
+    RotatingFileHandler는 server.log → server.log.1 → ... 로 이름만 바꾸므로
+    파일은 첫 줄의 해시로 식별한다. 이름이 바뀐 파일은 이미 색인한 오프셋부터
+    이어서 읽고, 로테이션으로 삭제된 파일의 항목은 다음 갱신 때 제거한다.
+    """
+
+    def __init__(self, log_file: str, index_path: str):
+        self.log_file = log_file
+        self._pool = ConnectionPool(index_path, max_size=2)
+        self._refresh_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS log_files (
+                    file_key TEXT PRIMARY KEY,
+                    indexed_offset INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS log_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_key TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    logged_at TEXT NOT NULL,
+                    level TEXT NOT NULL,
+                    pc_id INTEGER,
+                    command_id INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_log_entries_time ON log_entries(logged_at);
+                CREATE INDEX IF NOT EXISTS idx_log_entries_pc ON log_entries(pc_id, logged_at)
+                    WHERE pc_id IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_log_entries_command
+                    ON log_entries(command_id, logged_at)
+                    WHERE command_id IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_log_entries_file ON log_entries(file_key, offset);
+            ''')
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.acquire()
+        try:
+            yield conn
+        finally:
+            self._pool.release(conn)
+
+    def _log_paths(self) -> List[str]:
+        """현재 로그 파일 목록 (오래된 백업 → 현재 파일 순)"""
+        directory = os.path.dirname(self.log_file) or '.'
+        base = os.path.basename(self.log_file)
+        backups = []
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                suffix = name[len(base) + 1:]
+                if name.startswith(base + '.') and suffix.isdigit():
+                    backups.append((int(suffix), os.path.join(directory, name)))
+        paths = [path for _, path in sorted(backups, reverse=True)]
+        if os.path.exists(self.log_file):
+            paths.append(self.log_file)
+        return paths
+
+    @staticmethod
+    def _file_key(path: str) -> Optional[str]:
+        """첫 줄 해시 (빈 파일은 None)"""
+        with open(path, 'rb') as f:
+            first_line = f.readline()
+        if not first_line.endswith(b'\n'):
+            return None
+        return hashlib.sha1(first_line).hexdigest()
+
+    def _current_files(self) -> Dict[str, str]:
+        """file_key → 현재 경로"""
+        files = {}
+        for path in self._log_paths():
+            try:
+                key = self._file_key(path)
+            except OSError:
+                continue
+            if key:
+                files[key] = path
+        return files
+
+    def refresh(self) -> int:
+        """새로 추가된 로그 줄 색인
+
+        Returns:
+            새로 색인한 항목 수
+        """
+        with self._refresh_lock:
+            files = self._current_files()
+            added = 0
+            with self._connection() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    known = {
+                        row['file_key']: row['indexed_offset']
+                        for row in conn.execute('SELECT file_key, indexed_offset FROM log_files')
+                    }
+                    for key in set(known) - set(files):
+                        conn.execute('DELETE FROM log_entries WHERE file_key=?', (key,))
+                        conn.execute('DELETE FROM log_files WHERE file_key=?', (key,))
+
+                    for key, path in files.items():
+                        offset = known.get(key, 0)
+                        rows, offset = self._scan(path, key, offset)
+                        if rows:
+                            conn.executemany('''
+                                INSERT INTO log_entries
+                                    (file_key, offset, logged_at, level, pc_id, command_id)
+                                VALUES (?, ?, ?, ?, ?, ?)
+                            ''', rows)
+                            added += len(rows)
+                        conn.execute('''
+                            INSERT INTO log_files (file_key, indexed_offset) VALUES (?, ?)
+                            ON CONFLICT(file_key) DO UPDATE
+                                SET indexed_offset=excluded.indexed_offset
+                        ''', (key, offset))
+                    conn.execute('COMMIT')
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+            return added
+
+    @staticmethod
+    def _scan(path: str, key: str, offset: int) -> Tuple[List[Tuple[Any, ...]], int]:
+        """offset부터 완성된 줄만 읽어 색인 행 생성. (행 목록, 다음 offset)"""
+        rows = []
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # 아직 쓰는 중인 줄은 다음 갱신 때
+                match = LOG_LINE_RE.match(line)
+                if match:
+                    message = line[match.end():].decode('utf-8', errors='replace')
+                    pc_match = PC_ID_RE.search(message)
+                    command_match = COMMAND_ID_RE.search(message)
+                    rows.append((
+                        key,
+                        offset,
+                        match.group(1).decode(),
+                        match.group(2).decode(),
+                        int(pc_match.group(1)) if pc_match else None,
+                        int(command_match.group(1)) if command_match else None,
+                    ))
+                offset += len(line)
+        return rows, offset
+
+    def search(
+        self,
+        level: Optional[str] = None,
+        pc_id: Optional[int] = None,
+        command_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 200
+    ) -> List[Dict[str, Any]]:
+        """조건에 맞는 로그 항목 검색 (최신순)
+
+        Args:
+            level: 로그 레벨 (INFO, WARNING, ERROR ...)
+            pc_id: PC ID
+            command_id: 명령 ID
+            since: 시작 시각 (포함)
+            until: 종료 시각 (포함)
+            limit: 최대 결과 수
+
+        Returns:
+            {'logged_at', 'level', 'pc_id', 'command_id', 'text'} 리스트
+        """
+        self.refresh()
+
+        conditions, params = [], []
+        if level:
+            conditions.append('level=?')
+            params.append(level.upper())
+        if pc_id is not None:
+            conditions.append('pc_id=?')
+            params.append(pc_id)
+        if command_id is not None:
+            conditions.append('command_id=?')
+            params.append(command_id)
+        if since:
+            conditions.append('logged_at >= ?')
+            params.append(since.strftime('%Y-%m-%d %H:%M:%S'))
+        if until:
+            conditions.append('logged_at <= ?')
+            params.append(until.strftime('%Y-%m-%d %H:%M:%S'))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self._connection() as conn:
+            rows = conn.execute(f'''
+                SELECT file_key, offset, logged_at, level, pc_id, command_id
+                FROM log_entries {where}
+                ORDER BY logged_at DESC, id DESC
+                LIMIT ?
+            ''', (*params, limit)).fetchall()
+
+        files = self._current_files()
+        results = []
+        for row in rows:
+            path = files.get(row['file_key'])
+            if not path:
+                continue  # 검색 도중 로테이션으로 삭제됨
+            results.append({
+                'logged_at': row['logged_at'],
+                'level': row['level'],
+                'pc_id': row['pc_id'],
+                'command_id': row['command_id'],
+                'text': self._read_entry(path, row['offset']),
+            })
+        return results
+
+    @staticmethod
+    def _read_entry(path: str, offset: int) -> str:
+        """offset의 로그 항목 (다음 항목 헤더 전까지의 연속 줄 포함)"""
+        lines = []
+        size = 0
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if lines and LOG_LINE_RE.match(line):
+                    break
+                lines.append(line)
+                size += len(line)
+                if size >= MAX_ENTRY_BYTES:
+                    break
+        return b''.join(lines).decode('utf-8', errors='replace').rstrip('\n')
+
+    def close(self) -> None:
+        self._pool.close_all()
+
+
+_log_indexes: Dict[Tuple[str, str], LogIndex] = {}
+_log_indexes_lock = threading.Lock()
+
+
+def get_log_index(log_file: str, index_path: str) -> LogIndex:
+    """로그 파일별 LogIndex (프로세스당 1개)"""
+    key = (log_file, index_path)
+    with _log_indexes_lock:
+        index = _log_indexes.get(key)
+        if index is None:
+            os.makedirs(os.path.dirname(index_path) or '.', exist_ok=True)
+            index = LogIndex(log_file, index_path)
+            _log_indexes[key] = index
+        return index
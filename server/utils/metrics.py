@@ -0,0 +1,215 @@
+"""
+요청 메트릭 (Prometheus 텍스트 노출 형식)
+- 엔드포인트별 지연 시간 히스토그램, 상태 코드별 요청 수, 처리 중 요청 수, 실행 SQL 문 수
+- 플릿 게이지 (온라인 PC, 대기 명령, 열린 long-poll, writer 큐)는 /metrics 수집 시점에 계산
+
+외부 라이브러리 없이 락 하나로 갱신한다. 요청당 비용은 perf_counter 2회 + 락 2회 수준.
+
+워커 여러 개 (WCMS_WORKERS > 1):
+- 요청 메트릭과 프로세스 게이지(long-poll, writer 큐, 입장 제어)는 워커마다 따로 세고
+  worker="<PID>" 라벨을 붙인다. 한 번의 수집은 요청을 받은 워커 하나의 값만 보여준다.
+- 워커별 시계열은 각자 단조 증가하므로 rate()는 워커별로 계산한 뒤 합친다
+  (예: sum(rate(wcms_http_requests_total[5m])), sum(max_over_time(wcms_longpolls_open[1m])))
+- 워커 재시작은 wcms_process_start_time_seconds로 구분 (PID 재사용 대비)
+- PC/명령 게이지는 DB에서 계산하므로 어느 워커가 응답해도 같고 worker 라벨이 없다
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, g, request
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 초 단위 버킷 (long-poll 30~60초까지 포함)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 30.0, 60.0)
+LONG_POLL_ENDPOINT = 'client.poll_commands'
+
+# 세지 않는 문장 (트랜잭션 제어, query_stats의 실행 계획 조회)
+_UNCOUNTED_PREFIXES = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE', 'EXPLAIN')
+
+
+class RequestStats:
+    """요청 1건의 SQL 문 수 (writer 스레드에서 실행된 작업 포함)"""
+    __slots__ = ('queries', 'last_statement')
+
+    def __init__(self):
+        self.queries = 0
+        self.last_statement = None
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar('wcms_request_stats',
+                                                                  default=None)
+
+
+def count_statement(statement: str) -> None:
+    """sqlite3 trace 콜백 (set_statement_hook으로 설치)
+
+    트리거/REPLACE 내부 단계는 같은 문장 텍스트로 다시 보고되므로 연속 중복은 한 번으로 센다.
+    """
+    stats = _current_request.get()
+    if stats is None or statement == stats.last_statement:
+        return
+    if statement.startswith(_UNCOUNTED_PREFIXES):
+        return
+    stats.last_statement = statement
+    stats.queries += 1
+
+
+class MetricsRegistry:
+    """엔드포인트별 카운터/히스토그램 저장소 (프로세스당 1개)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # (endpoint, method) → [버킷별 개수..., +Inf 개수], 합계
+        self._histograms: Dict[Tuple[str, str], List[int]] = {}
+        self._sums: Dict[Tuple[str, str], float] = {}
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._queries: Dict[str, int] = {}
+        self.started_at = time.time()
+
+    def start(self, endpoint: str) -> None:
+        with self._lock:
+            self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+
+    def finish(self, endpoint: str, method: str, status: int, duration: float,
+               queries: int) -> None:
+        index = bisect_left(self.buckets, duration)
+        key = (endpoint, method)
+        with self._lock:
+            self._in_flight[endpoint] -= 1
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += duration
+            status_key = (endpoint, method, str(status))
+            self._requests[status_key] = self._requests.get(status_key, 0) + 1
+            self._queries[endpoint] = self._queries.get(endpoint, 0) + queries
+
+    def in_flight(self, endpoint: str) -> int:
+        with self._lock:
+            return self._in_flight.get(endpoint, 0)
+
+    def render(self, worker: Optional[str] = None) -> List[str]:
+        """요청 메트릭 텍스트 줄 (worker가 있으면 모든 시계열에 worker 라벨)"""
+        with self._lock:
+            histograms = {key: list(counts) for key, counts in self._histograms.items()}
+            sums = dict(self._sums)
+            requests_total = dict(self._requests)
+            in_flight = dict(self._in_flight)
+            queries = dict(self._queries)
+
+        worker_label = f',worker="{worker}"' if worker else ''
+        metric = 'wcms_http_request_duration_seconds'
+        lines = [f'# HELP {metric} 요청 처리 시간', f'# TYPE {metric} histogram']
+        for (endpoint, method), counts in sorted(histograms.items()):
+            labels = f'endpoint="{_escape(endpoint)}",method="{method}"{worker_label}'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{labels}}} {sums[(endpoint, method)]:.6f}')
+            lines.append(f'{metric}_count{{{labels}}} {cumulative}')
+
+        lines += ['# HELP wcms_http_requests_total 상태 코드별 요청 수',
+                  '# TYPE wcms_http_requests_total counter']
+        for (endpoint, method, status), count in sorted(requests_total.items()):
+            labels = f'endpoint="{_escape(endpoint)}",method="{method}",status="{status}"'
+            lines.append(f'wcms_http_requests_total{{{labels}{worker_label}}} {count}')
+
+        lines += ['# HELP wcms_http_requests_in_flight 처리 중인 요청 수',
+                  '# TYPE wcms_http_requests_in_flight gauge']
+        for endpoint, count in sorted(in_flight.items()):
+            labels = f'endpoint="{_escape(endpoint)}"{worker_label}'
+            lines.append(f'wcms_http_requests_in_flight{{{labels}}} {count}')
+
+        lines += ['# HELP wcms_http_db_queries_total 요청 처리 중 실행한 SQL 문 수',
+                  '# TYPE wcms_http_db_queries_total counter']
+        for endpoint, count in sorted(queries.items()):
+            labels = f'endpoint="{_escape(endpoint)}"{worker_label}'
+            lines.append(f'wcms_http_db_queries_total{{{labels}}} {count}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+def init_metrics(app: Flask) -> None:
+    """요청 계측 훅 등록 (다른 확장보다 먼저 호출해야 before_request가 가장 먼저 실행됨)"""
+
+    @app.before_request
+    def _start_request_metrics():
+        endpoint = request.endpoint or 'unmatched'
+        stats = RequestStats()
+        g._metrics = (endpoint, time.perf_counter(), stats, _current_request.set(stats))
+        registry.start(endpoint)
+
+    @app.after_request
+    def _record_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _finish_request_metrics(error=None):
+        state = g.pop('_metrics', None)
+        if state is None:
+            return
+        endpoint, started, stats, token = state
+        try:
+            _current_request.reset(token)
+        except ValueError:  # 다른 컨텍스트에서 정리되는 경우
+            _current_request.set(None)
+        status = g.pop('_metrics_status', 500 if error is not None else 200)
+        registry.finish(endpoint, request.method, status, time.perf_counter() - started,
+                        stats.queries)
+
+
+def render_metrics() -> str:
+    """/metrics 응답 본문 (요청 메트릭 + 플릿 게이지)"""
+    from .admission import admission
+    from .database import get_db_stats, get_read_db
+
+    worker = str(os.getpid())
+    lines = registry.render(worker)
+
+    db = get_read_db()
+    pcs_total, pcs_online = db.execute(
+        'SELECT COUNT(*), COALESCE(SUM(is_online = 1), 0) FROM pc_info'
+    ).fetchone()
+    pending = db.execute("SELECT COUNT(*) FROM commands WHERE status='pending'").fetchone()[0]
+    writer = get_db_stats().get('writer') or {}
+
+    # DB 기준 (모든 워커가 같은 값)
+    fleet_gauges = [
+        ('wcms_pcs_total', '등록된 PC 수', pcs_total),
+        ('wcms_pcs_online', '온라인 PC 수', pcs_online),
+        ('wcms_commands_pending', '대기 중인 명령 수', pending),
+    ]
+    # 워커 프로세스 기준
+    worker_gauges = [
+        ('wcms_process_start_time_seconds', '워커 프로세스 시작 시각 (Unix 초)',
+         f'{registry.started_at:.3f}'),
+        ('wcms_longpolls_open', '대기 중인 long-poll 연결 수', registry.in_flight(LONG_POLL_ENDPOINT)),
+        ('wcms_db_write_queue_depth', 'DB writer 큐 깊이', writer.get('queue_depth', 0)),
+        ('wcms_admission_in_use', '처리 중인 등록/전체 하트비트 수 (입장 제어)', admission.in_use),
+    ]
+    for name, help_text, value in fleet_gauges:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge', f'{name} {value}']
+    for name, help_text, value in worker_gauges:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge',
+                  f'{name}{{worker="{worker}"}} {value}']
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,92 @@
+"""
+PC 식별 맵 (machine_id → pc_id, is_online, ip_address)
+클라이언트 API(하트비트, long-poll, 종료/오프라인 신호)는 모두 machine_id로 PC를 찾는 조회로
+시작했다. 처음 사용할 때 pc_info 전체를 한 번 읽어 프로세스 메모리에 두고, 이후에는 조회 없이 답한다.
+
+- 등록 API는 put(), PC 삭제 API는 evict_pc()로 갱신
+- 다른 워커가 등록한 PC는 맵에 없으면 한 번 조회해서 채움
+- 다른 워커가 바꾼 상태(삭제, 오프라인 전환)는 맵이 모르므로, 호출자는 조건부 UPDATE의
+  rowcount로 어긋남을 감지하고 refresh()로 다시 읽는다
+"""
+import threading
+from typing import Any, Dict, Optional
+
+from .database import get_read_db
+
+
+def _entry(row) -> Dict[str, Any]:
+    return {'id': row['id'], 'is_online': bool(row['is_online']), 'ip_address': row['ip_address']}
+
+
+class PCIdentityMap:
+    """프로세스 단위 PC 식별 맵"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        rows = get_read_db().execute(
+            'SELECT machine_id, id, is_online, ip_address FROM pc_info'
+        ).fetchall()
+        entries = {row['machine_id']: _entry(row) for row in rows}
+        with self._lock:
+            # 읽는 동안 put()된 항목이 더 최신
+            entries.update(self._entries)
+            self._entries = entries
+            self._loaded = True
+
+    def get(self, machine_id: str) -> Optional[Dict[str, Any]]:
+        """machine_id의 {id, is_online, ip_address} (등록되지 않았으면 None)"""
+        if not self._loaded:
+            self._load()
+        entry = self._entries.get(machine_id)
+        if entry is None:
+            entry = self.refresh(machine_id)
+        return entry
+
+    def refresh(self, machine_id: str) -> Optional[Dict[str, Any]]:
+        """DB에서 다시 읽기 (맵과 DB가 어긋났을 때)"""
+        row = get_read_db().execute(
+            'SELECT id, is_online, ip_address FROM pc_info WHERE machine_id=?', (machine_id,)
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self._entries.pop(machine_id, None)
+                return None
+            entry = self._entries[machine_id] = _entry(row)
+        return entry
+
+    def put(self, machine_id: str, pc_id: int, is_online: bool, ip_address: Optional[str]) -> None:
+        """등록/갱신된 PC 기록"""
+        with self._lock:
+            self._entries[machine_id] = {'id': pc_id, 'is_online': is_online,
+                                         'ip_address': ip_address}
+
+    def update(self, machine_id: str, **fields) -> None:
+        """is_online/ip_address 변경 반영 (항목은 통째로 교체, 읽는 쪽은 락 없이 봄)"""
+        with self._lock:
+            entry = self._entries.get(machine_id)
+            if entry is not None:
+                self._entries[machine_id] = {**entry, **fields}
+
+    def evict(self, machine_id: str) -> None:
+        with self._lock:
+            self._entries.pop(machine_id, None)
+
+    def evict_pc(self, pc_id: int) -> None:
+        """PC 삭제 시 (pc_id로 제거)"""
+        with self._lock:
+            for machine_id, entry in list(self._entries.items()):
+                if entry['id'] == pc_id:
+                    del self._entries[machine_id]
+
+    def clear(self) -> None:
+        """맵 비우기 (앱 재생성 시, 다음 사용 때 다시 읽음)"""
+        with self._lock:
+            self._entries = {}
+            self._loaded = False
+
+
+pc_identity = PCIdentityMap()
@@ -0,0 +1,286 @@
+"""
+SQL 계측 (선택 기능, WCMS_DB_QUERY_STATS=true)
+- 문장별 실행 시간(execute + fetch)과 행 수를 정규화한 문장 텍스트 단위로 집계
+- 처음 보는 문장은 EXPLAIN QUERY PLAN을 1회 저장 → 인덱스 사용 여부 확인
+- 임계값(WCMS_DB_SLOW_QUERY_MS)을 넘은 실행은 실행 계획과 함께 경고 로그
+- top-N 리포트: GET /api/debug/queries
+
+ConnectionPool이 InstrumentedConnection 팩토리로 연결을 만들 때만 동작하며,
+비활성 시에는 일반 sqlite3.Connection을 그대로 사용한다.
+"""
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('wcms.query_stats')
+
+# 실행 계획을 확인할 문장 (PRAGMA/DDL/트랜잭션 제어 제외)
+_PLANNABLE = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+_INDEX_IN_PLAN = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def normalize_statement(sql: str) -> str:
+    """리터럴과 IN 목록 길이를 지운 문장 텍스트 (집계 키)"""
+    text = _STRING_LITERAL.sub('?', sql)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _WHITESPACE.sub(' ', text).strip()
+    return _IN_LIST.sub('IN (...)', text)
+
+
+class _StatementStats:
+    """정규화된 문장 1개의 누적 통계"""
+    __slots__ = ('statement', 'count', 'total', 'max', 'rows', 'slow', 'plan')
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.plan: Optional[List[str]] = None
+
+    def indexes(self) -> List[str]:
+        return sorted({name for detail in self.plan or []
+                       for name in _INDEX_IN_PLAN.findall(detail)})
+
+    def full_scans(self) -> List[str]:
+        """인덱스 없이 테이블 전체를 읽는 단계"""
+        return [d for d in self.plan or [] if d.startswith('SCAN ') and 'USING' not in d]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'statement': self.statement,
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'avg_ms': round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+            'slow': self.slow,
+            'plan': self.plan,
+            'indexes': self.indexes(),
+        }
+
+
+class QueryStats:
+    """프로세스 전체 SQL 통계 (모든 풀 연결이 공유)"""
+
+    # 원문 → 통계 캐시 최대 크기 (리터럴을 직접 넣는 문장이 캐시를 무한히 키우지 않도록)
+    MAX_RAW_CACHE = 4096
+
+    def __init__(self, slow_threshold_ms: float = 100.0):
+        self.slow_threshold = slow_threshold_ms / 1000
+        self._lock = threading.Lock()
+        self._statements: Dict[str, _StatementStats] = {}
+        self._by_sql: Dict[str, _StatementStats] = {}
+        self.started_at = time.time()
+
+    def lookup(self, conn: sqlite3.Connection, sql: str, params: Any) -> _StatementStats:
+        """문장 통계 조회 (처음 보는 문장이면 생성 후 실행 계획 저장)"""
+        entry = self._by_sql.get(sql)
+        if entry is not None:
+            return entry
+
+        key = normalize_statement(sql)
+        with self._lock:
+            entry = self._statements.get(key)
+            is_new = entry is None
+            if is_new:
+                entry = self._statements[key] = _StatementStats(key)
+            if len(self._by_sql) >= self.MAX_RAW_CACHE:
+                self._by_sql.clear()
+            self._by_sql[sql] = entry
+
+        if is_new and key.upper().startswith(_PLANNABLE):
+            entry.plan = self._explain(conn, sql, params)
+        return entry
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, params: Any) -> Optional[List[str]]:
+        """EXPLAIN QUERY PLAN 단계 목록 (executemany처럼 파라미터가 없으면 바인딩 오류로 None)"""
+        try:
+            rows = sqlite3.Connection.execute(conn, f'EXPLAIN QUERY PLAN {sql}',
+                                              params or ()).fetchall()
+        except (sqlite3.Error, ValueError):
+            return None
+        return [row[3] for row in rows]
+
+    def record(self, entry: _StatementStats, elapsed: float, rows: int,
+               new_execution: bool) -> None:
+        with self._lock:
+            if new_execution:
+                entry.count += 1
+            entry.total += elapsed
+            entry.rows += rows
+
+    def finish_execution(self, entry: _StatementStats, elapsed: float, rows: int, sql: str) -> None:
+        """실행 1회 종료 시점 (최대 시간 갱신, 느린 쿼리 로그)"""
+        slow = elapsed >= self.slow_threshold
+        with self._lock:
+            if elapsed > entry.max:
+                entry.max = elapsed
+            if slow:
+                entry.slow += 1
+        if slow:
+            plan = ' / '.join(entry.plan) if entry.plan else '-'
+            statement = _WHITESPACE.sub(' ', sql).strip()
+            logger.warning(
+                f"[느린 쿼리] {elapsed * 1000:.1f}ms rows={rows}: {statement} | 계획: {plan}"
+            )
+
+    def report(self, limit: int = 20, sort: str = 'total') -> Dict[str, Any]:
+        """top-N 문장 + 인덱스별 사용 횟수 + 전체 스캔 문장"""
+        sort_key = {
+            'total': lambda s: s.total,
+            'max': lambda s: s.max,
+            'count': lambda s: s.count,
+            'avg': lambda s: s.total / s.count if s.count else 0.0,
+            'rows': lambda s: s.rows,
+        }.get(sort, lambda s: s.total)
+
+        with self._lock:
+            statements = [s for s in self._statements.values() if s.count]
+            top = [s.to_dict() for s in sorted(statements, key=sort_key, reverse=True)[:limit]]
+            index_usage: Dict[str, int] = {}
+            full_scans = []
+            for s in statements:
+                for name in s.indexes():
+                    index_usage[name] = index_usage.get(name, 0) + s.count
+                scans = s.full_scans()
+                if scans:
+                    full_scans.append({'statement': s.statement, 'count': s.count, 'scans': scans})
+
+        full_scans.sort(key=lambda item: item['count'], reverse=True)
+        return {
+            'since': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at)),
+            'slow_threshold_ms': self.slow_threshold * 1000,
+            'statements': len(statements),
+            'executions': sum(s.count for s in statements),
+            'top': top,
+            'index_usage': dict(sorted(index_usage.items(), key=lambda item: item[1],
+                                       reverse=True)),
+            'full_scans': full_scans[:limit],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._by_sql.clear()
+            self.started_at = time.time()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """실행/fetch 시간과 행 수를 QueryStats에 기록하는 커서"""
+
+    _qs_entry: Optional[_StatementStats] = None
+
+    def _qs_begin(self, sql: str, params: Any, many: bool) -> None:
+        self._qs_finish()
+        stats: QueryStats = self.connection.query_stats
+        self._qs_sql = sql
+        self._qs_entry = stats.lookup(self.connection, sql, None if many else params)
+        self._qs_elapsed = 0.0
+        self._qs_rows = 0
+
+    def _qs_add(self, elapsed: float, rows: int, new_execution: bool = False) -> None:
+        self._qs_elapsed += elapsed
+        self._qs_rows += rows
+        self.connection.query_stats.record(self._qs_entry, elapsed, rows, new_execution)
+
+    def _qs_finish(self) -> None:
+        """이전 실행 마감 (새 execute, 결과 소진, close 시점)"""
+        entry = self._qs_entry
+        if entry is None:
+            return
+        self._qs_entry = None
+        self.connection.query_stats.finish_execution(entry, self._qs_elapsed, self._qs_rows,
+                                                     self._qs_sql)
+
+    def execute(self, sql, parameters=()):
+        self._qs_begin(sql, parameters, many=False)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            # SELECT는 fetch에서 행 수를 더하고, DML은 rowcount가 영향받은 행 수
+            self._qs_add(time.perf_counter() - started, max(self.rowcount, 0), new_execution=True)
+            if self.description is None:
+                self._qs_finish()
+
+    def executemany(self, sql, seq_of_parameters):
+        self._qs_begin(sql, None, many=True)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._qs_add(time.perf_counter() - started, max(self.rowcount, 0), new_execution=True)
+            self._qs_finish()
+
+    def fetchone(self):
+        if self._qs_entry is None:
+            return super().fetchone()
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._qs_add(time.perf_counter() - started, 0 if row is None else 1)
+        if row is None:
+            self._qs_finish()
+        return row
+
+    def fetchmany(self, size=None):
+        if self._qs_entry is None:
+            return super().fetchmany(self.arraysize if size is None else size)
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._qs_add(time.perf_counter() - started, len(rows))
+        if not rows:
+            self._qs_finish()
+        return rows
+
+    def fetchall(self):
+        if self._qs_entry is None:
+            return super().fetchall()
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._qs_add(time.perf_counter() - started, len(rows))
+        self._qs_finish()
+        return rows
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._qs_finish()
+        super().close()
+
+    def __del__(self):
+        # fetchone()으로 한 행만 읽고 버린 커서도 실행 1회로 마감
+        try:
+            self._qs_finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """InstrumentedCursor를 기본 커서로 쓰는 연결 (query_stats는 생성 직후 설정)"""
+
+    query_stats: QueryStats
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
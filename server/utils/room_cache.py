@@ -0,0 +1,41 @@
+"""
+실습실 목록 캐시
+모든 템플릿 렌더링에 주입되는 활성 실습실 이름 목록을 프로세스 단위로 캐시한다.
+seat_layout을 변경하는 API는 커밋 후 invalidate_room_cache()를 호출해야 한다.
+무효화는 호출한 워커에만 적용되므로, 다른 워커는 ROOM_CACHE_TTL초 뒤 다시 읽는다.
+"""
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from flask import current_app
+
+from .database import get_read_db
+
+# (실습실 목록, 읽은 시각)
+_room_names: Optional[Tuple[List[str], float]] = None
+_room_lock = threading.Lock()
+
+
+def get_active_room_names() -> List[str]:
+    """활성 실습실 이름 목록 (캐시 미스/만료 시에만 DB 조회)"""
+    global _room_names
+    cached = _room_names
+    ttl = current_app.config.get('ROOM_CACHE_TTL', 5)
+    if cached is not None and time.monotonic() - cached[1] < ttl:
+        return cached[0]
+
+    rows = get_read_db().execute(
+        'SELECT room_name FROM seat_layout WHERE is_active=1 ORDER BY room_name'
+    ).fetchall()
+    room_names = [r['room_name'] for r in rows]
+    with _room_lock:
+        _room_names = (room_names, time.monotonic())
+    return room_names
+
+
+def invalidate_room_cache() -> None:
+    """실습실 목록 캐시 비우기 (실습실 생성/수정/삭제, 배치 저장 시)"""
+    global _room_names
+    with _room_lock:
+        _room_names = None
@@ -0,0 +1,132 @@
+"""
+SQLite 세션 저장소
+Flask-Session(cachelib 백엔드)에 넘기는 BaseCache 구현.
+세션 조회/저장은 PRIMARY KEY 단일 조회, 만료 정리는 expires_at 인덱스로 처리한다.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from cachelib import BaseCache
+
+from .database import ConnectionPool
+
+
+class SQLiteSessionCache(BaseCache):
+    """SQLite 기반 세션 캐시 (FileSystemCache 대체)
+
+    - 세션 1건 = 행 1개 (파일 읽기/쓰기·디렉터리 스캔 없음)
+    - 만료된 세션은 조회 시 무시하고, prune_interval초마다 인덱스로 일괄 삭제
+    - 값은 JSON으로 저장 (SESSION_SERIALIZATION_FORMAT='json'과 동일한 제약)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        default_timeout: int = 3600,
+        prune_interval: int = 300,
+        pool_size: int = 4
+    ):
+        super().__init__(default_timeout)
+        self.prune_interval = prune_interval
+        self._pool = ConnectionPool(db_path, max_size=pool_size)
+        self._prune_lock = threading.Lock()
+        self._last_prune = time.time()
+
+        with self._connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at)')
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.acquire()
+        try:
+            yield conn
+        finally:
+            self._pool.release(conn)
+
+    def _expires_at(self, timeout: Optional[int]) -> Optional[float]:
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout > 0 else None
+
+    def get(self, key: str) -> Any:
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT value FROM sessions WHERE key=? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())
+            ).fetchone()
+        return json.loads(row['value']) if row else None
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        with self._connection() as conn:
+            conn.execute('''
+                INSERT INTO sessions (key, value, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value, expires_at=excluded.expires_at
+            ''', (key, json.dumps(value), self._expires_at(timeout)))
+        self._maybe_prune()
+        return True
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        """키가 없거나 만료된 경우에만 저장"""
+        with self._connection() as conn:
+            cursor = conn.execute('''
+                INSERT INTO sessions (key, value, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value, expires_at=excluded.expires_at
+                WHERE sessions.expires_at IS NOT NULL AND sessions.expires_at <= ?
+            ''', (key, json.dumps(value), self._expires_at(timeout), time.time()))
+        return cursor.rowcount > 0
+
+    def delete(self, key: str) -> bool:
+        with self._connection() as conn:
+            cursor = conn.execute('DELETE FROM sessions WHERE key=?', (key,))
+        return cursor.rowcount > 0
+
+    def has(self, key: str) -> bool:
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT 1 FROM sessions WHERE key=? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def clear(self) -> bool:
+        with self._connection() as conn:
+            conn.execute('DELETE FROM sessions')
+        return True
+
+    def prune(self) -> int:
+        """만료된 세션 삭제
+
+        Returns:
+            삭제된 세션 수
+        """
+        with self._connection() as conn:
+            cursor = conn.execute(
+                'DELETE FROM sessions WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                (time.time(),)
+            )
+        return cursor.rowcount
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        if now - self._last_prune < self.prune_interval:
+            return
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = now
+            self.prune()
+        finally:
+            self._prune_lock.release()
+
+    def close(self) -> None:
+        self._pool.close_all()
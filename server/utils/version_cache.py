@@ -0,0 +1,92 @@
+"""
+클라이언트 최신 버전 캐시
+모든 클라이언트가 시작할 때와 업데이트 확인 주기마다 호출하는 /api/client/version 응답을
+프로세스 단위로 캐시하고 응답 본문 해시를 ETag로 쓴다 (바뀌지 않았으면 304).
+
+- 버전을 등록/삭제하는 API는 커밋 후 invalidate_version_cache() 호출
+- 응답에는 릴리스 미러(artifacts) 상태도 들어가므로, 백그라운드 받기가 끝난 미러의
+  sha256/mirror_url은 캐시가 만료된 뒤(VERSION_CACHE_TTL) 응답에 나타난다
+- 조회 중 DB 오류는 캐시하지 않고 그대로 올린다 (기본 버전 1.0.0은 등록된 버전이 없을 때만)
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import current_app
+
+from .database import get_read_db
+
+_DEFAULT_VERSION = {
+    'version': '1.0.0',
+    'download_url': None,
+    'changelog': 'Initial version',
+    'released_at': None,
+}
+
+# (응답 본문, ETag, 미러 상태, 읽은 시각)
+_cached: Optional[Tuple[Dict[str, Any], str, Optional[str], float]] = None
+_cache_lock = threading.Lock()
+
+
+def _load_latest_version() -> Tuple[Dict[str, Any], Optional[str]]:
+    """최신 버전 + 서버 미러(아티팩트 캐시) 정보 조회
+
+    Returns:
+        (응답 본문, 미러 상태: None이면 미러 미등록)
+    """
+    db = get_read_db()
+    row = db.execute('''
+        SELECT version, download_url, changelog, released_at
+        FROM client_versions
+        ORDER BY released_at DESC, id DESC
+        LIMIT 1
+    ''').fetchone()
+    unmirrored = {'sha256': None, 'size': None, 'mirror_url': None}
+    if not row:
+        return {'status': 'success', **_DEFAULT_VERSION, **unmirrored}, None
+
+    body = {'status': 'success', **dict(row), **unmirrored}
+    mirror = None
+    if row['download_url']:
+        mirror = db.execute(
+            'SELECT status, sha256, size FROM artifacts WHERE source_url=?',
+            (row['download_url'],)
+        ).fetchone()
+    if mirror and mirror['status'] == 'ready':
+        body.update(sha256=mirror['sha256'], size=mirror['size'],
+                    mirror_url=f"/install/artifacts/{mirror['sha256']}")
+    return body, (mirror['status'] if mirror else None)
+
+
+def body_etag(body: Dict[str, Any]) -> str:
+    """응답 본문 해시 (ETag 값)"""
+    encoded = json.dumps(body, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def get_latest_version() -> Tuple[Dict[str, Any], str, Optional[str]]:
+    """최신 버전 응답 (캐시 미스/만료 시에만 DB 조회)
+
+    Returns:
+        (응답 본문, ETag 값, 미러 상태)
+    """
+    global _cached
+    cached = _cached
+    ttl = current_app.config.get('VERSION_CACHE_TTL', 30)
+    if cached is not None and time.monotonic() - cached[3] < ttl:
+        return cached[0], cached[1], cached[2]
+
+    body, mirror_status = _load_latest_version()
+    etag = body_etag(body)
+    with _cache_lock:
+        _cached = (body, etag, mirror_status, time.monotonic())
+    return body, etag, mirror_status
+
+
+def invalidate_version_cache() -> None:
+    """버전 캐시 비우기 (버전 등록/삭제, 미러 등록 시)"""
+    global _cached
+    with _cache_lock:
+        _cached = None
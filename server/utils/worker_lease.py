@@ -0,0 +1,62 @@
+"""
+워커 간 리더 임대 (SQLite 행 하나)
+Gunicorn 워커가 여러 개여도 오프라인 체크/DB 유지보수 같은 백그라운드 작업은
+임대를 가진 프로세스 하나만 실행한다. 보유자는 주기마다 임대를 갱신하고,
+보유자가 죽으면 ttl초 뒤 다른 워커가 이어받는다.
+"""
+import logging
+import os
+import socket
+import time
+import uuid
+
+from .database import run_write
+
+logger = logging.getLogger('wcms')
+
+_instance_token = uuid.uuid4().hex[:8]
+
+
+def worker_id() -> str:
+    """프로세스 식별자 (호스트:PID:임의값). fork 후에도 PID로 구분되도록 호출 시점에 계산"""
+    return f"{socket.gethostname()}:{os.getpid()}:{_instance_token}"
+
+
+class WorkerLease:
+    """이름별 리더 임대 (worker_leases 테이블)"""
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.holder = worker_id()
+        self.is_leader = False
+
+    def try_acquire(self) -> bool:
+        """임대 획득/갱신 (만료됐거나 이미 보유 중일 때만 성공, 앱 컨텍스트 필요)"""
+        now = time.time()
+
+        def job(db):
+            db.execute('''
+                INSERT INTO worker_leases (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE
+                    SET holder=excluded.holder, expires_at=excluded.expires_at
+                WHERE worker_leases.holder=excluded.holder OR worker_leases.expires_at < ?
+            ''', (self.name, self.holder, now + self.ttl, now))
+            row = db.execute('SELECT holder FROM worker_leases WHERE name=?',
+                             (self.name,)).fetchone()
+            return row[0] == self.holder
+
+        acquired = run_write(job)
+        if acquired != self.is_leader:
+            logger.info(f"[임대] {self.name}: {'획득' if acquired else '상실'} ({self.holder})")
+        self.is_leader = acquired
+        return acquired
+
+    def release(self) -> None:
+        """보유 중인 임대 반납 (정상 종료 시 다른 워커가 ttl을 기다리지 않도록)"""
+        if not self.is_leader:
+            return
+        run_write(lambda db: db.execute(
+            'DELETE FROM worker_leases WHERE name=? AND holder=?', (self.name, self.holder)
+        ))
+        self.is_leader = False
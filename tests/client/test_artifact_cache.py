@@ -0,0 +1,109 @@
+"""
+클라이언트 아티팩트 캐시 테스트 (로컬 HTTP 서버로 서버 캐시 대체)
+"""
+import hashlib
+import http.server
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# client 디렉토리를 sys.path에 추가
+client_dir = Path(__file__).parent.parent.parent / "client"
+if str(client_dir) not in sys.path:
+    sys.path.insert(0, str(client_dir))
+
+from artifact_cache import ArtifactCache
+
+DATA = os.urandom(200 * 1024)
+SHA256 = hashlib.sha256(DATA).hexdigest()
+SOURCE_URL = 'https://example.com/setup.exe'
+
+
+class _ArtifactHandler(http.server.BaseHTTPRequestHandler):
+    """/install/artifacts 조회 + Range 지원 다운로드"""
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('Range')))
+        if self.path.startswith('/install/artifacts?'):
+            body = ('{"sha256": "%s", "size": %d, "download_url": "/install/artifacts/%s"}'
+                    % (SHA256, len(DATA), SHA256)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+        elif self.path == f'/install/artifacts/{SHA256}':
+            start = int(self.headers['Range'][len('bytes='):-1]) if self.headers.get('Range') else 0
+            body = DATA[start:]
+            self.send_response(206 if start else 200)
+        else:
+            body = b''
+            self.send_response(404)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    _ArtifactHandler.requests_seen = []
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _ArtifactHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+
+
+def _downloads():
+    return [(path, rng) for path, rng in _ArtifactHandler.requests_seen if path.endswith(SHA256)]
+
+
+class TestArtifactCache:
+    """ArtifactCache 테스트"""
+
+    def test_downloads_once_then_uses_local_copy(self, server, tmp_path):
+        cache = ArtifactCache(server, str(tmp_path), timeout=5)
+
+        path = cache.fetch(SOURCE_URL)
+        assert path and Path(path).read_bytes() == DATA
+        assert cache.fetch(SOURCE_URL) == path
+        assert len(_downloads()) == 1
+
+    def test_resumes_partial_download(self, server, tmp_path):
+        (tmp_path / f'{SHA256}.part').write_bytes(DATA[:50000])
+        cache = ArtifactCache(server, str(tmp_path), timeout=5)
+
+        path = cache.fetch(SOURCE_URL)
+        assert Path(path).read_bytes() == DATA
+        assert _downloads() == [(f'/install/artifacts/{SHA256}', 'bytes=50000-')]
+
+    def test_hash_mismatch_is_discarded(self, server, tmp_path):
+        (tmp_path / f'{SHA256}.part').write_bytes(b'corrupt' * 100)
+        cache = ArtifactCache(server, str(tmp_path), timeout=5)
+
+        assert cache.fetch(SOURCE_URL) is None
+        assert not any(tmp_path.iterdir())
+
+
+class TestUpdaterDownload:
+    """업데이터 다운로드 (이어받기 + SHA-256 검증)"""
+
+    def test_resumes_and_verifies(self, server, tmp_path):
+        from updater import download_file
+        dest = tmp_path / 'WCMS-Client-9.9.9.exe'
+        Path(str(dest) + '.part').write_bytes(DATA[:1234])
+
+        assert download_file(f'{server}install/artifacts/{SHA256}', str(dest), SHA256) is True
+        assert dest.read_bytes() == DATA
+        assert _downloads() == [(f'/install/artifacts/{SHA256}', 'bytes=1234-')]
+
+    def test_rejects_hash_mismatch(self, server, tmp_path):
+        from updater import download_file
+        dest = tmp_path / 'WCMS-Client-9.9.9.exe'
+
+        assert download_file(f'{server}install/artifacts/{SHA256}', str(dest), '0' * 64) is False
+        assert not any(tmp_path.iterdir())
@@ -0,0 +1,60 @@
+"""
+명령 결과 묶음 전송 테스트
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# client 디렉토리를 sys.path에 추가
+client_dir = Path(__file__).parent.parent.parent / "client"
+if str(client_dir) not in sys.path:
+    sys.path.insert(0, str(client_dir))
+
+from batcher import ResultBatcher
+
+
+class TestResultBatcher:
+    """ResultBatcher 테스트"""
+
+    def test_coalesces_results_within_window(self):
+        """window 안에 들어온 결과는 한 번에 전송"""
+        batches = []
+        sent = threading.Event()
+        batcher = ResultBatcher(lambda items: (batches.append(items), sent.set()), window=0.2)
+
+        for command_id in range(5):
+            batcher.submit({'command_id': command_id})
+        assert sent.wait(2)
+        batcher.close()
+
+        assert [[item['command_id'] for item in batch] for batch in batches] == [[0, 1, 2, 3, 4]]
+
+    def test_max_items_and_close_flush(self):
+        """max_items를 넘으면 나눠 보내고, close 시 남은 결과를 모두 전송"""
+        batches = []
+        batcher = ResultBatcher(batches.append, window=30, max_items=2)
+
+        started = time.monotonic()
+        for command_id in range(5):
+            batcher.submit({'command_id': command_id})
+        batcher.close()
+
+        assert time.monotonic() - started < 5
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        batcher.submit({'command_id': 5})  # 종료 후에는 바로 전송
+        assert batches[-1] == [{'command_id': 5}]
+
+    def test_send_error_hands_batch_to_on_error(self):
+        """send_batch가 예외를 던지면 묶음을 버리지 않고 on_error로 넘김"""
+        failed = []
+
+        def send(items):
+            raise ConnectionError('server down')
+
+        batcher = ResultBatcher(send, window=0.05, on_error=failed.append)
+        batcher.submit({'command_id': 1})
+        batcher.submit({'command_id': 2})
+        batcher.close()
+
+        assert [item['command_id'] for batch in failed for item in batch] == [1, 2]
@@ -0,0 +1,70 @@
+"""
+명령 출력 스트리밍 테스트
+"""
+import sys
+import time
+from pathlib import Path
+
+# client 디렉토리를 sys.path에 추가
+client_dir = Path(__file__).parent.parent.parent / "client"
+if str(client_dir) not in sys.path:
+    sys.path.insert(0, str(client_dir))
+
+from executor import CommandExecutor
+from output_stream import OutputStreamer
+
+
+class TestOutputStreamer:
+    """OutputStreamer 테스트"""
+
+    def test_streams_lines_while_running(self):
+        """프로세스가 끝나기 전에 출력 조각이 업로드되고, 마지막 줄들만 결과로 남음"""
+        chunks = []
+        first_upload = []
+        streamer = OutputStreamer(lambda seq, data: chunks.append((seq, data)) or True,
+                                  interval=0.1)
+        script = ("import sys, time\n"
+                  "for i in range(5):\n"
+                  "    print(f'line {i}', flush=True)\n"
+                  "    time.sleep(0.1)\n")
+
+        def on_output(line):
+            streamer.write(line)
+            if chunks and not first_upload:
+                first_upload.append(time.monotonic())
+
+        started = time.monotonic()
+        returncode, tail, timed_out = CommandExecutor._run_streaming(
+            [sys.executable, '-c', script], timeout=10, on_output=on_output, tail_lines=2
+        )
+        finished = time.monotonic()
+        streamer.close()
+
+        assert (returncode, timed_out) == (0, False)
+        assert tail == 'line 3\nline 4'
+        assert first_upload and first_upload[0] < finished
+        assert [seq for seq, _ in chunks] == list(range(1, len(chunks) + 1))
+        assert ''.join(data for _, data in chunks) == ''.join(f'line {i}\n' for i in range(5))
+        assert finished - started < 5
+
+    def test_retries_with_same_seq_and_bounds_pending(self):
+        """전송 실패한 조각은 같은 seq로 재전송, 보관 상한을 넘으면 오래된 조각부터 버림"""
+        sent = []
+        online = [False]
+        streamer = OutputStreamer(lambda seq, data: online[0] and not sent.append((seq, data)),
+                                  interval=60, max_pending_bytes=10)
+
+        for text in ['aaaa\n', 'bbbb\n', 'cccc\n']:
+            streamer.write(text)
+            assert streamer.flush() is False
+
+        online[0] = True
+        streamer.close()
+        assert sent == [(2, 'bbbb\n'), (3, 'cccc\n')]
+        assert streamer.dropped == 1
+
+    def test_timeout_kills_process(self):
+        returncode, _, timed_out = CommandExecutor._run_streaming(
+            [sys.executable, '-c', 'import time; time.sleep(10)'], timeout=0.3
+        )
+        assert timed_out is True
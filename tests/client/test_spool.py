@@ -0,0 +1,115 @@
+"""
+클라이언트 디스크 스풀 테스트
+"""
+import sys
+from pathlib import Path
+
+# client 디렉토리를 sys.path에 추가
+client_dir = Path(__file__).parent.parent.parent / "client"
+if str(client_dir) not in sys.path:
+    sys.path.insert(0, str(client_dir))
+
+from spool import Spool, KIND_RESULT
+
+
+def _result(command_id):
+    return {'command_id': command_id, 'status': 'completed', 'result': f'output {command_id}'}
+
+
+class TestSpool:
+    """Spool 테스트"""
+
+    def test_replay_in_order_and_batches(self, tmp_path):
+        """쌓인 순서대로, batch_size 단위로 재전송"""
+        spool = Spool(str(tmp_path), batch_size=3)
+        for command_id in range(1, 8):
+            spool.append(KIND_RESULT, _result(command_id))
+
+        batches = []
+
+        def send(records):
+            batches.append([record['payload']['command_id'] for record in records])
+            return len(records)
+
+        assert spool.replay(send) == 7
+        assert batches == [[1, 2, 3], [4, 5, 6], [7]]
+        assert spool.pending_count() == 0
+        assert spool.replay(send) == 0
+
+    def test_partial_delivery_resumes(self, tmp_path):
+        """일부만 전송되면 멈추고, 다음 재전송은 그 다음 레코드부터"""
+        spool = Spool(str(tmp_path), batch_size=10)
+        for command_id in range(1, 6):
+            spool.append(KIND_RESULT, _result(command_id))
+
+        assert spool.replay(lambda records: 2) == 2
+        assert [r['payload']['command_id'] for r in spool.peek()] == [3, 4, 5]
+
+        spool.append(KIND_RESULT, _result(6))
+        sent = []
+
+        def send(records):
+            sent.extend(r['payload']['command_id'] for r in records)
+            return len(records)
+
+        spool.replay(send)
+        assert sent == [3, 4, 5, 6]
+
+    def test_survives_restart(self, tmp_path):
+        """서비스 재시작(새 인스턴스) 후에도 ack 위치부터 이어서 재전송"""
+        first = Spool(str(tmp_path), batch_size=2)
+        for command_id in range(1, 5):
+            first.append(KIND_RESULT, _result(command_id))
+        first.replay(lambda records: 1)
+
+        # 기록 도중 전원이 꺼진 것처럼 마지막 줄을 잘라 둠
+        segment = sorted(tmp_path.glob('spool-*.jsonl'))[-1]
+        with open(segment, 'ab') as f:
+            f.write(b'{"kind": "result", "pay')
+
+        second = Spool(str(tmp_path), batch_size=2)
+        second.append(KIND_RESULT, _result(5))
+        assert [r['payload']['command_id'] for r in second.peek()] == [2, 3, 4, 5]
+
+    def test_segments_rotate_and_are_removed(self, tmp_path):
+        """세그먼트가 넘치면 새 파일, 다 보낸 세그먼트는 삭제"""
+        spool = Spool(str(tmp_path), segment_bytes=200, batch_size=100)
+        for command_id in range(10):
+            spool.append(KIND_RESULT, _result(command_id))
+        assert len(list(tmp_path.glob('spool-*.jsonl'))) > 1
+
+        assert spool.replay(len) == 10
+        assert list(tmp_path.glob('spool-*.jsonl')) == []
+
+        spool.append(KIND_RESULT, _result(10))
+        assert [r['payload']['command_id'] for r in spool.peek()] == [10]
+
+    def test_cap_drops_oldest_records(self, tmp_path):
+        """용량 상한 초과 시 오래된 레코드부터 정리하고 최근 결과는 보존"""
+        spool = Spool(str(tmp_path), max_bytes=4000)
+        for command_id in range(60):
+            spool.append(KIND_RESULT, _result(command_id))
+
+        assert spool.size() <= 4000
+        assert spool.dropped > 0
+        command_ids = [r['payload']['command_id'] for r in spool.peek()]
+        assert command_ids == list(range(60 - len(command_ids), 60))
+
+
+class TestSpoolReplay:
+    """클라이언트 스풀 재전송 테스트 (main._send_spooled)"""
+
+    def test_results_replayed_in_one_batch(self, tmp_path, monkeypatch):
+        """쌓인 명령 결과는 일괄 API 한 번으로 재전송"""
+        import main
+
+        posted = []
+        monkeypatch.setattr(main, '_post_results', lambda items: posted.append(items) or len(items))
+
+        spool = Spool(str(tmp_path))
+        spool.append(KIND_RESULT, _result(1))
+        spool.append(KIND_RESULT, _result(2))
+
+        assert spool.replay(main._send_spooled) == 2
+        assert [[item['command_id'] for item in items] for items in posted] == [[1, 2]]
+        assert spool.pending_count() == 0
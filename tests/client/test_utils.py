@@ -9,7 +9,7 @@ client_dir = Path(__file__).parent.parent.parent / "client"
 if str(client_dir) not in sys.path:
     sys.path.insert(0, str(client_dir))
 
-from utils import safe_request, retry_on_network_error, format_bytes
+from utils import safe_request, retry_on_network_error, format_bytes, backoff_delay, ServerBusyError
 
 
 class TestSafeRequest:
@@ -59,6 +59,29 @@ class TestRetryDecorator:
         assert result == "success"
         assert call_count['count'] == 3
 
+    def test_retry_honors_server_busy_hint(self, monkeypatch):
+        """503 힌트보다 먼저 재시도하지 않음"""
+        waits = []
+        monkeypatch.setattr('utils.time.sleep', waits.append)
+        call_count = {'count': 0}
+
+        @retry_on_network_error(max_retries=2, delay=0.001)
+        def busy_once():
+            call_count['count'] += 1
+            if call_count['count'] == 1:
+                raise ServerBusyError(7.5)
+            return "success"
+
+        assert busy_once() == "success"
+        assert waits == [7.5]
+
+    def test_backoff_delay_full_jitter(self):
+        """0 ~ min(cap, base * 2^attempt) 사이에 퍼짐"""
+        delays = [backoff_delay(3, 5, cap=30) for _ in range(200)]
+        assert all(0 <= d <= 30 for d in delays)
+        assert max(delays) - min(delays) > 10
+        assert backoff_delay(0, 5, hint=12) >= 12
+
 
 class TestFormatBytes:
     """format_bytes 함수 테스트"""
@@ -68,6 +68,40 @@ class TestClientAPI:
         data = response.get_json()
         assert data['status'] == 'success'
 
+    def test_client_command_results_batch(self, client, app, registered_pc):
+        """명령 결과 일괄 제출 API (항목별 상태)"""
+        from models import CommandModel
+
+        pc_id, _ = registered_pc
+        done_id = CommandModel.create(pc_id, 'message', {'message': 'hi'})
+        failed_id = CommandModel.create(pc_id, 'kill_process', {'process_name': 'x.exe'})
+
+        response = client.post('/api/client/commands/results', json={'results': [
+            {'command_id': done_id, 'status': 'success', 'output': 'shown'},
+            {'command_id': failed_id, 'status': 'error', 'error_message': 'not running'},
+            {'command_id': 999999, 'status': 'success', 'output': ''},
+            {'status': 'success'},
+        ]})
+
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert (data['total'], data['recorded'], data['failed']) == (4, 2, 2)
+        statuses = [r['status'] for r in data['results']]
+        assert statuses == ['recorded', 'recorded', 'not_found', 'invalid']
+        assert CommandModel.get_by_id(done_id)['status'] == 'completed'
+        assert CommandModel.get_by_id(done_id)['result'] == 'shown'
+        assert CommandModel.get_by_id(failed_id)['error_message'] == 'not running'
+
+    def test_client_command_results_batch_limits(self, client, app):
+        """빈 목록/최대 항목 수 초과 거부"""
+        assert client.post('/api/client/commands/results', json={'results': []}).status_code == 400
+
+        app.config['RESULT_BATCH_MAX'] = 2
+        response = client.post('/api/client/commands/results', json={'results': [
+            {'command_id': i, 'status': 'success'} for i in range(3)
+        ]})
+        assert response.status_code == 413
+
 
 class TestAdminAPI:
     """관리자 API 테스트"""
@@ -79,6 +113,34 @@ class TestAdminAPI:
             sess['admin'] = True
             sess['username'] = 'admin'
 
+    def test_command_output_stream_tail(self, client, app, registered_pc):
+        """클라이언트가 올린 출력 조각을 커서로 이어 읽기 (중복 seq 무시, 용량 초과 시 truncated)"""
+        from models import CommandModel
+
+        pc_id, _ = registered_pc
+        command_id = CommandModel.create(pc_id, 'install', {'app_id': 'vlc'})
+        CommandModel.start_execution(command_id)
+        app.config['COMMAND_OUTPUT_MAX_BYTES'] = 20
+
+        for seq, data in [(1, 'Installing...\n'), (2, 'Progress 50%\n'), (2, 'Progress 50%\n')]:
+            response = client.post(f'/api/client/commands/{command_id}/output',
+                                   json={'seq': seq, 'data': data})
+            assert response.status_code == 200
+        assert response.get_json()['data']['stored'] is False
+
+        data = client.get(f'/api/commands/{command_id}/output').get_json()['data']
+        assert [c['data'] for c in data['chunks']] == ['Progress 50%\n']
+        assert data['truncated'] is True and data['done'] is False
+
+        client.post(f'/api/client/commands/{command_id}/output', json={'seq': 3, 'data': 'Done\n'})
+        data = client.get(f'/api/commands/{command_id}/output',
+                          query_string={'cursor': data['next_cursor']}).get_json()['data']
+        assert [c['data'] for c in data['chunks']] == ['Done\n']
+        assert (data['next_cursor'], data['truncated']) == (3, False)
+
+        response = client.post('/api/client/commands/999999/output', json={'seq': 1, 'data': 'x'})
+        assert response.status_code == 404
+
     def test_admin_list_pcs(self, client):
         """PC 목록 조회 API (인증 필요)"""
         response = client.get('/api/pcs')
@@ -165,6 +227,43 @@ class TestAdminAPI:
         assert data['status'] == 'success'
         assert 'deleted_count' in data
 
+    def test_admin_check_cached_between_requests(self, client, app):
+        """활성 관리자 확인은 admins 변경 세대가 같으면 TTL 동안 재조회하지 않음"""
+        assert client.get('/api/pcs').status_code == 200
+
+        with app.app_context():
+            from utils.database import get_db
+            db = get_db()
+            db.execute("UPDATE admins SET is_active=0 WHERE username='admin'")  # 모델 우회
+            # 트리거가 올린 세대를 되돌려 캐시된 확인 결과가 쓰이는지 확인
+            db.execute('UPDATE admin_cache_state SET generation = generation - 1 WHERE id=1')
+            db.commit()
+
+        assert client.get('/api/pcs').status_code == 200
+
+    def test_admin_deactivation_revokes_immediately(self, client, app):
+        """AdminModel.set_active(False) 즉시 401 (캐시 무효화)"""
+        assert client.get('/api/pcs').status_code == 200
+
+        with app.app_context():
+            from models import AdminModel
+            admin = AdminModel.get_by_username('admin')
+            assert AdminModel.set_active(admin['id'], False)
+
+        assert client.get('/api/pcs').status_code == 401
+
+    def test_room_list_cache_invalidated_on_create(self, client, app):
+        """실습실 생성 후 템플릿용 실습실 목록 캐시 갱신"""
+        from utils import get_active_room_names
+        with app.test_request_context():
+            assert 'CacheLab' not in get_active_room_names()
+
+        response = client.post('/api/rooms', json={'room_name': 'CacheLab'})
+        assert response.status_code == 200
+
+        with app.test_request_context():
+            assert 'CacheLab' in get_active_room_names()
+
 
 class TestPublicAPI:
     """인증 불필요 공개 API 테스트"""
@@ -206,3 +305,44 @@ class TestHealthCheck:
         response = client.get('/')
         # 200 (성공) 또는 302 (리다이렉트) 허용
         assert response.status_code in [200, 302]
+
+
+class TestAppFactory:
+    """앱 생성 (지연 생성, 선택적 확장) 테스트"""
+
+    def test_import_does_not_build_app(self):
+        """app 모듈 임포트만으로는 전역 앱/Limiter를 만들지 않음"""
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        server_dir = Path(__file__).resolve().parents[2] / 'server'
+        env = dict(os.environ, PYTHONPATH=str(server_dir), WCMS_ENV='test')
+        result = subprocess.run(
+            [sys.executable, '-c',
+             "import sys, app; print(app._app is None, 'flask_limiter' in sys.modules)"],
+            capture_output=True, text=True, env=env, cwd=server_dir, check=True
+        )
+        assert result.stdout.split() == ['True', 'False']
+
+    def test_login_rate_limit_when_enabled(self, monkeypatch):
+        """RATELIMIT_ENABLED=True면 로그인 5회/분 제한 적용"""
+        from config import TestConfig
+        from app import create_app
+        from utils.database import get_db
+        from pathlib import Path
+
+        monkeypatch.setattr(TestConfig, 'RATELIMIT_ENABLED', True)
+        app = create_app('test')
+        schema_path = Path(__file__).resolve().parents[2] / 'server' / 'migrations' / 'schema.sql'
+        with app.app_context():
+            get_db().executescript(schema_path.read_text(encoding='utf-8'))
+
+        client = app.test_client()
+        statuses = [
+            client.post('/login', data={'username': 'admin', 'password': 'wrong'}).status_code
+            for _ in range(6)
+        ]
+        assert statuses[:5] == [200] * 5
+        assert statuses[5] == 429
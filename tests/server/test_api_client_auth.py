@@ -140,3 +140,53 @@ class TestClientRegistrationWithPIN:
 
         assert pc['is_verified'] == 1
         assert pc['registered_with_token'] == test_pin
+
+    def test_register_single_use_pin_consumed_once(self, client, app):
+        """1회용 PIN은 두 번째 PC 등록 시 거부"""
+        from models.registration import RegistrationTokenModel
+
+        token = RegistrationTokenModel.create(created_by='admin', usage_type='single')['token']
+
+        response1 = client.post('/api/client/register', json={
+            'machine_id': 'TEST-SINGLE-001',
+            'pin': token,
+            'hostname': 'TEST-SINGLE-1',
+            'mac_address': 'AA:BB:CC:DD:EE:21'
+        })
+        assert response1.status_code == 200
+
+        response2 = client.post('/api/client/register', json={
+            'machine_id': 'TEST-SINGLE-002',
+            'pin': token,
+            'hostname': 'TEST-SINGLE-2',
+            'mac_address': 'AA:BB:CC:DD:EE:22'
+        })
+        assert response2.status_code == 403
+        assert 'already used' in response2.get_json()['message'].lower()
+        assert RegistrationTokenModel.get_by_token(token)['used_count'] == 1
+
+    def test_register_upserts_specs_and_dynamic_info(self, client, app, test_pin):
+        """재등록 시 pc_info/pc_specs/pc_dynamic_info가 같은 행으로 갱신"""
+        payload = {
+            'machine_id': 'TEST-UPSERT-001',
+            'pin': test_pin,
+            'hostname': 'TEST-UPSERT-PC',
+            'mac_address': 'AA:BB:CC:DD:EE:31',
+            'cpu_cores': 4,
+            'ram_total': 8.0,
+            'system_info': {'cpu_usage': 12.5, 'processes': ['chrome.exe']}
+        }
+        pc_id = client.post('/api/client/register', json=payload).get_json()['pc_id']
+
+        payload.update({'cpu_cores': 8, 'system_info': {'cpu_usage': 50.0, 'processes': []}})
+        response = client.post('/api/client/register', json=payload)
+        assert response.status_code == 200
+        assert response.get_json()['pc_id'] == pc_id
+
+        from utils.database import get_db
+        db = get_db()
+        specs = db.execute('SELECT cpu_cores FROM pc_specs WHERE pc_id=?', (pc_id,)).fetchall()
+        dynamic = db.execute('SELECT cpu_usage FROM pc_dynamic_info WHERE pc_id=?',
+                             (pc_id,)).fetchall()
+        assert [row['cpu_cores'] for row in specs] == [8]
+        assert [row['cpu_usage'] for row in dynamic] == [50.0]
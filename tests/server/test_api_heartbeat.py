@@ -72,6 +72,34 @@ class TestLongPollCommands:
         pc_data = pc_resp.get_json()
         assert pc_data.get('is_online') == 1
 
+    def test_concurrent_longpolls_exceed_pool_size(self, app, tmp_path):
+        """대기 중인 long-poll은 풀 연결을 붙잡지 않음 (풀 크기보다 많은 동시 대기)"""
+        import sqlite3
+        from concurrent.futures import ThreadPoolExecutor
+        from pathlib import Path
+        from utils.database import init_db_manager
+
+        db_path = str(tmp_path / 'poll.sqlite3')
+        conn = sqlite3.connect(db_path)
+        schema = Path(__file__).resolve().parents[2] / 'server' / 'migrations' / 'schema.sql'
+        conn.executescript(schema.read_text(encoding='utf-8'))
+        conn.execute("INSERT INTO pc_info (machine_id, hostname, mac_address, is_online) "
+                     "VALUES ('AABBCCDDEEFF', 'PC', 'AA:BB:CC:DD:EE:FF', 1)")
+        conn.commit()
+        conn.close()
+        init_db_manager(db_path, timeout=1, pool_size=1, read_pool_size=1, use_writer=True)
+
+        def poll(_):
+            return app.test_client().get('/api/client/commands', query_string={
+                'machine_id': 'AABBCCDDEEFF', 'timeout': 1
+            }).status_code
+
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                assert list(pool.map(poll, range(4))) == [200] * 4
+        finally:
+            init_db_manager(':memory:')
+
     def test_offline_signal(self, client, registered_pc):
         """네트워크 오프라인 신호"""
         pc_id, machine_id = registered_pc
@@ -99,6 +127,38 @@ class TestLongPollCommands:
         pc_data = pc_resp.get_json()
         assert pc_data.get('is_online') == 0
 
+    def test_drain_answers_open_longpoll_and_suppresses_offline(self, app, client, registered_pc):
+        """서버 drain: 대기 중인 long-poll은 재연결 지시, 새 long-poll은 503, 유예 구간의 오프라인 신호는 무시"""
+        import threading
+        import time
+        from services import PCService
+        from utils import get_db
+        from utils.drain import drain, record_restart_window
+
+        pc_id, machine_id = registered_pc
+        drain.configure(1000, 3000)
+        threading.Timer(0.2, drain.begin).start()
+        poll = {'machine_id': machine_id, 'timeout': 10}
+        try:
+            started = time.monotonic()
+            response = client.get('/api/client/commands', query_string=poll)
+            assert time.monotonic() - started < 5
+            assert 1000 <= response.get_json()['data']['reconnect_after_ms'] <= 3000
+
+            rejected = client.get('/api/client/commands', query_string=poll)
+            assert rejected.status_code == 503
+            assert 1 <= int(rejected.headers['Retry-After']) <= 3
+        finally:
+            drain.reset()
+
+        record_restart_window(60, 'test')
+        response = client.post('/api/client/offline', json={'machine_id': machine_id})
+        assert response.get_json()['ignored'] is True
+        get_db().execute("UPDATE pc_info SET last_seen=datetime('now', '-10 minutes')")
+        get_db().commit()
+        assert PCService.update_offline_status() == 0
+        assert get_db().execute('SELECT COUNT(*) FROM network_events').fetchone()[0] == 0
+
     def test_reconnect_restores_online_status(self, client, registered_pc):
         """오프라인 후 재연결 시 is_online=1 복원"""
         pc_id, machine_id = registered_pc
@@ -160,4 +220,89 @@ class TestLongPollCommands:
 
         assert response.status_code == 200
         data = response.get_json()
-        assert data['full_update'] is False
\ No newline at end of file
+        assert data['full_update'] is False
+
+    def test_full_heartbeat_shed_when_saturated(self, app, client, registered_pc):
+        """입장 제어: 상한에 걸린 전체 하트비트는 503 + 지터 있는 Retry-After, 경량은 통과"""
+        from utils.admission import admission
+
+        pc_id, machine_id = registered_pc
+        app.config.update(ADMISSION_QUEUE_WAIT=0, ADMISSION_RETRY_AFTER=2)
+        admission.configure(1)
+        assert admission.try_acquire()
+        try:
+            response = client.post('/api/client/heartbeat',
+                                   json={'machine_id': machine_id, 'full_update': True})
+            assert response.status_code == 503
+            hint_ms = response.get_json()['retry_after_ms']
+            assert 2000 <= hint_ms <= 6000
+            assert int(response.headers['Retry-After']) * 1000 >= hint_ms
+
+            light = client.post('/api/client/heartbeat', json={
+                'machine_id': machine_id, 'full_update': False, 'system_info': {'cpu_usage': 1.0}
+            })
+            assert light.status_code == 200
+        finally:
+            admission.release()
+
+        response = client.post('/api/client/heartbeat',
+                               json={'machine_id': machine_id, 'full_update': True})
+        assert response.status_code == 200
+        assert admission.in_use == 0
+
+    def test_identity_map_skips_lookup_queries(self, client, registered_pc):
+        """식별 맵: 하트비트는 PC 조회 없이 쓰기만, 다른 워커에서 삭제된 PC는 404"""
+        from utils import get_db
+        from utils.metrics import registry
+
+        pc_id, machine_id = registered_pc
+        system_info = {'cpu_usage': 1.0, 'ram_usage_percent': 2.0, 'ip_address': '10.0.0.5'}
+        body = {'machine_id': machine_id, 'full_update': False, 'system_info': system_info}
+        client.post('/api/client/heartbeat',
+                    json={**body, 'system_info': {'ip_address': '10.0.0.4'}})
+        first = client.post('/api/client/heartbeat', json=body)
+        assert first.get_json()['ip_changed'] is True
+
+        before = registry._queries.get('client.heartbeat', 0)
+        second = client.post('/api/client/heartbeat', json=body)
+        assert second.get_json()['ip_changed'] is False
+        # pc_info(last_seen) + pc_dynamic_info UPDATE 두 문장 (machine_id/IP 조회 없음)
+        assert registry._queries['client.heartbeat'] - before == 2
+
+        get_db().execute('DELETE FROM pc_info WHERE id=?', (pc_id,))
+        get_db().commit()
+        assert client.post('/api/client/heartbeat', json=body).status_code == 404
+        response = client.get('/api/client/commands',
+                              query_string={'machine_id': machine_id, 'timeout': 0})
+        assert response.status_code == 404
+
+    def test_identity_map_follows_reregistration_in_other_worker(self, client, registered_pc):
+        """다른 워커에서 삭제 후 재등록된 PC: 맵의 낡은 pc_id 대신 새 pc_id로 기록"""
+        from utils import get_db
+
+        pc_id, machine_id = registered_pc
+        db = get_db()
+        db.execute('DELETE FROM pc_info WHERE id=?', (pc_id,))
+        new_id = db.execute(
+            "INSERT INTO pc_info (machine_id, hostname, mac_address, is_online) "
+            "VALUES (?, 'PC', ?, 0)",
+            (machine_id, 'AA:BB:CC:DD:EE:98')
+        ).lastrowid
+        db.commit()
+
+        response = client.post('/api/client/heartbeat', json={
+            'machine_id': machine_id, 'full_update': False,
+            'system_info': {'cpu_usage': 3.0, 'ram_usage_percent': 4.0}
+        })
+        assert response.status_code == 200
+        row = db.execute('SELECT cpu_usage FROM pc_dynamic_info WHERE pc_id=?',
+                         (new_id,)).fetchone()
+        assert row[0] == 3.0
+
+        response = client.post('/api/client/shutdown', json={'machine_id': machine_id})
+        assert response.status_code == 200
+        assert db.execute('SELECT is_online FROM pc_info WHERE id=?', (new_id,)).fetchone()[0] == 0
+        events = db.execute(
+            'SELECT pc_id, reason FROM network_events WHERE online_at IS NULL'
+        ).fetchall()
+        assert [tuple(e) for e in events] == [(new_id, 'shutdown')]
@@ -0,0 +1,191 @@
+"""
+아티팩트 캐시 테스트 (로컬 file:// 원본으로 외부 저장소 대체)
+"""
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+
+from models import ArtifactModel, CommandModel
+from services import ArtifactService
+from utils.database import run_write
+from utils.version_cache import invalidate_version_cache
+
+
+@pytest.fixture
+def artifact_app(app, tmp_path):
+    """아티팩트 캐시 활성 + file:// 원본 허용"""
+    app.config.update(
+        ARTIFACT_CACHE_ENABLED=True,
+        ARTIFACT_CACHE_DIR=str(tmp_path / 'cache'),
+        ARTIFACT_ALLOWED_SCHEMES=('file',),
+    )
+    return app
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """원본 저장소 역할의 로컬 파일"""
+    data = os.urandom(300 * 1024)
+    path = tmp_path / 'upstream' / 'setup.exe'
+    path.parent.mkdir()
+    path.write_bytes(data)
+    return path.as_uri(), data
+
+
+def _wait_for_fetches():
+    for thread in threading.enumerate():
+        if thread.name == 'wcms-artifact-fetch':
+            thread.join(timeout=10)
+
+
+class TestArtifactCache:
+    """서버 아티팩트 캐시"""
+
+    def test_fetch_once_and_serve_with_range_and_etag(self, artifact_app, admin_session, upstream,
+                                                      monkeypatch):
+        url, data = upstream
+        sha256 = hashlib.sha256(data).hexdigest()
+        fetches = []
+        original_fetch = ArtifactService.fetch
+
+        def counting_fetch(*args):
+            fetches.append(args)
+            return original_fetch(*args)
+
+        monkeypatch.setattr(ArtifactService, 'fetch', staticmethod(counting_fetch))
+
+        # 관리자가 등록하지 않은 URL은 서버가 받지 않음
+        assert admin_session.get('/install/artifacts', query_string={'url': url}).status_code == 404
+
+        response = admin_session.post('/install/artifacts', json={'url': url})
+        assert response.status_code in (200, 202)
+        _wait_for_fetches()
+        ArtifactService.prefetch(url, artifact_app, background=False)
+        assert len(fetches) == 1
+
+        resolved = admin_session.get('/install/artifacts', query_string={'url': url}).get_json()
+        assert (resolved['sha256'], resolved['size']) == (sha256, len(data))
+
+        full = admin_session.get(resolved['download_url'])
+        assert full.status_code == 200 and full.data == data
+        assert full.headers['ETag'] == f'"{sha256}"'
+        assert admin_session.get(resolved['download_url'],
+                                 headers={'If-None-Match': f'"{sha256}"'}).status_code == 304
+
+        partial = admin_session.get(resolved['download_url'],
+                                    headers={'Range': 'bytes=1000-', 'If-Range': f'"{sha256}"'})
+        assert partial.status_code == 206 and partial.data == data[1000:]
+        # If-Range가 다르면 전체를 다시 보냄
+        stale = admin_session.get(resolved['download_url'],
+                                  headers={'Range': 'bytes=1000-', 'If-Range': '"old"'})
+        assert stale.status_code == 200 and stale.data == data
+
+        assert admin_session.get('/install/artifacts/' + '0' * 64).status_code == 404
+        assert admin_session.get('/install/artifacts/../config.py').status_code == 404
+
+    def test_install_command_caches_package(self, artifact_app, admin_session, registered_pc,
+                                            tmp_path):
+        data = b'PK fake nupkg'
+        (tmp_path / 'vlc').write_bytes(data)
+        artifact_app.config['ARTIFACT_CHOCO_PACKAGE_URL'] = tmp_path.as_uri() + '/{app_id}'
+        pc_id, _ = registered_pc
+
+        response = admin_session.post(f'/api/pc/{pc_id}/install', json={'app_id': 'vlc'})
+        assert response.status_code == 200
+        _wait_for_fetches()
+
+        command = CommandModel.get_by_id(response.get_json()['command_id'])
+        package_url = json.loads(command['command_data'])['package_url']
+        assert package_url.endswith('/vlc')
+        assert ArtifactModel.get_by_url(package_url)['sha256'] == hashlib.sha256(data).hexdigest()
+
+    def test_stale_package_refetched(self, artifact_app, tmp_path):
+        """max age가 지난 ready 항목은 다시 받고, 바뀐 내용이면 이전 파일 삭제"""
+        package = tmp_path / 'vlc'
+        package.write_bytes(b'PK vlc 3.0.20')
+        url = package.as_uri()
+        first = ArtifactService.prefetch(url, artifact_app, background=False)
+        old_path = ArtifactService.path_for(artifact_app.config['ARTIFACT_CACHE_DIR'],
+                                            first['sha256'])
+
+        package.write_bytes(b'PK vlc 3.0.21')
+        assert ArtifactService.prefetch(url, artifact_app, background=False)['sha256'] == \
+            first['sha256']  # max age 전에는 그대로
+
+        run_write(lambda db: db.execute(
+            "UPDATE artifacts SET updated_at=datetime('now', '-2 days') WHERE source_url=?", (url,)
+        ))
+        second = ArtifactService.prefetch(url, artifact_app, background=False)
+        assert second['status'] == 'ready'
+        assert second['sha256'] == hashlib.sha256(b'PK vlc 3.0.21').hexdigest()
+        assert not os.path.exists(old_path)
+
+    def test_failed_fetch_falls_back_and_can_retry(self, artifact_app, admin_session, tmp_path):
+        missing = (tmp_path / 'missing.msi').as_uri()
+        entry = ArtifactService.prefetch(missing, artifact_app, background=False)
+        assert entry['status'] == 'error'
+        response = admin_session.get('/install/artifacts', query_string={'url': missing})
+        assert response.status_code == 404
+
+        (tmp_path / 'missing.msi').write_bytes(b'now here')
+        entry = ArtifactService.prefetch(missing, artifact_app, background=False)
+        assert entry['status'] == 'ready'
+
+        # 허용되지 않은 scheme은 등록하지 않음
+        response = admin_session.post('/install/artifacts',
+                                      json={'url': 'http://example.com/a.exe'})
+        assert response.status_code == 400
+
+    def test_client_version_mirrored_with_etag(self, artifact_app, admin_session, upstream):
+        url, data = upstream
+        response = admin_session.post('/api/client/version',
+                                      json={'version': '9.9.9', 'download_url': url})
+        assert response.status_code == 200
+        _wait_for_fetches()
+        # 미러가 준비된 뒤 캐시 만료(VERSION_CACHE_TTL)를 기다리는 대신 직접 비움
+        invalidate_version_cache()
+
+        first = admin_session.get('/api/client/version')
+        body = first.get_json()
+        expected = ('9.9.9', hashlib.sha256(data).hexdigest(), len(data))
+        assert (body['version'], body['sha256'], body['size']) == expected
+        assert admin_session.get(body['mirror_url']).data == data
+
+        etag = first.headers['ETag']
+        cached = admin_session.get('/api/client/version', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+
+    def test_version_lookup_error_not_cached(self, artifact_app, monkeypatch):
+        """DB 오류를 기본 버전(1.0.0)으로 캐시하지 않고 그대로 올림"""
+        import sqlite3
+        import utils.version_cache as version_cache
+
+        def broken_db():
+            raise sqlite3.OperationalError('database is locked')
+
+        invalidate_version_cache()
+        monkeypatch.setattr(version_cache, 'get_read_db', broken_db)
+        with artifact_app.test_request_context():
+            with pytest.raises(sqlite3.OperationalError):
+                version_cache.get_latest_version()
+        assert version_cache._cached is None
+
+    def test_unmirrored_release_mirrored_at_startup(self, artifact_app, admin_session, upstream):
+        """미러 없이 등록된 버전은 GET이 아니라 서버 시작 시 미러링"""
+        url, data = upstream
+        run_write(lambda db: db.execute(
+            "INSERT INTO client_versions (version, download_url) VALUES ('9.9.8', ?)", (url,)
+        ))
+        invalidate_version_cache()
+
+        assert admin_session.get('/api/client/version').get_json()['sha256'] is None
+        assert ArtifactModel.get_by_url(url) is None
+
+        ArtifactService.mirror_latest_release(artifact_app)
+        _wait_for_fetches()
+        invalidate_version_cache()
+        body = admin_session.get('/api/client/version').get_json()
+        assert body['sha256'] == hashlib.sha256(data).hexdigest()
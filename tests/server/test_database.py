@@ -0,0 +1,170 @@
+"""
+DatabaseManager / 연결 풀 테스트
+"""
+import re
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from utils.database import ConnectionPool
+from utils.db_writer import DatabaseWriter
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / 'server' / 'migrations'
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    """WAL 모드에서 사용할 임시 파일 DB"""
+    path = str(tmp_path / 'pool.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestConnectionPool:
+    """ConnectionPool 테스트"""
+
+    def test_connection_reused_after_release(self, db_file):
+        """반납한 연결은 PRAGMA 재실행 없이 재사용"""
+        pool = ConnectionPool(db_file, max_size=2)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        assert pool.acquire() is conn
+        assert pool.created == 1
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+    def test_pool_is_bounded(self, db_file):
+        """최대 크기를 넘으면 timeout 후 예외"""
+        pool = ConnectionPool(db_file, timeout=0, max_size=1)
+        pool.acquire()
+
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire()
+
+    def test_release_rolls_back_open_transaction(self, db_file):
+        """트랜잭션이 열린 채 반납되면 롤백"""
+        pool = ConnectionPool(db_file, max_size=1)
+        conn = pool.acquire()
+        conn.execute('BEGIN')
+        conn.execute("INSERT INTO items (name) VALUES ('leak')")
+        pool.release(conn)
+
+        conn = pool.acquire()
+        assert not conn.in_transaction
+        assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+
+    def test_unhealthy_connection_replaced(self, db_file):
+        """상태 확인에 실패한 유휴 연결은 폐기 후 새로 생성"""
+        pool = ConnectionPool(db_file, max_size=1, health_check_interval=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        conn.close()
+
+        replacement = pool.acquire()
+        assert replacement is not conn
+        assert pool.discarded == 1
+        assert replacement.execute('SELECT 1').fetchone()[0] == 1
+
+    def test_memory_database_shares_connection(self):
+        """':memory:' DB는 모든 대여자가 같은 연결 공유"""
+        pool = ConnectionPool(':memory:', max_size=1)
+        assert pool.acquire() is pool.acquire()
+
+    def test_read_only_pool_rejects_writes(self, db_file):
+        """읽기 전용 풀 연결은 query_only로 쓰기 거부"""
+        pool = ConnectionPool(db_file, max_size=1, read_only=True)
+        conn = pool.acquire()
+
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items (name) VALUES ('x')")
+        assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+
+
+class TestDatabaseWriter:
+    """DatabaseWriter 테스트"""
+
+    @pytest.fixture
+    def writer(self, db_file):
+        pool = ConnectionPool(db_file)
+        writer = DatabaseWriter(pool.connect, max_batch=16, job_timeout=5)
+        yield writer
+        writer.stop()
+
+    def test_jobs_committed_and_results_returned(self, writer, db_file):
+        """제출한 작업이 커밋되고 반환값이 전달됨"""
+        def insert(db, i):
+            return db.execute('INSERT INTO items (name) VALUES (?)', (f'pc-{i}',)).lastrowid
+
+        futures = [writer.submit(lambda db, i=i: insert(db, i)) for i in range(20)]
+        ids = [f.result(timeout=5) for f in futures]
+
+        assert len(set(ids)) == 20
+        conn = sqlite3.connect(db_file)
+        assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 20
+
+    def test_failed_job_rolled_back_alone(self, writer, db_file):
+        """실패한 작업만 SAVEPOINT로 되돌리고 같은 배치의 다른 작업은 커밋"""
+        def failing(db):
+            db.execute("INSERT INTO items (name) VALUES ('bad')")
+            raise ValueError('boom')
+
+        ok = writer.submit(
+            lambda db: db.execute("INSERT INTO items (name) VALUES ('good')").rowcount
+        )
+        bad = writer.submit(failing)
+
+        assert ok.result(timeout=5) == 1
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+        conn = sqlite3.connect(db_file)
+        names = [r[0] for r in conn.execute('SELECT name FROM items')]
+        assert names == ['good']
+
+    def test_stats_reports_queue_and_latency(self, writer):
+        """stats()에 큐 깊이와 지연 시간 포함"""
+        writer.execute(lambda db: db.execute('SELECT 1'))
+        stats = writer.stats()
+
+        assert stats['running'] is True
+        assert stats['queue_depth'] == 0
+        assert stats['jobs_total'] == 1
+        assert stats['latency_max_ms'] >= stats['latency_p50_ms'] >= 0
+
+
+class TestMigrations:
+    """번호 마이그레이션 (server/migrations/NNN_*.sql) 테스트"""
+
+    @staticmethod
+    def _objects(conn):
+        return set(conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+        ))
+
+    def test_migrations_bring_old_db_up_to_schema(self):
+        """마이그레이션이 만드는 객체를 지운 DB(이전 버전)에 적용하면 schema.sql과 같아지고, 다시 적용해도 안전"""
+        schema = (MIGRATIONS_DIR / 'schema.sql').read_text(encoding='utf-8')
+        migrations = sorted(p for p in MIGRATIONS_DIR.glob('[0-9]*.sql'))
+        assert migrations
+
+        current = sqlite3.connect(':memory:')
+        current.executescript(schema)
+        old = sqlite3.connect(':memory:')
+        old.executescript(schema)
+        created = [
+            match for path in migrations
+            for match in re.findall(r'CREATE (TRIGGER|INDEX|TABLE) IF NOT EXISTS (\w+)',
+                                    path.read_text(encoding='utf-8'))
+        ]
+        for kind in ('TRIGGER', 'INDEX', 'TABLE'):
+            for _, name in (c for c in created if c[0] == kind):
+                old.execute(f'DROP {kind} IF EXISTS {name}')
+        assert self._objects(old) != self._objects(current)
+
+        for _ in range(2):
+            for path in migrations:
+                old.executescript(path.read_text(encoding='utf-8'))
+            assert self._objects(old) == self._objects(current)
@@ -0,0 +1,86 @@
+"""
+로그 tail / 검색 색인 테스트
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+from utils.log_reader import LogIndex, tail_lines
+
+
+def _line(ts: str, level: str, message: str) -> str:
+    return f"[2026-03-02 {ts},123] {level}: {message}\n"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'server.log'
+    path.write_text(
+        _line('09:00:00', 'INFO', '[명령조회] 명령 발견: PC 3, 명령 123 (shutdown)')
+        + _line('09:00:05', 'ERROR', '[명령결과] 예외: 명령 124, boom')
+        + 'Traceback (most recent call last):\n'
+        + '  ValueError: boom\n'
+        + _line('09:01:00', 'INFO', '[재연결] PC 7 (ABC) 온라인 복원'),
+        encoding='utf-8'
+    )
+    return str(path)
+
+
+@pytest.fixture
+def index(log_file, tmp_path):
+    idx = LogIndex(log_file, str(tmp_path / 'index.sqlite3'))
+    yield idx
+    idx.close()
+
+
+class TestTailLines:
+    """tail_lines 테스트"""
+
+    def test_returns_last_lines_across_chunks(self, tmp_path):
+        """청크 경계와 관계없이 마지막 N줄 반환"""
+        path = tmp_path / 'big.log'
+        path.write_text(''.join(f"line {i}\n" for i in range(1000)), encoding='utf-8')
+
+        assert tail_lines(str(path), 3, chunk_size=7) == ['line 997\n', 'line 998\n', 'line 999\n']
+
+    def test_short_file(self, log_file):
+        """줄 수보다 많이 요청하면 전체 반환"""
+        assert len(tail_lines(log_file, 200)) == 5
+
+
+class TestLogIndex:
+    """LogIndex 테스트"""
+
+    def test_search_by_command_id_includes_traceback(self, index):
+        """명령 ID로 검색, 이어지는 traceback 줄 포함"""
+        entries = index.search(command_id=124)
+
+        assert len(entries) == 1
+        assert entries[0]['level'] == 'ERROR'
+        assert entries[0]['text'].endswith('ValueError: boom')
+
+    def test_search_filters(self, index):
+        """PC ID / 레벨 / 시간 범위 필터"""
+        assert [e['command_id'] for e in index.search(pc_id=3)] == [123]
+        assert [e['pc_id'] for e in index.search(level='info')] == [7, 3]
+        since = datetime(2026, 3, 2, 9, 0, 30)
+        assert [e['pc_id'] for e in index.search(since=since)] == [7]
+
+    def test_incremental_refresh_and_rotation(self, index, log_file):
+        """추가된 줄만 색인하고, 로테이션된 파일은 재색인하지 않음"""
+        assert index.refresh() == 3
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write(_line('09:02:00', 'INFO', '명령 완료 처리: cmd_id=200, rows_affected=1'))
+        assert index.refresh() == 1
+
+        os.rename(log_file, log_file + '.1')
+        with open(log_file, 'w', encoding='utf-8') as f:
+            f.write(_line('09:03:00', 'WARNING', '명령 전송 실패: PC 미존재 (pc_id=9)'))
+        assert index.refresh() == 1
+
+        assert index.search(command_id=200)[0]['text'].endswith('rows_affected=1')
+        assert index.search(pc_id=9)[0]['level'] == 'WARNING'
+
+        os.remove(log_file + '.1')
+        assert index.search(command_id=200) == []
@@ -0,0 +1,67 @@
+"""
+MaintenanceService 테스트 (보관 기간 정리 + incremental vacuum)
+"""
+from services import MaintenanceService
+from utils.database import get_db
+
+
+def _insert_commands(db, count, status, age_days):
+    db.execute('''
+        INSERT OR IGNORE INTO pc_info (id, machine_id, hostname, mac_address)
+        VALUES (1, 'MAINT-PC', 'maint-pc', '00:00:00:00:00:01')
+    ''')
+    db.executemany(f'''
+        INSERT INTO commands (pc_id, command_type, status, created_at)
+        VALUES (1, 'execute', ?, datetime('now', '-{age_days} days'))
+    ''', [(status,)] * count)
+    db.commit()
+
+
+class TestMaintenanceService:
+    """MaintenanceService 테스트"""
+
+    def test_purge_in_batches_stops_on_short_batch(self):
+        """삭제 행이 배치 크기보다 적으면 중단"""
+        remaining = [1200]
+
+        def purge(n):
+            deleted = min(n, remaining[0])
+            remaining[0] -= deleted
+            return deleted
+
+        assert MaintenanceService.purge_in_batches(purge, 500, max_batches=10) == 1200
+        assert remaining[0] == 0
+
+    def test_purge_respects_batch_budget(self):
+        """max_batches를 넘겨 삭제하지 않음"""
+        assert MaintenanceService.purge_in_batches(lambda n: n, 100, max_batches=3) == 300
+
+    def test_run_deletes_only_expired_finished_commands(self, app):
+        """보관 기간이 지난 완료 명령만 배치로 삭제"""
+        db = get_db()
+        _insert_commands(db, 120, 'completed', age_days=40)
+        _insert_commands(db, 5, 'pending', age_days=40)
+        _insert_commands(db, 7, 'completed', age_days=1)
+
+        config = dict(app.config, MAINTENANCE_BATCH_SIZE=50)
+        report = MaintenanceService.run(config)
+
+        assert report['deleted']['commands'] == 120
+        assert db.execute('SELECT COUNT(*) FROM commands').fetchone()[0] == 12
+        assert MaintenanceService.get_last_report() is report
+        assert report['checkpoint']['mode'] == 'PASSIVE'
+
+    def test_incremental_vacuum_reclaims_pages(self, app):
+        """삭제로 생긴 빈 페이지를 예산만큼 회수"""
+        db = get_db()
+        _insert_commands(db, 3000, 'completed', age_days=40)
+        db.execute("UPDATE commands SET result = hex(randomblob(500))")
+        db.execute('DELETE FROM commands')
+        db.commit()
+
+        free_before = db.execute('PRAGMA freelist_count').fetchone()[0]
+        result = MaintenanceService.incremental_vacuum(max_pages=10)
+
+        assert result['auto_vacuum'] == 'INCREMENTAL'
+        assert result['pages_reclaimed'] == 10
+        assert result['freelist_after'] == free_before - 10
@@ -0,0 +1,121 @@
+"""
+요청 메트릭 / /metrics 엔드포인트 테스트
+"""
+import os
+import sqlite3
+
+from utils.db_writer import DatabaseWriter
+from utils.metrics import MetricsRegistry, RequestStats, _current_request, count_statement
+
+
+def _metric_value(body, prefix):
+    """prefix로 시작하는 메트릭 줄의 값 (없으면 None)"""
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry 단위 테스트"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """버킷은 누적 개수, +Inf와 count는 전체 요청 수"""
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        for duration in (0.005, 0.05, 0.5):
+            registry.start('client.heartbeat')
+            registry.finish('client.heartbeat', 'POST', 200, duration, queries=2)
+
+        body = '\n'.join(registry.render())
+        labels = 'endpoint="client.heartbeat",method="POST"'
+        assert f'wcms_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 1' in body
+        assert f'wcms_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 2' in body
+        assert f'wcms_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in body
+        assert f'wcms_http_request_duration_seconds_count{{{labels}}} 3' in body
+        assert f'wcms_http_requests_total{{{labels},status="200"}} 3' in body
+        assert 'wcms_http_db_queries_total{endpoint="client.heartbeat"} 6' in body
+        assert registry.in_flight('client.heartbeat') == 0
+
+    def test_count_statement_skips_transaction_control_and_repeats(self):
+        """BEGIN/COMMIT/SAVEPOINT와 연속 중복(트리거 단계 재보고)은 세지 않음"""
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        try:
+            for statement in ('BEGIN', 'SELECT 1', 'SELECT 1', 'SAVEPOINT job',
+                              'UPDATE t SET a=1', 'COMMIT'):
+                count_statement(statement)
+        finally:
+            _current_request.reset(token)
+        assert stats.queries == 2
+
+    def test_writer_jobs_count_toward_submitting_request(self, tmp_path):
+        """writer 스레드에서 실행된 쓰기도 제출한 요청의 SQL 문 수에 포함"""
+        def connect():
+            conn = sqlite3.connect(str(tmp_path / 'writer.db'), isolation_level=None,
+                                   check_same_thread=False)
+            conn.set_trace_callback(count_statement)
+            return conn
+
+        writer = DatabaseWriter(connect)
+        writer.execute(lambda conn: conn.execute('CREATE TABLE t (a INTEGER)'))
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        try:
+            writer.execute(lambda conn: conn.execute('INSERT INTO t VALUES (1)'))
+        finally:
+            _current_request.reset(token)
+            writer.stop()
+        assert stats.queries == 1
+
+
+class TestMetricsEndpoint:
+    """/metrics 엔드포인트 테스트"""
+
+    def test_metrics_after_heartbeat(self, client, registered_pc):
+        """하트비트 요청 후 지연 히스토그램, SQL 문 수, 플릿 게이지 노출 (워커 시계열은 worker 라벨)"""
+        pc_id, _ = registered_pc
+        worker = f'worker="{os.getpid()}"'
+        queries = f'wcms_http_db_queries_total{{endpoint="client.heartbeat",{worker}}}'
+        before = _metric_value(client.get('/metrics').get_data(as_text=True), queries) or 0
+
+        response = client.post('/api/client/heartbeat', json={'pc_id': pc_id, 'cpu_usage': 10.0})
+        assert response.status_code == 200
+
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.get_data(as_text=True)
+
+        assert ('wcms_http_request_duration_seconds_bucket'
+                f'{{endpoint="client.heartbeat",method="POST",{worker},le="+Inf"}}') in body
+        assert _metric_value(body, queries) > before
+        assert _metric_value(body, 'wcms_pcs_total ') == 1
+        assert _metric_value(body, 'wcms_pcs_online ') == 1
+        assert _metric_value(body, 'wcms_commands_pending ') == 0
+        assert _metric_value(body, f'wcms_longpolls_open{{{worker}}} ') == 0
+        assert _metric_value(body, f'wcms_process_start_time_seconds{{{worker}}} ') > 0
+        # 수집 중인 /metrics 요청 자신은 처리 중으로 보임
+        in_flight = f'wcms_http_requests_in_flight{{endpoint="metrics",{worker}}}'
+        assert _metric_value(body, in_flight) == 1
+
+    def test_metrics_token_required_when_configured(self, app, client):
+        """WCMS_METRICS_TOKEN 설정 시 Bearer 토큰 없으면 401"""
+        app.config['METRICS_TOKEN'] = 'scrape-secret'
+
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+        response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+        assert response.status_code == 200
+        assert 'wcms_http_requests_total' in response.get_data(as_text=True)
+
+    def test_metrics_disabled(self, monkeypatch):
+        """METRICS_ENABLED=False면 /metrics 라우트와 trace 콜백을 설치하지 않음"""
+        from config import TestConfig
+        from app import create_app
+        from utils import database
+
+        monkeypatch.setattr(TestConfig, 'METRICS_ENABLED', False)
+        app = create_app('test')
+        assert 'metrics' not in app.view_functions
+        assert database._statement_hook is None
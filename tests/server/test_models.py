@@ -77,6 +77,51 @@ class TestCommandModel:
         commands = CommandModel.get_pending_for_pc(pc_id)
         assert len(commands) > 0
 
+    def test_result_stored_compressed_out_of_row(self, app, monkeypatch):
+        """결과는 commands 밖에 압축 저장되고, 상한을 넘으면 잘림 표시가 붙음"""
+        from models import CommandResultModel
+        from utils.database import get_db
+        pc_id = PCModel.register(machine_id='TEST-PC-RESULT', hostname='r',
+                                 mac_address='00:00:00:00:00:01')
+        small_id = CommandModel.create(pc_id=pc_id, command_type='execute')
+        big_id = CommandModel.create(pc_id=pc_id, command_type='execute')
+        monkeypatch.setattr(CommandResultModel, 'max_bytes', 1000)
+
+        assert CommandModel.complete(small_id, '한글 출력\n' * 50)
+        assert CommandModel.complete(big_id, 'x' * 5000)
+
+        assert CommandModel.get_by_id(small_id)['result'] == '한글 출력\n' * 50
+        big = CommandModel.get_by_id(big_id)['result']
+        assert big.startswith('x' * 1000) and '원본 5000바이트' in big
+        db = get_db()
+        inline = db.execute('SELECT result FROM commands WHERE id IN (?, ?)',
+                            (small_id, big_id)).fetchall()
+        assert [row['result'] for row in inline] == [None, None]
+        row = db.execute('SELECT original_size, truncated, length(result) AS stored '
+                         'FROM command_results WHERE command_id=?', (big_id,)).fetchone()
+        assert (row['original_size'], row['truncated']) == (5000, 1) and row['stored'] < 200
+
+    def test_inline_results_migrated_and_cleaned_up(self, app):
+        """이전 버전 인라인 결과는 읽을 수 있고, 이동 후 오래된 명령과 함께 삭제됨"""
+        from models import CommandResultModel
+        from utils.database import get_db
+        pc_id = PCModel.register(machine_id='TEST-PC-LEGACY', hostname='l',
+                                 mac_address='00:00:00:00:00:02')
+        cmd_id = CommandModel.create(pc_id=pc_id, command_type='execute')
+        db = get_db()
+        db.execute("UPDATE commands SET status='completed', result='legacy output', "
+                   "created_at=datetime('now', '-40 days') WHERE id=?", (cmd_id,))
+        db.commit()
+
+        assert CommandModel.get_recent()[0]['result'] == 'legacy output'
+        assert CommandResultModel.migrate_inline() == 1
+        row = db.execute('SELECT result FROM commands WHERE id=?', (cmd_id,)).fetchone()
+        assert row['result'] is None
+        assert CommandModel.get_by_status('completed')[0]['result'] == 'legacy output'
+
+        assert CommandModel.cleanup_old(days=30) == 1
+        assert CommandResultModel.load([cmd_id]) == {}
+
 
 class TestAdminModel:
     """AdminModel 테스트"""
@@ -0,0 +1,98 @@
+"""
+AvailabilityModel 테스트 (network_events 일별 롤업 + 리포트)
+"""
+from datetime import date, datetime
+
+import pytest
+from models import AvailabilityModel
+from utils.database import get_db
+
+NOW = datetime(2026, 3, 4, 12, 0, 0)
+
+
+@pytest.fixture
+def pc_with_events(app):
+    """03-02 ~ 03-04 사이 장애 3건이 있는 PC"""
+    db = get_db()
+    cursor = db.execute('''
+        INSERT INTO pc_info (machine_id, hostname, mac_address, room_name, created_at)
+        VALUES ('AVAIL-PC-1', 'lab-pc-1', '00:11:22:33:44:55', '1실습실', '2026-03-01 00:00:00')
+    ''')
+    pc_id = cursor.lastrowid
+    db.executemany(
+        'INSERT INTO network_events (pc_id, offline_at, online_at, reason) VALUES (?, ?, ?, ?)',
+        [
+            # 자정을 걸친 2시간 장애
+            (pc_id, '2026-03-02 23:00:00', '2026-03-03 01:00:00', 'timeout'),
+            # 위 장애와 겹치는 이벤트 (다운타임 중복 계산 안 함)
+            (pc_id, '2026-03-03 00:30:00', '2026-03-03 00:45:00', 'network_error'),
+            # 아직 복구되지 않은 장애 (NOW까지 2시간)
+            (pc_id, '2026-03-04 10:00:00', None, 'shutdown'),
+        ]
+    )
+    db.commit()
+    return pc_id
+
+
+class TestAvailabilityModel:
+    """AvailabilityModel 테스트"""
+
+    def test_rollup_splits_outages_by_day(self, app, pc_with_events):
+        """완료된 날짜만 증분 롤업, 자정을 걸친 구간은 일자별로 분할"""
+        assert AvailabilityModel.refresh_rollup(datetime(2026, 3, 3, 0, 30)) == 1
+        assert AvailabilityModel.refresh_rollup(NOW) == 1
+        assert AvailabilityModel.refresh_rollup(NOW) == 0
+
+        rows = get_db().execute('''
+            SELECT day, reason, downtime_sec, outage_count, recovered_count
+            FROM availability_daily WHERE pc_id=? ORDER BY day, reason
+        ''', (pc_with_events,)).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ('2026-03-02', 'timeout', 3600, 1, 0),
+            ('2026-03-03', 'network_error', 0, 1, 1),
+            ('2026-03-03', 'timeout', 3600, 0, 1),
+        ]
+        cumulative = get_db().execute('''
+            SELECT cum_downtime_sec, cum_outage_count, cum_recovery_sec FROM availability_daily
+            WHERE pc_id=? AND reason='timeout' AND day='2026-03-03'
+        ''', (pc_with_events,)).fetchone()
+        assert tuple(cumulative) == (7200, 1, 7200)
+
+    def test_report_combines_rollup_and_today(self, app, pc_with_events):
+        """리포트 = 롤업(어제까지) + 오늘 원본 집계"""
+        report = AvailabilityModel.get_report(date(2026, 3, 2), date(2026, 3, 4), now=NOW)
+        pc = report['pcs'][0]
+
+        assert pc['period_sec'] == 60 * 3600
+        assert pc['downtime_sec'] == 4 * 3600
+        assert pc['uptime_percent'] == pytest.approx(93.333, abs=0.001)
+        assert pc['outage_count'] == 3
+        assert pc['mttr_sec'] == (7200 + 900) // 2
+        assert pc['by_reason']['shutdown'] == {'outage_count': 1, 'downtime_sec': 7200}
+
+        room = report['rooms'][0]
+        assert room['room_name'] == '1실습실'
+        assert room['pc_count'] == 1
+        assert room['uptime_percent'] == pc['uptime_percent']
+
+    def test_report_skips_writer_when_rolled_up(self, app, pc_with_events, monkeypatch):
+        """어제까지 롤업돼 있으면 리포트 조회는 writer 트랜잭션을 열지 않음"""
+        AvailabilityModel.get_report(date(2026, 3, 2), date(2026, 3, 4), now=NOW)
+
+        def no_write(job):
+            raise AssertionError('writer used')
+
+        monkeypatch.setattr('models.availability.run_write', no_write)
+        report = AvailabilityModel.get_report(date(2026, 3, 2), date(2026, 3, 4), now=NOW)
+        assert report['pcs'][0]['downtime_sec'] == 4 * 3600
+        assert AvailabilityModel.refresh_rollup(NOW) == 0
+
+    def test_report_range_and_room_filter(self, app, pc_with_events):
+        """조회 범위 밖 장애 제외, 다른 실습실은 빈 결과"""
+        report = AvailabilityModel.get_report(date(2026, 3, 2), date(2026, 3, 2), now=NOW)
+        assert report['pcs'][0]['downtime_sec'] == 3600
+        assert report['pcs'][0]['outage_count'] == 1
+
+        assert AvailabilityModel.get_report(
+            date(2026, 3, 2), date(2026, 3, 4), room_name='없는실습실', now=NOW
+        )['pcs'] == []
@@ -0,0 +1,120 @@
+"""
+SQL 문장 통계 (느린 쿼리 로그, 실행 계획, top-N 리포트) 테스트
+"""
+import logging
+from pathlib import Path
+
+import pytest
+
+from utils.database import ConnectionPool
+from utils.query_stats import QueryStats, normalize_statement
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / 'server' / 'migrations' / 'schema.sql'
+
+
+@pytest.fixture
+def stats_conn():
+    """통계 수집 연결 (인메모리 DB + schema.sql)"""
+    stats = QueryStats(slow_threshold_ms=1000)
+    conn = ConnectionPool(':memory:', query_stats=stats).connect()
+    conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+    stats.reset()
+    yield conn, stats
+    conn.close()
+
+
+class TestQueryStats:
+    """QueryStats 테스트"""
+
+    def test_normalize_statement(self):
+        """리터럴, 공백, IN 목록 길이가 달라도 같은 문장으로 집계"""
+        assert normalize_statement("SELECT * FROM t WHERE a = 'x''y' AND b = 10") == \
+            'SELECT * FROM t WHERE a = ? AND b = ?'
+        assert normalize_statement('SELECT *\n  FROM t WHERE id IN (?, ?, ?)') == \
+            normalize_statement('SELECT * FROM t WHERE id IN (?)')
+        assert normalize_statement('SELECT col2 FROM t2') == 'SELECT col2 FROM t2'
+
+    def test_aggregates_executions_and_rows(self, stats_conn):
+        """실행 횟수, fetch한 행 수, 변경 행 수 집계"""
+        conn, stats = stats_conn
+        insert = 'INSERT INTO pc_info (machine_id, hostname, mac_address) VALUES (?, ?, ?)'
+        conn.executemany(insert, [(f'M{i}', f'pc-{i}', f'00:00:00:00:00:{i:02d}')
+                                  for i in range(5)])
+        for _ in range(3):
+            conn.execute('SELECT id FROM pc_info').fetchall()
+        rows = list(conn.execute('SELECT hostname FROM pc_info WHERE id > ?', (2,)))
+
+        report = {s['statement']: s for s in stats.report()['top']}
+        assert len(rows) == 3
+        assert report['SELECT id FROM pc_info']['count'] == 3
+        assert report['SELECT id FROM pc_info']['rows'] == 15
+        assert report['SELECT hostname FROM pc_info WHERE id > ?']['rows'] == 3
+        assert report[insert]['rows'] == 5
+
+    def test_reports_index_usage(self, stats_conn):
+        """실행 계획으로 idx_commands_pending / idx_pc_info_room 사용 여부 확인"""
+        conn, stats = stats_conn
+        conn.execute('''
+            SELECT id FROM commands WHERE pc_id=? AND status='pending'
+            ORDER BY priority ASC, created_at ASC LIMIT 1
+        ''', (1,)).fetchone()
+        conn.execute('SELECT id FROM pc_info WHERE room_name=? AND is_online=1',
+                     ('1실습실',)).fetchall()
+        conn.execute('SELECT id FROM commands WHERE command_type=?', ('execute',)).fetchall()
+
+        report = stats.report()
+        assert report['index_usage']['idx_commands_pending'] == 1
+        assert report['index_usage']['idx_pc_info_room'] == 1
+        full_scans = [s['statement'] for s in report['full_scans']]
+        assert full_scans == ['SELECT id FROM commands WHERE command_type=?']
+
+    def test_slow_query_logged_with_plan(self, caplog):
+        """임계값 이상 실행은 실행 계획과 함께 경고 로그"""
+        stats = QueryStats(slow_threshold_ms=0)
+        conn = ConnectionPool(':memory:', query_stats=stats).connect()
+        conn.execute('CREATE TABLE t (a INTEGER)')
+        with caplog.at_level(logging.WARNING, logger='wcms.query_stats'):
+            conn.execute('SELECT a FROM t WHERE a = ?', (1,)).fetchall()
+        conn.close()
+
+        assert any('[느린 쿼리]' in r.message and 'SCAN t' in r.message for r in caplog.records)
+        entry = next(s for s in stats.report()['top']
+                     if s['statement'] == 'SELECT a FROM t WHERE a = ?')
+        assert entry['slow'] == 1
+
+
+class TestQueryReportAPI:
+    """GET/DELETE /api/debug/queries 테스트"""
+
+    def test_disabled_by_default(self, client, admin_session):
+        """기본 설정에서는 통계 비활성 (404)"""
+        response = client.get('/api/debug/queries')
+        assert response.status_code == 404
+
+    def test_report_and_reset(self, monkeypatch):
+        """WCMS_DB_QUERY_STATS=true면 top-N 리포트 조회 및 초기화"""
+        from config import TestConfig
+        from app import create_app
+        from utils.database import get_db
+
+        monkeypatch.setattr(TestConfig, 'DB_QUERY_STATS', True)
+        app = create_app('test')
+        with app.app_context():
+            get_db().executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['admin'] = True
+            sess['username'] = 'admin'
+        client.get('/api/pcs')
+
+        response = client.get('/api/debug/queries', query_string={'limit': 3, 'sort': 'count'})
+        assert response.status_code == 200
+        data = response.get_json()['data']
+        assert data['executions'] > 0
+        assert len(data['top']) <= 3
+        assert data['top'][0]['count'] >= data['top'][-1]['count']
+
+        assert client.delete('/api/debug/queries').status_code == 200
+        after_reset = client.get('/api/debug/queries').get_json()['data']
+        assert after_reset['executions'] < data['executions']
@@ -0,0 +1,135 @@
+"""
+클라이언트 단계적 배포 테스트
+"""
+import pytest
+
+from models import RolloutModel
+from services import RolloutService
+from utils import get_db
+
+
+@pytest.fixture
+def rollout_app(app):
+    """관찰 시간 없이 바로 다음 웨이브로 넘어가는 배포 설정"""
+    app.config.update(ROLLOUT_SOAK_SECONDS=0, ROLLOUT_CACHE_TTL=0, ROLLOUT_MAX_FAILURE_RATIO=0.5)
+    return app
+
+
+def _add_pcs(count, room_name='1실습실'):
+    db = get_db()
+    for i in range(count):
+        db.execute('''
+            INSERT INTO pc_info (machine_id, hostname, mac_address, room_name, last_seen)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (f'{room_name}-{i}', f'PC-{i}', f'AA:BB:CC:00:00:{i:02X}', room_name))
+    db.commit()
+    return [f'{room_name}-{i}' for i in range(count)]
+
+
+def _release(admin_session, version, rollout=None):
+    body = {'version': version, 'download_url': f'https://example.com/{version}.exe'}
+    if rollout is not None:
+        body['rollout'] = rollout
+    response = admin_session.post('/api/client/version', json=body)
+    assert response.status_code == 200
+    return response.get_json()['rollout_id']
+
+
+def _check(client, machine_id, current='1.0.0'):
+    return client.get('/api/client/version',
+                      query_string={'machine_id': machine_id, 'current': current})
+
+
+class TestRollout:
+    """웨이브 배정과 동시 업데이트 상한"""
+
+    def test_normalize_waves(self):
+        assert RolloutService.normalize_waves('percent', [10, 50]) == [10, 50, 100]
+        assert RolloutService.normalize_waves('room', ['1실습실', ['2실습실', '3실습실']]) == \
+            [['1실습실'], ['2실습실', '3실습실']]
+        invalid = (('percent', [50, 10]), ('percent', [0]), ('room', [[]]), ('zone', [1]))
+        for strategy, waves in invalid:
+            with pytest.raises(ValueError):
+                RolloutService.normalize_waves(strategy, waves)
+
+    def test_concurrency_cap_and_return_on_new_version(self, rollout_app, admin_session, client):
+        pcs = _add_pcs(3)
+        _release(admin_session, '1.0.0', rollout=False)
+        rollout_id = _release(admin_session, '2.0.0', rollout={'waves': [100], 'max_concurrent': 1})
+
+        first = _check(client, pcs[0])
+        assert first.get_json()['version'] == '2.0.0'
+        assert first.get_json()['rollout']['state'] == 'go'
+
+        # 상한에 걸린 PC는 현재 버전과 짧은 Retry-After를 받음
+        second = _check(client, pcs[1])
+        body = second.get_json()
+        assert (body['version'], body['download_url']) == ('1.0.0', None)
+        assert second.headers['Retry-After'] == str(rollout_app.config['ROLLOUT_SLOT_RETRY_AFTER'])
+        assert second.headers['ETag'] != first.headers['ETag']
+
+        # 이전 클라이언트(machine_id 없음)는 배포가 끝날 때까지 이전 버전
+        assert client.get('/api/client/version').get_json()['version'] == '1.0.0'
+
+        # 첫 PC가 새 버전으로 돌아오면 슬롯이 비어 다음 PC 차례
+        assert _check(client, pcs[0], current='2.0.0').get_json()['version'] == '2.0.0'
+        assert RolloutModel.get_client(rollout_id, pcs[0])['state'] == 'updated'
+        assert _check(client, pcs[1]).get_json()['rollout']['state'] == 'go'
+
+    def test_waves_advance_and_complete(self, rollout_app, admin_session, client):
+        first_room, second_room = _add_pcs(2, '1실습실'), _add_pcs(2, '2실습실')
+        _release(admin_session, '1.0.0', rollout=False)
+        rollout_id = _release(admin_session, '2.0.0',
+                              rollout={'strategy': 'room', 'waves': [['1실습실']]})
+
+        # 2실습실은 정의에 없으므로 나머지 웨이브 (차례가 아님)
+        waiting = _check(client, second_room[0])
+        retry_after = rollout_app.config['ROLLOUT_RETRY_AFTER']
+        assert waiting.get_json()['rollout'] == {'id': rollout_id, 'state': 'waiting', 'wave': 1,
+                                                 'retry_after': retry_after}
+
+        for machine_id in first_room:
+            assert _check(client, machine_id).get_json()['rollout']['state'] == 'go'
+        # 진행 중인 업데이트가 있으면 다음 웨이브로 가지 않음
+        assert RolloutService.evaluate(rollout_app.config)['current_wave'] == 0
+        for machine_id in first_room:
+            _check(client, machine_id, current='2.0.0')
+
+        assert RolloutService.evaluate(rollout_app.config)['current_wave'] == 1
+        assert _check(client, second_room[0]).get_json()['rollout']['state'] == 'go'
+        _check(client, second_room[0], current='2.0.0')
+        assert RolloutService.evaluate(rollout_app.config)['status'] == 'completed'
+
+        progress = admin_session.get(f'/api/rollouts/{rollout_id}').get_json()['rollout']
+        assert [(w['targets'], w['updated']) for w in progress['wave_progress']] == [(2, 2), (2, 1)]
+        # 완료 후에는 모든 클라이언트가 새 버전을 받음
+        assert _check(client, second_room[1]).get_json()['version'] == '2.0.0'
+        assert client.get('/api/client/version').get_json()['version'] == '2.0.0'
+
+    def test_pause_on_failures_and_admin_control(self, rollout_app, admin_session, client):
+        pcs = _add_pcs(2)
+        _release(admin_session, '1.0.0', rollout=False)
+        rollout_id = _release(admin_session, '2.0.0', rollout={'waves': [100]})
+        for machine_id in pcs:
+            _check(client, machine_id)
+
+        # 제한 시간 안에 새 버전으로 돌아오지 않음 → 실패 → 배포 중지
+        get_db().execute("UPDATE rollout_clients SET started_at=datetime('now', '-1 hour')")
+        get_db().commit()
+        rollout_app.config['ROLLOUT_SLOT_TIMEOUT'] = 600
+        rollout = RolloutService.evaluate(rollout_app.config)
+        assert rollout['status'] == 'paused' and '2/2' in rollout['status_reason']
+        assert _check(client, pcs[0]).get_json()['version'] == '1.0.0'
+
+        assert admin_session.post(f'/api/rollouts/{rollout_id}/pause').status_code == 409
+        assert admin_session.post(f'/api/rollouts/{rollout_id}/bogus').status_code == 400
+        resumed = admin_session.post(f'/api/rollouts/{rollout_id}/resume').get_json()['rollout']
+        assert resumed['status'] == 'active'
+        assert admin_session.post(f'/api/rollouts/{rollout_id}/cancel').status_code == 200
+        assert client.get('/api/client/version').get_json()['version'] == '2.0.0'
+
+        listed = admin_session.get('/api/rollouts').get_json()['rollouts']
+        assert [r['status'] for r in listed] == ['cancelled']
+        assert admin_session.post('/api/rollouts', json={'version': '9.9.9'}).status_code == 404
+        response = admin_session.post('/api/rollouts', json={'version': '2.0.0', 'waves': [50, 10]})
+        assert response.status_code == 400
@@ -0,0 +1,62 @@
+"""
+SQLite 세션 저장소 테스트
+"""
+import time
+
+import pytest
+
+from utils.session_store import SQLiteSessionCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    store = SQLiteSessionCache(str(tmp_path / 'sessions.sqlite3'), default_timeout=60)
+    yield store
+    store.close()
+
+
+class TestSQLiteSessionCache:
+    """SQLiteSessionCache 테스트"""
+
+    def test_set_and_get(self, cache):
+        """저장한 세션 데이터를 그대로 조회"""
+        cache.set('session:abc', {'admin_id': 1, 'username': 'admin'})
+
+        assert cache.get('session:abc') == {'admin_id': 1, 'username': 'admin'}
+        assert cache.has('session:abc')
+
+    def test_set_overwrites_existing(self, cache):
+        """같은 키로 다시 저장하면 덮어쓰기"""
+        cache.set('session:abc', {'n': 1})
+        cache.set('session:abc', {'n': 2})
+
+        assert cache.get('session:abc') == {'n': 2}
+
+    def test_expired_session_not_returned(self, cache, monkeypatch):
+        """만료된 세션은 조회되지 않고 prune()으로 삭제"""
+        cache.set('session:old', {'n': 1}, timeout=10)
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 11)
+
+        assert cache.get('session:old') is None
+        assert not cache.has('session:old')
+        assert cache.add('session:old', {'n': 2})
+        assert cache.get('session:old') == {'n': 2}
+
+        cache.set('session:stale', {'n': 3}, timeout=1)
+        monkeypatch.setattr(time, 'time', lambda: now + 20)
+        assert cache.prune() == 1
+
+    def test_add_keeps_live_session(self, cache):
+        """유효한 세션이 있으면 add()는 덮어쓰지 않음"""
+        cache.set('session:abc', {'n': 1})
+
+        assert not cache.add('session:abc', {'n': 2})
+        assert cache.get('session:abc') == {'n': 1}
+
+    def test_delete(self, cache):
+        """로그아웃 시 세션 삭제"""
+        cache.set('session:abc', {'n': 1})
+
+        assert cache.delete('session:abc')
+        assert cache.get('session:abc') is None
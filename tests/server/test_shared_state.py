@@ -0,0 +1,209 @@
+"""
+워커 간 공유 상태 테스트 (명령 알림, 리더 임대, SQLite Rate Limit 저장소, 관리자 캐시)
+"""
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from utils.command_watcher import CommandWatcher
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / 'server' / 'migrations' / 'schema.sql'
+
+
+class TestCommandWatcher:
+    """CommandWatcher 테스트"""
+
+    def test_notify_wakes_waiter(self):
+        """같은 프로세스에서 명령 생성 시 대기자가 즉시 깨어남"""
+        watcher = CommandWatcher(probe_interval=60)
+        watcher.latest_id = 5
+        watcher._probed_at = time.monotonic()  # 조회 없이 notify만으로 깨어나는지 확인
+
+        threading.Timer(0.1, watcher.notify, args=(6,)).start()
+        started = time.monotonic()
+        assert watcher.wait(5, timeout=5, probe=lambda: 5) == 6
+        assert time.monotonic() - started < 1
+
+    def test_probe_detects_other_worker(self):
+        """다른 워커가 만든 명령은 probe_interval 안에 감지"""
+        watcher = CommandWatcher(probe_interval=0.05)
+        watcher.latest_id = 3
+        latest = [3]
+        threading.Timer(0.2, lambda: latest.__setitem__(0, 4)).start()
+
+        assert watcher.wait(3, timeout=5, probe=lambda: latest[0]) == 4
+
+    def test_waiters_share_one_probe(self):
+        """동시에 기다리는 long-poll이 많아도 조회는 주기당 한 번"""
+        watcher = CommandWatcher(probe_interval=0.1)
+        threads = [threading.Thread(target=watcher.wait, args=(0, 0.5, lambda: 0))
+                   for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert watcher.probes <= 7
+
+    def test_timeout_without_change(self):
+        watcher = CommandWatcher(probe_interval=0.05)
+        assert watcher.wait(0, timeout=0.2, probe=lambda: 0) == 0
+
+
+class TestLongPollWakeup:
+    """long-poll 즉시 반환 테스트"""
+
+    def test_longpoll_returns_when_other_worker_creates_command(self, app, tmp_path):
+        """다른 프로세스가 DB에 넣은 명령도 timeout을 기다리지 않고 전달"""
+        from utils.database import init_db_manager
+
+        db_path = str(tmp_path / 'wake.sqlite3')
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+        pc_id = conn.execute("INSERT INTO pc_info (machine_id, hostname, mac_address, is_online) "
+                             "VALUES ('WAKE-PC', 'PC', 'AA:BB:CC:DD:EE:01', 1)").lastrowid
+        conn.commit()
+        init_db_manager(db_path, use_writer=True)
+
+        def other_worker_creates_command():
+            other = sqlite3.connect(db_path)
+            other.execute("INSERT INTO commands (pc_id, command_type, status) "
+                          "VALUES (?, 'shutdown', 'pending')", (pc_id,))
+            other.commit()
+            other.close()
+
+        def poll():
+            # 별도 스레드 = 별도 앱 컨텍스트 (픽스처의 인메모리 DB 연결과 섞이지 않도록)
+            return app.test_client().get('/api/client/commands', query_string={
+                'machine_id': 'WAKE-PC', 'timeout': 10
+            })
+
+        try:
+            threading.Timer(0.5, other_worker_creates_command).start()
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                response = pool.submit(poll).result()
+            elapsed = time.monotonic() - started
+        finally:
+            conn.close()
+            init_db_manager(':memory:')
+
+        assert response.get_json()['data']['has_command'] is True
+        assert elapsed < 2
+
+
+class TestAdminCacheAcrossWorkers:
+    """활성 관리자 캐시 워커 간 무효화 테스트"""
+
+    def test_revocation_in_other_process_is_immediate(self, app, tmp_path):
+        """다른 프로세스(워커)가 관리자를 비활성화하면 이 워커의 캐시도 다음 요청에서 무효"""
+        from utils.auth import _is_active_admin
+        from utils.database import init_db_manager
+
+        db_path = str(tmp_path / 'admins.sqlite3')
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+        conn.execute("INSERT INTO admins (username, password_hash) VALUES ('lab-admin', 'x')")
+        conn.commit()
+        conn.close()
+        init_db_manager(db_path, use_writer=True)
+
+        def other_worker(sql):
+            subprocess.run([sys.executable, '-c', (
+                'import sqlite3, sys; conn = sqlite3.connect(sys.argv[1]); '
+                'conn.execute(sys.argv[2]); conn.commit()'
+            ), db_path, sql], check=True)
+
+        try:
+            with app.test_request_context():
+                assert _is_active_admin('lab-admin') is True
+                other_worker("UPDATE admins SET email='a@b.c' WHERE username='lab-admin'")
+                assert _is_active_admin('lab-admin') is True
+
+                other_worker("UPDATE admins SET is_active=0 WHERE username='lab-admin'")
+                assert _is_active_admin('lab-admin') is False
+
+                other_worker("UPDATE admins SET is_active=1 WHERE username='lab-admin'")
+                assert _is_active_admin('lab-admin') is True
+                other_worker("DELETE FROM admins WHERE username='lab-admin'")
+                assert _is_active_admin('lab-admin') is False
+        finally:
+            init_db_manager(':memory:')
+
+
+class TestWorkerCount:
+    """config의 gunicorn 워커 수 감지 테스트"""
+
+    def test_gunicorn_command_line(self, monkeypatch):
+        """gunicorn -w N으로 직접 실행해도 워커 수를 읽음"""
+        from config import _gunicorn_workers
+
+        monkeypatch.delenv('GUNICORN_CMD_ARGS', raising=False)
+        monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+        monkeypatch.setattr(sys, 'argv', ['/opt/wcms/.venv/bin/gunicorn', '-k', 'gevent',
+                                          '-w', '4', 'app:app'])
+        assert _gunicorn_workers() == 4
+
+        monkeypatch.setattr(sys, 'argv', ['gunicorn', '--workers=3', 'app:app'])
+        assert _gunicorn_workers() == 3
+
+        monkeypatch.setattr(sys, 'argv', ['pytest'])
+        assert _gunicorn_workers() is None
+        monkeypatch.setenv('GUNICORN_CMD_ARGS', '-w 2 --timeout 120')
+        assert _gunicorn_workers() == 2
+
+
+class TestWorkerLease:
+    """WorkerLease 테스트"""
+
+    def test_single_leader(self, app):
+        """같은 이름의 임대는 한 보유자만 획득, 만료 후 다른 보유자가 이어받음"""
+        from utils.worker_lease import WorkerLease
+
+        first = WorkerLease('offline-checker', ttl=0.2)
+        second = WorkerLease('offline-checker', ttl=0.2)
+        second.holder = 'other-host:2:abcd'
+
+        assert first.try_acquire() is True
+        assert second.try_acquire() is False
+        assert first.try_acquire() is True  # 보유자는 갱신 가능
+
+        time.sleep(0.3)
+        assert second.try_acquire() is True
+        assert first.try_acquire() is False
+
+        second.release()
+        assert first.try_acquire() is True
+
+
+class TestSQLiteLimiterStorage:
+    """Rate Limit SQLite 저장소 테스트"""
+
+    def test_counters_shared_between_instances(self, tmp_path):
+        """같은 파일을 쓰는 저장소(= 다른 워커)끼리 카운터 공유"""
+        from limits import RateLimitItemPerMinute
+        from limits.strategies import FixedWindowRateLimiter
+        from utils.limiter_storage import SQLiteLimiterStorage
+
+        uri = f"sqlite:///{tmp_path / 'ratelimit.sqlite3'}"
+        worker_a = FixedWindowRateLimiter(SQLiteLimiterStorage(uri))
+        worker_b = FixedWindowRateLimiter(SQLiteLimiterStorage(uri))
+        limit = RateLimitItemPerMinute(3)
+
+        hits = [worker_a.hit(limit, '10.0.0.1'), worker_b.hit(limit, '10.0.0.1'),
+                worker_a.hit(limit, '10.0.0.1'), worker_b.hit(limit, '10.0.0.1')]
+        assert hits == [True, True, True, False]
+        assert worker_a.hit(limit, '10.0.0.2') is True
+
+    def test_expired_window_restarts(self, tmp_path):
+        from utils.limiter_storage import SQLiteLimiterStorage
+
+        storage = SQLiteLimiterStorage(f"sqlite:///{tmp_path / 'ratelimit.sqlite3'}")
+        assert storage.incr('k', 1) == 1
+        assert storage.incr('k', 1) == 2
+        time.sleep(1.1)
+        assert storage.get('k') == 0
+        assert storage.incr('k', 1) == 1